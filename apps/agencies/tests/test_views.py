@@ -0,0 +1,45 @@
+"""
+Agency Views Unit Tests
+
+Tests for agency settings updates.
+"""
+from contextlib import nullcontext
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.agencies.views import AgencySettingsView
+from apps.core.tests.test_permissions import create_auth_user
+
+
+@patch('apps.agencies.views.transaction.atomic', return_value=nullcontext())
+@patch('apps.agencies.views.invalidate_agency_by_phone')
+@patch('apps.agencies.views.connection')
+class AgencySettingsPatchTests(SimpleTestCase):
+    """PATCH /api/agencies/{id}/settings."""
+
+    def setUp(self):
+        self.user = create_auth_user(is_admin=True)
+        self.agency_id = str(self.user.agency_id)
+
+    def _patch(self, data):
+        request = APIRequestFactory().patch(f'/api/agencies/{self.agency_id}/settings', data, format='json')
+        force_authenticate(request, user=self.user)
+        return AgencySettingsView.as_view()(request, agency_id=self.agency_id)
+
+    def test_phone_change_invalidates_old_and_new(self, mock_connection, mock_invalidate, mock_atomic):
+        """Inbound SMS to the new number is not routed by a stale cache entry."""
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = ('+15551234567',)
+
+        response = self._patch({'phone_number': '(669) 245-6363'})
+
+        self.assertEqual(response.status_code, 200)
+        mock_invalidate.assert_called_once_with('+15551234567', '(669) 245-6363')
+
+    def test_other_settings_leave_phone_cache(self, mock_connection, mock_invalidate, mock_atomic):
+        response = self._patch({'display_name': 'Acme'})
+
+        self.assertEqual(response.status_code, 200)
+        mock_invalidate.assert_not_called()
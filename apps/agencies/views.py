@@ -13,7 +13,7 @@ import logging
 import os
 import uuid
 
-from django.db import connection
+from django.db import connection, transaction
 from rest_framework import status
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
@@ -22,6 +22,9 @@ from rest_framework.views import APIView
 
 from apps.core.authentication import CronSecretAuthentication, SupabaseJWTAuthentication
 from apps.core.mixins import AuthenticatedAPIView
+from apps.core.phone import find_agency_by_phone
+from apps.sms.inbound import invalidate_agency_by_phone
+from apps.sms.templates_service import AGENCY_TEMPLATE_COLUMNS, validate_template
 
 logger = logging.getLogger(__name__)
 
@@ -155,6 +158,16 @@ class AgencySettingsView(AuthenticatedAPIView, APIView):
             'default_scoreboard_start_date',
         ]
 
+        # Reject SMS templates using placeholders their message type can't fill
+        for template_type, column in AGENCY_TEMPLATE_COLUMNS.items():
+            template = request.data.get(column)
+            unknown = validate_template(template, template_type) if template else []
+            if unknown:
+                return Response(
+                    {'error': 'ValidationError', 'message': f"Unknown placeholders in {column}: {', '.join(unknown)}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
         updates = []
         params = []
 
@@ -178,7 +191,16 @@ class AgencySettingsView(AuthenticatedAPIView, APIView):
 
         try:
             params.append(agency_id)
-            with connection.cursor() as cursor:
+            with transaction.atomic(), connection.cursor() as cursor:
+                # Inbound SMS caches agencies by receiving number; drop the old and new entries
+                if 'phone_number' in request.data:
+                    cursor.execute(
+                        "SELECT phone_number FROM public.agencies WHERE id = %s FOR UPDATE",
+                        [agency_id],
+                    )
+                    row = cursor.fetchone()
+                    invalidate_agency_by_phone(row[0] if row else None, request.data['phone_number'])
+
                 cursor.execute(f"""
                     UPDATE public.agencies
                     SET {', '.join(updates)}, updated_at = NOW()
@@ -518,35 +540,12 @@ class AgencyByPhoneView(AuthenticatedAPIView, APIView):
             )
 
         try:
-            # Normalize phone number for comparison (remove all non-digits)
-            import re
-            normalized = re.sub(r'\D', '', phone)
-
-            # Try multiple phone format variations
-            phone_variations = [
-                phone,                           # Original format
-                normalized,                      # Digits only
-                f'+1{normalized}' if len(normalized) == 10 else f'+{normalized}',  # E.164
-            ]
-
-            for variation in phone_variations:
-                with connection.cursor() as cursor:
-                    cursor.execute("""
-                        SELECT id, name, phone_number
-                        FROM public.agencies
-                        WHERE phone_number = %s
-                    """, [variation])
-                    row = cursor.fetchone()
-
-                if row:
-                    return Response({
-                        'found': True,
-                        'agency': {
-                            'id': str(row[0]),
-                            'name': row[1],
-                            'phone_number': row[2],
-                        }
-                    })
+            agency = find_agency_by_phone(phone)
+            if agency:
+                return Response({
+                    'found': True,
+                    'agency': agency,
+                })
 
             return Response({
                 'found': False,
@@ -13,6 +13,8 @@ from django.db import connection
 from django.db.models import F, IntegerField, Value
 from django_cte import With
 
+from apps.core.pagination import decode_cursor, name_sort_key
+
 
 def get_agent_downline(agent_id: UUID, agency_id: UUID) -> list[dict]:
     """
@@ -286,6 +288,18 @@ def get_agents_hierarchy_nodes(user_id: UUID, include_full_agency: bool = False)
         ]
 
 
+# Agents table sorts by last_name, first_name (NULLs last) with id as
+# tiebreaker; the IS NULL flags keep the keyset comparison NULL-safe
+AGENTS_TABLE_ORDER_BY = (
+    "u.last_name IS NULL, COALESCE(u.last_name, ''), "
+    "u.first_name IS NULL, COALESCE(u.first_name, ''), u.id"
+)
+
+
+def agents_table_sort_key(row: dict) -> tuple:
+    """Keyset sort key of a get_agents_table() row (matches AGENTS_TABLE_ORDER_BY)."""
+    return name_sort_key(row['last_name'], row['first_name']) + (row['agent_id'],)
+
 # Allowed filter keys for get_agents_table() - security whitelist
 ALLOWED_AGENT_TABLE_FILTER_KEYS = frozenset({
     'status',
@@ -298,29 +312,16 @@ ALLOWED_AGENT_TABLE_FILTER_KEYS = frozenset({
 })
 
 
-def get_agents_table(
+def _agents_table_query_parts(
     user_id: UUID,
-    filters: dict[str, Any] | None = None,
-    include_full_agency: bool = False,
-    limit: int = 20,
-    offset: int = 0,
-) -> list[dict]:
+    filters: dict[str, Any] | None,
+    include_full_agency: bool,
+) -> tuple[str, str, list]:
     """
-    Get paginated agent table data with filtering.
-    Translated from Supabase RPC: get_agents_table
-
-    Note: Kept as raw SQL due to complex dynamic filtering requirements.
-    This is a P3 function - partial ORM conversion planned.
-
-    Args:
-        user_id: The requesting user's ID
-        filters: Filter dictionary with keys like status, agent_name, etc.
-        include_full_agency: Include all agency agents
-        limit: Page size
-        offset: Page offset
+    Build the visibility CTEs and WHERE clause shared by the agents table queries.
 
     Returns:
-        List of agent rows with total_count for pagination
+        Tuple of (WITH clause, WHERE clause, params)
 
     Raises:
         ValueError: If an invalid filter key is provided
@@ -345,182 +346,233 @@ def get_agents_table(
     needs_upline_cte = in_upline is not None and in_upline != 'all'
     needs_downline_cte = in_downline is not None and in_downline != 'all'
 
-    with connection.cursor() as cursor:
-        # Build the query dynamically based on filters
-        # NOTE: No is_active filter to match RPC behavior
-        params = [str(user_id)]
-        where_clauses = ["u.role <> 'client'"]
-
-        # Base query - either full agency or user's downline
-        if include_full_agency:
-            base_cte = """
-                WITH current_usr AS (
-                    SELECT id, agency_id FROM users WHERE id = %s LIMIT 1
-                ),
-                visible_agents AS (
-                    SELECT u.id
-                    FROM users u
-                    JOIN current_usr cu ON cu.agency_id = u.agency_id
-                    WHERE u.role <> 'client'
-                )
-            """
-        else:
-            base_cte = """
-                WITH RECURSIVE
-                current_usr AS (
-                    SELECT id, agency_id FROM users WHERE id = %s LIMIT 1
-                ),
-                downline AS (
-                    SELECT u.id
-                    FROM users u
-                    WHERE u.id = (SELECT id FROM current_usr)
-                    UNION ALL
-                    SELECT u.id
-                    FROM users u
-                    JOIN downline d ON u.upline_id = d.id
-                ),
-                visible_agents AS (
-                    SELECT id FROM downline
-                )
-            """
+    # Build the query dynamically based on filters
+    # NOTE: No is_active filter to match RPC behavior
+    params = [str(user_id)]
+    where_clauses = ["u.role <> 'client'"]
 
-        # Add upline chain CTE if needed for in_upline filter
-        # This finds agents who have the specified agent somewhere in their upline chain
-        if needs_upline_cte:
-            base_cte = base_cte.rstrip().rstrip(',') + """,
-                target_agent AS (
-                    SELECT id FROM users
-                    WHERE LOWER(CONCAT(first_name, ' ', last_name)) LIKE %s
-                    LIMIT 1
-                ),
-                upline_chain AS (
-                    -- Start from target agent and walk up
-                    SELECT id, upline_id, 0 as depth
-                    FROM users
-                    WHERE id = (SELECT id FROM target_agent)
-                    UNION ALL
-                    SELECT u.id, u.upline_id, uc.depth + 1
-                    FROM users u
-                    JOIN upline_chain uc ON u.id = uc.upline_id
-                    WHERE uc.depth < 50
-                )
-            """
-            params.append(f'%{in_upline.lower()}%')
-
-        # Add downline tree CTE if needed for in_downline filter
-        # This finds agents who have the specified agent somewhere in their downline
-        if needs_downline_cte:
-            base_cte = base_cte.rstrip().rstrip(',') + """,
-                target_downline_agent AS (
-                    SELECT id FROM users
-                    WHERE LOWER(CONCAT(first_name, ' ', last_name)) LIKE %s
-                    LIMIT 1
-                ),
-                downline_tree AS (
-                    -- Start from target agent and walk down
-                    SELECT id, 0 as depth
-                    FROM users
-                    WHERE id = (SELECT id FROM target_downline_agent)
-                    UNION ALL
-                    SELECT u.id, dt.depth + 1
-                    FROM users u
-                    JOIN downline_tree dt ON u.upline_id = dt.id
-                    WHERE dt.depth < 50
-                )
-            """
-            params.append(f'%{in_downline.lower()}%')
-
-        # Status filter
-        if status_filter and status_filter != 'all':
-            where_clauses.append("u.status = %s")
-            params.append(status_filter)
-
-        # Position filter
-        if position_id and position_id != 'all':
-            if position_id is None:
-                where_clauses.append("u.position_id IS NULL")
-            else:
-                where_clauses.append("u.position_id = %s")
-                params.append(position_id)
-
-        # Agent name filter (search by name)
-        if agent_name and agent_name != 'all':
-            where_clauses.append(
-                "(LOWER(u.first_name) LIKE %s OR LOWER(u.last_name) LIKE %s OR "
-                "LOWER(CONCAT(u.first_name, ' ', u.last_name)) LIKE %s)"
+    # Base query - either full agency or user's downline
+    if include_full_agency:
+        base_cte = """
+            WITH current_usr AS (
+                SELECT id, agency_id FROM users WHERE id = %s LIMIT 1
+            ),
+            visible_agents AS (
+                SELECT u.id
+                FROM users u
+                JOIN current_usr cu ON cu.agency_id = u.agency_id
+                WHERE u.role <> 'client'
             )
-            pattern = f'%{agent_name.lower()}%'
-            params.extend([pattern, pattern, pattern])
-
-        # in_upline filter: Find agents who appear in the upline chain of the target agent
-        # (i.e., the target agent reports up to them somehow)
-        if needs_upline_cte:
-            where_clauses.append("u.id IN (SELECT id FROM upline_chain WHERE id != (SELECT id FROM target_agent))")
-
-        # in_downline filter: Find agents who appear in the downline tree of the target agent
-        # (i.e., the target agent has them in their organization)
-        if needs_downline_cte:
-            where_clauses.append("u.id IN (SELECT id FROM downline_tree WHERE id != (SELECT id FROM target_downline_agent))")
-
-        # Direct upline filter
-        if direct_upline is not None and direct_upline != 'all':
-            if direct_upline == '':
-                where_clauses.append("u.upline_id IS NULL")
-            else:
-                where_clauses.append("""
-                    u.upline_id IN (
-                        SELECT id FROM users
-                        WHERE LOWER(CONCAT(first_name, ' ', last_name)) LIKE %s
-                    )
-                """)
-                params.append(f'%{direct_upline.lower()}%')
+        """
+    else:
+        base_cte = """
+            WITH current_usr AS (
+                SELECT id, agency_id FROM users WHERE id = %s LIMIT 1
+            ),
+            visible_agents AS (
+                SELECT id FROM current_usr
+                UNION
+                SELECT c.descendant_id
+                FROM user_hierarchy_closure c
+                WHERE c.ancestor_id = (SELECT id FROM current_usr)
+            )
+        """
+
+    # Add upline chain CTE if needed for in_upline filter
+    # This finds agents who have the specified agent somewhere in their upline chain
+    if needs_upline_cte:
+        base_cte = base_cte.rstrip().rstrip(',') + """,
+            target_agent AS (
+                SELECT id FROM users
+                WHERE LOWER(CONCAT(first_name, ' ', last_name)) LIKE %s
+                LIMIT 1
+            ),
+            upline_chain AS (
+                -- Every ancestor of the target agent
+                SELECT c.ancestor_id AS id, c.depth
+                FROM user_hierarchy_closure c
+                WHERE c.descendant_id = (SELECT id FROM target_agent)
+                  AND c.depth <= 50
+            )
+        """
+        params.append(f'%{in_upline.lower()}%')
+
+    # Add downline tree CTE if needed for in_downline filter
+    # This finds agents who have the specified agent somewhere in their downline
+    if needs_downline_cte:
+        base_cte = base_cte.rstrip().rstrip(',') + """,
+            target_downline_agent AS (
+                SELECT id FROM users
+                WHERE LOWER(CONCAT(first_name, ' ', last_name)) LIKE %s
+                LIMIT 1
+            ),
+            downline_tree AS (
+                -- Every descendant of the target agent
+                SELECT c.descendant_id AS id, c.depth
+                FROM user_hierarchy_closure c
+                WHERE c.ancestor_id = (SELECT id FROM target_downline_agent)
+                  AND c.depth <= 50
+            )
+        """
+        params.append(f'%{in_downline.lower()}%')
+
+    # Status filter
+    if status_filter and status_filter != 'all':
+        where_clauses.append("u.status = %s")
+        params.append(status_filter)
 
-        # Direct downline filter
-        if direct_downline is not None and direct_downline != 'all':
+    # Position filter
+    if position_id and position_id != 'all':
+        if position_id is None:
+            where_clauses.append("u.position_id IS NULL")
+        else:
+            where_clauses.append("u.position_id = %s")
+            params.append(position_id)
+
+    # Agent name filter (search by name)
+    if agent_name and agent_name != 'all':
+        where_clauses.append(
+            "(LOWER(u.first_name) LIKE %s OR LOWER(u.last_name) LIKE %s OR "
+            "LOWER(CONCAT(u.first_name, ' ', u.last_name)) LIKE %s)"
+        )
+        pattern = f'%{agent_name.lower()}%'
+        params.extend([pattern, pattern, pattern])
+
+    # in_upline filter: Find agents who appear in the upline chain of the target agent
+    # (i.e., the target agent reports up to them somehow)
+    if needs_upline_cte:
+        where_clauses.append("u.id IN (SELECT id FROM upline_chain WHERE id != (SELECT id FROM target_agent))")
+
+    # in_downline filter: Find agents who appear in the downline tree of the target agent
+    # (i.e., the target agent has them in their organization)
+    if needs_downline_cte:
+        where_clauses.append("u.id IN (SELECT id FROM downline_tree WHERE id != (SELECT id FROM target_downline_agent))")
+
+    # Direct upline filter
+    if direct_upline is not None and direct_upline != 'all':
+        if direct_upline == '':
+            where_clauses.append("u.upline_id IS NULL")
+        else:
             where_clauses.append("""
-                u.id IN (
-                    SELECT upline_id FROM users
+                u.upline_id IN (
+                    SELECT id FROM users
                     WHERE LOWER(CONCAT(first_name, ' ', last_name)) LIKE %s
                 )
             """)
-            params.append(f'%{direct_downline.lower()}%')
+            params.append(f'%{direct_upline.lower()}%')
+
+    # Direct downline filter
+    if direct_downline is not None and direct_downline != 'all':
+        where_clauses.append("""
+            u.id IN (
+                SELECT upline_id FROM users
+                WHERE LOWER(CONCAT(first_name, ' ', last_name)) LIKE %s
+            )
+        """)
+        params.append(f'%{direct_downline.lower()}%')
+
+    where_sql = " AND ".join(where_clauses)
+    return base_cte, where_sql, params
+
+
+def get_agents_table(
+    user_id: UUID,
+    filters: dict[str, Any] | None = None,
+    include_full_agency: bool = False,
+    limit: int = 20,
+    offset: int = 0,
+    cursor: str | None = None,
+) -> list[dict]:
+    """
+    Get paginated agent table data with filtering.
+    Translated from Supabase RPC: get_agents_table
+
+    Note: Kept as raw SQL due to complex dynamic filtering requirements.
+    This is a P3 function - partial ORM conversion planned.
+
+    Args:
+        user_id: The requesting user's ID
+        filters: Filter dictionary with keys like status, agent_name, etc.
+        include_full_agency: Include all agency agents
+        limit: Page size
+        offset: Page offset
+        cursor: Keyset cursor ('' for the first page); None uses offset.
+            Keyset mode returns up to limit + 1 rows and no total_count
+            (see apps.core.pagination.keyset_page and count_agents_table)
+
+    Returns:
+        List of agent rows with total_count for pagination
+
+    Raises:
+        ValueError: If an invalid filter key is provided
+    """
+    after = decode_cursor(cursor, 5) if cursor is not None else None
+    base_cte, where_sql, params = _agents_table_query_parts(user_id, filters, include_full_agency)
+
+    if after:
+        where_sql += f" AND ({AGENTS_TABLE_ORDER_BY}) > (%s, %s, %s, %s, %s::uuid)"
+        params.extend(after)
+    # Keyset pages skip the per-row window count and fetch one extra row instead
+    total_count_sql = "" if cursor is not None else ",\n            COUNT(*) OVER() as total_count"
+    if cursor is not None:
+        limit, offset = limit + 1, 0
+
+    # Main query - includes total_prod, total_policies_sold, downline_count to match RPC
+    # NOTE: phone_number removed to match RPC
+    query = f"""
+        {base_cte}
+        SELECT
+            u.id as agent_id,
+            u.first_name,
+            u.last_name,
+            u.email,
+            u.status,
+            u.perm_level,
+            u.position_id,
+            p.name as position_name,
+            p.level as position_level,
+            u.upline_id,
+            upline.first_name || ' ' || upline.last_name as upline_name,
+            u.created_at,
+            u.total_prod,
+            u.total_policies_sold,
+            (SELECT COUNT(*) FROM users d WHERE d.upline_id = u.id) as downline_count{total_count_sql}
+        FROM users u
+        JOIN visible_agents va ON va.id = u.id
+        LEFT JOIN positions p ON p.id = u.position_id
+        LEFT JOIN users upline ON upline.id = u.upline_id
+        WHERE {where_sql}
+        ORDER BY {AGENTS_TABLE_ORDER_BY}
+        LIMIT %s OFFSET %s
+    """
+    params.extend([str(limit), str(offset)])
+
+    with connection.cursor() as db_cursor:
+        db_cursor.execute(query, params)
+        columns = [col[0] for col in db_cursor.description]
+        return [dict(zip(columns, row, strict=False)) for row in db_cursor.fetchall()]
+
 
-        where_sql = " AND ".join(where_clauses)
+def count_agents_table(
+    user_id: UUID,
+    filters: dict[str, Any] | None = None,
+    include_full_agency: bool = False,
+) -> int:
+    """
+    Count the rows get_agents_table() would return across all pages.
 
-        # Main query - includes total_prod, total_policies_sold, downline_count to match RPC
-        # NOTE: phone_number removed to match RPC
-        query = f"""
+    Used for the optional total of keyset-paginated agent tables.
+    """
+    base_cte, where_sql, params = _agents_table_query_parts(user_id, filters, include_full_agency)
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
             {base_cte}
-            SELECT
-                u.id as agent_id,
-                u.first_name,
-                u.last_name,
-                u.email,
-                u.status,
-                u.perm_level,
-                u.position_id,
-                p.name as position_name,
-                p.level as position_level,
-                u.upline_id,
-                upline.first_name || ' ' || upline.last_name as upline_name,
-                u.created_at,
-                u.total_prod,
-                u.total_policies_sold,
-                (SELECT COUNT(*) FROM users d WHERE d.upline_id = u.id) as downline_count,
-                COUNT(*) OVER() as total_count
+            SELECT COUNT(*)
             FROM users u
             JOIN visible_agents va ON va.id = u.id
-            LEFT JOIN positions p ON p.id = u.position_id
-            LEFT JOIN users upline ON upline.id = u.upline_id
             WHERE {where_sql}
-            ORDER BY u.last_name, u.first_name
-            LIMIT %s OFFSET %s
-        """
-        params.extend([str(limit), str(offset)])
-
-        cursor.execute(query, params)
-        columns = [col[0] for col in cursor.description]
-        return [dict(zip(columns, row, strict=False)) for row in cursor.fetchall()]
+        """, params)
+        return cursor.fetchone()[0]
 
 
 def get_agents_without_positions(user_id: UUID) -> dict:
@@ -765,27 +817,32 @@ def get_agents_debt_production(
         user_agency_id = str(user_row[0])
 
         cursor.execute("""
-            WITH RECURSIVE
-            -- Step 1: Build hierarchy tree for all requested agents
-            agent_tree AS (
-                -- Base case: each agent is their own root
-                SELECT
-                    u.id as root_agent_id,
-                    u.id as descendant_id,
-                    0 as depth
+            WITH
+            -- Step 1: Expand each requested agent to its hierarchy via the closure table
+            agent_roots AS (
+                SELECT u.id
                 FROM users u
                 WHERE u.id = ANY(%s::uuid[])
                     AND u.agency_id = %s::uuid
+            ),
+            agent_tree AS (
+                -- Each agent is their own root
+                SELECT
+                    r.id as root_agent_id,
+                    r.id as descendant_id,
+                    0 as depth
+                FROM agent_roots r
 
                 UNION ALL
 
-                -- Recursive case: find all downlines
+                -- All downlines, at any depth
                 SELECT
-                    at.root_agent_id,
-                    u.id as descendant_id,
-                    at.depth + 1
-                FROM agent_tree at
-                JOIN users u ON u.upline_id = at.descendant_id
+                    c.ancestor_id as root_agent_id,
+                    c.descendant_id,
+                    c.depth
+                FROM agent_roots r
+                JOIN user_hierarchy_closure c ON c.ancestor_id = r.id AND c.depth > 0
+                JOIN users u ON u.id = c.descendant_id
                 WHERE u.agency_id = %s::uuid
             ),
 
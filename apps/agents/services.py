@@ -11,6 +11,15 @@ import httpx
 from django.conf import settings
 from django.db import connection, transaction
 
+from apps.core.authentication import invalidate_cached_user
+from apps.core.cache import bump_data_version
+from apps.core.hierarchy import (
+    invalidate_hierarchy_index,
+    is_in_downline,
+    is_upline_cycle,
+    update_hierarchy_closure,
+)
+
 logger = logging.getLogger(__name__)
 
 # Supabase configuration
@@ -71,24 +80,11 @@ def update_agent_position(
         has_permission = is_admin
 
         if not is_admin:
-            # Check if agent_id is in the downline of user_id
-            cursor.execute("""
-                WITH RECURSIVE downline AS (
-                    SELECT u.id
-                    FROM users u
-                    WHERE u.id = %s
-                    UNION ALL
-                    SELECT u.id
-                    FROM users u
-                    JOIN downline d ON u.upline_id = d.id
-                    WHERE d.id <> u.id  -- Prevent cycles
-                )
-                SELECT EXISTS (
-                    SELECT 1 FROM downline WHERE id = %s
-                )
-            """, [str(user_id), str(agent_id)])
-
-            has_permission = cursor.fetchone()[0]
+            # Check if agent_id is the user or in the downline of user_id
+            has_permission = (
+                str(user_id) == str(agent_id)
+                or is_in_downline(user_id, agent_id, agency_id)
+            )
 
         if not has_permission:
             return {'success': False, 'error': 'You do not have permission to update this agent'}
@@ -101,14 +97,17 @@ def update_agent_position(
                 updated_at = NOW()
             WHERE id = %s
                 AND agency_id = %s
-            RETURNING id
+            RETURNING id, auth_user_id
         """, [str(position_id), str(agent_id), str(agency_id)])
 
-        updated = cursor.fetchone() is not None
+        updated_row = cursor.fetchone()
 
-        if not updated:
+        if not updated_row:
             return {'success': False, 'error': 'Agent not found or does not belong to your agency'}
 
+        invalidate_cached_user(updated_row[1])
+        bump_data_version(agency_id)
+
         return {'success': True}
 
 
@@ -144,13 +143,16 @@ def assign_position_to_agent(
             UPDATE users
             SET position_id = %s, updated_at = NOW()
             WHERE id = %s AND agency_id = %s
-            RETURNING id, first_name, last_name, email, position_id, status
+            RETURNING id, first_name, last_name, email, position_id, status, auth_user_id
         """, [str(position_id) if position_id else None, str(agent_id), str(agency_id)])
 
         columns = [col[0] for col in cursor.description]
         row = cursor.fetchone()
         if row:
-            return dict(zip(columns, row, strict=False))
+            agent = dict(zip(columns, row, strict=False))
+            invalidate_cached_user(agent.pop('auth_user_id'))
+            bump_data_version(agency_id)
+            return agent
         return None
 
 
@@ -271,6 +273,10 @@ def invite_agent(
                 _delete_supabase_user(auth_user_id)
                 return {'success': False, 'error': 'Failed to update user'}
 
+            update_hierarchy_closure(row[0], effective_upline_id)
+            invalidate_hierarchy_index(agency_id)
+            bump_data_version(agency_id)
+
             return {
                 'success': True,
                 'user_id': str(row[0]),
@@ -343,6 +349,10 @@ def invite_agent(
                 _delete_supabase_user(auth_user_id)
                 return {'success': False, 'error': 'Failed to create user record'}
 
+            update_hierarchy_closure(row[0], effective_upline_id)
+            invalidate_hierarchy_index(agency_id)
+            bump_data_version(agency_id)
+
             return {
                 'success': True,
                 'user_id': str(row[0]),
@@ -527,6 +537,7 @@ def resend_agent_invite(
             cursor.execute("""
                 UPDATE users SET auth_user_id = NULL WHERE id = %s
             """, [str(agent_id)])
+            invalidate_cached_user(auth_user_id)
 
             # 2. Delete the old auth account
             logger.info(f'Deleting old auth account: {auth_user_id}')
@@ -630,24 +641,11 @@ def update_agent(
         has_permission = is_admin
 
         if not is_admin:
-            # Check if agent_id is in the downline of requester_id
-            cursor.execute("""
-                WITH RECURSIVE downline AS (
-                    SELECT u.id
-                    FROM users u
-                    WHERE u.id = %s
-                    UNION ALL
-                    SELECT u.id
-                    FROM users u
-                    JOIN downline d ON u.upline_id = d.id
-                    WHERE d.id <> u.id
-                )
-                SELECT EXISTS (
-                    SELECT 1 FROM downline WHERE id = %s
-                )
-            """, [str(requester_id), str(agent_id)])
-
-            has_permission = cursor.fetchone()[0]
+            # Check if agent_id is the requester or in the downline of requester_id
+            has_permission = (
+                str(requester_id) == str(agent_id)
+                or is_in_downline(requester_id, agent_id, agency_id)
+            )
 
         if not has_permission:
             return {'success': False, 'error': 'You do not have permission to update this agent'}
@@ -668,6 +666,7 @@ def update_agent(
             update_fields.append('phone_number = %s')
             update_values.append(phone_number.strip() if phone_number else None)
 
+        upline_changed = False
         if upline_id is not None:
             upline_id_str = str(upline_id) if upline_id else None
             if upline_id_str != str(current_upline_id) if current_upline_id else None:
@@ -678,8 +677,11 @@ def update_agent(
                     """, [str(upline_id), str(agency_id)])
                     if not cursor.fetchone():
                         return {'success': False, 'error': 'Upline agent not found in this agency'}
+                    if is_upline_cycle(agent_id, upline_id):
+                        return {'success': False, 'error': 'Upline cannot be the agent or one of their downlines'}
                 update_fields.append('upline_id = %s')
                 update_values.append(str(upline_id) if upline_id else None)
+                upline_changed = True
 
         # Handle email change - requires Supabase auth sync
         email_changed = False
@@ -716,6 +718,12 @@ def update_agent(
         if not row:
             return {'success': False, 'error': 'Failed to update agent'}
 
+        invalidate_cached_user(auth_user_id)
+        bump_data_version(agency_id)
+        if upline_changed:
+            update_hierarchy_closure(agent_id, upline_id or None)
+            invalidate_hierarchy_index(agency_id)
+
         # Sync email to Supabase auth if changed
         if email_changed and auth_user_id:
             try:
@@ -832,7 +840,12 @@ def deactivate_agent(
                 WHERE upline_id = %s AND agency_id = %s
                 RETURNING id
             """, [str(upline_id), str(agent_id), str(agency_id)])
-            reassigned_count = cursor.rowcount
+            reassigned_ids = [r[0] for r in cursor.fetchall()]
+            reassigned_count = len(reassigned_ids)
+            for downline_id in reassigned_ids:
+                update_hierarchy_closure(downline_id, upline_id)
+            if reassigned_count:
+                invalidate_hierarchy_index(agency_id)
 
         # Deactivate the agent
         cursor.execute("""
@@ -845,6 +858,9 @@ def deactivate_agent(
         if not cursor.fetchone():
             return {'success': False, 'error': 'Failed to deactivate agent'}
 
+        invalidate_cached_user(auth_user_id)
+        bump_data_version(agency_id)
+
         # Deactivate Supabase auth user
         if auth_user_id:
             try:
@@ -0,0 +1,110 @@
+"""
+Agent Services Unit Tests
+
+Tests for upline changes in update_agent.
+"""
+from contextlib import nullcontext
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+from django.test import SimpleTestCase
+
+from apps.agents.services import update_agent
+
+
+class FakeHierarchyDB:
+    """
+    Minimal stand-in for public.users and public.user_hierarchy_closure.
+
+    Closure rows are derived from the users' upline_id values, so they are
+    always consistent with the tree.
+    """
+
+    def __init__(self, agency_id, uplines: dict):
+        self.agency_id = agency_id
+        self.uplines = dict(uplines)
+        self.updates: list[list] = []
+        self._result = None
+
+    def is_ancestor(self, ancestor_id, descendant_id) -> bool:
+        node = descendant_id
+        while node is not None:
+            if node == ancestor_id:
+                return True
+            node = self.uplines.get(node)
+        return False
+
+    def cursor(self):
+        cursor = MagicMock()
+        cursor.execute.side_effect = self._execute
+        cursor.fetchone.side_effect = lambda: self._result
+        return nullcontext(cursor)
+
+    def _execute(self, sql, params):
+        sql = ' '.join(sql.split())
+        if 'as is_admin' in sql:
+            self._result = (True,)
+        elif sql.startswith('SELECT id, auth_user_id, email'):
+            user_id = params[0]
+            self._result = (user_id, None, 'agent@example.com', 'A', 'Agent', None,
+                            self.uplines[user_id], self.agency_id)
+        elif sql.startswith('SELECT id FROM users'):
+            self._result = (params[0],) if params[0] in self.uplines else None
+        elif 'user_hierarchy_closure' in sql:
+            self._result = (1,) if self.is_ancestor(params[0], params[1]) else None
+        elif sql.startswith('UPDATE users'):
+            self.updates.append(params)
+            user_id, upline_id = params[-2], params[0]
+            self.uplines[user_id] = upline_id
+            self._result = (user_id, 'agent@example.com', 'A', 'Agent', None, upline_id)
+        else:
+            raise AssertionError(f'Unexpected SQL: {sql}')
+
+
+@patch('apps.agents.services.invalidate_hierarchy_index')
+@patch('apps.agents.services.update_hierarchy_closure')
+@patch('apps.agents.services.bump_data_version')
+@patch('apps.agents.services.invalidate_cached_user')
+class UpdateAgentUplineTests(SimpleTestCase):
+    """update_agent is called through __wrapped__, outside its atomic block."""
+
+    def setUp(self):
+        # root -> manager -> agent
+        self.agency_id = str(uuid4())
+        self.root, self.manager, self.agent = str(uuid4()), str(uuid4()), str(uuid4())
+        self.db = FakeHierarchyDB(self.agency_id, {
+            self.root: None,
+            self.manager: self.root,
+            self.agent: self.manager,
+        })
+        for target in ('apps.agents.services.connection', 'apps.core.hierarchy.connection'):
+            patcher = patch(target, self.db)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _move(self, user_id, upline_id):
+        return update_agent.__wrapped__(
+            requester_id=self.root, agent_id=user_id, agency_id=self.agency_id, upline_id=upline_id,
+        )
+
+    def test_rejects_upline_in_own_downline(self, *mocks):
+        """Moving a manager beneath their own agent is refused before users is written."""
+        result = self._move(self.manager, self.agent)
+
+        self.assertFalse(result['success'])
+        self.assertIn('downlines', result['error'])
+        self.assertEqual(self.db.updates, [])
+        self.assertEqual(self.db.uplines[self.manager], self.root)
+
+    def test_rejects_self_as_upline(self, *mocks):
+        result = self._move(self.agent, self.agent)
+
+        self.assertFalse(result['success'])
+        self.assertEqual(self.db.updates, [])
+
+    def test_moves_outside_subtree(self, mock_invalidate_user, mock_bump, mock_closure, mock_invalidate_index):
+        result = self._move(self.agent, self.root)
+
+        self.assertTrue(result['success'])
+        self.assertEqual(self.db.uplines[self.agent], self.root)
+        mock_closure.assert_called_once_with(self.agent, self.root)
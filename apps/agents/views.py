@@ -18,9 +18,13 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.core.authentication import CronSecretAuthentication, SupabaseJWTAuthentication, get_user_context
+from apps.core.exceptions import ValidationError
+from apps.core.pagination import cached_total, cursor_pagination, keyset_page, parse_cursor_params
 
 from .selectors import (
+    agents_table_sort_key,
     check_agent_upline_positions,
+    count_agents_table,
     get_agent_detail,
     get_agent_downline_with_depth,
     get_agent_downlines_with_details,
@@ -125,6 +129,8 @@ class AgentsListView(APIView):
         positionId: Filter by position
         startMonth: Start month for metrics (YYYY-MM)
         endMonth: End month for metrics (YYYY-MM)
+        cursor: Keyset paging instead of page ('' for the first page, then nextCursor)
+        include_total: With cursor, include an approximate totalCount
     """
     permission_classes = [IsAuthenticated]
 
@@ -141,6 +147,7 @@ class AgentsListView(APIView):
         page = int(request.query_params.get('page', 1))
         limit = int(request.query_params.get('limit', 20))
         offset = (page - 1) * limit
+        cursor, include_total = parse_cursor_params(request.query_params)
 
         is_admin = user.is_admin or user.role == 'admin' or user.perm_level == 'admin'
 
@@ -191,10 +198,28 @@ class AgentsListView(APIView):
                 include_full_agency=include_full_agency,
                 limit=limit,
                 offset=offset,
+                cursor=cursor,
             )
 
-            total_count = table_rows[0]['total_count'] if table_rows else 0
-            total_pages = (total_count + limit - 1) // limit if limit > 0 else 0
+            if cursor is not None:
+                table_rows, next_cursor = keyset_page(table_rows, limit, agents_table_sort_key)
+                total_count = cached_total(
+                    user.agency_id, 'agents.table',
+                    {'user': user.id, 'filters': filters, 'full_agency': include_full_agency},
+                    lambda: count_agents_table(user.id, filters, include_full_agency),
+                ) if include_total else None
+                pagination = cursor_pagination(limit, next_cursor, total_count)
+            else:
+                total_count = table_rows[0]['total_count'] if table_rows else 0
+                total_pages = (total_count + limit - 1) // limit if limit > 0 else 0
+                pagination = {
+                    'currentPage': page,
+                    'totalPages': total_pages,
+                    'totalCount': total_count,
+                    'limit': limit,
+                    'hasNextPage': page < total_pages,
+                    'hasPrevPage': page > 1,
+                }
 
             # Get agent IDs for debt/production metrics
             agent_ids = [row['agent_id'] for row in table_rows]
@@ -279,16 +304,11 @@ class AgentsListView(APIView):
             return Response({
                 'agents': agents,
                 'allAgents': all_agents,
-                'pagination': {
-                    'currentPage': page,
-                    'totalPages': total_pages,
-                    'totalCount': total_count,
-                    'limit': limit,
-                    'hasNextPage': page < total_pages,
-                    'hasPrevPage': page > 1,
-                },
+                'pagination': pagination,
             })
 
+        except ValidationError as e:
+            return Response({'error': e.message}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.error(f'Agents list failed: {e}')
             return Response(
@@ -423,6 +443,8 @@ class AgentDetailView(APIView):
 
             return Response(result)
 
+        except ValidationError as e:
+            return Response({'error': e.message}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.error(f'Agent update failed: {e}')
             return Response(
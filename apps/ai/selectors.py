@@ -9,6 +9,7 @@ from uuid import UUID
 from django.db import connection
 
 from apps.core.authentication import AuthenticatedUser
+from apps.core.pagination import cached_total, cursor_pagination, decode_cursor, keyset_page
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,8 @@ def get_ai_conversations(
     user: AuthenticatedUser,
     page: int = 1,
     limit: int = 20,
+    cursor: str | None = None,
+    include_total: bool = False,
 ) -> dict:
     """
     Get AI conversations for a user.
@@ -25,11 +28,14 @@ def get_ai_conversations(
         user: The authenticated user
         page: Page number (1-based)
         limit: Page size
+        cursor: Keyset cursor ('' for the first page); None uses page
+        include_total: With cursor, include the cached approximate total
 
     Returns:
         Dictionary with conversations and pagination
     """
     offset = (page - 1) * limit
+    after = decode_cursor(cursor, 2) if cursor is not None else None
 
     # Count query
     count_query = """
@@ -38,8 +44,9 @@ def get_ai_conversations(
         WHERE user_id = %s AND agency_id = %s
     """
 
-    # Main query
-    main_query = """
+    # Main query; keyset mode replaces OFFSET with a (updated_at, id) bound
+    keyset_filter = "AND (c.updated_at, c.id) < (%s::timestamptz, %s::uuid)" if after else ""
+    main_query = f"""
         SELECT
             c.id,
             c.title,
@@ -53,6 +60,7 @@ def get_ai_conversations(
             ) as message_count
         FROM public.ai_conversations c
         WHERE c.user_id = %s AND c.agency_id = %s
+          {keyset_filter}
         ORDER BY c.updated_at DESC, c.id DESC
         LIMIT %s OFFSET %s
     """
@@ -60,6 +68,22 @@ def get_ai_conversations(
     try:
         params = [str(user.id), str(user.agency_id)]
 
+        if cursor is not None:
+            with connection.cursor() as db_cursor:
+                db_cursor.execute(main_query, params + (after or []) + [limit + 1, 0])
+                columns = [col[0] for col in db_cursor.description]
+                rows = [dict(zip(columns, row, strict=False)) for row in db_cursor.fetchall()]
+
+            rows, next_cursor = keyset_page(rows, limit, lambda conv: (conv['updated_at'], conv['id']))
+            total = cached_total(
+                user.agency_id, 'ai.conversations', {'user': user.id},
+                lambda: _count(count_query, params),
+            ) if include_total else None
+            return {
+                'conversations': [_format_conversation(conv) for conv in rows],
+                'pagination': cursor_pagination(limit, next_cursor, total),
+            }
+
         with connection.cursor() as cursor:
             # Get total count
             cursor.execute(count_query, params)
@@ -70,17 +94,9 @@ def get_ai_conversations(
             columns = [col[0] for col in cursor.description]
             rows = cursor.fetchall()
 
-        conversations = []
-        for row in rows:
-            conv = dict(zip(columns, row, strict=False))
-            conversations.append({
-                'id': str(conv['id']),
-                'title': conv['title'],
-                'is_active': conv['is_active'],
-                'message_count': conv['message_count'] or 0,
-                'created_at': conv['created_at'].isoformat() if conv['created_at'] else None,
-                'updated_at': conv['updated_at'].isoformat() if conv['updated_at'] else None,
-            })
+        conversations = [
+            _format_conversation(dict(zip(columns, row, strict=False))) for row in rows
+        ]
 
         total_pages = (total_count + limit - 1) // limit if limit > 0 else 0
 
@@ -101,6 +117,24 @@ def get_ai_conversations(
         raise
 
 
+def _format_conversation(conv: dict) -> dict:
+    """Format an ai_conversations row for the API."""
+    return {
+        'id': str(conv['id']),
+        'title': conv['title'],
+        'is_active': conv['is_active'],
+        'message_count': conv['message_count'] or 0,
+        'created_at': conv['created_at'].isoformat() if conv['created_at'] else None,
+        'updated_at': conv['updated_at'].isoformat() if conv['updated_at'] else None,
+    }
+
+
+def _count(query: str, params: list) -> int:
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        return cursor.fetchone()[0]
+
+
 def get_ai_conversation_detail(
     user: AuthenticatedUser,
     conversation_id: UUID,
@@ -198,6 +232,8 @@ def get_ai_messages(
     conversation_id: UUID,
     page: int = 1,
     limit: int = 50,
+    cursor: str | None = None,
+    include_total: bool = False,
 ) -> dict:
     """
     Get paginated messages for an AI conversation.
@@ -207,11 +243,14 @@ def get_ai_messages(
         conversation_id: The conversation ID
         page: Page number (1-based)
         limit: Page size
+        cursor: Keyset cursor ('' for the first page); None uses page
+        include_total: With cursor, include the cached approximate total
 
     Returns:
         Dictionary with messages and pagination
     """
     offset = (page - 1) * limit
+    after = decode_cursor(cursor, 2) if cursor is not None else None
 
     # Verify user owns the conversation
     with connection.cursor() as cursor:
@@ -223,13 +262,13 @@ def get_ai_messages(
         row = cursor.fetchone()
 
     if not row:
-        return {'messages': [], 'pagination': _empty_pagination(page, limit)}
+        return {'messages': [], 'pagination': _empty_pagination(page, limit, cursor)}
 
     owner_user_id, owner_agency_id = row
 
     # Check access
     if str(owner_user_id) != str(user.id) or str(owner_agency_id) != str(user.agency_id):
-        return {'messages': [], 'pagination': _empty_pagination(page, limit)}
+        return {'messages': [], 'pagination': _empty_pagination(page, limit, cursor)}
 
     # Count query
     count_query = """
@@ -238,8 +277,9 @@ def get_ai_messages(
         WHERE conversation_id = %s
     """
 
-    # Main query
-    main_query = """
+    # Main query; keyset mode replaces OFFSET with a (created_at, id) bound
+    keyset_filter = "AND (created_at, id) > (%s::timestamptz, %s::uuid)" if after else ""
+    main_query = f"""
         SELECT
             id,
             role,
@@ -249,11 +289,28 @@ def get_ai_messages(
             created_at
         FROM public.ai_messages
         WHERE conversation_id = %s
-        ORDER BY created_at ASC
+          {keyset_filter}
+        ORDER BY created_at ASC, id ASC
         LIMIT %s OFFSET %s
     """
 
     try:
+        if cursor is not None:
+            with connection.cursor() as db_cursor:
+                db_cursor.execute(main_query, [str(conversation_id)] + (after or []) + [limit + 1, 0])
+                columns = [col[0] for col in db_cursor.description]
+                rows = [dict(zip(columns, row, strict=False)) for row in db_cursor.fetchall()]
+
+            rows, next_cursor = keyset_page(rows, limit, lambda msg: (msg['created_at'], msg['id']))
+            total = cached_total(
+                user.agency_id, 'ai.messages', {'conversation': conversation_id},
+                lambda: _count(count_query, [str(conversation_id)]),
+            ) if include_total else None
+            return {
+                'messages': [_format_message(msg) for msg in rows],
+                'pagination': cursor_pagination(limit, next_cursor, total),
+            }
+
         with connection.cursor() as cursor:
             cursor.execute(count_query, [str(conversation_id)])
             total_count = cursor.fetchone()[0]
@@ -262,17 +319,7 @@ def get_ai_messages(
             columns = [col[0] for col in cursor.description]
             rows = cursor.fetchall()
 
-        messages = []
-        for row in rows:
-            msg = dict(zip(columns, row, strict=False))
-            messages.append({
-                'id': str(msg['id']),
-                'role': msg['role'],
-                'content': msg['content'],
-                'tool_calls': msg['tool_calls'],
-                'tool_results': msg['tool_results'],
-                'created_at': msg['created_at'].isoformat() if msg['created_at'] else None,
-            })
+        messages = [_format_message(dict(zip(columns, row, strict=False))) for row in rows]
 
         total_pages = (total_count + limit - 1) // limit if limit > 0 else 0
 
@@ -293,8 +340,22 @@ def get_ai_messages(
         raise
 
 
-def _empty_pagination(page: int, limit: int) -> dict:
-    """Return empty pagination structure."""
+def _format_message(msg: dict) -> dict:
+    """Format an ai_messages row for the API."""
+    return {
+        'id': str(msg['id']),
+        'role': msg['role'],
+        'content': msg['content'],
+        'tool_calls': msg['tool_calls'],
+        'tool_results': msg['tool_results'],
+        'created_at': msg['created_at'].isoformat() if msg['created_at'] else None,
+    }
+
+
+def _empty_pagination(page: int, limit: int, cursor: str | None = None) -> dict:
+    """Return empty pagination structure (keyset shape when a cursor was given)."""
+    if cursor is not None:
+        return cursor_pagination(limit, None, 0)
     return {
         'currentPage': page,
         'totalPages': 0,
@@ -19,7 +19,8 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.core.constants import PAGINATION
-from apps.core.mixins import AuthenticatedAPIView
+from apps.core.mixins import AuthenticatedAPIView, handle_api_errors
+from apps.core.pagination import parse_cursor_params
 from apps.core.permissions import SubscriptionTierPermission
 
 from .selectors import (
@@ -41,11 +42,17 @@ logger = logging.getLogger(__name__)
 
 
 class AIConversationsView(AuthenticatedAPIView, APIView):
-    """GET/POST /api/ai/conversations - List or create AI conversations."""
+    """
+    GET/POST /api/ai/conversations - List or create AI conversations.
+
+    GET accepts cursor ('' for the first page, then nextCursor) for keyset
+    paging and include_total for an approximate totalCount.
+    """
 
     permission_classes = [IsAuthenticated, SubscriptionTierPermission]
     required_features = ['ai_chat_enabled']
 
+    @handle_api_errors
     def get(self, request):
         user = self.get_user(request)
 
@@ -55,7 +62,11 @@ class AIConversationsView(AuthenticatedAPIView, APIView):
             PAGINATION["max_limit"],
         )
 
-        result = get_ai_conversations(user=user, page=page, limit=limit)
+        cursor, include_total = parse_cursor_params(request.query_params)
+
+        result = get_ai_conversations(
+            user=user, page=page, limit=limit, cursor=cursor, include_total=include_total,
+        )
         return Response(result)
 
     def post(self, request):
@@ -136,11 +147,16 @@ class AIConversationDetailView(AuthenticatedAPIView, APIView):
 
 
 class AIMessagesView(AuthenticatedAPIView, APIView):
-    """GET/POST /api/ai/conversations/{id}/messages - List or send messages."""
+    """
+    GET/POST /api/ai/conversations/{id}/messages - List or send messages.
+
+    GET accepts cursor/include_total like AIConversationsView.
+    """
 
     permission_classes = [IsAuthenticated, SubscriptionTierPermission]
     required_features = ['ai_chat_enabled']
 
+    @handle_api_errors
     def get(self, request, conversation_id):
         user = self.get_user(request)
         conversation_uuid = self.parse_uuid(conversation_id, "conversation_id")
@@ -151,11 +167,15 @@ class AIMessagesView(AuthenticatedAPIView, APIView):
             PAGINATION["max_limit"],
         )
 
+        cursor, include_total = parse_cursor_params(request.query_params)
+
         result = get_ai_messages(
             user=user,
             conversation_id=conversation_uuid,
             page=page,
             limit=limit,
+            cursor=cursor,
+            include_total=include_total,
         )
         return Response(result)
 
@@ -0,0 +1,38 @@
+"""
+Rebuild public.deal_monthly_rollup from deals.
+
+Usage:
+    python manage.py rebuild_deal_rollup
+    python manage.py rebuild_deal_rollup --agency <agency_id>
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.analytics.services import refresh_deal_rollup
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the monthly deal rollup for one or all agencies'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--agency', dest='agency_id', help='Only rebuild this agency')
+
+    def handle(self, *args, **options):
+        agency_id = options.get('agency_id')
+        if agency_id:
+            agency_ids = [agency_id]
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT id FROM public.agencies ORDER BY id')
+                agency_ids = [row[0] for row in cursor.fetchall()]
+
+        total = 0
+        for aid in agency_ids:
+            with transaction.atomic():
+                rows = refresh_deal_rollup(aid)
+            total += rows
+            self.stdout.write(f'{aid}: {rows} rollup rows')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt deal rollup for {len(agency_ids)} agencies ({total} rows)'
+        ))
@@ -5,6 +5,10 @@ Complex analytics queries translated from Supabase RPC functions:
 - get_analytics_split_view -> get_analytics_split_view()
 - get_downline_production_distribution -> get_downline_production_distribution()
 - get_analytics_from_deals_with_agency_id -> get_analytics_from_deals()
+
+Deal-level analytics read from public.deal_monthly_rollup (maintained by
+apps.analytics.services) rather than scanning deals on every request, and the
+top-level results are cached per agency data version (apps.core.cache).
 """
 import logging
 from datetime import date
@@ -16,6 +20,7 @@ from django.db.models import Exists, OuterRef, Q, Sum
 from django_cte import With
 
 from apps.core.authentication import AuthenticatedUser
+from apps.core.cache import agency_cached
 
 logger = logging.getLogger(__name__)
 
@@ -97,6 +102,7 @@ def get_downline_production_distribution(
     return result
 
 
+@agency_cached('analytics.split_view', agency_arg='user')
 def get_analytics_split_view(
     user: AuthenticatedUser,
     as_of: date | None = None,
@@ -137,29 +143,13 @@ def get_analytics_split_view(
 
     carrier_ids_array = [str(cid) for cid in carrier_ids] if carrier_ids else None
 
-    # Call internal helper for your_deals
-    your_deals_result = _get_analytics_for_scope(
-        user=user,
-        as_of=as_of,
-        all_time_months=all_time_months,
-        top_states=top_states,
-        carrier_ids_array=carrier_ids_array,
-        scope='your_deals',
-        include_series=include_series,
-        include_windows_by_carrier=include_windows_by_carrier,
-        include_breakdowns_status=include_breakdowns_status,
-        include_breakdowns_state=include_breakdowns_state,
-        include_breakdowns_age=include_breakdowns_age,
-    )
-
-    # Call internal helper for downline
-    downline_result = _get_analytics_for_scope(
+    # Both scopes are computed from a single pass over the visible deals
+    scopes = _get_analytics_for_scopes(
         user=user,
         as_of=as_of,
         all_time_months=all_time_months,
         top_states=top_states,
         carrier_ids_array=carrier_ids_array,
-        scope='downline',
         include_series=include_series,
         include_windows_by_carrier=include_windows_by_carrier,
         include_breakdowns_status=include_breakdowns_status,
@@ -168,8 +158,8 @@ def get_analytics_split_view(
     )
 
     return {
-        'your_deals': your_deals_result,
-        'downline': downline_result,
+        'your_deals': scopes['your_deals'],
+        'downline': scopes['downline'],
         'metadata': {
             'as_of': as_of.isoformat(),
             'all_time_months': all_time_months,
@@ -178,113 +168,40 @@ def get_analytics_split_view(
     }
 
 
-def _get_analytics_for_scope(
+_SPLIT_VIEW_SCOPES = ('your_deals', 'downline')
+
+
+def _get_analytics_for_scopes(
     user: AuthenticatedUser,
     as_of: date,
     all_time_months: int,
     top_states: int,
     carrier_ids_array: list[str] | None,
-    scope: str,  # 'your_deals' or 'downline'
     include_series: bool,
     include_windows_by_carrier: bool,
     include_breakdowns_status: bool,
     include_breakdowns_state: bool,
     include_breakdowns_age: bool,
-) -> dict[str, Any]:
+) -> dict[str, dict[str, Any]]:
     """
-    Internal helper to get analytics for a specific scope (your_deals or downline).
-    Returns structure matching the RPC output.
+    Internal helper computing both split-view scopes in a single query.
+
+    Rollup rows visible to the user are read once and tagged with the scope(s)
+    they belong to ('your_deals', 'downline'); every aggregation groups by that
+    tag and the final SELECT returns one row per scope. Aggregations for
+    sections excluded by the include_* flags are not computed.
+    Returns a dict keyed by scope, each matching the RPC output structure.
     """
-    # Build the scope-specific WHERE clause
-    if scope == 'your_deals':
-        scope_filter = "d.agent_id = %s"
-        scope_params = [str(user.id)]
-    else:  # downline
-        scope_filter = """(
-            (uc.is_admin = true)
-            OR
-            (uc.is_admin = false
-             AND d.id IN (SELECT deal_id FROM deal_hierarchy_snapshot WHERE agent_id = %s)
-             AND d.agent_id != %s
-            )
-        )"""
-        scope_params = [str(user.id), str(user.id)]
+    include_breakdowns = include_breakdowns_status or include_breakdowns_state or include_breakdowns_age
 
-    with connection.cursor() as cursor:
-        cursor.execute(f"""
-            WITH
-            user_context AS (
-                SELECT
-                    u.id,
-                    u.agency_id,
-                    COALESCE(u.is_admin, false)
-                        OR u.perm_level = 'admin'
-                        OR u.role = 'admin' as is_admin
-                FROM users u
-                WHERE u.id = %s
-                LIMIT 1
-            ),
-            as_of_month AS (
-                SELECT make_date(
-                    extract(year from %s::date)::int,
-                    extract(month from %s::date)::int,
-                    1
-                ) as month_start
-            ),
-            base_deals AS (
-                SELECT
-                    d.id,
-                    d.carrier_id,
-                    c.name as carrier_name,
-                    date_trunc('month', COALESCE(d.policy_effective_date, d.submission_date))::date as effective_month,
-                    d.monthly_premium,
-                    coalesce(nullif(btrim(d.state), ''), 'UNK') as state,
-                    coalesce(d.age_band, 'UNK') as age_band,
-                    nullif(btrim(d.status), '') as status_raw,
-                    CASE
-                        WHEN sm.impact = 'positive' THEN 'Active'
-                        WHEN sm.impact = 'negative' THEN 'Inactive'
-                        ELSE NULL
-                    END as impact_class,
-                    CASE
-                        WHEN sm.placement = 'positive' THEN 'Placed'
-                        WHEN sm.placement = 'negative' THEN 'Not Placed'
-                        ELSE NULL
-                    END as placement_class
-                FROM deals d
-                JOIN carriers c ON c.id = d.carrier_id
-                LEFT JOIN status_mapping sm
-                    ON sm.carrier_id = d.carrier_id
-                    AND sm.raw_status = d.status
-                CROSS JOIN user_context uc
-                CROSS JOIN as_of_month aom
-                WHERE d.agency_id = uc.agency_id
-                    AND COALESCE(d.policy_effective_date, d.submission_date) IS NOT NULL
-                    AND date_trunc('month', COALESCE(d.policy_effective_date, d.submission_date))::date
-                        BETWEEN (aom.month_start - make_interval(months => %s - 1))
-                            AND aom.month_start
-                    AND (%s IS NULL OR d.carrier_id = ANY(%s::uuid[]))
-                    AND {scope_filter}
-            ),
-            -- Monthly series aggregation
-            monthly_series AS (
-                SELECT
-                    b.carrier_id,
-                    b.carrier_name,
-                    b.effective_month,
-                    count(*)::int as submitted,
-                    sum(b.monthly_premium)::numeric as premium_sum,
-                    (sum(b.monthly_premium) / nullif(count(*), 0))::numeric(12,2) as avg_premium_submitted,
-                    sum((b.impact_class = 'Active')::int)::int as active,
-                    sum((b.impact_class = 'Inactive')::int)::int as inactive,
-                    sum((b.placement_class = 'Placed')::int)::int as placed,
-                    sum((b.placement_class = 'Not Placed')::int)::int as not_placed
-                FROM base_deals b
-                GROUP BY b.carrier_id, b.carrier_name, b.effective_month
-            ),
+    # Optional CTEs, only built when their section is requested
+    optional_ctes = []
+    if include_series:
+        optional_ctes.append("""
             -- Rolling 9m for persistency calculation
             rolling_9m AS (
                 SELECT
+                    ms_outer.scope,
                     ms_outer.carrier_id,
                     ms_outer.carrier_name,
                     ms_outer.effective_month,
@@ -294,129 +211,81 @@ def _get_analytics_for_scope(
                     sum(ms_inner.not_placed)::int as not_placed_9m
                 FROM monthly_series ms_outer
                 JOIN monthly_series ms_inner
-                    ON ms_inner.carrier_id = ms_outer.carrier_id
+                    ON ms_inner.scope = ms_outer.scope
+                    AND ms_inner.carrier_id = ms_outer.carrier_id
                     AND ms_inner.effective_month BETWEEN
                         (ms_outer.effective_month - make_interval(months => 8))
                         AND ms_outer.effective_month
-                GROUP BY ms_outer.carrier_id, ms_outer.carrier_name, ms_outer.effective_month
-            ),
-            -- Window definitions
-            win_ranges AS (
-                SELECT * FROM (VALUES
-                    ('3m', 3),
-                    ('6m', 6),
-                    ('9m', 9),
-                    ('all_time', %s)
-                ) AS t(win_key, win_months)
-                CROSS JOIN as_of_month aom
-            ),
-            -- Window series by carrier
-            win_series AS (
-                SELECT
-                    ms.carrier_id,
-                    ms.carrier_name,
-                    wr.win_key,
-                    sum(ms.active)::int as active,
-                    sum(ms.inactive)::int as inactive,
-                    sum(ms.submitted)::int as submitted,
-                    (sum(ms.premium_sum) / nullif(sum(ms.submitted), 0))::numeric(12,2) as avg_premium_submitted,
-                    sum(ms.placed)::int as placed,
-                    sum(ms.not_placed)::int as not_placed
-                FROM monthly_series ms
-                CROSS JOIN as_of_month aom
-                JOIN win_ranges wr ON ms.effective_month BETWEEN
-                    (aom.month_start - make_interval(months => wr.win_months - 1))
-                    AND aom.month_start
-                GROUP BY ms.carrier_id, ms.carrier_name, wr.win_key
-            ),
-            -- Window totals (all carriers combined)
-            win_all AS (
-                SELECT
-                    wr.win_key,
-                    sum(ms.active)::int as active,
-                    sum(ms.inactive)::int as inactive,
-                    sum(ms.submitted)::int as submitted,
-                    (sum(ms.premium_sum) / nullif(sum(ms.submitted), 0))::numeric(12,2) as avg_premium_submitted,
-                    sum(ms.placed)::int as placed,
-                    sum(ms.not_placed)::int as not_placed
-                FROM monthly_series ms
-                CROSS JOIN as_of_month aom
-                JOIN win_ranges wr ON ms.effective_month BETWEEN
-                    (aom.month_start - make_interval(months => wr.win_months - 1))
-                    AND aom.month_start
-                GROUP BY wr.win_key
-            ),
+                GROUP BY ms_outer.scope, ms_outer.carrier_id, ms_outer.carrier_name, ms_outer.effective_month
+            )""")
+    if include_breakdowns_status:
+        optional_ctes.append("""
             -- Status breakdown by carrier and window
             status_breakdown AS (
                 SELECT
+                    b.scope,
                     b.carrier_id,
                     b.carrier_name,
                     wr.win_key,
                     coalesce(b.status_raw, 'Unknown') as status_value,
-                    count(*)::int as cnt
+                    sum(b.deal_count)::int as cnt
                 FROM base_deals b
                 CROSS JOIN as_of_month aom
                 JOIN win_ranges wr ON b.effective_month BETWEEN
                     (aom.month_start - make_interval(months => wr.win_months - 1))
                     AND aom.month_start
-                GROUP BY b.carrier_id, b.carrier_name, wr.win_key, coalesce(b.status_raw, 'Unknown')
-            ),
+                GROUP BY b.scope, b.carrier_id, b.carrier_name, wr.win_key, coalesce(b.status_raw, 'Unknown')
+            )""")
+    if include_breakdowns_state:
+        optional_ctes.append("""
             -- State breakdown ranked
             state_ranked AS (
                 SELECT
+                    b.scope,
                     b.carrier_id,
                     b.carrier_name,
                     wr.win_key,
                     b.state,
-                    count(*)::int as submitted,
-                    sum((b.impact_class = 'Active')::int)::int as active,
-                    sum((b.impact_class = 'Inactive')::int)::int as inactive,
-                    (sum(b.monthly_premium) / nullif(count(*), 0))::numeric(12,2) as avg_premium_submitted,
+                    sum(b.deal_count)::int as submitted,
+                    sum((b.impact_class = 'Active')::int * b.deal_count)::int as active,
+                    sum((b.impact_class = 'Inactive')::int * b.deal_count)::int as inactive,
+                    (sum(b.premium_sum) / nullif(sum(b.deal_count), 0))::numeric(12,2) as avg_premium_submitted,
                     row_number() over (
-                        partition by b.carrier_id, wr.win_key
-                        order by count(*) desc, b.state
+                        partition by b.scope, b.carrier_id, wr.win_key
+                        order by sum(b.deal_count) desc, b.state
                     ) as rn
                 FROM base_deals b
                 CROSS JOIN as_of_month aom
                 JOIN win_ranges wr ON b.effective_month BETWEEN
                     (aom.month_start - make_interval(months => wr.win_months - 1))
                     AND aom.month_start
-                GROUP BY b.carrier_id, b.carrier_name, wr.win_key, b.state
-            ),
+                GROUP BY b.scope, b.carrier_id, b.carrier_name, wr.win_key, b.state
+            )""")
+    if include_breakdowns_age:
+        optional_ctes.append("""
             -- Age breakdown
             age_breakdown AS (
                 SELECT
+                    b.scope,
                     b.carrier_id,
                     b.carrier_name,
                     wr.win_key,
                     b.age_band,
-                    count(*)::int as submitted,
-                    sum((b.impact_class = 'Active')::int)::int as active,
-                    sum((b.impact_class = 'Inactive')::int)::int as inactive,
-                    (sum(b.monthly_premium) / nullif(count(*), 0))::numeric(12,2) as avg_premium_submitted
+                    sum(b.deal_count)::int as submitted,
+                    sum((b.impact_class = 'Active')::int * b.deal_count)::int as active,
+                    sum((b.impact_class = 'Inactive')::int * b.deal_count)::int as inactive,
+                    (sum(b.premium_sum) / nullif(sum(b.deal_count), 0))::numeric(12,2) as avg_premium_submitted
                 FROM base_deals b
                 CROSS JOIN as_of_month aom
                 JOIN win_ranges wr ON b.effective_month BETWEEN
                     (aom.month_start - make_interval(months => wr.win_months - 1))
                     AND aom.month_start
-                GROUP BY b.carrier_id, b.carrier_name, wr.win_key, b.age_band
-            )
-            SELECT
-                -- Meta
-                (SELECT jsonb_build_object(
-                    'window', 'all_time',
-                    'grain', 'month',
-                    'as_of', to_char((SELECT month_start FROM as_of_month), 'YYYY-MM-DD'),
-                    'carriers', coalesce(
-                        (SELECT jsonb_agg(DISTINCT carrier_name ORDER BY carrier_name)
-                         FROM base_deals), '[]'::jsonb),
-                    'period_start', to_char(
-                        (SELECT month_start - make_interval(months => %s - 1) FROM as_of_month),
-                        'YYYY-MM'),
-                    'period_end', to_char((SELECT month_start FROM as_of_month), 'YYYY-MM')
-                )) as meta,
-                -- Series
-                coalesce(
+                GROUP BY b.scope, b.carrier_id, b.carrier_name, wr.win_key, b.age_band
+            )""")
+    optional_cte_sql = ''.join(f',{cte}' for cte in optional_ctes)
+
+    if include_series:
+        series_sql = """coalesce(
                     (SELECT jsonb_agg(
                         jsonb_build_object(
                             'period', to_char(ms.effective_month, 'YYYY-MM'),
@@ -434,12 +303,17 @@ def _get_analytics_for_scope(
                     )
                     FROM monthly_series ms
                     LEFT JOIN rolling_9m rp
-                        ON rp.carrier_id = ms.carrier_id
-                        AND rp.effective_month = ms.effective_month),
+                        ON rp.scope = ms.scope
+                        AND rp.carrier_id = ms.carrier_id
+                        AND rp.effective_month = ms.effective_month
+                    WHERE ms.scope = sc.scope),
                     '[]'::jsonb
-                ) as series,
-                -- Windows by carrier
-                coalesce(
+                )"""
+    else:
+        series_sql = "'[]'::jsonb"
+
+    if include_windows_by_carrier:
+        windows_sql = """coalesce(
                     (SELECT jsonb_object_agg(
                         carrier_name,
                         win_payload
@@ -463,66 +337,28 @@ def _get_analytics_for_scope(
                                 ORDER BY ws.win_key
                             ) as win_payload
                         FROM win_series ws
+                        WHERE ws.scope = sc.scope
                         GROUP BY ws.carrier_name
                     ) t),
-                    '{{}}'::jsonb
-                ) as windows_by_carrier,
-                -- Totals
-                jsonb_build_object(
-                    'by_carrier', coalesce(
-                        (SELECT jsonb_agg(
-                            jsonb_build_object(
-                                'window', 'all_time',
-                                'carrier', ws.carrier_name,
-                                'active', ws.active,
-                                'inactive', ws.inactive,
-                                'submitted', ws.submitted,
-                                'avg_premium_submitted', ws.avg_premium_submitted,
-                                'persistency', (ws.active::numeric / nullif(ws.active + ws.inactive, 0)),
-                                'placed', ws.placed,
-                                'not_placed', ws.not_placed,
-                                'placement', (ws.placed::numeric / nullif(ws.placed + ws.not_placed, 0))
-                            )
-                            ORDER BY ws.carrier_name
-                        )
-                        FROM win_series ws
-                        WHERE ws.win_key = 'all_time'),
-                        '[]'::jsonb
-                    ),
-                    'all', coalesce(
-                        (SELECT jsonb_build_object(
-                            'window', 'all_time',
-                            'carrier', 'ALL',
-                            'active', wa.active,
-                            'inactive', wa.inactive,
-                            'submitted', wa.submitted,
-                            'avg_premium_submitted', wa.avg_premium_submitted,
-                            'persistency', (wa.active::numeric / nullif(wa.active + wa.inactive, 0)),
-                            'placed', wa.placed,
-                            'not_placed', wa.not_placed,
-                            'placement', (wa.placed::numeric / nullif(wa.placed + wa.not_placed, 0))
-                        )
-                        FROM win_all wa
-                        WHERE wa.win_key = 'all_time'),
-                        '{{}}'::jsonb
-                    )
-                ) as totals,
-                -- Breakdowns by carrier
-                coalesce(
-                    (SELECT jsonb_object_agg(
-                        c.carrier_name,
-                        jsonb_build_object(
-                            'status', coalesce(
+                    '{}'::jsonb
+                )"""
+    else:
+        windows_sql = "'{}'::jsonb"
+
+    status_sql = """coalesce(
                                 (SELECT jsonb_object_agg(
                                     sb.win_key,
                                     (SELECT jsonb_object_agg(sb2.status_value, sb2.cnt)
                                      FROM status_breakdown sb2
-                                     WHERE sb2.carrier_id = c.carrier_id AND sb2.win_key = sb.win_key)
+                                     WHERE sb2.scope = sc.scope
+                                        AND sb2.carrier_id = c.carrier_id
+                                        AND sb2.win_key = sb.win_key)
                                 )
-                                FROM (SELECT DISTINCT win_key FROM status_breakdown WHERE carrier_id = c.carrier_id) sb),
-                                '{{}}'::jsonb
-                            ),
-                            'state', coalesce(
+                                FROM (SELECT DISTINCT win_key FROM status_breakdown
+                                      WHERE scope = sc.scope AND carrier_id = c.carrier_id) sb),
+                                '{}'::jsonb
+                            )""" if include_breakdowns_status else "'{}'::jsonb"
+    state_sql = """coalesce(
                                 (SELECT jsonb_object_agg(
                                     sr.win_key,
                                     (SELECT jsonb_agg(
@@ -536,14 +372,16 @@ def _get_analytics_for_scope(
                                         ORDER BY sr2.submitted DESC, sr2.state
                                     )
                                     FROM state_ranked sr2
-                                    WHERE sr2.carrier_id = c.carrier_id
+                                    WHERE sr2.scope = sc.scope
+                                        AND sr2.carrier_id = c.carrier_id
                                         AND sr2.win_key = sr.win_key
-                                        AND sr2.rn <= %s)
+                                        AND sr2.rn <= %(top_states)s)
                                 )
-                                FROM (SELECT DISTINCT win_key FROM state_ranked WHERE carrier_id = c.carrier_id) sr),
-                                '{{}}'::jsonb
-                            ),
-                            'age_band', coalesce(
+                                FROM (SELECT DISTINCT win_key FROM state_ranked
+                                      WHERE scope = sc.scope AND carrier_id = c.carrier_id) sr),
+                                '{}'::jsonb
+                            )""" if include_breakdowns_state else "'{}'::jsonb"
+    age_sql = """coalesce(
                                 (SELECT jsonb_object_agg(
                                     ab.win_key,
                                     (SELECT jsonb_agg(
@@ -567,44 +405,252 @@ def _get_analytics_for_scope(
                                             END, ab2.age_band
                                     )
                                     FROM age_breakdown ab2
-                                    WHERE ab2.carrier_id = c.carrier_id AND ab2.win_key = ab.win_key)
+                                    WHERE ab2.scope = sc.scope
+                                        AND ab2.carrier_id = c.carrier_id
+                                        AND ab2.win_key = ab.win_key)
                                 )
-                                FROM (SELECT DISTINCT win_key FROM age_breakdown WHERE carrier_id = c.carrier_id) ab),
-                                '{{}}'::jsonb
-                            )
+                                FROM (SELECT DISTINCT win_key FROM age_breakdown
+                                      WHERE scope = sc.scope AND carrier_id = c.carrier_id) ab),
+                                '{}'::jsonb
+                            )""" if include_breakdowns_age else "'{}'::jsonb"
+
+    if include_breakdowns:
+        breakdowns_sql = f"""coalesce(
+                    (SELECT jsonb_object_agg(
+                        c.carrier_name,
+                        jsonb_build_object(
+                            'status', {status_sql},
+                            'state', {state_sql},
+                            'age_band', {age_sql}
                         )
                         ORDER BY c.carrier_name
                     )
-                    FROM (SELECT DISTINCT carrier_id, carrier_name FROM base_deals) c),
+                    FROM (SELECT DISTINCT carrier_id, carrier_name FROM base_deals WHERE scope = sc.scope) c),
                     '{{}}'::jsonb
-                ) as breakdowns_by_carrier
-        """, [
-            str(user.id),
-            as_of, as_of,
-            all_time_months,
-            carrier_ids_array, carrier_ids_array,
-            *scope_params,
-            all_time_months,
-            all_time_months,
-            top_states,
-        ])
-
-        row = cursor.fetchone()
-
-    if not row:
-        return _empty_analytics_scope()
+                )"""
+    else:
+        breakdowns_sql = "'{}'::jsonb"
 
-    meta, series, windows_by_carrier, totals, breakdowns_by_carrier = row
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            WITH
+            user_context AS (
+                SELECT
+                    u.id,
+                    u.agency_id,
+                    COALESCE(u.is_admin, false)
+                        OR u.perm_level = 'admin'
+                        OR u.role = 'admin' as is_admin
+                FROM users u
+                WHERE u.id = %(user_id)s
+                LIMIT 1
+            ),
+            as_of_month AS (
+                SELECT make_date(
+                    extract(year from %(as_of)s::date)::int,
+                    extract(month from %(as_of)s::date)::int,
+                    1
+                ) as month_start
+            ),
+            -- Visible rollup rows, tagged with each scope they count towards:
+            -- your_deals = deals the user wrote; downline = every written deal
+            -- for admins, otherwise deals whose hierarchy snapshot includes the
+            -- user, excluding deals they wrote themselves
+            base_deals AS (
+                SELECT
+                    s.scope,
+                    r.carrier_id,
+                    c.name as carrier_name,
+                    r.effective_month,
+                    r.deal_count,
+                    r.premium_sum,
+                    r.state,
+                    r.age_band,
+                    nullif(btrim(r.status), '') as status_raw,
+                    CASE
+                        WHEN sm.impact = 'positive' THEN 'Active'
+                        WHEN sm.impact = 'negative' THEN 'Inactive'
+                        ELSE NULL
+                    END as impact_class,
+                    CASE
+                        WHEN sm.placement = 'positive' THEN 'Placed'
+                        WHEN sm.placement = 'negative' THEN 'Not Placed'
+                        ELSE NULL
+                    END as placement_class
+                FROM deal_monthly_rollup r
+                JOIN carriers c ON c.id = r.carrier_id
+                LEFT JOIN status_mapping sm
+                    ON sm.carrier_id = r.carrier_id
+                    AND sm.raw_status = r.status
+                CROSS JOIN user_context uc
+                CROSS JOIN as_of_month aom
+                CROSS JOIN LATERAL (
+                    SELECT 'your_deals' as scope
+                    WHERE r.source = 'written' AND r.agent_id = uc.id
+                    UNION ALL
+                    SELECT 'downline'
+                    WHERE (uc.is_admin = true AND r.source = 'written')
+                        OR (uc.is_admin = false
+                            AND r.source = 'hierarchy'
+                            AND r.agent_id = uc.id
+                            AND NOT r.is_writer)
+                ) s
+                WHERE r.agency_id = uc.agency_id
+                    AND (uc.is_admin = true OR r.agent_id = uc.id)
+                    AND r.effective_month
+                        BETWEEN (aom.month_start - make_interval(months => %(all_time_months)s - 1))
+                            AND aom.month_start
+                    AND (%(carrier_ids)s IS NULL OR r.carrier_id = ANY(%(carrier_ids)s::uuid[]))
+            ),
+            -- Monthly series aggregation
+            monthly_series AS (
+                SELECT
+                    b.scope,
+                    b.carrier_id,
+                    b.carrier_name,
+                    b.effective_month,
+                    sum(b.deal_count)::int as submitted,
+                    sum(b.premium_sum)::numeric as premium_sum,
+                    (sum(b.premium_sum) / nullif(sum(b.deal_count), 0))::numeric(12,2) as avg_premium_submitted,
+                    sum((b.impact_class = 'Active')::int * b.deal_count)::int as active,
+                    sum((b.impact_class = 'Inactive')::int * b.deal_count)::int as inactive,
+                    sum((b.placement_class = 'Placed')::int * b.deal_count)::int as placed,
+                    sum((b.placement_class = 'Not Placed')::int * b.deal_count)::int as not_placed
+                FROM base_deals b
+                GROUP BY b.scope, b.carrier_id, b.carrier_name, b.effective_month
+            ),
+            -- Window definitions
+            win_ranges AS (
+                SELECT * FROM (VALUES
+                    ('3m', 3),
+                    ('6m', 6),
+                    ('9m', 9),
+                    ('all_time', %(all_time_months)s)
+                ) AS t(win_key, win_months)
+                CROSS JOIN as_of_month aom
+            ),
+            -- Window series by carrier
+            win_series AS (
+                SELECT
+                    ms.scope,
+                    ms.carrier_id,
+                    ms.carrier_name,
+                    wr.win_key,
+                    sum(ms.active)::int as active,
+                    sum(ms.inactive)::int as inactive,
+                    sum(ms.submitted)::int as submitted,
+                    (sum(ms.premium_sum) / nullif(sum(ms.submitted), 0))::numeric(12,2) as avg_premium_submitted,
+                    sum(ms.placed)::int as placed,
+                    sum(ms.not_placed)::int as not_placed
+                FROM monthly_series ms
+                CROSS JOIN as_of_month aom
+                JOIN win_ranges wr ON ms.effective_month BETWEEN
+                    (aom.month_start - make_interval(months => wr.win_months - 1))
+                    AND aom.month_start
+                GROUP BY ms.scope, ms.carrier_id, ms.carrier_name, wr.win_key
+            ),
+            -- Window totals (all carriers combined)
+            win_all AS (
+                SELECT
+                    ms.scope,
+                    wr.win_key,
+                    sum(ms.active)::int as active,
+                    sum(ms.inactive)::int as inactive,
+                    sum(ms.submitted)::int as submitted,
+                    (sum(ms.premium_sum) / nullif(sum(ms.submitted), 0))::numeric(12,2) as avg_premium_submitted,
+                    sum(ms.placed)::int as placed,
+                    sum(ms.not_placed)::int as not_placed
+                FROM monthly_series ms
+                CROSS JOIN as_of_month aom
+                JOIN win_ranges wr ON ms.effective_month BETWEEN
+                    (aom.month_start - make_interval(months => wr.win_months - 1))
+                    AND aom.month_start
+                GROUP BY ms.scope, wr.win_key
+            ){optional_cte_sql}
+            SELECT
+                sc.scope,
+                -- Meta
+                (SELECT jsonb_build_object(
+                    'window', 'all_time',
+                    'grain', 'month',
+                    'as_of', to_char((SELECT month_start FROM as_of_month), 'YYYY-MM-DD'),
+                    'carriers', coalesce(
+                        (SELECT jsonb_agg(DISTINCT carrier_name ORDER BY carrier_name)
+                         FROM base_deals WHERE scope = sc.scope), '[]'::jsonb),
+                    'period_start', to_char(
+                        (SELECT month_start - make_interval(months => %(all_time_months)s - 1) FROM as_of_month),
+                        'YYYY-MM'),
+                    'period_end', to_char((SELECT month_start FROM as_of_month), 'YYYY-MM')
+                )) as meta,
+                -- Series
+                {series_sql} as series,
+                -- Windows by carrier
+                {windows_sql} as windows_by_carrier,
+                -- Totals
+                jsonb_build_object(
+                    'by_carrier', coalesce(
+                        (SELECT jsonb_agg(
+                            jsonb_build_object(
+                                'window', 'all_time',
+                                'carrier', ws.carrier_name,
+                                'active', ws.active,
+                                'inactive', ws.inactive,
+                                'submitted', ws.submitted,
+                                'avg_premium_submitted', ws.avg_premium_submitted,
+                                'persistency', (ws.active::numeric / nullif(ws.active + ws.inactive, 0)),
+                                'placed', ws.placed,
+                                'not_placed', ws.not_placed,
+                                'placement', (ws.placed::numeric / nullif(ws.placed + ws.not_placed, 0))
+                            )
+                            ORDER BY ws.carrier_name
+                        )
+                        FROM win_series ws
+                        WHERE ws.scope = sc.scope AND ws.win_key = 'all_time'),
+                        '[]'::jsonb
+                    ),
+                    'all', coalesce(
+                        (SELECT jsonb_build_object(
+                            'window', 'all_time',
+                            'carrier', 'ALL',
+                            'active', wa.active,
+                            'inactive', wa.inactive,
+                            'submitted', wa.submitted,
+                            'avg_premium_submitted', wa.avg_premium_submitted,
+                            'persistency', (wa.active::numeric / nullif(wa.active + wa.inactive, 0)),
+                            'placed', wa.placed,
+                            'not_placed', wa.not_placed,
+                            'placement', (wa.placed::numeric / nullif(wa.placed + wa.not_placed, 0))
+                        )
+                        FROM win_all wa
+                        WHERE wa.scope = sc.scope AND wa.win_key = 'all_time'),
+                        '{{}}'::jsonb
+                    )
+                ) as totals,
+                -- Breakdowns by carrier
+                {breakdowns_sql} as breakdowns_by_carrier
+            FROM (VALUES ('your_deals'), ('downline')) AS sc(scope)
+        """, {
+            'user_id': str(user.id),
+            'as_of': as_of,
+            'all_time_months': all_time_months,
+            'carrier_ids': carrier_ids_array,
+            'top_states': top_states,
+        })
 
-    return {
-        'meta': meta or {},
-        'series': series if include_series else [],
-        'windows_by_carrier': windows_by_carrier if include_windows_by_carrier else {},
-        'totals': totals or {'by_carrier': [], 'all': {}},
-        'breakdowns_over_time': {
-            'by_carrier': breakdowns_by_carrier if (include_breakdowns_status or include_breakdowns_state or include_breakdowns_age) else {},
-        },
-    }
+        rows = cursor.fetchall()
+
+    results = {scope: _empty_analytics_scope() for scope in _SPLIT_VIEW_SCOPES}
+    for scope, meta, series, windows_by_carrier, totals, breakdowns_by_carrier in rows:
+        results[scope] = {
+            'meta': meta or {},
+            'series': series or [],
+            'windows_by_carrier': windows_by_carrier or {},
+            'totals': totals or {'by_carrier': [], 'all': {}},
+            'breakdowns_over_time': {
+                'by_carrier': breakdowns_by_carrier or {},
+            },
+        }
+    return results
 
 
 def _empty_analytics_scope() -> dict[str, Any]:
@@ -663,50 +709,49 @@ def get_analytics_from_deals(
             ),
             base AS (
                 SELECT
-                    d.id,
-                    d.carrier_id,
+                    r.carrier_id,
                     c.name as carrier_name,
-                    date_trunc('month', COALESCE(d.policy_effective_date, d.submission_date))::date as effective_month,
-                    d.monthly_premium,
-                    d.annual_premium,
-                    coalesce(nullif(btrim(d.state), ''), 'UNK') as state,
-                    coalesce(d.age_band, 'UNK') as age_band,
-                    nullif(btrim(d.status), '') as status_raw,
+                    r.effective_month,
+                    r.deal_count,
+                    r.premium_count,
+                    r.premium_sum,
+                    r.state,
+                    r.age_band,
                     CASE
                         WHEN sm.impact = 'positive' THEN 'Active'
                         WHEN sm.impact = 'negative' THEN 'Inactive'
                         ELSE NULL
                     END as impact_class
-                FROM deals d
-                JOIN carriers c ON c.id = d.carrier_id
+                FROM deal_monthly_rollup r
+                JOIN carriers c ON c.id = r.carrier_id
                 LEFT JOIN status_mapping sm
-                    ON sm.carrier_id = d.carrier_id
-                    AND sm.raw_status = d.status
+                    ON sm.carrier_id = r.carrier_id
+                    AND sm.raw_status = r.status
                 CROSS JOIN as_of_month aom
-                WHERE d.agency_id = %s
-                    AND COALESCE(d.policy_effective_date, d.submission_date) IS NOT NULL
-                    AND date_trunc('month', COALESCE(d.policy_effective_date, d.submission_date))::date
+                WHERE r.agency_id = %s
+                    AND r.source = 'written'
+                    AND r.effective_month
                         BETWEEN (aom.month_start - make_interval(months => %s - 1))
                             AND aom.month_start
-                    AND (%s IS NULL OR d.carrier_id = ANY(%s::uuid[]))
+                    AND (%s IS NULL OR r.carrier_id = ANY(%s::uuid[]))
             ),
             summary AS (
                 SELECT
-                    count(*) as total_deals,
-                    sum(CASE WHEN impact_class = 'Active' THEN 1 ELSE 0 END) as active_count,
-                    sum(CASE WHEN impact_class = 'Inactive' THEN 1 ELSE 0 END) as inactive_count,
-                    coalesce(sum(monthly_premium), 0) as total_premium,
-                    coalesce(avg(monthly_premium), 0) as avg_premium
+                    coalesce(sum(deal_count), 0) as total_deals,
+                    sum(CASE WHEN impact_class = 'Active' THEN deal_count ELSE 0 END) as active_count,
+                    sum(CASE WHEN impact_class = 'Inactive' THEN deal_count ELSE 0 END) as inactive_count,
+                    coalesce(sum(premium_sum), 0) as total_premium,
+                    coalesce(sum(premium_sum) / nullif(sum(premium_count), 0), 0) as avg_premium
                 FROM base
             ),
             carrier_breakdown AS (
                 SELECT
                     carrier_id,
                     carrier_name,
-                    count(*) as deal_count,
-                    sum(CASE WHEN impact_class = 'Active' THEN 1 ELSE 0 END) as active,
-                    sum(CASE WHEN impact_class = 'Inactive' THEN 1 ELSE 0 END) as inactive,
-                    coalesce(sum(monthly_premium), 0) as premium
+                    sum(deal_count) as deal_count,
+                    sum(CASE WHEN impact_class = 'Active' THEN deal_count ELSE 0 END) as active,
+                    sum(CASE WHEN impact_class = 'Inactive' THEN deal_count ELSE 0 END) as inactive,
+                    coalesce(sum(premium_sum), 0) as premium
                 FROM base
                 GROUP BY carrier_id, carrier_name
                 ORDER BY deal_count DESC
@@ -714,9 +759,9 @@ def get_analytics_from_deals(
             state_breakdown AS (
                 SELECT
                     state,
-                    count(*) as deal_count,
-                    sum(CASE WHEN impact_class = 'Active' THEN 1 ELSE 0 END) as active,
-                    sum(CASE WHEN impact_class = 'Inactive' THEN 1 ELSE 0 END) as inactive
+                    sum(deal_count) as deal_count,
+                    sum(CASE WHEN impact_class = 'Active' THEN deal_count ELSE 0 END) as active,
+                    sum(CASE WHEN impact_class = 'Inactive' THEN deal_count ELSE 0 END) as inactive
                 FROM base
                 GROUP BY state
                 ORDER BY deal_count DESC
@@ -725,10 +770,10 @@ def get_analytics_from_deals(
             monthly_trend AS (
                 SELECT
                     to_char(effective_month, 'YYYY-MM') as month,
-                    count(*) as deal_count,
-                    sum(CASE WHEN impact_class = 'Active' THEN 1 ELSE 0 END) as active,
-                    sum(CASE WHEN impact_class = 'Inactive' THEN 1 ELSE 0 END) as inactive,
-                    coalesce(sum(monthly_premium), 0) as premium
+                    sum(deal_count) as deal_count,
+                    sum(CASE WHEN impact_class = 'Active' THEN deal_count ELSE 0 END) as active,
+                    sum(CASE WHEN impact_class = 'Inactive' THEN deal_count ELSE 0 END) as inactive,
+                    coalesce(sum(premium_sum), 0) as premium
                 FROM base
                 GROUP BY effective_month
                 ORDER BY effective_month
@@ -792,6 +837,7 @@ def get_analytics_from_deals(
     }
 
 
+@agency_cached('analytics.persistency', agency_arg='agency_id')
 def analyze_persistency_for_deals(
     agency_id: UUID,
     as_of: date | None = None,
@@ -816,7 +862,7 @@ def analyze_persistency_for_deals(
     if as_of is None:
         as_of = date.today()
 
-    carrier_filter = "AND d.carrier_id = %s" if carrier_id else ""
+    carrier_filter = "AND r.carrier_id = %s" if carrier_id else ""
     carrier_params = [str(carrier_id)] if carrier_id else []
 
     with connection.cursor() as cursor:
@@ -840,25 +886,25 @@ def analyze_persistency_for_deals(
             ),
             base_deals AS (
                 SELECT
-                    d.id,
-                    d.carrier_id,
+                    r.carrier_id,
                     c.name as carrier_name,
-                    d.status as raw_status,
-                    date_trunc('month', COALESCE(d.policy_effective_date, d.submission_date))::date as effective_month,
+                    r.status as raw_status,
+                    r.effective_month,
+                    r.deal_count,
                     CASE
                         WHEN sm.impact = 'positive' THEN 'Active'
                         WHEN sm.impact = 'negative' THEN 'Inactive'
                         ELSE 'Unknown'
                     END as status_class
-                FROM deals d
-                JOIN carriers c ON c.id = d.carrier_id
+                FROM deal_monthly_rollup r
+                JOIN carriers c ON c.id = r.carrier_id
                 LEFT JOIN status_mapping sm
-                    ON sm.carrier_id = d.carrier_id
-                    AND sm.raw_status = d.status
+                    ON sm.carrier_id = r.carrier_id
+                    AND sm.raw_status = r.status
                 CROSS JOIN as_of_month aom
-                WHERE d.agency_id = %s
-                    AND COALESCE(d.policy_effective_date, d.submission_date) IS NOT NULL
-                    AND date_trunc('month', COALESCE(d.policy_effective_date, d.submission_date))::date
+                WHERE r.agency_id = %s
+                    AND r.source = 'written'
+                    AND r.effective_month
                         BETWEEN (aom.month_start - make_interval(months => 23))
                             AND aom.month_start
                     {carrier_filter}
@@ -869,9 +915,9 @@ def analyze_persistency_for_deals(
                     bd.carrier_id,
                     bd.carrier_name,
                     tb.bucket_key,
-                    count(*)::int as total_count,
-                    sum(CASE WHEN bd.status_class = 'Active' THEN 1 ELSE 0 END)::int as positive_count,
-                    sum(CASE WHEN bd.status_class = 'Inactive' THEN 1 ELSE 0 END)::int as negative_count
+                    sum(bd.deal_count)::int as total_count,
+                    sum(CASE WHEN bd.status_class = 'Active' THEN bd.deal_count ELSE 0 END)::int as positive_count,
+                    sum(CASE WHEN bd.status_class = 'Inactive' THEN bd.deal_count ELSE 0 END)::int as negative_count
                 FROM base_deals bd
                 CROSS JOIN as_of_month aom
                 JOIN time_buckets tb ON bd.effective_month >= (aom.month_start - make_interval(months => tb.bucket_months - 1))
@@ -884,10 +930,10 @@ def analyze_persistency_for_deals(
                     bd.carrier_name,
                     tb.bucket_key,
                     COALESCE(bd.raw_status, 'Unknown') as status_value,
-                    count(*)::int as cnt,
+                    sum(bd.deal_count)::int as cnt,
                     row_number() over (
                         partition by bd.carrier_id, tb.bucket_key
-                        order by count(*) desc
+                        order by sum(bd.deal_count) desc
                     ) as rn
                 FROM base_deals bd
                 CROSS JOIN as_of_month aom
@@ -898,9 +944,9 @@ def analyze_persistency_for_deals(
             overall_time_metrics AS (
                 SELECT
                     tb.bucket_key,
-                    count(*)::int as total_count,
-                    sum(CASE WHEN bd.status_class = 'Active' THEN 1 ELSE 0 END)::int as active_count,
-                    sum(CASE WHEN bd.status_class = 'Inactive' THEN 1 ELSE 0 END)::int as inactive_count
+                    sum(bd.deal_count)::int as total_count,
+                    sum(CASE WHEN bd.status_class = 'Active' THEN bd.deal_count ELSE 0 END)::int as active_count,
+                    sum(CASE WHEN bd.status_class = 'Inactive' THEN bd.deal_count ELSE 0 END)::int as inactive_count
                 FROM base_deals bd
                 CROSS JOIN as_of_month aom
                 JOIN time_buckets tb ON bd.effective_month >= (aom.month_start - make_interval(months => tb.bucket_months - 1))
@@ -910,10 +956,10 @@ def analyze_persistency_for_deals(
             carrier_shares AS (
                 SELECT
                     bd.carrier_name,
-                    sum(CASE WHEN bd.status_class = 'Active' THEN 1 ELSE 0 END)::float as active_cnt,
-                    sum(CASE WHEN bd.status_class = 'Inactive' THEN 1 ELSE 0 END)::float as inactive_cnt,
-                    (SELECT sum(CASE WHEN status_class = 'Active' THEN 1 ELSE 0 END) FROM base_deals)::float as total_active,
-                    (SELECT sum(CASE WHEN status_class = 'Inactive' THEN 1 ELSE 0 END) FROM base_deals)::float as total_inactive
+                    sum(CASE WHEN bd.status_class = 'Active' THEN bd.deal_count ELSE 0 END)::float as active_cnt,
+                    sum(CASE WHEN bd.status_class = 'Inactive' THEN bd.deal_count ELSE 0 END)::float as inactive_cnt,
+                    (SELECT sum(CASE WHEN status_class = 'Active' THEN deal_count ELSE 0 END) FROM base_deals)::float as total_active,
+                    (SELECT sum(CASE WHEN status_class = 'Inactive' THEN deal_count ELSE 0 END) FROM base_deals)::float as total_inactive
                 FROM base_deals bd
                 GROUP BY bd.carrier_name
             )
@@ -1152,14 +1198,14 @@ def get_analytics_for_agent(
             ),
             base_deals AS (
                 SELECT
-                    d.id,
-                    d.carrier_id,
+                    r.carrier_id,
                     c.name as carrier_name,
-                    date_trunc('month', COALESCE(d.policy_effective_date, d.submission_date))::date as effective_month,
-                    d.monthly_premium,
-                    coalesce(nullif(btrim(d.state), ''), 'UNK') as state,
-                    coalesce(d.age_band, 'UNK') as age_band,
-                    nullif(btrim(d.status), '') as status_raw,
+                    r.effective_month,
+                    r.deal_count,
+                    r.premium_sum,
+                    r.state,
+                    r.age_band,
+                    nullif(btrim(r.status), '') as status_raw,
                     CASE
                         WHEN sm.impact = 'positive' THEN 'Active'
                         WHEN sm.impact = 'negative' THEN 'Inactive'
@@ -1170,23 +1216,23 @@ def get_analytics_for_agent(
                         WHEN sm.placement = 'negative' THEN 'Not Placed'
                         ELSE NULL
                     END as placement_class
-                FROM deals d
-                JOIN carriers c ON c.id = d.carrier_id
+                FROM deal_monthly_rollup r
+                JOIN carriers c ON c.id = r.carrier_id
                 LEFT JOIN status_mapping sm
-                    ON sm.carrier_id = d.carrier_id
-                    AND sm.raw_status = d.status
+                    ON sm.carrier_id = r.carrier_id
+                    AND sm.raw_status = r.status
                 CROSS JOIN user_context uc
                 CROSS JOIN as_of_month aom
-                WHERE d.agency_id = uc.agency_id
-                    AND COALESCE(d.policy_effective_date, d.submission_date) IS NOT NULL
-                    AND date_trunc('month', COALESCE(d.policy_effective_date, d.submission_date))::date
+                WHERE r.agency_id = uc.agency_id
+                    AND r.effective_month
                         BETWEEN (aom.month_start - make_interval(months => %s - 1))
                             AND aom.month_start
-                    AND (%s IS NULL OR d.carrier_id = ANY(%s::uuid[]))
+                    AND (%s IS NULL OR r.carrier_id = ANY(%s::uuid[]))
                     -- For non-admins, only include deals from their hierarchy
-                    AND (uc.is_admin OR d.id IN (
-                        SELECT deal_id FROM deal_hierarchy_snapshot WHERE agent_id = %s
-                    ))
+                    AND (
+                        (uc.is_admin AND r.source = 'written')
+                        OR (NOT coalesce(uc.is_admin, false) AND r.source = 'hierarchy' AND r.agent_id = %s)
+                    )
             ),
             -- Monthly series aggregation
             monthly_series AS (
@@ -1194,13 +1240,13 @@ def get_analytics_for_agent(
                     b.carrier_id,
                     b.carrier_name,
                     b.effective_month,
-                    count(*)::int as submitted,
-                    sum(b.monthly_premium)::numeric as premium_sum,
-                    (sum(b.monthly_premium) / nullif(count(*), 0))::numeric(12,2) as avg_premium_submitted,
-                    sum((b.impact_class = 'Active')::int)::int as active,
-                    sum((b.impact_class = 'Inactive')::int)::int as inactive,
-                    sum((b.placement_class = 'Placed')::int)::int as placed,
-                    sum((b.placement_class = 'Not Placed')::int)::int as not_placed
+                    sum(b.deal_count)::int as submitted,
+                    sum(b.premium_sum)::numeric as premium_sum,
+                    (sum(b.premium_sum) / nullif(sum(b.deal_count), 0))::numeric(12,2) as avg_premium_submitted,
+                    sum((b.impact_class = 'Active')::int * b.deal_count)::int as active,
+                    sum((b.impact_class = 'Inactive')::int * b.deal_count)::int as inactive,
+                    sum((b.placement_class = 'Placed')::int * b.deal_count)::int as placed,
+                    sum((b.placement_class = 'Not Placed')::int * b.deal_count)::int as not_placed
                 FROM base_deals b
                 GROUP BY b.carrier_id, b.carrier_name, b.effective_month
             ),
@@ -1275,7 +1321,7 @@ def get_analytics_for_agent(
                     b.carrier_name,
                     wr.win_key,
                     coalesce(b.status_raw, 'Unknown') as status_value,
-                    count(*)::int as cnt
+                    sum(b.deal_count)::int as cnt
                 FROM base_deals b
                 CROSS JOIN as_of_month aom
                 JOIN win_ranges wr ON b.effective_month BETWEEN
@@ -1290,13 +1336,13 @@ def get_analytics_for_agent(
                     b.carrier_name,
                     wr.win_key,
                     b.state,
-                    count(*)::int as submitted,
-                    sum((b.impact_class = 'Active')::int)::int as active,
-                    sum((b.impact_class = 'Inactive')::int)::int as inactive,
-                    (sum(b.monthly_premium) / nullif(count(*), 0))::numeric(12,2) as avg_premium_submitted,
+                    sum(b.deal_count)::int as submitted,
+                    sum((b.impact_class = 'Active')::int * b.deal_count)::int as active,
+                    sum((b.impact_class = 'Inactive')::int * b.deal_count)::int as inactive,
+                    (sum(b.premium_sum) / nullif(sum(b.deal_count), 0))::numeric(12,2) as avg_premium_submitted,
                     row_number() over (
                         partition by b.carrier_id, wr.win_key
-                        order by count(*) desc, b.state
+                        order by sum(b.deal_count) desc, b.state
                     ) as rn
                 FROM base_deals b
                 CROSS JOIN as_of_month aom
@@ -1312,10 +1358,10 @@ def get_analytics_for_agent(
                     b.carrier_name,
                     wr.win_key,
                     b.age_band,
-                    count(*)::int as submitted,
-                    sum((b.impact_class = 'Active')::int)::int as active,
-                    sum((b.impact_class = 'Inactive')::int)::int as inactive,
-                    (sum(b.monthly_premium) / nullif(count(*), 0))::numeric(12,2) as avg_premium_submitted
+                    sum(b.deal_count)::int as submitted,
+                    sum((b.impact_class = 'Active')::int * b.deal_count)::int as active,
+                    sum((b.impact_class = 'Inactive')::int * b.deal_count)::int as inactive,
+                    (sum(b.premium_sum) / nullif(sum(b.deal_count), 0))::numeric(12,2) as avg_premium_submitted
                 FROM base_deals b
                 CROSS JOIN as_of_month aom
                 JOIN win_ranges wr ON b.effective_month BETWEEN
@@ -1557,6 +1603,7 @@ def _empty_agent_analytics() -> dict[str, Any]:
     }
 
 
+@agency_cached('analytics.carrier_metrics', agency_arg='agency_id')
 def get_carrier_metrics(
     agency_id: UUID,
     as_of: date | None = None,
@@ -1605,31 +1652,31 @@ def get_carrier_metrics(
             ),
             base_deals AS (
                 SELECT
-                    d.id,
-                    d.carrier_id,
+                    r.carrier_id,
                     c.name as carrier_name,
-                    date_trunc('month', COALESCE(d.policy_effective_date, d.submission_date))::date as effective_month,
-                    d.monthly_premium,
-                    coalesce(nullif(btrim(d.state), ''), 'UNK') as state,
-                    coalesce(d.age_band, 'UNK') as age_band,
-                    nullif(btrim(d.status), '') as status_raw,
+                    r.effective_month,
+                    r.deal_count,
+                    r.premium_sum,
+                    r.state,
+                    r.age_band,
+                    nullif(btrim(r.status), '') as status_raw,
                     CASE
                         WHEN sm.impact = 'positive' THEN 'Active'
                         WHEN sm.impact = 'negative' THEN 'Inactive'
                         ELSE NULL
                     END as impact_class
-                FROM deals d
-                JOIN carriers c ON c.id = d.carrier_id
+                FROM deal_monthly_rollup r
+                JOIN carriers c ON c.id = r.carrier_id
                 LEFT JOIN status_mapping sm
-                    ON sm.carrier_id = d.carrier_id
-                    AND sm.raw_status = d.status
+                    ON sm.carrier_id = r.carrier_id
+                    AND sm.raw_status = r.status
                 CROSS JOIN as_of_month aom
-                WHERE d.agency_id = %s
-                    AND COALESCE(d.policy_effective_date, d.submission_date) IS NOT NULL
-                    AND date_trunc('month', COALESCE(d.policy_effective_date, d.submission_date))::date
+                WHERE r.agency_id = %s
+                    AND r.effective_month
                         BETWEEN (aom.month_start - make_interval(months => %s - 1))
                             AND aom.month_start
-                    AND (%s IS NULL OR d.carrier_id = ANY(%s::uuid[]))
+                    AND (%s IS NULL OR r.carrier_id = ANY(%s::uuid[]))
+                    AND r.source = 'written'
             ),
             -- Monthly series aggregation
             monthly_series AS (
@@ -1637,11 +1684,11 @@ def get_carrier_metrics(
                     b.carrier_id,
                     b.carrier_name,
                     b.effective_month,
-                    count(*)::int as submitted,
-                    sum(b.monthly_premium)::numeric as premium_sum,
-                    (sum(b.monthly_premium) / nullif(count(*), 0))::numeric(12,2) as avg_premium_submitted,
-                    sum((b.impact_class = 'Active')::int)::int as active,
-                    sum((b.impact_class = 'Inactive')::int)::int as inactive
+                    sum(b.deal_count)::int as submitted,
+                    sum(b.premium_sum)::numeric as premium_sum,
+                    (sum(b.premium_sum) / nullif(sum(b.deal_count), 0))::numeric(12,2) as avg_premium_submitted,
+                    sum((b.impact_class = 'Active')::int * b.deal_count)::int as active,
+                    sum((b.impact_class = 'Inactive')::int * b.deal_count)::int as inactive
                 FROM base_deals b
                 GROUP BY b.carrier_id, b.carrier_name, b.effective_month
             ),
@@ -1694,7 +1741,7 @@ def get_carrier_metrics(
                     b.carrier_name,
                     wr.win_key,
                     coalesce(b.status_raw, 'Unknown') as status_value,
-                    count(*)::int as cnt
+                    sum(b.deal_count)::int as cnt
                 FROM base_deals b
                 CROSS JOIN as_of_month aom
                 JOIN win_ranges wr ON b.effective_month BETWEEN
@@ -1709,13 +1756,13 @@ def get_carrier_metrics(
                     b.carrier_name,
                     wr.win_key,
                     b.state,
-                    count(*)::int as submitted,
-                    sum((b.impact_class = 'Active')::int)::int as active,
-                    sum((b.impact_class = 'Inactive')::int)::int as inactive,
-                    (sum(b.monthly_premium) / nullif(count(*), 0))::numeric(12,2) as avg_premium_submitted,
+                    sum(b.deal_count)::int as submitted,
+                    sum((b.impact_class = 'Active')::int * b.deal_count)::int as active,
+                    sum((b.impact_class = 'Inactive')::int * b.deal_count)::int as inactive,
+                    (sum(b.premium_sum) / nullif(sum(b.deal_count), 0))::numeric(12,2) as avg_premium_submitted,
                     row_number() over (
                         partition by b.carrier_id, wr.win_key
-                        order by count(*) desc, b.state
+                        order by sum(b.deal_count) desc, b.state
                     ) as rn
                 FROM base_deals b
                 CROSS JOIN as_of_month aom
@@ -1731,10 +1778,10 @@ def get_carrier_metrics(
                     b.carrier_name,
                     wr.win_key,
                     b.age_band,
-                    count(*)::int as submitted,
-                    sum((b.impact_class = 'Active')::int)::int as active,
-                    sum((b.impact_class = 'Inactive')::int)::int as inactive,
-                    (sum(b.monthly_premium) / nullif(count(*), 0))::numeric(12,2) as avg_premium_submitted
+                    sum(b.deal_count)::int as submitted,
+                    sum((b.impact_class = 'Active')::int * b.deal_count)::int as active,
+                    sum((b.impact_class = 'Inactive')::int * b.deal_count)::int as inactive,
+                    (sum(b.premium_sum) / nullif(sum(b.deal_count), 0))::numeric(12,2) as avg_premium_submitted
                 FROM base_deals b
                 CROSS JOIN as_of_month aom
                 JOIN win_ranges wr ON b.effective_month BETWEEN
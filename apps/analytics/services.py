@@ -0,0 +1,150 @@
+"""
+Analytics Services
+
+Maintenance of public.deal_monthly_rollup, the pre-aggregated deal store read
+by apps.analytics.selectors.
+
+The rollup is refreshed per (agency, month) slice: a slice is deleted and
+re-aggregated from deals + deal_hierarchy_snapshot in one transaction, so
+a refresh is idempotent and self-healing. Single-deal writes refresh only the
+months the deal moved out of and into (see track_deal_rollup); bulk imports
+refresh the whole agency.
+"""
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from datetime import date
+from uuid import UUID
+
+from django.db import connection, transaction
+
+from apps.core.cache import bump_data_version
+
+_EFFECTIVE_MONTH_SQL = "date_trunc('month', COALESCE(d.policy_effective_date, d.submission_date))::date"
+
+
+def get_deal_rollup_slices(deal_ids: Iterable[UUID | str]) -> set[tuple[str, date]]:
+    """
+    Get the (agency_id, month) rollup slices the given deals currently fall in.
+
+    Args:
+        deal_ids: Deal IDs to look up
+
+    Returns:
+        Set of (agency_id, effective_month) tuples
+    """
+    deal_ids = [str(did) for did in deal_ids]
+    if not deal_ids:
+        return set()
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT DISTINCT d.agency_id, {_EFFECTIVE_MONTH_SQL}
+            FROM public.deals d
+            WHERE d.id = ANY(%s::uuid[])
+                AND d.agency_id IS NOT NULL
+                AND COALESCE(d.policy_effective_date, d.submission_date) IS NOT NULL
+        """, [deal_ids])
+        return {(str(row[0]), row[1]) for row in cursor.fetchall()}
+
+
+@transaction.atomic
+def refresh_deal_rollup(agency_id: UUID | str, months: Iterable[date] | None = None) -> int:
+    """
+    Recompute rollup rows for an agency.
+
+    Atomic and serialized per agency with a transaction-scoped advisory lock,
+    so concurrent refreshes cannot interleave their DELETE and INSERT.
+
+    Args:
+        agency_id: The agency to refresh
+        months: First-of-month dates to refresh (None for every month)
+
+    Returns:
+        Number of rollup rows written
+    """
+    agency_id = str(agency_id)
+    months_array = sorted(set(months)) if months is not None else None
+    if months_array == []:
+        return 0
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_advisory_xact_lock(hashtext('deal_monthly_rollup:' || %s))",
+            [agency_id]
+        )
+
+        cursor.execute("""
+            DELETE FROM public.deal_monthly_rollup
+            WHERE agency_id = %s
+                AND (%s::date[] IS NULL OR effective_month = ANY(%s::date[]))
+        """, [agency_id, months_array, months_array])
+
+        cursor.execute(f"""
+            INSERT INTO public.deal_monthly_rollup (
+                agency_id, source, agent_id, is_writer, carrier_id, effective_month,
+                state, age_band, status, deal_count, premium_count, premium_sum
+            )
+            SELECT
+                d.agency_id,
+                a.source,
+                a.agent_id,
+                a.is_writer,
+                d.carrier_id,
+                {_EFFECTIVE_MONTH_SQL} as effective_month,
+                coalesce(nullif(btrim(d.state), ''), 'UNK') as state,
+                coalesce(d.age_band, 'UNK') as age_band,
+                d.status,
+                count(*)::int as deal_count,
+                count(d.monthly_premium)::int as premium_count,
+                sum(d.monthly_premium) as premium_sum
+            FROM public.deals d
+            CROSS JOIN LATERAL (
+                SELECT 'written' as source, d.agent_id, true as is_writer
+                UNION ALL
+                SELECT 'hierarchy', dhs.agent_id, coalesce(dhs.agent_id = d.agent_id, true)
+                FROM public.deal_hierarchy_snapshot dhs
+                WHERE dhs.deal_id = d.id
+            ) a
+            WHERE d.agency_id = %s
+                AND d.carrier_id IS NOT NULL
+                AND COALESCE(d.policy_effective_date, d.submission_date) IS NOT NULL
+                AND (%s::date[] IS NULL OR {_EFFECTIVE_MONTH_SQL} = ANY(%s::date[]))
+            GROUP BY 1, 2, 3, 4, 5, 6, 7, 8, 9
+        """, [agency_id, months_array, months_array])
+        written = cursor.rowcount
+
+    bump_data_version(agency_id)
+    return written
+
+
+def refresh_deal_rollup_slices(slices: Iterable[tuple[str, date]]) -> None:
+    """
+    Refresh a set of (agency_id, month) slices.
+
+    Args:
+        slices: Slices as returned by get_deal_rollup_slices
+    """
+    by_agency: dict[str, set[date]] = {}
+    for agency_id, month in slices:
+        by_agency.setdefault(str(agency_id), set()).add(month)
+
+    for agency_id, months in by_agency.items():
+        refresh_deal_rollup(agency_id, months)
+
+
+@contextmanager
+def track_deal_rollup(deal_ids: Iterable[UUID | str]) -> Iterator[None]:
+    """
+    Keep the rollup in step with writes to the given deals.
+
+    Records the deals' slices on entry and refreshes the union of the old and
+    new slices on successful exit, covering inserts, updates that move a deal
+    between months, and deletes. Use inside the write's transaction.
+
+    Args:
+        deal_ids: Deals about to be inserted, updated or deleted
+    """
+    deal_ids = [str(did) for did in deal_ids]
+    before = get_deal_rollup_slices(deal_ids)
+    yield
+    refresh_deal_rollup_slices(before | get_deal_rollup_slices(deal_ids))
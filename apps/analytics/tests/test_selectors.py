@@ -0,0 +1,79 @@
+"""
+Analytics Selector Unit Tests
+
+Tests for the single-pass analytics split view.
+"""
+import uuid
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from apps.analytics.selectors import get_analytics_split_view
+from apps.core.authentication import AuthenticatedUser
+
+
+def create_auth_user() -> AuthenticatedUser:
+    """Helper to create AuthenticatedUser for tests."""
+    return AuthenticatedUser(
+        id=uuid.uuid4(),
+        auth_user_id=uuid.uuid4(),
+        email='test@example.com',
+        agency_id=uuid.uuid4(),
+        role='agent',
+        is_admin=False,
+        status='active',
+        perm_level=None,
+        subscription_tier='free',
+    )
+
+
+@patch('apps.analytics.selectors.connection')
+class AnalyticsSplitViewTests(SimpleTestCase):
+    """Tests for get_analytics_split_view."""
+
+    def _mock_cursor(self, mock_connection, rows):
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = rows
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        return mock_cursor
+
+    def test_both_scopes_from_one_query(self, mock_connection):
+        """your_deals and downline come back from a single statement."""
+        totals = {'by_carrier': [], 'all': {'submitted': 3}}
+        mock_cursor = self._mock_cursor(mock_connection, [
+            ('your_deals', {'window': 'all_time'}, [], {}, totals, {}),
+            ('downline', {'window': 'all_time'}, [{'period': '2026-01'}], {}, totals, {}),
+        ])
+
+        result = get_analytics_split_view(create_auth_user())
+
+        mock_cursor.execute.assert_called_once()
+        self.assertEqual(result['your_deals']['totals'], totals)
+        self.assertEqual(result['downline']['series'], [{'period': '2026-01'}])
+
+    def test_missing_scope_row_is_empty(self, mock_connection):
+        """A scope without a result row falls back to the empty structure."""
+        self._mock_cursor(mock_connection, [])
+
+        result = get_analytics_split_view(create_auth_user())
+
+        self.assertEqual(result['your_deals']['series'], [])
+        self.assertEqual(result['downline']['totals'], {'by_carrier': [], 'all': {}})
+
+    def test_excluded_sections_are_not_computed(self, mock_connection):
+        """include_* flags drop the matching aggregations from the query."""
+        mock_cursor = self._mock_cursor(mock_connection, [])
+
+        get_analytics_split_view(
+            create_auth_user(),
+            include_series=False,
+            include_breakdowns_status=False,
+            include_breakdowns_age=False,
+        )
+
+        sql = mock_cursor.execute.call_args.args[0]
+        self.assertNotIn('rolling_9m AS', sql)
+        self.assertNotIn('status_breakdown AS', sql)
+        self.assertNotIn('age_breakdown AS', sql)
+        self.assertIn('state_ranked AS', sql)
+        self.assertIn('win_series AS', sql)
@@ -13,7 +13,8 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.core.authentication import get_user_context
+from apps.core.authentication import get_user_context, invalidate_cached_user
+from apps.core.hierarchy import invalidate_hierarchy_index, update_hierarchy_closure
 from apps.core.throttles import AuthRateThrottle
 from apps.onboarding.services import create_onboarding_progress
 
@@ -310,6 +311,9 @@ class RegisterView(APIView):
                 """, [auth_user_id, email, first_name, last_name, agency_id])
                 user_id = cursor.fetchone()[0]
 
+            update_hierarchy_closure(user_id, None)
+            invalidate_hierarchy_index(agency_id)
+
             # Initialize onboarding progress for new admin
             try:
                 create_onboarding_progress(user_id)
@@ -407,6 +411,7 @@ class VerifyInviteView(APIView):
                     row = cursor.fetchone()
                     if row:
                         user_id = row[0]
+                        invalidate_cached_user(auth_user_id)
 
                 # Initialize onboarding progress for the user
                 if user_id:
@@ -511,6 +516,7 @@ class SetupAccountView(APIView):
                         SET {', '.join(updates)}
                         WHERE id = %s
                     """, params)
+                invalidate_cached_user(user.auth_user_id)
 
             return Response({'message': 'Account setup complete'})
 
@@ -874,6 +880,7 @@ class UserProfileView(APIView):
                     SET {', '.join(updates)}, updated_at = NOW()
                     WHERE id = %s
                 """, params)
+            invalidate_cached_user(user.auth_user_id)
 
             # Initialize onboarding progress if transitioning to onboarding
             if status_changed_to_onboarding:
@@ -929,6 +936,7 @@ class CompleteOnboardingView(APIView):
                     RETURNING status
                 """, [str(user.id)])
                 result = cursor.fetchone()
+                invalidate_cached_user(user.auth_user_id)
 
                 if not result:
                     return Response(
@@ -1652,6 +1660,7 @@ class AuthCallbackUserView(APIView):
                     updated = cursor.fetchone()
                     if updated:
                         user_status = 'onboarding'
+                        invalidate_cached_user(auth_user_id)
                         # Create onboarding progress for newly transitioned user
                         try:
                             from uuid import UUID
@@ -1814,6 +1823,7 @@ class UserSubscriptionTierView(APIView):
                     RETURNING subscription_tier, scheduled_tier_change, scheduled_tier_change_date
                 """, params)
                 row = cursor.fetchone()
+                invalidate_cached_user(user.auth_user_id)
 
                 if not row:
                     return Response(
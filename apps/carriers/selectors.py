@@ -4,6 +4,8 @@ Carrier Selectors
 Query functions for carrier data following the selector pattern.
 
 Uses Django ORM with select_related and prefetch_related for efficient queries.
+Reference lists (carriers, status mappings) are cached per reference-data
+version (see apps.core.reference_data).
 """
 from uuid import UUID
 
@@ -12,8 +14,10 @@ from django.db.models import Prefetch
 import math
 
 from apps.core.models import AgentCarrierNumber, Carrier, Product, StatusMapping
+from apps.core.reference_data import reference_cached
 
 
+@reference_cached('carriers.active')
 def get_active_carriers() -> list[dict]:
     """
     Get all active carriers ordered by display_name.
@@ -41,6 +45,7 @@ def get_active_carriers() -> list[dict]:
     ]
 
 
+@reference_cached('carriers.with_products', agency_arg='agency_id')
 def get_carriers_with_products_for_agency(agency_id: UUID) -> list[dict]:
     """
     Get carriers that have products associated with the given agency.
@@ -97,6 +102,7 @@ def get_carriers_with_products_for_agency(agency_id: UUID) -> list[dict]:
     ]
 
 
+@reference_cached('carriers.names')
 def get_carrier_names() -> list[dict]:
     """
     Get carrier names for dropdowns (lightweight query).
@@ -122,6 +128,7 @@ def get_carrier_names() -> list[dict]:
     ]
 
 
+@reference_cached('carriers.agency', agency_arg='agency_id')
 def get_carriers_for_agency(agency_id: UUID) -> list[dict]:
     """
     Get carriers associated with an agency (P2-030).
@@ -189,6 +196,7 @@ def get_carrier_by_id(carrier_id: UUID) -> dict | None:
 # Status Mappings (P1-020)
 # =============================================================================
 
+@reference_cached('carriers.status_mappings')
 def get_status_mappings(carrier_id: UUID | None = None) -> list[dict]:
     """
     Get status mappings (P1-020).
@@ -16,6 +16,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.core.authentication import get_user_context
+from apps.core.mixins import reference_data_etag
 
 from .selectors import (
     get_active_carriers,
@@ -51,6 +52,7 @@ class CarriersListView(APIView):
     """
     permission_classes = [IsAuthenticated]
 
+    @reference_data_etag('carriers.list')
     def get(self, request):
         try:
             carriers = get_active_carriers()
@@ -122,6 +124,7 @@ class CarrierNamesView(APIView):
     """
     permission_classes = [IsAuthenticated]
 
+    @reference_data_etag('carriers.names')
     def get(self, request):
         try:
             carriers = get_carrier_names()
@@ -153,6 +156,7 @@ class AgencyCarriersView(APIView):
     """
     permission_classes = [IsAuthenticated]
 
+    @reference_data_etag('carriers.agency', agency_scoped=True)
     def get(self, request):
         user = get_user_context(request)
         if not user:
@@ -199,6 +203,7 @@ class CarriersWithProductsView(APIView):
     """
     permission_classes = [IsAuthenticated]
 
+    @reference_data_etag('carriers.with_products', agency_scoped=True)
     def get(self, request):
         user = get_user_context(request)
         if not user:
@@ -243,6 +248,7 @@ class StatusMappingsView(APIView):
     """
     permission_classes = [IsAuthenticated]
 
+    @reference_data_etag('carriers.status_mappings')
     def get(self, request):
         from uuid import UUID
 
@@ -289,6 +295,7 @@ class StandardizedStatusesView(APIView):
     """
     permission_classes = [IsAuthenticated]
 
+    @reference_data_etag('carriers.standardized_statuses')
     def get(self, request):
         try:
             statuses = get_standardized_statuses()
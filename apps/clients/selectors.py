@@ -12,10 +12,36 @@ from uuid import UUID
 from django.db import connection
 
 from apps.core.authentication import AuthenticatedUser
+from apps.core.pagination import cached_total, cursor_pagination, decode_cursor, keyset_page, name_sort_key
 from apps.core.permissions import get_visible_agent_ids
 
 logger = logging.getLogger(__name__)
 
+# Client lists sort by last_name, first_name (NULLs last) with id as
+# tiebreaker; the IS NULL flags keep the keyset comparison NULL-safe
+CLIENT_ORDER_BY = (
+    "c.last_name IS NULL, COALESCE(c.last_name, ''), "
+    "c.first_name IS NULL, COALESCE(c.first_name, ''), c.id"
+)
+
+
+def _client_keyset(cursor: str | None) -> tuple[str, list]:
+    """Build the WHERE fragment and params for a client list cursor."""
+    after = decode_cursor(cursor, 5) if cursor is not None else None
+    if not after:
+        return '', []
+    return f"AND ({CLIENT_ORDER_BY}) > (%s, %s, %s, %s, %s::uuid)", after
+
+
+def _client_sort_key(client: dict) -> tuple:
+    return name_sort_key(client['last_name'], client['first_name']) + (client['id'],)
+
+
+def _count(query: str, params: list) -> int:
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        return cursor.fetchone()[0]
+
 
 def get_clients_list(
     user: AuthenticatedUser,
@@ -24,6 +50,8 @@ def get_clients_list(
     search_query: str | None = None,
     agent_id: UUID | None = None,
     include_full_agency: bool = False,
+    cursor: str | None = None,
+    include_total: bool = False,
 ) -> dict:
     """
     Get paginated list of clients.
@@ -35,12 +63,15 @@ def get_clients_list(
         search_query: Search by client name, email, or phone
         agent_id: Filter by specific agent's clients
         include_full_agency: If True and user is admin, include all agency clients
+        cursor: Keyset cursor ('' for the first page); None uses page
+        include_total: With cursor, include the cached approximate total
 
     Returns:
         Dictionary with clients and pagination
     """
     is_admin = user.is_admin or user.role == 'admin'
     offset = (page - 1) * limit
+    keyset_filter, keyset_params = _client_keyset(cursor)
 
     # Build agent filter for deals (to get clients associated with visible agents)
     visible_ids = (
@@ -50,7 +81,7 @@ def get_clients_list(
     )
 
     if not visible_ids:
-        return {'clients': [], 'pagination': _empty_pagination(page, limit)}
+        return {'clients': [], 'pagination': _empty_pagination(page, limit, cursor)}
 
     # Build parameterized placeholders for visible_ids
     id_placeholders = ','.join(['%s'] * len(visible_ids))
@@ -98,27 +129,33 @@ def get_clients_list(
         WHERE c.agency_id = %s
           AND d.agent_id IN ({id_placeholders})
           {search_filter}
+          {keyset_filter}
         GROUP BY c.id, c.first_name, c.last_name, c.email, c.phone, c.created_at
-        ORDER BY c.last_name, c.first_name
+        ORDER BY {CLIENT_ORDER_BY}
         LIMIT %s OFFSET %s
     """
 
     try:
         # Build parameter list: agency_id + visible_ids + search_params
         count_params = [str(user.agency_id)] + visible_id_params + search_params
-        main_params = [str(user.agency_id)] + visible_id_params + search_params + [limit, offset]
+        # Keyset mode fetches one extra row instead of counting
+        page_params = keyset_params + [limit + 1, 0] if cursor is not None else [limit, offset]
+        main_params = count_params + page_params
 
-        with connection.cursor() as cursor:
-            cursor.execute(count_query, count_params)
-            total_count = cursor.fetchone()[0]
+        with connection.cursor() as db_cursor:
+            if cursor is None:
+                db_cursor.execute(count_query, count_params)
+                total_count = db_cursor.fetchone()[0]
 
-            cursor.execute(main_query, main_params)
-            columns = [col[0] for col in cursor.description]
-            rows = cursor.fetchall()
+            db_cursor.execute(main_query, main_params)
+            columns = [col[0] for col in db_cursor.description]
+            rows = [dict(zip(columns, row, strict=False)) for row in db_cursor.fetchall()]
+
+        if cursor is not None:
+            rows, next_cursor = keyset_page(rows, limit, _client_sort_key)
 
         clients = []
-        for row in rows:
-            client = dict(zip(columns, row, strict=False))
+        for client in rows:
             clients.append({
                 'id': str(client['id']),
                 'first_name': client['first_name'],
@@ -137,6 +174,14 @@ def get_clients_list(
                 ),
             })
 
+        if cursor is not None:
+            total = cached_total(
+                user.agency_id, 'clients.list',
+                {'user': user.id, 'visible': visible_id_params, 'search': search_query},
+                lambda: _count(count_query, count_params),
+            ) if include_total else None
+            return {'clients': clients, 'pagination': cursor_pagination(limit, next_cursor, total)}
+
         total_pages = (total_count + limit - 1) // limit if limit > 0 else 0
 
         return {
@@ -270,8 +315,10 @@ def get_client_detail(
         raise
 
 
-def _empty_pagination(page: int, limit: int) -> dict:
-    """Return empty pagination structure."""
+def _empty_pagination(page: int, limit: int, cursor: str | None = None) -> dict:
+    """Return empty pagination structure (keyset shape when a cursor was given)."""
+    if cursor is not None:
+        return cursor_pagination(limit, None, 0)
     return {
         'currentPage': page,
         'totalPages': 0,
@@ -365,6 +412,8 @@ def get_clients_overview(
     page: int = 1,
     limit: int = 20,
     search_query: str | None = None,
+    cursor: str | None = None,
+    include_total: bool = False,
 ) -> dict:
     """
     Get clients overview with view mode support.
@@ -378,12 +427,15 @@ def get_clients_overview(
         page: Page number (1-based)
         limit: Page size
         search_query: Search by client name, email, or phone
+        cursor: Keyset cursor ('' for the first page); None uses page
+        include_total: With cursor, include the cached approximate total
 
     Returns:
         Dictionary with clients and pagination
     """
     is_admin = user.is_admin or user.role == 'admin'
     offset = (page - 1) * limit
+    keyset_filter, keyset_params = _client_keyset(cursor)
 
     # Build visibility filter based on p_view
     # Uses deal_hierarchy_snapshot for visibility (matches RPC behavior)
@@ -459,27 +511,33 @@ def get_clients_overview(
         WHERE c.agency_id = %s
           {visibility_filter}
           {search_filter}
+          {keyset_filter}
         GROUP BY c.id, c.first_name, c.last_name, c.email, c.phone, c.created_at
-        ORDER BY c.last_name, c.first_name
+        ORDER BY {CLIENT_ORDER_BY}
         LIMIT %s OFFSET %s
     """
 
     try:
         # Build parameter lists
         count_params = [str(user.agency_id)] + visibility_params + search_params
-        main_params = [str(user.agency_id)] + visibility_params + search_params + [limit, offset]
+        # Keyset mode fetches one extra row instead of counting
+        page_params = keyset_params + [limit + 1, 0] if cursor is not None else [limit, offset]
+        main_params = count_params + page_params
 
-        with connection.cursor() as cursor:
-            cursor.execute(count_query, count_params)
-            total_count = cursor.fetchone()[0]
+        with connection.cursor() as db_cursor:
+            if cursor is None:
+                db_cursor.execute(count_query, count_params)
+                total_count = db_cursor.fetchone()[0]
 
-            cursor.execute(main_query, main_params)
-            columns = [col[0] for col in cursor.description]
-            rows = cursor.fetchall()
+            db_cursor.execute(main_query, main_params)
+            columns = [col[0] for col in db_cursor.description]
+            rows = [dict(zip(columns, row, strict=False)) for row in db_cursor.fetchall()]
+
+        if cursor is not None:
+            rows, next_cursor = keyset_page(rows, limit, _client_sort_key)
 
         clients = []
-        for row in rows:
-            client = dict(zip(columns, row, strict=False))
+        for client in rows:
             clients.append({
                 'id': str(client['id']),
                 'first_name': client['first_name'],
@@ -499,6 +557,14 @@ def get_clients_overview(
                 'supporting_agent': client['supporting_agent'],  # Added to match RPC
             })
 
+        if cursor is not None:
+            total = cached_total(
+                user.agency_id, 'clients.overview',
+                {'user': user.id, 'view': p_view, 'search': search_query},
+                lambda: _count(count_query, count_params),
+            ) if include_total else None
+            return {'clients': clients, 'pagination': cursor_pagination(limit, next_cursor, total)}
+
         total_pages = (total_count + limit - 1) // limit if limit > 0 else 0
 
         return {
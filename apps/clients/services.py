@@ -11,6 +11,9 @@ import httpx
 from django.conf import settings
 from django.db import connection, transaction
 
+from apps.core.authentication import invalidate_cached_user
+from apps.core.hierarchy import invalidate_hierarchy_index, update_hierarchy_closure
+
 logger = logging.getLogger(__name__)
 
 # Supabase configuration
@@ -213,6 +216,10 @@ def invite_client(
                 _delete_supabase_user(auth_user_id)
                 return {'success': False, 'error': 'Failed to create client record'}
 
+            # Invited clients have no upline; add their self row
+            update_hierarchy_closure(row[0], None)
+            invalidate_hierarchy_index(agency_id)
+
             return {
                 'success': True,
                 'user_id': str(row[0]),
@@ -296,6 +303,7 @@ def resend_client_invite(
             cursor.execute("""
                 UPDATE users SET auth_user_id = NULL WHERE id = %s
             """, [str(client_id)])
+            invalidate_cached_user(auth_user_id)
 
             # 2. Delete the old auth account
             logger.info(f'Deleting old auth account: {auth_user_id}')
@@ -16,6 +16,8 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.core.authentication import get_user_context
+from apps.core.exceptions import ValidationError
+from apps.core.pagination import parse_cursor_params
 
 from .selectors import (
     get_client_dashboard_data,
@@ -42,6 +44,8 @@ class ClientsListView(APIView):
         search: Search by client name, email, or phone
         agent_id: Filter by specific agent's clients
         view: Visibility scope - 'self' (own clients), 'downlines' (default), 'all' (admin only)
+        cursor: Keyset paging instead of page ('' for the first page, then nextCursor)
+        include_total: With cursor, include an approximate totalCount
     """
     permission_classes = [IsAuthenticated]
 
@@ -59,6 +63,7 @@ class ClientsListView(APIView):
             limit = min(limit, 100)
 
             search_query = request.query_params.get('search', '').strip() or None
+            cursor, include_total = parse_cursor_params(request.query_params)
 
             # Support view parameter from RPC (self, downlines, all)
             view = request.query_params.get('view', 'downlines').lower()
@@ -84,10 +89,14 @@ class ClientsListView(APIView):
                 search_query=search_query,
                 agent_id=agent_id,
                 include_full_agency=include_full_agency,
+                cursor=cursor,
+                include_total=include_total,
             )
 
             return Response(result)
 
+        except ValidationError as e:
+            return Response({'error': e.message}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.error(f'Clients list failed: {e}')
             return Response(
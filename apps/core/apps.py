@@ -1,7 +1,22 @@
+import logging
+
 from django.apps import AppConfig
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
     verbose_name = 'Core'
+
+    def ready(self):
+        backend = settings.CACHES['default']['BACKEND']
+        if not settings.DEBUG and backend in getattr(settings, 'PER_PROCESS_CACHE_BACKENDS', ()):
+            logger.warning(
+                f"CACHES['default'] uses {backend}, which is not shared between pods: "
+                "data version bumps, hierarchy index and cached user invalidations stay "
+                "local, so other pods serve stale results and permissions until their TTLs "
+                "expire. Set CACHE_BACKEND=db for multi-pod deployments."
+            )
@@ -10,11 +10,33 @@ from uuid import UUID
 
 import jwt
 from django.conf import settings
-from django.db import connection
+from django.core.cache import caches
+from django.db import connection, transaction
 from rest_framework import authentication, exceptions
 
+from .cache import LRUCache
+
 logger = logging.getLogger(__name__)
 
+# Attribute on the Django HttpRequest holding the memoized authentication result.
+# Set by whichever of SupabaseAuthMiddleware / DRF authentication runs first so
+# the JWT is decoded and the users row fetched only once per request.
+AUTH_RESULT_ATTR = '_supabase_auth_result'
+
+# Cross-request cache of auth_user_id -> AuthenticatedUser.
+# A short-lived per-process LRU sits in front of the configured Django cache;
+# the local TTL bounds how stale another worker's copy can be after invalidation.
+_USER_CACHE_SETTINGS = getattr(settings, 'AUTH_USER_CACHE', {})
+USER_CACHE_ALIAS = _USER_CACHE_SETTINGS.get('ALIAS', 'default')
+USER_CACHE_TTL = _USER_CACHE_SETTINGS.get('TTL', 60)
+USER_CACHE_LOCAL_TTL = _USER_CACHE_SETTINGS.get('LOCAL_TTL', 5)
+
+_local_user_cache = LRUCache(
+    maxsize=_USER_CACHE_SETTINGS.get('MAX_ENTRIES', 1024),
+    ttl=USER_CACHE_LOCAL_TTL,
+    name='auth_user',
+)
+
 
 @dataclass
 class AuthenticatedUser:
@@ -55,16 +77,20 @@ class SupabaseJWTAuthentication(authentication.BaseAuthentication):
     Authenticates requests using Supabase JWTs.
 
     Flow:
-    1. Extract Bearer token from Authorization header
-    2. Decode and validate JWT using Supabase JWT secret
-    3. Look up user in public.users by auth_user_id (sub claim)
-    4. Return AuthenticatedUser with full context
+    1. Reuse the result memoized on the request by the middleware, if any
+    2. Extract Bearer token from Authorization header
+    3. Decode and validate JWT using Supabase JWT secret
+    4. Look up user in public.users by auth_user_id (sub claim)
+    5. Return AuthenticatedUser with full context
     """
 
     def authenticate(self, request):
         """
         Authenticate the request and return (user, token) or None.
 
+        The result is memoized on the underlying Django HttpRequest, so DRF
+        authentication is a no-op when SupabaseAuthMiddleware already ran.
+
         Returns:
             tuple: (AuthenticatedUser, token) if authenticated
             None: If no authentication credentials provided
@@ -72,6 +98,9 @@ class SupabaseJWTAuthentication(authentication.BaseAuthentication):
         Raises:
             AuthenticationFailed: If credentials are invalid
         """
+        # DRF wraps the Django request; the memo lives on the HttpRequest
+        django_request = getattr(request, '_request', request)
+
         auth_header = request.META.get('HTTP_AUTHORIZATION', '')
 
         if not auth_header:
@@ -85,6 +114,10 @@ class SupabaseJWTAuthentication(authentication.BaseAuthentication):
         if not token:
             return None
 
+        cached = getattr(django_request, AUTH_RESULT_ATTR, None)
+        if cached is not None and cached[1] == token:
+            return cached
+
         # Decode and validate JWT
         payload = self._decode_jwt(token)
         if not payload:
@@ -95,7 +128,9 @@ class SupabaseJWTAuthentication(authentication.BaseAuthentication):
         if not user:
             raise exceptions.AuthenticationFailed('User not found')
 
-        return (user, token)
+        result = (user, token)
+        setattr(django_request, AUTH_RESULT_ATTR, result)
+        return result
 
     def authenticate_header(self, request):
         """
@@ -171,48 +206,150 @@ class SupabaseJWTAuthentication(authentication.BaseAuthentication):
             logger.warning('JWT missing sub claim')
             return None
 
+        return get_authenticated_user_by_auth_id(auth_user_id)
+
+
+def _user_cache_key(auth_user_id: UUID | str) -> str:
+    return f'auth_user:{auth_user_id}'
+
+
+def get_authenticated_user_by_auth_id(auth_user_id: UUID | str) -> AuthenticatedUser | None:
+    """
+    Resolve a user by auth_user_id, serving repeat lookups from cache.
+
+    Single source of truth for auth_user_id -> user resolution, shared by
+    JWT authentication and service-level helpers that only have the auth ID.
+    Only found users are cached; services that change the users row call
+    invalidate_cached_user / invalidate_cached_users_by_id.
+
+    Args:
+        auth_user_id: The Supabase auth user ID (JWT sub claim)
+
+    Returns:
+        AuthenticatedUser if found, None otherwise
+    """
+    key = _user_cache_key(auth_user_id)
+
+    user = _local_user_cache.get(key)
+    if user is not None:
+        return user
+
+    if USER_CACHE_TTL > 0:
         try:
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    SELECT
-                        id,
-                        auth_user_id,
-                        email,
-                        agency_id,
-                        role,
-                        is_admin,
-                        status,
-                        perm_level,
-                        subscription_tier,
-                        first_name,
-                        last_name
-                    FROM public.users
-                    WHERE auth_user_id = %s
-                    LIMIT 1
-                """, [auth_user_id])
-
-                row = cursor.fetchone()
-
-                if not row:
-                    logger.warning(f'No user found for auth_user_id: {auth_user_id}')
-                    return None
-
-                return AuthenticatedUser(
-                    id=row[0],
-                    auth_user_id=row[1],
-                    email=row[2] or '',
-                    agency_id=row[3],
-                    role=row[4] or 'agent',
-                    is_admin=row[5] or False,
-                    status=row[6] or 'active',
-                    perm_level=row[7],
-                    subscription_tier=row[8],
-                    first_name=row[9],
-                    last_name=row[10],
-                )
+            user = caches[USER_CACHE_ALIAS].get(key)
         except Exception as e:
-            logger.error(f'Database error looking up user: {e}')
-            return None
+            logger.warning(f'User cache read failed: {e}')
+            user = None
+        if user is not None:
+            _local_user_cache.set(key, user)
+            return user
+
+    user = _fetch_authenticated_user(auth_user_id)
+    if user is not None and USER_CACHE_TTL > 0:
+        _local_user_cache.set(key, user)
+        try:
+            caches[USER_CACHE_ALIAS].set(key, user, USER_CACHE_TTL)
+        except Exception as e:
+            logger.warning(f'User cache write failed: {e}')
+    return user
+
+
+def _fetch_authenticated_user(auth_user_id: UUID | str) -> AuthenticatedUser | None:
+    """
+    Look up a user in public.users by auth_user_id.
+
+    Args:
+        auth_user_id: The Supabase auth user ID (JWT sub claim)
+
+    Returns:
+        AuthenticatedUser if found, None otherwise
+    """
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT
+                    id,
+                    auth_user_id,
+                    email,
+                    agency_id,
+                    role,
+                    is_admin,
+                    status,
+                    perm_level,
+                    subscription_tier,
+                    first_name,
+                    last_name
+                FROM public.users
+                WHERE auth_user_id = %s
+                LIMIT 1
+            """, [str(auth_user_id)])
+
+            row = cursor.fetchone()
+
+            if not row:
+                logger.warning(f'No user found for auth_user_id: {auth_user_id}')
+                return None
+
+            return AuthenticatedUser(
+                id=row[0],
+                auth_user_id=row[1],
+                email=row[2] or '',
+                agency_id=row[3],
+                role=row[4] or 'agent',
+                is_admin=row[5] or False,
+                status=row[6] or 'active',
+                perm_level=row[7],
+                subscription_tier=row[8],
+                first_name=row[9],
+                last_name=row[10],
+            )
+    except Exception as e:
+        logger.error(f'Database error looking up user: {e}')
+        return None
+
+
+def invalidate_cached_user(auth_user_id: UUID | str | None) -> None:
+    """
+    Drop a user from the authentication cache.
+
+    Deferred until the surrounding transaction commits so a concurrent
+    request can't re-cache the pre-update row in between.
+
+    Args:
+        auth_user_id: The Supabase auth user ID (None is ignored)
+    """
+    if not auth_user_id:
+        return
+
+    key = _user_cache_key(auth_user_id)
+
+    def _invalidate():
+        _local_user_cache.delete(key)
+        try:
+            caches[USER_CACHE_ALIAS].delete(key)
+        except Exception as e:
+            logger.warning(f'User cache invalidation failed: {e}')
+
+    transaction.on_commit(_invalidate)
+
+
+def invalidate_cached_users_by_id(user_ids: list[UUID | str]) -> None:
+    """
+    Drop users from the authentication cache by public.users.id.
+
+    Args:
+        user_ids: List of users.id values whose rows changed
+    """
+    if not user_ids:
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT auth_user_id FROM public.users
+            WHERE id = ANY(%s::uuid[]) AND auth_user_id IS NOT NULL
+        """, [[str(uid) for uid in user_ids]])
+        for (auth_user_id,) in cursor.fetchall():
+            invalidate_cached_user(auth_user_id)
 
 
 def get_user_context(request) -> AuthenticatedUser | None:
@@ -233,6 +370,12 @@ def get_user_context(request) -> AuthenticatedUser | None:
     return None
 
 
+# ID of the system user returned by CronSecretAuthentication. It is not a
+# row in public.users or public.agencies, so never write it to a column that
+# references them.
+SYSTEM_USER_ID = UUID('00000000-0000-0000-0000-000000000000')
+
+
 class CronSecretAuthentication(authentication.BaseAuthentication):
     """
     Authenticates requests using a shared CRON_SECRET.
@@ -272,10 +415,10 @@ class CronSecretAuthentication(authentication.BaseAuthentication):
         # Return a system-level user for cron jobs
         # This user has admin privileges but isn't tied to a real user
         system_user = AuthenticatedUser(
-            id=UUID('00000000-0000-0000-0000-000000000000'),  # System user ID
-            auth_user_id=UUID('00000000-0000-0000-0000-000000000000'),
+            id=SYSTEM_USER_ID,
+            auth_user_id=SYSTEM_USER_ID,
             email='system@internal',
-            agency_id=UUID('00000000-0000-0000-0000-000000000000'),  # Will be overridden per-agency
+            agency_id=SYSTEM_USER_ID,  # Will be overridden per-agency
             role='admin',
             is_admin=True,
             status='active',
@@ -0,0 +1,428 @@
+"""
+Caching Utilities for AgentSpace Backend
+
+Small building blocks for caching hot lookups:
+- LRUCache: bounded in-process cache that sits in front of Django's cache
+  framework to avoid even that hop
+- TieredCache: Django cache backend pairing a per-process LRUCache (L1) with
+  a shared cache alias (L2), configured as the 'tiered' alias in CACHES
+- AgencyCache: per-agency key namespace, invalidated by bump_data_version()
+- agency_cached: result cache for expensive read functions, keyed by the
+  agency's data version so writers invalidate with bump_data_version()
+- get_cache_stats: per-process hit/miss counters for monitoring
+"""
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import asdict, is_dataclass
+from datetime import date
+from typing import Any
+from uuid import UUID
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# Named in-process caches reported by get_cache_stats()
+_registry: dict[str, 'LRUCache'] = {}
+_registry_lock = threading.Lock()
+
+
+class LRUCache:
+    """
+    Thread-safe, bounded LRU cache with per-entry TTL.
+
+    Entries are evicted least-recently-used first once maxsize is reached,
+    and are treated as absent once their TTL has elapsed. Caches created with
+    a name report their hit/miss counters through get_cache_stats().
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0, name: str | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        if name:
+            with _registry_lock:
+                _registry[name] = self
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing/expired."""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Any, value: Any, ttl: float | None = None) -> None:
+        """Store value under key for ttl seconds (defaults to the cache TTL)."""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Any) -> None:
+        """Remove key if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+def get_cache_stats() -> dict[str, Any]:
+    """
+    Get hit/miss counters for this process's named caches.
+
+    Counters are per process (each gunicorn worker keeps its own), so the pid
+    is included to tell workers apart when sampling.
+
+    Returns:
+        Dictionary with pid and a stats dict per cache name
+    """
+    with _registry_lock:
+        named = dict(_registry)
+    stats: dict[str, Any] = {name: cache.stats() for name, cache in named.items()}
+    with _tiered_lock:
+        for name, counters in _tiered_counters.items():
+            stats.setdefault(name, {}).update(counters)
+    return {'pid': os.getpid(), 'caches': stats}
+
+
+# =============================================================================
+# Tiered Django Cache Backend
+# =============================================================================
+
+# L1 caches and shared-tier counters are per process; Django instantiates
+# cache backends per thread, so they live at module level
+_tiered_local: dict[str, LRUCache] = {}
+_tiered_counters: dict[str, dict[str, int]] = {}
+_tiered_lock = threading.Lock()
+
+
+class TieredCache(BaseCache):
+    """
+    Django cache backend with a per-process LRU (L1) in front of another
+    cache alias (L2).
+
+    LOCATION names the L2 alias. Reads try L1, then L2 (filling L1); writes
+    go to both. Other processes' L1 copies are not invalidated, so an entry
+    may be served up to LOCAL_TTL seconds after it changed in L2: use this
+    alias for values that are expensive to load and either tolerate that or
+    are keyed by a version (see AgencyCache). Throttle counters and version
+    tokens belong on the shared alias itself.
+
+    OPTIONS:
+        LOCAL_TTL: Maximum seconds an entry lives in L1 (default 30)
+        LOCAL_MAX_ENTRIES: L1 capacity (default 1024)
+    """
+
+    def __init__(self, location: str, params: dict):
+        options = dict(params.get('OPTIONS') or {})
+        local_ttl = options.pop('LOCAL_TTL', 30)
+        local_max_entries = options.pop('LOCAL_MAX_ENTRIES', 1024)
+        super().__init__({**params, 'OPTIONS': options})
+
+        self._shared_alias = location or 'default'
+        self._name = f'tiered:{self._shared_alias}'
+        with _tiered_lock:
+            if self._name not in _tiered_local:
+                _tiered_local[self._name] = LRUCache(
+                    maxsize=local_max_entries, ttl=local_ttl, name=self._name,
+                )
+                _tiered_counters[self._name] = {'shared_hits': 0, 'shared_misses': 0}
+            self._local = _tiered_local[self._name]
+            self._counters = _tiered_counters[self._name]
+
+    @property
+    def _shared(self) -> BaseCache:
+        return caches[self._shared_alias]
+
+    def _count(self, counter: str) -> None:
+        with _tiered_lock:
+            self._counters[counter] += 1
+
+    def _set_local(self, local_key: str, value: Any, timeout: Any) -> None:
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self._shared.default_timeout
+        if timeout is not None and timeout <= 0:
+            self._local.delete(local_key)
+            return
+        ttl = self._local.ttl if timeout is None else min(timeout, self._local.ttl)
+        # Stored pickled, like LocMemCache, so callers mutating a result
+        # cannot change what later readers get
+        self._local.set(local_key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), ttl)
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        cached = self._local.get(local_key, _MISSING)
+        if cached is not _MISSING:
+            return pickle.loads(cached)
+
+        value = self._shared.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            self._count('shared_misses')
+            return default
+        self._count('shared_hits')
+        self._set_local(local_key, value, None)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        self._shared.set(key, value, timeout, version=version)
+        self._set_local(local_key, value, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        added = self._shared.add(key, value, timeout, version=version)
+        if added:
+            self._set_local(local_key, value, timeout)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._shared.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        self._local.delete(self.make_and_validate_key(key, version=version))
+        return self._shared.delete(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self._local.delete(self.make_and_validate_key(key, version=version))
+        return self._shared.incr(key, delta, version=version)
+
+    def has_key(self, key, version=None):
+        return self.get(key, _MISSING, version=version) is not _MISSING
+
+    def clear(self):
+        self._local.clear()
+        self._shared.clear()
+
+
+# =============================================================================
+# Agency Data Versions & Result Caching
+# =============================================================================
+
+_RESULT_SETTINGS = getattr(settings, 'RESULT_CACHE', {})
+RESULT_CACHE_ALIAS = _RESULT_SETTINGS.get('ALIAS', 'default')
+VERSION_CACHE_ALIAS = _RESULT_SETTINGS.get('VERSION_ALIAS', 'default')
+RESULT_CACHE_TTL = _RESULT_SETTINGS.get('TTL', 900)
+
+_GLOBAL_VERSION_SCOPE = 'global'
+
+
+def _data_version_key(scope: str) -> str:
+    return f'data_version:{scope}'
+
+
+def _get_version(cache, scope: str) -> str:
+    key = _data_version_key(scope)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key) or ''
+    return version
+
+
+def get_data_version(agency_id: UUID | str) -> str:
+    """
+    Get the current data version for an agency.
+
+    Combines the agency's own version with the global version (bumped for
+    cross-agency reference data such as status_mapping), so bumping either
+    one changes the result.
+
+    Args:
+        agency_id: The agency ID
+
+    Returns:
+        Opaque version string
+    """
+    cache = caches[VERSION_CACHE_ALIAS]
+    return f'{_get_version(cache, _GLOBAL_VERSION_SCOPE)}.{_get_version(cache, str(agency_id))}'
+
+
+def bump_data_version(agency_id: UUID | str | None = None) -> None:
+    """
+    Mark an agency's data (deals, users) as changed.
+
+    Runs once the surrounding transaction commits, so readers never cache a
+    result computed from uncommitted rows under the new version. Pass None to
+    bump the global version, invalidating every agency at once.
+
+    Args:
+        agency_id: The agency whose data changed, or None for all agencies
+    """
+    scope = str(agency_id) if agency_id else _GLOBAL_VERSION_SCOPE
+
+    def _bump():
+        try:
+            caches[VERSION_CACHE_ALIAS].set(_data_version_key(scope), uuid.uuid4().hex, None)
+        except Exception as e:
+            logger.warning(f'Data version bump failed: {e}')
+
+    transaction.on_commit(_bump)
+
+
+class AgencyCache:
+    """
+    Per-agency namespace over a Django cache alias.
+
+    Keys are prefixed with the agency ID and its current data version, so
+    agencies never see each other's entries and bump_data_version() drops a
+    whole agency's namespace at once. Values take a per-key timeout like any
+    Django cache.
+
+    Example:
+        agency_cache = AgencyCache(agency_id)
+        carriers = agency_cache.get_or_set('carriers', load_carriers, timeout=600)
+    """
+
+    def __init__(self, agency_id: UUID | str, alias: str | None = None):
+        self.agency_id = str(agency_id)
+        self.cache = caches[alias or RESULT_CACHE_ALIAS]
+        self.prefix = f'agency:{self.agency_id}:{get_data_version(self.agency_id)}'
+
+    def make_key(self, key: str) -> str:
+        return f'{self.prefix}:{key}'
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.cache.get(self.make_key(key), default)
+
+    def set(self, key: str, value: Any, timeout: Any = DEFAULT_TIMEOUT) -> None:
+        self.cache.set(self.make_key(key), value, timeout)
+
+    def delete(self, key: str) -> bool:
+        return self.cache.delete(self.make_key(key))
+
+    def get_or_set(self, key: str, default: Any, timeout: Any = DEFAULT_TIMEOUT) -> Any:
+        return self.cache.get_or_set(self.make_key(key), default, timeout)
+
+
+def _key_part(value: Any) -> Any:
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, (date, UUID)):
+        return str(value)
+    if isinstance(value, (list, tuple, set)):
+        return [_key_part(v) for v in value]
+    return value
+
+
+def agency_cached(
+    namespace: str,
+    agency_arg: str,
+    cache_if: Callable[[Any], bool] | None = None,
+    ignore_args: tuple[str, ...] = (),
+) -> Callable:
+    """
+    Cache a read function's result per agency data version.
+
+    The key is built from the namespace, the agency, its current data version,
+    today's date (results default to and compare against "today") and every
+    bound argument of the call. Writers invalidate by calling
+    bump_data_version(); RESULT_CACHE['TTL'] bounds staleness otherwise.
+
+    Args:
+        namespace: Key prefix identifying the function
+        agency_arg: Name of the argument holding the agency ID, or an object
+            with an agency_id attribute (e.g. the user)
+        cache_if: Optional predicate; results failing it are not cached
+        ignore_args: Arguments left out of the key, for results that do not
+            depend on them (e.g. agency-wide data requested by any user)
+
+    Example:
+        @agency_cached('analytics.carrier_metrics', agency_arg='agency_id')
+        def get_carrier_metrics(agency_id, as_of=None, ...):
+            ...
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if RESULT_CACHE_TTL <= 0:
+                return func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            agency = bound.arguments[agency_arg]
+            agency_id = getattr(agency, 'agency_id', agency)
+
+            try:
+                agency_cache = AgencyCache(agency_id)
+                params = json.dumps(
+                    {
+                        name: _key_part(value)
+                        for name, value in bound.arguments.items()
+                        if name not in ignore_args
+                    },
+                    sort_keys=True,
+                    default=str,
+                )
+                digest = hashlib.sha256(params.encode()).hexdigest()[:32]
+                key = f'result:{namespace}:{date.today()}:{digest}'
+                result = agency_cache.get(key, _MISSING)
+            except Exception as e:
+                logger.warning(f'Result cache lookup failed for {namespace}: {e}')
+                return func(*args, **kwargs)
+
+            if result is not _MISSING:
+                return result
+
+            result = func(*args, **kwargs)
+            if cache_if is None or cache_if(result):
+                try:
+                    agency_cache.set(key, result, RESULT_CACHE_TTL)
+                except Exception as e:
+                    logger.warning(f'Result cache store failed for {namespace}: {e}')
+            return result
+
+        wrapper.uncached = func  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
@@ -0,0 +1,333 @@
+"""
+Postgres LISTEN/NOTIFY Event Hub
+
+Writers publish small JSON events with publish(), which issues pg_notify in
+the writer's transaction, so events are delivered only if it commits. Each
+process runs a single listener thread holding one dedicated connection that
+LISTENs on EVENT_HUB['CHANNELS'] and fans events out to in-process
+subscribers (SSE streams), so idle subscribers cost no database queries.
+
+If the listener is disabled or disconnected, subscriptions report
+live=False and callers fall back to polling. After a reconnect every
+subscriber receives a {'event': 'resync'} event, since notifications sent
+while disconnected are lost.
+
+Subscriptions can be consumed from threads (get/iter_event_batches) or from
+asyncio code (aget/aiter_event_batches); the latter wakes the waiting task
+with call_soon_threadsafe, so an idle async stream holds no thread.
+
+Note: LISTEN needs a session-level connection (direct or session-mode
+pooler), not a transaction-mode pooler.
+"""
+import asyncio
+import contextlib
+import json
+import logging
+import queue
+import select
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from typing import Any
+
+import psycopg2
+from django.conf import settings
+from django.db import connection, connections
+
+logger = logging.getLogger(__name__)
+
+_HUB_SETTINGS = getattr(settings, 'EVENT_HUB', {})
+EVENT_HUB_ENABLED = _HUB_SETTINGS.get('ENABLED', True)
+EVENT_HUB_DATABASE = _HUB_SETTINGS.get('DATABASE', 'default')
+EVENT_HUB_CHANNELS = tuple(_HUB_SETTINGS.get('CHANNELS', ()))
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+
+RESYNC_EVENT = {'event': 'resync'}
+
+
+def publish(channel: str, payload: dict[str, Any]) -> None:
+    """
+    Publish an event to a channel.
+
+    Delivered when the current transaction commits (immediately in
+    autocommit mode). Payloads should carry IDs, not rows; subscribers load
+    whatever they need.
+
+    Args:
+        channel: Channel name (one of EVENT_HUB['CHANNELS'])
+        payload: JSON-serializable event
+    """
+    data = json.dumps(payload, default=str)
+    if len(data.encode()) > MAX_PAYLOAD_BYTES:
+        logger.warning(f'Event on {channel} too large ({len(data)} bytes), dropped')
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_notify(%s, %s)', [channel, data])
+
+
+class Subscription:
+    """
+    A subscriber's queue of events from one channel.
+
+    Events failing the optional predicate are never queued. If the queue
+    overflows, pending events are replaced by a single resync event.
+    """
+
+    def __init__(
+        self,
+        hub: 'EventHub',
+        channel: str,
+        predicate: Callable[[dict], bool] | None = None,
+        maxsize: int = 256,
+    ):
+        self.hub = hub
+        self.channel = channel
+        self.predicate = predicate
+        self._queue: queue.Queue[dict] = queue.Queue(maxsize=maxsize)
+        # Set on first aget(): the waiting task's loop and wakeup flag
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    @property
+    def live(self) -> bool:
+        """Whether events are currently being delivered."""
+        return self.hub.is_connected()
+
+    def deliver(self, event: dict) -> None:
+        if self.predicate is not None and event is not RESYNC_EVENT:
+            try:
+                if not self.predicate(event):
+                    return
+            except Exception:
+                return
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self._drain()
+            self._queue.put_nowait(RESYNC_EVENT)
+        if self._wakeup is not None:
+            with contextlib.suppress(RuntimeError):  # loop already closed
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def get(self, timeout: float) -> dict | None:
+        """Wait up to timeout seconds for the next event."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def get_nowait(self) -> dict | None:
+        """Return the next queued event, if any."""
+        try:
+            return self._queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    async def aget(self, timeout: float) -> dict | None:
+        """Asynchronously wait up to timeout seconds for the next event."""
+        if self._wakeup is None:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+        deadline = time.monotonic() + timeout
+        while True:
+            self._wakeup.clear()
+            # Check after clearing so an event delivered in between still wakes us
+            event = self.get_nowait()
+            if event is not None:
+                return event
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), remaining)
+            except TimeoutError:
+                return None
+
+    def _drain(self) -> None:
+        while self.get_nowait() is not None:
+            pass
+
+    def close(self) -> None:
+        self.hub.unsubscribe(self)
+
+    def __enter__(self) -> 'Subscription':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def iter_event_batches(
+    subscription: Subscription,
+    max_duration: float,
+    keepalive_interval: float,
+    poll_interval: float,
+) -> Iterator[list[dict] | None]:
+    """
+    Wait on a subscription, yielding what an SSE stream should react to.
+
+    Yields a list of events when some arrive (queued events are coalesced
+    into one batch), None when the stream has been idle for
+    keepalive_interval, and [RESYNC_EVENT] every poll_interval while the hub
+    is not live so callers fall back to polling. Stops after max_duration.
+    """
+    deadline = time.monotonic() + max_duration
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+
+        live = subscription.live
+        event = subscription.get(timeout=min(keepalive_interval if live else poll_interval, remaining))
+        if event is None:
+            if time.monotonic() >= deadline:
+                return
+            yield None if live else [RESYNC_EVENT]
+            continue
+
+        batch = [event]
+        while (queued := subscription.get_nowait()) is not None:
+            batch.append(queued)
+        yield batch
+
+
+async def aiter_event_batches(
+    subscription: Subscription,
+    max_duration: float,
+    keepalive_interval: float,
+    poll_interval: float,
+) -> AsyncIterator[list[dict] | None]:
+    """Async counterpart of iter_event_batches (same yields)."""
+    deadline = time.monotonic() + max_duration
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+
+        live = subscription.live
+        event = await subscription.aget(timeout=min(keepalive_interval if live else poll_interval, remaining))
+        if event is None:
+            if time.monotonic() >= deadline:
+                return
+            yield None if live else [RESYNC_EVENT]
+            continue
+
+        batch = [event]
+        while (queued := subscription.get_nowait()) is not None:
+            batch.append(queued)
+        yield batch
+
+
+class EventHub:
+    """Per-process LISTEN connection fanning notifications out to subscribers."""
+
+    RECONNECT_DELAY = 1.0
+    MAX_RECONNECT_DELAY = 30.0
+    POLL_TIMEOUT = 5.0
+
+    def __init__(self, channels: tuple[str, ...], database: str = 'default', enabled: bool = True):
+        self.channels = channels
+        self.database = database
+        self.enabled = enabled
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._connected = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def subscribe(self, channel: str, predicate: Callable[[dict], bool] | None = None) -> Subscription:
+        """
+        Subscribe to a channel, starting the listener on first use.
+
+        Args:
+            channel: Channel name
+            predicate: Optional filter applied before queueing an event
+
+        Returns:
+            Subscription (use as a context manager to unsubscribe)
+        """
+        subscription = Subscription(self, channel, predicate)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscription)
+        self._ensure_started()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.get(subscription.channel, set()).discard(subscription)
+
+    def is_connected(self) -> bool:
+        return self._connected.is_set()
+
+    def dispatch(self, channel: str, event: dict) -> None:
+        """Deliver an event to every subscriber of a channel."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+    def _broadcast_resync(self) -> None:
+        with self._lock:
+            subscribers = [s for subs in self._subscribers.values() for s in subs]
+        for subscription in subscribers:
+            subscription.deliver(RESYNC_EVENT)
+
+    def _ensure_started(self) -> None:
+        if not self.enabled or not self.channels:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='event-hub-listener', daemon=True)
+            self._thread.start()
+
+    def _connect(self):
+        params = connections[self.database].get_connection_params()
+        conn = psycopg2.connect(**params)
+        conn.set_session(autocommit=True)
+        with conn.cursor() as cursor:
+            for channel in self.channels:
+                cursor.execute(f'LISTEN "{channel}"')
+        return conn
+
+    def _run(self) -> None:
+        delay = self.RECONNECT_DELAY
+        reconnecting = False
+        while True:
+            conn = None
+            try:
+                conn = self._connect()
+                self._connected.set()
+                delay = self.RECONNECT_DELAY
+                if reconnecting:
+                    self._broadcast_resync()
+                logger.info(f'Event hub listening on {", ".join(self.channels)}')
+
+                while True:
+                    readable, _, _ = select.select([conn], [], [], self.POLL_TIMEOUT)
+                    if not readable:
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        try:
+                            event = json.loads(notify.payload)
+                        except ValueError:
+                            logger.warning(f'Ignoring non-JSON event on {notify.channel}')
+                            continue
+                        self.dispatch(notify.channel, event)
+            except Exception as e:
+                logger.warning(f'Event hub connection lost: {e}')
+            finally:
+                self._connected.clear()
+                if conn is not None:
+                    with contextlib.suppress(Exception):
+                        conn.close()
+
+            reconnecting = True
+            time.sleep(delay)
+            delay = min(delay * 2, self.MAX_RECONNECT_DELAY)
+
+
+hub = EventHub(EVENT_HUB_CHANNELS, database=EVENT_HUB_DATABASE, enabled=EVENT_HUB_ENABLED)
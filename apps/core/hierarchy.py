@@ -1,15 +1,255 @@
 """
 Centralized Hierarchy Traversal Utilities for AgentSpace.
 
-This module provides optimized functions for traversing user hierarchies
-using PostgreSQL recursive CTEs. These functions are used throughout the
-application for downline/upline operations.
-
-All functions use raw SQL for optimal performance.
+This module provides the functions used throughout the application for
+downline/upline operations.
+
+Lookups are answered from an in-memory, per-agency hierarchy index
+(parent/children arrays plus Euler-tour enter/exit numbering) instead of a
+recursive CTE per call. The index is rebuilt from public.users when the
+agency's hierarchy version changes (see invalidate_hierarchy_index) or after
+HIERARCHY_INDEX['MAX_AGE'] seconds, whichever comes first.
 """
+import logging
+import threading
+import time
+import uuid
 from uuid import UUID
 
-from django.db import connection
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+
+from .cache import LRUCache
+from .exceptions import ValidationError
+
+logger = logging.getLogger(__name__)
+
+_INDEX_SETTINGS = getattr(settings, 'HIERARCHY_INDEX', {})
+INDEX_CACHE_ALIAS = _INDEX_SETTINGS.get('ALIAS', 'default')
+INDEX_MAX_AGE = _INDEX_SETTINGS.get('MAX_AGE', 300)
+
+# Built indexes, per process. Entries are validated against the shared
+# version token on every lookup, so the TTL here is only a memory bound.
+_index_cache = LRUCache(
+    maxsize=_INDEX_SETTINGS.get('MAX_AGENCIES', 64),
+    ttl=max(INDEX_MAX_AGE, 1),
+    name='hierarchy_index',
+)
+_build_lock = threading.Lock()
+
+
+def _as_uuid(value: UUID | str) -> UUID:
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+
+class AgencyHierarchyIndex:
+    """
+    Immutable snapshot of one agency's upline tree.
+
+    Nodes are numbered 0..n-1. A DFS assigns each node an enter time; exit[i]
+    is the largest enter time inside i's subtree, so j is in i's downline iff
+    enter[i] < enter[j] <= exit[i], and i's whole downline is the contiguous
+    slice order[enter[i] + 1 : exit[i] + 1].
+    """
+
+    __slots__ = (
+        'agency_id', 'version', 'built_at', 'ids', 'position', 'parent',
+        'children', 'depth', 'enter', 'exit', 'order', 'is_client',
+    )
+
+    def __init__(self, agency_id: UUID, rows: list[tuple], version: str | None = None):
+        """
+        Build the index.
+
+        Args:
+            agency_id: The agency the rows belong to
+            rows: (id, upline_id, role) tuples for every user in the agency
+            version: Version token the rows were read under
+        """
+        self.agency_id = agency_id
+        self.version = version
+        self.built_at = time.monotonic()
+
+        n = len(rows)
+        self.ids: list[UUID] = [_as_uuid(row[0]) for row in rows]
+        self.position: dict[UUID, int] = {uid: i for i, uid in enumerate(self.ids)}
+        self.is_client: list[bool] = [row[2] == 'client' for row in rows]
+        self.parent: list[int] = [-1] * n
+        self.children: list[list[int]] = [[] for _ in range(n)]
+
+        for i, row in enumerate(rows):
+            upline_id = row[1]
+            if upline_id is None:
+                continue
+            p = self.position.get(_as_uuid(upline_id))
+            # Uplines outside the agency make the user a root, matching the
+            # agency-scoped recursive CTEs this index replaces
+            if p is not None and p != i:
+                self.parent[i] = p
+                self.children[p].append(i)
+
+        self.depth: list[int] = [0] * n
+        self.enter: list[int] = [-1] * n
+        self.exit: list[int] = [-1] * n
+        self.order: list[int] = []
+
+        roots = [i for i in range(n) if self.parent[i] == -1]
+        for root in roots:
+            self._dfs(root)
+
+        # Nodes on an upline cycle are unreachable from any root; break the
+        # cycle at the first unvisited node so every user is indexed once
+        for i in range(n):
+            if self.enter[i] == -1:
+                self.parent[i] = -1
+                self._dfs(i)
+
+    def _dfs(self, root: int) -> None:
+        """Iterative DFS assigning enter/exit numbers below root."""
+        self.enter[root] = len(self.order)
+        self.order.append(root)
+        stack = [(root, iter(self.children[root]))]
+        while stack:
+            node, it = stack[-1]
+            child = next(it, None)
+            if child is None:
+                self.exit[node] = len(self.order) - 1
+                stack.pop()
+                continue
+            if self.enter[child] != -1:
+                continue
+            self.depth[child] = self.depth[node] + 1
+            self.enter[child] = len(self.order)
+            self.order.append(child)
+            stack.append((child, iter(self.children[child])))
+
+    def __contains__(self, user_id: UUID | str) -> bool:
+        return _as_uuid(user_id) in self.position
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def downline(self, user_id: UUID | str, max_depth: int | None = None) -> list[UUID]:
+        """All users below user_id in DFS order, optionally limited to max_depth levels."""
+        i = self.position.get(_as_uuid(user_id))
+        if i is None:
+            return []
+        members = self.order[self.enter[i] + 1:self.exit[i] + 1]
+        if max_depth is not None:
+            limit = self.depth[i] + max_depth
+            members = [j for j in members if self.depth[j] <= limit]
+        return [self.ids[j] for j in members]
+
+    def upline_chain(self, user_id: UUID | str) -> list[UUID]:
+        """Uplines from the direct upline to the root."""
+        i = self.position.get(_as_uuid(user_id))
+        if i is None:
+            return []
+        chain = []
+        p = self.parent[i]
+        while p != -1:
+            chain.append(self.ids[p])
+            p = self.parent[p]
+        return chain
+
+    def depth_of(self, user_id: UUID | str) -> int:
+        """Distance from the user to their root (0 for roots and unknown users)."""
+        i = self.position.get(_as_uuid(user_id))
+        return self.depth[i] if i is not None else 0
+
+    def is_descendant(self, ancestor_id: UUID | str, target_id: UUID | str) -> bool:
+        """True if target_id is strictly below ancestor_id."""
+        a = self.position.get(_as_uuid(ancestor_id))
+        t = self.position.get(_as_uuid(target_id))
+        if a is None or t is None:
+            return False
+        return self.enter[a] < self.enter[t] <= self.exit[a]
+
+    def agent_ids(self, exclude_clients: bool = True) -> list[UUID]:
+        """All users in the agency, optionally excluding clients."""
+        if not exclude_clients:
+            return list(self.ids)
+        return [uid for uid, client in zip(self.ids, self.is_client, strict=True) if not client]
+
+
+def _version_key(agency_id: UUID | str) -> str:
+    return f'hierarchy_version:{agency_id}'
+
+
+def _current_version(agency_id: UUID | str) -> str | None:
+    try:
+        return caches[INDEX_CACHE_ALIAS].get(_version_key(agency_id))
+    except Exception as e:
+        logger.warning(f'Hierarchy version read failed: {e}')
+        return None
+
+
+def get_hierarchy_index(agency_id: UUID | str) -> AgencyHierarchyIndex:
+    """
+    Get the hierarchy index for an agency, rebuilding it if stale.
+
+    Args:
+        agency_id: The agency ID
+
+    Returns:
+        AgencyHierarchyIndex for the agency
+    """
+    agency_id = _as_uuid(agency_id)
+    version = _current_version(agency_id)
+
+    index = _index_cache.get(agency_id)
+    if (
+        index is not None
+        and index.version == version
+        and time.monotonic() - index.built_at < INDEX_MAX_AGE
+    ):
+        return index
+
+    with _build_lock:
+        # Another thread may have rebuilt it while we waited
+        index = _index_cache.get(agency_id)
+        if (
+            index is not None
+            and index.version == version
+            and time.monotonic() - index.built_at < INDEX_MAX_AGE
+        ):
+            return index
+
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT id, upline_id, role
+                FROM public.users
+                WHERE agency_id = %s
+            """, [str(agency_id)])
+            rows = cursor.fetchall()
+
+        index = AgencyHierarchyIndex(agency_id, rows, version)
+        _index_cache.set(agency_id, index)
+        return index
+
+
+def invalidate_hierarchy_index(agency_id: UUID | str) -> None:
+    """
+    Mark an agency's hierarchy as changed.
+
+    Call after inserting users or changing upline_id. Bumps the shared
+    version token once the surrounding transaction commits, so every
+    process rebuilds its index on the next lookup.
+
+    Args:
+        agency_id: The agency whose users changed
+    """
+    agency_id = _as_uuid(agency_id)
+
+    def _bump():
+        _index_cache.delete(agency_id)
+        try:
+            caches[INDEX_CACHE_ALIAS].set(_version_key(agency_id), uuid.uuid4().hex, None)
+        except Exception as e:
+            logger.warning(f'Hierarchy version bump failed: {e}')
+
+    transaction.on_commit(_bump)
 
 
 def get_downline_ids(
@@ -21,8 +261,6 @@ def get_downline_ids(
     """
     Get all user IDs in a user's downline (recursive).
 
-    Uses a recursive CTE for efficient hierarchy traversal.
-
     Args:
         user_id: The root user ID to start traversal from
         agency_id: Agency ID for multi-tenancy filtering
@@ -32,49 +270,12 @@ def get_downline_ids(
     Returns:
         List of user IDs in the downline
     """
-    # Validate max_depth to prevent SQL injection - must be positive integer or None
     if max_depth is not None:
         max_depth = int(max_depth)
         if max_depth < 1:
             max_depth = None
 
-    with connection.cursor() as cursor:
-        if max_depth is not None:
-            # Use parameterized query with depth limit
-            cursor.execute("""
-                WITH RECURSIVE downline AS (
-                    SELECT id, 1 as depth
-                    FROM public.users
-                    WHERE upline_id = %s AND agency_id = %s
-
-                    UNION ALL
-
-                    SELECT u.id, d.depth + 1
-                    FROM public.users u
-                    JOIN downline d ON u.upline_id = d.id
-                    WHERE u.agency_id = %s AND d.depth < %s
-                )
-                SELECT id FROM downline
-            """, [str(user_id), str(agency_id), str(agency_id), max_depth])
-        else:
-            # No depth limit
-            cursor.execute("""
-                WITH RECURSIVE downline AS (
-                    SELECT id, 1 as depth
-                    FROM public.users
-                    WHERE upline_id = %s AND agency_id = %s
-
-                    UNION ALL
-
-                    SELECT u.id, d.depth + 1
-                    FROM public.users u
-                    JOIN downline d ON u.upline_id = d.id
-                    WHERE u.agency_id = %s
-                )
-                SELECT id FROM downline
-            """, [str(user_id), str(agency_id), str(agency_id)])
-
-        result = [row[0] for row in cursor.fetchall()]
+    result = get_hierarchy_index(agency_id).downline(user_id, max_depth)
 
     if include_self:
         result.insert(0, user_id)
@@ -82,38 +283,47 @@ def get_downline_ids(
     return result
 
 
-def get_upline_ids(user_id: UUID, include_self: bool = False) -> list[UUID]:
+def get_upline_ids(
+    user_id: UUID,
+    include_self: bool = False,
+    agency_id: UUID | None = None,
+) -> list[UUID]:
     """
     Get the chain of uplines from a user to the root.
 
-    Uses a recursive CTE for efficient traversal.
+    Served from the hierarchy index when agency_id is known; otherwise falls
+    back to a recursive CTE, which can also cross agency boundaries.
 
     Args:
         user_id: The starting user ID
         include_self: Whether to include the user themselves in the result
+        agency_id: The user's agency ID, if known
 
     Returns:
         List of user IDs from direct upline to root (ordered by proximity)
     """
-    with connection.cursor() as cursor:
-        cursor.execute("""
-            WITH RECURSIVE upline_chain AS (
-                SELECT id, upline_id, 1 as depth
-                FROM public.users
-                WHERE id = %s
+    if agency_id is not None:
+        result = get_hierarchy_index(agency_id).upline_chain(user_id)
+    else:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                WITH RECURSIVE upline_chain AS (
+                    SELECT id, upline_id, 1 as depth
+                    FROM public.users
+                    WHERE id = %s
 
-                UNION ALL
+                    UNION ALL
 
-                SELECT u.id, u.upline_id, uc.depth + 1
-                FROM public.users u
-                JOIN upline_chain uc ON u.id = uc.upline_id
-                WHERE u.id IS NOT NULL
-            )
-            SELECT id FROM upline_chain
-            WHERE depth > 1
-            ORDER BY depth
-        """, [str(user_id)])
-        result = [row[0] for row in cursor.fetchall()]
+                    SELECT u.id, u.upline_id, uc.depth + 1
+                    FROM public.users u
+                    JOIN upline_chain uc ON u.id = uc.upline_id
+                    WHERE u.id IS NOT NULL
+                )
+                SELECT id FROM upline_chain
+                WHERE depth > 1
+                ORDER BY depth
+            """, [str(user_id)])
+            result = [row[0] for row in cursor.fetchall()]
 
     if include_self:
         result.insert(0, user_id)
@@ -121,12 +331,24 @@ def get_upline_ids(user_id: UUID, include_self: bool = False) -> list[UUID]:
     return result
 
 
+def get_hierarchy_depth(user_id: UUID, agency_id: UUID) -> int:
+    """
+    Get the depth of a user in the hierarchy (distance from root).
+
+    Args:
+        user_id: The user ID
+        agency_id: Agency ID for multi-tenancy filtering
+
+    Returns:
+        Number of uplines above the user (0 for a root)
+    """
+    return get_hierarchy_index(agency_id).depth_of(user_id)
+
+
 def is_in_downline(upline_id: UUID, target_id: UUID, agency_id: UUID) -> bool:
     """
     Check if a target user is in an upline's downline.
 
-    Uses a recursive CTE for efficient traversal with early exit.
-
     Args:
         upline_id: The potential upline user ID
         target_id: The user ID to check if in downline
@@ -139,20 +361,7 @@ def is_in_downline(upline_id: UUID, target_id: UUID, agency_id: UUID) -> bool:
     if str(upline_id) == str(target_id):
         return False
 
-    with connection.cursor() as cursor:
-        cursor.execute("""
-            WITH RECURSIVE downline AS (
-                SELECT id FROM public.users WHERE id = %s
-
-                UNION ALL
-
-                SELECT u.id FROM public.users u
-                JOIN downline d ON u.upline_id = d.id
-                WHERE u.agency_id = %s
-            )
-            SELECT 1 FROM downline WHERE id = %s LIMIT 1
-        """, [str(upline_id), str(agency_id), str(target_id)])
-        return cursor.fetchone() is not None
+    return get_hierarchy_index(agency_id).is_descendant(upline_id, target_id)
 
 
 def get_all_agency_agent_ids(agency_id: UUID, exclude_clients: bool = True) -> list[UUID]:
@@ -166,18 +375,7 @@ def get_all_agency_agent_ids(agency_id: UUID, exclude_clients: bool = True) -> l
     Returns:
         List of user IDs in the agency
     """
-    with connection.cursor() as cursor:
-        if exclude_clients:
-            cursor.execute("""
-                SELECT id FROM public.users
-                WHERE agency_id = %s AND role != 'client'
-            """, [str(agency_id)])
-        else:
-            cursor.execute("""
-                SELECT id FROM public.users
-                WHERE agency_id = %s
-            """, [str(agency_id)])
-        return [row[0] for row in cursor.fetchall()]
+    return get_hierarchy_index(agency_id).agent_ids(exclude_clients)
 
 
 def is_in_agency(user_id: UUID, agency_id: UUID) -> bool:
@@ -191,10 +389,148 @@ def is_in_agency(user_id: UUID, agency_id: UUID) -> bool:
     Returns:
         True if user is in agency, False otherwise
     """
+    return user_id in get_hierarchy_index(agency_id)
+
+
+# =============================================================================
+# Closure Table
+# =============================================================================
+#
+# public.user_hierarchy_closure stores every (ancestor, descendant, depth)
+# pair of the upline tree so that SQL reports can join descendants directly
+# instead of walking users.upline_id with a recursive CTE. It must be kept in
+# step with upline_id: call update_hierarchy_closure() whenever a single
+# user's upline is set or changed, and rebuild_hierarchy_closure() after bulk
+# imports.
+
+def is_upline_cycle(user_id: UUID | str, upline_id: UUID | str | None) -> bool:
+    """
+    Check whether making upline_id the upline of user_id would create a cycle.
+
+    Reads the closure table, so it sees the caller's uncommitted changes.
+
+    Args:
+        user_id: The user whose upline would change
+        upline_id: The proposed upline (None is never a cycle)
+
+    Returns:
+        True if upline_id is user_id or one of its descendants
+    """
+    if not upline_id:
+        return False
+    if str(user_id) == str(upline_id):
+        return True
+
     with connection.cursor() as cursor:
         cursor.execute("""
-            SELECT 1 FROM public.users
-            WHERE id = %s AND agency_id = %s
-            LIMIT 1
-        """, [str(user_id), str(agency_id)])
+            SELECT 1 FROM public.user_hierarchy_closure
+            WHERE ancestor_id = %s AND descendant_id = %s
+        """, [str(user_id), str(upline_id)])
         return cursor.fetchone() is not None
+
+
+def update_hierarchy_closure(user_id: UUID | str, upline_id: UUID | str | None) -> None:
+    """
+    Attach a user (and their whole subtree) under a new upline.
+
+    Removes the subtree's links to its previous ancestors and re-links it
+    beneath upline_id. Safe to call for brand-new users (only the self row
+    and upline links are created) and with upline_id=None (detaches to root).
+    Runs inside the caller's transaction.
+
+    Args:
+        user_id: The user whose upline was set or changed
+        upline_id: The user's new upline, or None for a root user
+
+    Raises:
+        ValidationError: If upline_id is in user_id's subtree. The caller's
+            transaction must roll back so users.upline_id and the closure
+            table don't diverge; check is_upline_cycle() before writing.
+    """
+    user_id = str(user_id)
+    upline_id = str(upline_id) if upline_id else None
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO public.user_hierarchy_closure (ancestor_id, descendant_id, depth)
+            VALUES (%s, %s, 0)
+            ON CONFLICT DO NOTHING
+        """, [user_id, user_id])
+
+        # Drop links from the subtree to ancestors outside the subtree
+        cursor.execute("""
+            DELETE FROM public.user_hierarchy_closure c
+            USING public.user_hierarchy_closure sub
+            WHERE sub.ancestor_id = %(user_id)s
+              AND c.descendant_id = sub.descendant_id
+              AND c.ancestor_id NOT IN (
+                  SELECT descendant_id
+                  FROM public.user_hierarchy_closure
+                  WHERE ancestor_id = %(user_id)s
+              )
+        """, {'user_id': user_id})
+
+        if upline_id is None:
+            return
+
+        cursor.execute("""
+            SELECT 1 FROM public.user_hierarchy_closure
+            WHERE ancestor_id = %s AND descendant_id = %s
+        """, [user_id, upline_id])
+        if cursor.fetchone():
+            raise ValidationError(f'Cannot link {user_id} under its own descendant {upline_id}')
+
+        cursor.execute("""
+            INSERT INTO public.user_hierarchy_closure (ancestor_id, descendant_id, depth)
+            SELECT sup.ancestor_id, sub.descendant_id, sup.depth + sub.depth + 1
+            FROM public.user_hierarchy_closure sup
+            CROSS JOIN public.user_hierarchy_closure sub
+            WHERE sup.descendant_id = %(upline_id)s
+              AND sub.ancestor_id = %(user_id)s
+            ON CONFLICT (ancestor_id, descendant_id) DO UPDATE SET depth = EXCLUDED.depth
+        """, {'user_id': user_id, 'upline_id': upline_id})
+
+
+def rebuild_hierarchy_closure(agency_id: UUID | str) -> int:
+    """
+    Recompute the closure rows for every user in an agency.
+
+    Used after bulk user imports and for backfilling. Upline cycles are
+    broken rather than followed. Runs inside the caller's transaction.
+
+    Args:
+        agency_id: The agency to rebuild
+
+    Returns:
+        Number of closure rows written
+    """
+    agency_id = str(agency_id)
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            DELETE FROM public.user_hierarchy_closure c
+            USING public.users u
+            WHERE u.id = c.descendant_id AND u.agency_id = %s
+        """, [agency_id])
+
+        cursor.execute("""
+            WITH RECURSIVE tree AS (
+                SELECT u.id AS ancestor_id, u.id AS descendant_id, 0 AS depth, ARRAY[u.id] AS path
+                FROM public.users u
+                WHERE u.agency_id = %(agency_id)s
+
+                UNION ALL
+
+                SELECT t.ancestor_id, u.id, t.depth + 1, t.path || u.id
+                FROM tree t
+                JOIN public.users u ON u.upline_id = t.descendant_id
+                WHERE u.agency_id = %(agency_id)s
+                  AND NOT u.id = ANY(t.path)
+            )
+            INSERT INTO public.user_hierarchy_closure (ancestor_id, descendant_id, depth)
+            SELECT ancestor_id, descendant_id, MIN(depth)
+            FROM tree
+            GROUP BY ancestor_id, descendant_id
+            ON CONFLICT (ancestor_id, descendant_id) DO UPDATE SET depth = EXCLUDED.depth
+        """, {'agency_id': agency_id})
+        return cursor.rowcount
@@ -0,0 +1,367 @@
+"""
+Background Job Queue
+
+Long-running operations (bulk SMS, report generation, ingest orchestration,
+messaging runs) are stored in public.background_jobs and executed by
+`manage.py run_jobs` workers instead of inside the HTTP request. Views
+enqueue and return 202 with the job ID; clients poll GET /api/jobs/{id}.
+
+Workers lease jobs with UPDATE ... FOR UPDATE SKIP LOCKED (the same pattern
+as apps.nipr.services.acquire_job), so any number of workers can run side
+by side. A lease expires after JOB_QUEUE['LEASE_SECONDS'] unless the worker
+extends it, at which point the job is leased again. Failed attempts are
+retried with exponential backoff until max_attempts.
+
+Handlers live in each app's jobs.py and register with @register_job;
+workers import them with autodiscover_jobs().
+"""
+import json
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import Any
+from uuid import UUID
+
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import autodiscover_modules
+
+from apps.core.authentication import SYSTEM_USER_ID
+
+logger = logging.getLogger(__name__)
+
+_QUEUE_SETTINGS = getattr(settings, 'JOB_QUEUE', {})
+JOB_LEASE_SECONDS = _QUEUE_SETTINGS.get('LEASE_SECONDS', 600)
+JOB_MAX_ATTEMPTS = _QUEUE_SETTINGS.get('MAX_ATTEMPTS', 3)
+JOB_RETRY_BACKOFF = _QUEUE_SETTINGS.get('RETRY_BACKOFF', 30)
+JOB_MAX_BACKOFF = _QUEUE_SETTINGS.get('MAX_BACKOFF', 3600)
+
+
+@dataclass
+class Job:
+    """A leased job as seen by its handler."""
+    id: UUID
+    job_type: str
+    payload: dict[str, Any]
+    attempts: int
+    max_attempts: int
+    agency_id: UUID | None
+    created_by: UUID | None
+
+
+@dataclass
+class JobHandler:
+    func: Callable[[Job], Any]
+    max_attempts: int
+
+
+_handlers: dict[str, JobHandler] = {}
+
+
+def register_job(job_type: str, max_attempts: int | None = None) -> Callable:
+    """
+    Register a job handler.
+
+    The handler receives the Job and returns a JSON-serializable result,
+    stored on the job. Raising marks the attempt failed (and retried if
+    attempts remain); handlers that are not safe to repeat should set
+    max_attempts=1.
+
+    Example:
+        @register_job('dashboard.generate_report')
+        def generate_report_job(job):
+            ...
+    """
+    def decorator(func: Callable[[Job], Any]) -> Callable[[Job], Any]:
+        _handlers[job_type] = JobHandler(func, max_attempts or JOB_MAX_ATTEMPTS)
+        return func
+
+    return decorator
+
+
+def get_handler(job_type: str) -> JobHandler | None:
+    return _handlers.get(job_type)
+
+
+def autodiscover_jobs() -> None:
+    """Import every installed app's jobs module so handlers register."""
+    autodiscover_modules('jobs')
+
+
+def job_agency_id(user) -> UUID | None:
+    """
+    Agency to record on a job queued by user.
+
+    The cron system user has no real agency, and background_jobs.agency_id
+    references public.agencies, so its jobs are queued without one.
+    """
+    if user.id == SYSTEM_USER_ID:
+        return None
+    return user.agency_id
+
+
+def enqueue_job(
+    job_type: str,
+    payload: dict[str, Any] | None = None,
+    agency_id: UUID | None = None,
+    created_by: UUID | None = None,
+    delay_seconds: int = 0,
+    dedupe_key: str | None = None,
+) -> UUID | None:
+    """
+    Add a job to the queue.
+
+    Runs in the caller's transaction, so the job only becomes visible to
+    workers if it commits.
+
+    Args:
+        job_type: Registered handler name
+        payload: JSON-serializable handler arguments
+        agency_id: Agency the job belongs to (status access)
+        created_by: users.id of the requester (status access)
+        delay_seconds: Do not run before this many seconds from now
+        dedupe_key: Skip the insert if a job of this type was already
+            enqueued with the same key (whatever its status)
+
+    Returns:
+        The job ID, or None if dedupe_key matched an existing job
+    """
+    handler = get_handler(job_type)
+    max_attempts = handler.max_attempts if handler else JOB_MAX_ATTEMPTS
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO public.background_jobs (
+                job_type, agency_id, created_by, payload, max_attempts, dedupe_key,
+                run_after, created_at, updated_at
+            )
+            VALUES (%s, %s, %s, %s::jsonb, %s, %s, NOW() + make_interval(secs => %s), NOW(), NOW())
+            ON CONFLICT (job_type, dedupe_key) WHERE dedupe_key IS NOT NULL DO NOTHING
+            RETURNING id
+        """, [
+            job_type,
+            str(agency_id) if agency_id else None,
+            str(created_by) if created_by else None,
+            _to_json(payload or {}),
+            max_attempts,
+            dedupe_key,
+            delay_seconds,
+        ])
+        row = cursor.fetchone()
+
+    if not row:
+        logger.info(f'Skipped duplicate {job_type} job ({dedupe_key})')
+        return None
+
+    logger.info(f'Enqueued {job_type} job {row[0]}')
+    return row[0]
+
+
+def lease_job(worker_id: str, job_types: list[str] | None = None) -> Job | None:
+    """
+    Lease the next runnable job.
+
+    Picks the oldest pending job whose run_after has passed, or a running job
+    whose lease expired (its worker died), and locks it for JOB_LEASE_SECONDS.
+
+    Args:
+        worker_id: Identifies the worker holding the lease
+        job_types: Only lease these types (None for all)
+
+    Returns:
+        The leased Job, or None if nothing is runnable
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            UPDATE public.background_jobs
+            SET
+                status = 'running',
+                attempts = attempts + 1,
+                locked_by = %s,
+                locked_until = NOW() + make_interval(secs => %s),
+                started_at = COALESCE(started_at, NOW()),
+                updated_at = NOW()
+            WHERE id = (
+                SELECT id FROM public.background_jobs
+                WHERE (
+                    (status = 'pending' AND run_after <= NOW())
+                    OR (status = 'running' AND locked_until < NOW())
+                )
+                AND attempts < max_attempts
+                AND (%s::text[] IS NULL OR job_type = ANY(%s::text[]))
+                ORDER BY run_after ASC
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, job_type, payload, attempts, max_attempts, agency_id, created_by
+        """, [worker_id, JOB_LEASE_SECONDS, job_types, job_types])
+        row = cursor.fetchone()
+
+    if not row:
+        return None
+
+    return Job(
+        id=row[0],
+        job_type=row[1],
+        payload=row[2] or {},
+        attempts=row[3],
+        max_attempts=row[4],
+        agency_id=row[5],
+        created_by=row[6],
+    )
+
+
+def extend_lease(job_id: UUID, worker_id: str) -> bool:
+    """Extend a running job's lease; False if the worker no longer holds it."""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            UPDATE public.background_jobs
+            SET locked_until = NOW() + make_interval(secs => %s), updated_at = NOW()
+            WHERE id = %s AND status = 'running' AND locked_by = %s
+        """, [JOB_LEASE_SECONDS, str(job_id), worker_id])
+        return cursor.rowcount > 0
+
+
+def complete_job(job_id: UUID, result: Any) -> None:
+    """Mark a job completed with its handler's result."""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            UPDATE public.background_jobs
+            SET
+                status = 'completed',
+                result = %s::jsonb,
+                error_message = NULL,
+                progress = 100,
+                locked_until = NULL,
+                completed_at = NOW(),
+                updated_at = NOW()
+            WHERE id = %s
+        """, [_to_json(result), str(job_id)])
+
+
+def fail_job(job: Job, error: str) -> bool:
+    """
+    Record a failed attempt.
+
+    Returns:
+        True if the job will be retried, False if it failed permanently
+    """
+    retry = job.attempts < job.max_attempts
+    backoff = min(JOB_RETRY_BACKOFF * 2 ** (job.attempts - 1), JOB_MAX_BACKOFF)
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            UPDATE public.background_jobs
+            SET
+                status = CASE WHEN %s THEN 'pending' ELSE 'failed' END,
+                run_after = CASE WHEN %s THEN NOW() + make_interval(secs => %s) ELSE run_after END,
+                completed_at = CASE WHEN %s THEN NULL ELSE NOW() END,
+                error_message = %s,
+                locked_by = NULL,
+                locked_until = NULL,
+                updated_at = NOW()
+            WHERE id = %s
+        """, [retry, retry, backoff, retry, error, str(job.id)])
+
+    return retry
+
+
+def fail_expired_jobs() -> int:
+    """
+    Fail running jobs whose lease expired on their last allowed attempt.
+
+    Returns:
+        Number of jobs failed
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            UPDATE public.background_jobs
+            SET
+                status = 'failed',
+                error_message = COALESCE(error_message, 'Worker lease expired'),
+                locked_until = NULL,
+                completed_at = NOW(),
+                updated_at = NOW()
+            WHERE status = 'running'
+              AND locked_until < NOW()
+              AND attempts >= max_attempts
+        """)
+        return cursor.rowcount
+
+
+def set_job_progress(job_id: UUID, progress: int, message: str | None = None) -> None:
+    """Update a running job's progress (0-100) for status polling."""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            UPDATE public.background_jobs
+            SET progress = %s, progress_message = COALESCE(%s, progress_message), updated_at = NOW()
+            WHERE id = %s
+        """, [progress, message, str(job_id)])
+
+
+def get_job(job_id: UUID) -> dict | None:
+    """Get a job's status for the status endpoint."""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT
+                id, job_type, status, agency_id, created_by, attempts, max_attempts,
+                progress, progress_message, result, error_message,
+                created_at, started_at, completed_at, run_after
+            FROM public.background_jobs
+            WHERE id = %s
+        """, [str(job_id)])
+        row = cursor.fetchone()
+
+    if not row:
+        return None
+
+    return {
+        'job_id': str(row[0]),
+        'job_type': row[1],
+        'status': row[2],
+        'agency_id': str(row[3]) if row[3] else None,
+        'created_by': str(row[4]) if row[4] else None,
+        'attempts': row[5],
+        'max_attempts': row[6],
+        'progress': row[7],
+        'progress_message': row[8],
+        'result': row[9],
+        'error_message': row[10],
+        'created_at': row[11].isoformat() if row[11] else None,
+        'started_at': row[12].isoformat() if row[12] else None,
+        'completed_at': row[13].isoformat() if row[13] else None,
+        'run_after': row[14].isoformat() if row[14] else None,
+    }
+
+
+def run_job(job: Job) -> bool:
+    """
+    Run a leased job's handler and record the outcome.
+
+    Returns:
+        True if the job completed
+    """
+    handler = get_handler(job.job_type)
+    if handler is None:
+        logger.error(f'No handler registered for job type {job.job_type}')
+        # Not retryable: no worker can run it
+        fail_job(replace(job, max_attempts=job.attempts), f'Unknown job type: {job.job_type}')
+        return False
+
+    try:
+        result = handler.func(job)
+    except Exception as e:
+        retry = fail_job(job, str(e))
+        logger.error(
+            f'Job {job.id} ({job.job_type}) attempt {job.attempts}/{job.max_attempts} failed: {e}'
+            + (' - will retry' if retry else '')
+        )
+        return False
+
+    complete_job(job.id, result)
+    logger.info(f'Job {job.id} ({job.job_type}) completed')
+    return True
+
+
+def _to_json(value: Any) -> str:
+    return json.dumps(value, default=str)
@@ -0,0 +1,28 @@
+"""
+Invalidate cached reference data after editing it outside this service
+(e.g. carriers or status_mapping rows changed in Supabase).
+
+Usage:
+    python manage.py bump_reference_data
+    python manage.py bump_reference_data --agency <agency_id>
+"""
+from django.core.management.base import BaseCommand
+
+from apps.core.cache import bump_data_version
+from apps.core.reference_data import bump_reference_version
+
+
+class Command(BaseCommand):
+    help = 'Invalidate cached reference data (and the analytics derived from it)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--agency', dest='agency_id', help="Only invalidate this agency's products/positions")
+
+    def handle(self, *args, **options):
+        agency_id = options.get('agency_id')
+        bump_reference_version(agency_id)
+        # Status mappings feed analytics and dashboard results as well
+        bump_data_version(agency_id)
+
+        scope = f'agency {agency_id}' if agency_id else 'all agencies'
+        self.stdout.write(self.style.SUCCESS(f'Reference data invalidated for {scope}'))
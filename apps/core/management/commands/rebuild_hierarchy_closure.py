@@ -0,0 +1,38 @@
+"""
+Rebuild public.user_hierarchy_closure from users.upline_id.
+
+Usage:
+    python manage.py rebuild_hierarchy_closure
+    python manage.py rebuild_hierarchy_closure --agency <agency_id>
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.core.hierarchy import rebuild_hierarchy_closure
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the user hierarchy closure table for one or all agencies'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--agency', dest='agency_id', help='Only rebuild this agency')
+
+    def handle(self, *args, **options):
+        agency_id = options.get('agency_id')
+        if agency_id:
+            agency_ids = [agency_id]
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT id FROM public.agencies ORDER BY id')
+                agency_ids = [row[0] for row in cursor.fetchall()]
+
+        total = 0
+        for aid in agency_ids:
+            with transaction.atomic():
+                rows = rebuild_hierarchy_closure(aid)
+            total += rows
+            self.stdout.write(f'{aid}: {rows} closure rows')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt hierarchy closure for {len(agency_ids)} agencies ({total} rows)'
+        ))
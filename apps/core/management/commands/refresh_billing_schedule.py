@@ -0,0 +1,33 @@
+"""
+Regenerate public.deal_billing_schedule from deals.
+
+Deal writes and imports keep the schedule current and the daily billing
+reminder run rolls its horizon forward (see
+apps.messaging.services.run_billing_reminders); use this for a full rebuild
+by hand, e.g. after changing BILLING_SCHEDULE['HORIZON_DAYS'].
+
+Usage:
+    python manage.py refresh_billing_schedule
+    python manage.py refresh_billing_schedule --agency <agency_id>
+"""
+from django.core.management.base import BaseCommand
+
+from apps.deals.billing_schedule import refresh_all_billing_schedules, refresh_billing_schedule
+
+
+class Command(BaseCommand):
+    help = 'Regenerate deal billing schedules for one or all agencies'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--agency', dest='agency_id', help='Only refresh this agency')
+
+    def handle(self, *args, **options):
+        agency_id = options.get('agency_id')
+        written = {agency_id: refresh_billing_schedule(agency_id)} if agency_id else refresh_all_billing_schedules()
+
+        for aid, rows in written.items():
+            self.stdout.write(f'{aid}: {rows} schedule rows')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Refreshed billing schedules for {len(written)} agencies ({sum(written.values())} rows)'
+        ))
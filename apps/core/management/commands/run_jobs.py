@@ -0,0 +1,113 @@
+"""
+Run background jobs from public.background_jobs (see apps.core.jobs).
+
+Run as many workers as needed; they lease jobs with SKIP LOCKED and never
+run the same job twice at once. SIGTERM/SIGINT finish the current job
+before exiting.
+
+Usage:
+    python manage.py run_jobs
+    python manage.py run_jobs --types sms.bulk_send,dashboard.generate_report
+    python manage.py run_jobs --once
+"""
+import logging
+import os
+import signal
+import socket
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from apps.core.jobs import (
+    JOB_LEASE_SECONDS,
+    autodiscover_jobs,
+    extend_lease,
+    fail_expired_jobs,
+    lease_job,
+    run_job,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Process queued background jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--types', help='Comma-separated job types to process (default: all)')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--once', action='store_true', help='Exit when the queue is empty')
+
+    def handle(self, *args, **options):
+        autodiscover_jobs()
+
+        job_types = [t.strip() for t in options['types'].split(',')] if options.get('types') else None
+        poll_interval = options['poll_interval']
+        worker_id = f'{socket.gethostname()}:{os.getpid()}'
+
+        self._stopping = threading.Event()
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        self.stdout.write(f'Worker {worker_id} processing {", ".join(job_types) if job_types else "all job types"}')
+
+        processed = 0
+        while not self._stopping.is_set():
+            close_old_connections()
+
+            expired = fail_expired_jobs()
+            if expired:
+                self.stdout.write(self.style.WARNING(f'Failed {expired} jobs with expired leases'))
+
+            job = lease_job(worker_id, job_types)
+            if job is None:
+                if options['once']:
+                    break
+                self._stopping.wait(poll_interval)
+                continue
+
+            self.stdout.write(f'Running {job.job_type} job {job.id} (attempt {job.attempts}/{job.max_attempts})')
+            with _LeaseKeeper(job.id, worker_id):
+                completed = run_job(job)
+            processed += 1
+
+            if completed:
+                self.stdout.write(self.style.SUCCESS(f'Completed {job.id}'))
+            else:
+                self.stdout.write(self.style.ERROR(f'Failed {job.id}'))
+
+        self.stdout.write(f'Worker {worker_id} stopped after {processed} jobs')
+
+    def _stop(self, signum, frame):
+        self.stdout.write('Stopping after the current job...')
+        self._stopping.set()
+
+
+class _LeaseKeeper:
+    """Extends a job's lease from a background thread while it runs."""
+
+    def __init__(self, job_id, worker_id: str):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        try:
+            while not self._done.wait(JOB_LEASE_SECONDS / 3):
+                try:
+                    extend_lease(self.job_id, self.worker_id)
+                except Exception as e:
+                    logger.warning(f'Lease extension failed for job {self.job_id}: {e}')
+        finally:
+            # Thread-local connection opened by extend_lease
+            connection.close()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._done.set()
+        self._thread.join()
@@ -3,7 +3,7 @@ Conversation QuerySet and Manager for optimized SMS conversation queries.
 """
 
 from django.db import models
-from django.db.models import OuterRef, Q, Subquery
+from django.db.models import Q
 
 from apps.core.querysets import HierarchyQuerySetMixin, ViewModeQuerySetMixin
 
@@ -56,63 +56,36 @@ class ConversationQuerySet(HierarchyQuerySetMixin, ViewModeQuerySetMixin, models
 
     def with_last_message(self):
         """
-        Annotate with the last message details.
+        Last message details.
 
-        Adds last_message_at and last_message_content annotations.
+        last_message_at and last_message_content are stored on the
+        conversation, so no annotation is needed.
         """
-        from apps.core.models import Message
-
-        # Subquery for last message timestamp
-        last_message_subquery = (
-            Message.objects.filter(conversation_id=OuterRef('id'))
-            .order_by('-created_at')
-            .values('created_at')[:1]
-        )
-
-        # Subquery for last message content
-        last_content_subquery = (
-            Message.objects.filter(conversation_id=OuterRef('id'))
-            .order_by('-created_at')
-            .values('content')[:1]
-        )
-
-        return self.annotate(
-            last_message_at=Subquery(last_message_subquery),
-            last_message_content=Subquery(last_content_subquery)
-        )
+        return self
 
     def with_unread_count(self, for_agent: bool = True):
         """
-        Annotate with unread message count.
+        Unread message count.
 
         Args:
-            for_agent: If True, count unread by agent. If False, count unread by client.
+            for_agent: If True, count unread by agent (the stored unread_count).
+                If False, annotate client_unread_count with messages from the
+                agent the client hasn't read.
         """
-        from django.db.models import Count
+        if for_agent:
+            return self
 
+        from django.db.models import Count
 
-        if for_agent:
-            # Count messages from client that agent hasn't read
-            return self.annotate(
-                unread_count=Count(
-                    'messages',
-                    filter=Q(
-                        messages__direction='inbound',
-                        messages__read_at__isnull=True
-                    )
-                )
-            )
-        else:
-            # Count messages from agent that client hasn't read
-            return self.annotate(
-                unread_count=Count(
-                    'messages',
-                    filter=Q(
-                        messages__direction='outbound',
-                        messages__read_at__isnull=True
-                    )
+        return self.annotate(
+            client_unread_count=Count(
+                'messages',
+                filter=Q(
+                    messages__direction='outbound',
+                    messages__read_at__isnull=True
                 )
             )
+        )
 
     def search(self, query: str):
         """
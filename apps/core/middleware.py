@@ -23,6 +23,10 @@ class SupabaseAuthMiddleware:
     2. Validates JWT for protected routes
     3. Attaches AuthenticatedUser to request.user
     4. Returns 401 for unauthenticated requests to protected routes
+
+    The authenticator memoizes its result on the request, so the DRF
+    SupabaseJWTAuthentication pass that follows reuses it without
+    decoding the JWT or querying public.users again.
     """
 
     # Routes that don't require authentication
@@ -4,13 +4,17 @@ Core View Mixins
 Provides standardized authentication, error handling, and response patterns
 for all API views in the application.
 """
+import functools
 from uuid import UUID
 
+from django.utils.cache import parse_etags
+from rest_framework import status
 from rest_framework.response import Response
 
 from .authentication import AuthenticatedUser, get_user_context
 from .exceptions import APIException as APIError
 from .exceptions import ValidationError
+from .reference_data import reference_etag
 
 
 class AuthenticatedAPIView:
@@ -93,6 +97,21 @@ class AuthenticatedAPIView:
         return Response(data, status=status_code)
 
 
+def job_accepted_response(job_id: UUID) -> Response:
+    """
+    Build the 202 response for an operation handed to the job queue.
+
+    Clients poll the Location (GET /api/jobs/{id}) for status and result.
+    """
+    status_url = f"/api/jobs/{job_id}"
+    response = Response(
+        {"success": True, "job_id": str(job_id), "status": "pending", "status_url": status_url},
+        status=status.HTTP_202_ACCEPTED,
+    )
+    response["Location"] = status_url
+    return response
+
+
 def handle_api_errors(func):
     """
     Decorator to handle APIError exceptions in view methods.
@@ -112,3 +131,47 @@ def handle_api_errors(func):
                 status=e.status_code
             )
     return wrapper
+
+
+def reference_data_etag(namespace: str, agency_scoped: bool = False):
+    """
+    Decorator adding ETag/If-None-Match handling to reference-data views.
+
+    The ETag is derived from the reference-data version (see
+    apps.core.reference_data), so a matching If-None-Match is answered with
+    304 before the view body runs.
+
+    Usage:
+        @reference_data_etag('carriers.list')
+        def get(self, request):
+            ...
+
+    Args:
+        namespace: Identifies the endpoint's data
+        agency_scoped: Whether the data belongs to the user's agency
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, request, *args, **kwargs):
+            agency_id = None
+            if agency_scoped:
+                user = get_user_context(request)
+                if not user:
+                    return func(self, request, *args, **kwargs)
+                agency_id = user.agency_id
+
+            etag = reference_etag(namespace, agency_id, request)
+            if etag:
+                if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+                if etag in if_none_match or '*' in if_none_match:
+                    response = Response(status=status.HTTP_304_NOT_MODIFIED)
+                    response['ETag'] = etag
+                    return response
+
+            response = func(self, request, *args, **kwargs)
+            if etag and response.status_code == status.HTTP_200_OK:
+                response['ETag'] = etag
+                response['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapper
+    return decorator
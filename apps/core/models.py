@@ -34,6 +34,8 @@ class Agency(models.Model):
     code = models.TextField()
     is_active = models.BooleanField(default=True, null=True)
     phone_number = models.TextField(null=True, blank=True)
+    # Generated column - public.phone_e164(phone_number), see apps.core.phone
+    phone_number_e164 = models.TextField(null=True, blank=True, editable=False)
     lead_sources = ArrayField(models.TextField(), default=list, blank=True)
     messaging_enabled = models.BooleanField(default=False)
 
@@ -189,7 +191,7 @@ class User(models.Model):
         """
         Get all agents in this user's downline (recursive).
 
-        Uses a recursive CTE for efficient hierarchy traversal.
+        Served from the agency hierarchy index.
 
         Args:
             max_depth: Maximum depth to traverse (None for unlimited)
@@ -212,7 +214,7 @@ class User(models.Model):
             List of user IDs from direct upline to root (ordered)
         """
         from apps.core.hierarchy import get_upline_ids
-        return get_upline_ids(self.id, include_self=False)
+        return get_upline_ids(self.id, include_self=False, agency_id=self.agency_id)
 
     def is_in_downline(self, target_user_id: 'UUID') -> bool:
         """
@@ -382,6 +384,7 @@ class Deal(models.Model):
     # Generated columns - read-only, computed by PostgreSQL
     client_email_lc = models.TextField(null=True, blank=True, editable=False)
     client_phone10 = models.TextField(null=True, blank=True, editable=False)
+    client_phone_e164 = models.TextField(null=True, blank=True, editable=False)
     client_name_norm = models.TextField(null=True, blank=True, editable=False)
 
     split_agent = models.ForeignKey(
@@ -596,8 +599,13 @@ class Conversation(models.Model):
         related_name='conversations'
     )
     client_phone = models.TextField(null=True, blank=True)
+    # Generated column - public.phone_e164(client_phone), see apps.core.phone
+    client_phone_e164 = models.TextField(null=True, blank=True, editable=False)
     type = models.TextField(default='sms')
     last_message_at = models.DateTimeField(null=True, blank=True)
+    # Denormalized from messages by apps.sms.services.refresh_conversation_summaries
+    unread_count = models.IntegerField(default=0)
+    last_message_content = models.TextField(null=True, blank=True)
     is_active = models.BooleanField(default=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True, null=True)
 
@@ -794,6 +802,8 @@ class IngestJob(models.Model):
     updated_at = models.DateTimeField(auto_now=True, null=True, blank=True)
     client_job_id = models.TextField(null=True, blank=True)
     watcher_created_at = models.DateTimeField(null=True, blank=True)
+    # Per-stage timings and row counts of the last ingest run (apps.ingest.pipeline)
+    metrics = models.JSONField(null=True, blank=True)
 
     class Meta:
         managed = False
@@ -1037,11 +1047,14 @@ class ParsingInfo(models.Model):
 class PolicyReportStagingSyncLog(models.Model):
     """
     Sync log for policy report staging operations.
+
+    Ingest pipeline runs log one row per stage (reason 'ingest_stage',
+    no staging_id) with its timing and row count in details.
     Maps to: public.policy_report_staging_sync_log
     """
     id = models.BigAutoField(primary_key=True)
     run_id = models.UUIDField()
-    staging_id = models.UUIDField()
+    staging_id = models.UUIDField(null=True, blank=True)
     reason = models.TextField()
     details = models.JSONField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -1054,6 +1067,256 @@ class PolicyReportStagingSyncLog(models.Model):
         return f"Staging Sync {self.id} - {self.reason[:50]}"
 
 
+class UserHierarchyClosure(models.Model):
+    """
+    Ancestor/descendant closure of the users.upline_id tree.
+
+    One row per (ancestor, descendant) pair within an agency, including a
+    depth-0 self row per user. Maintained incrementally by
+    apps.core.hierarchy.update_hierarchy_closure / rebuild_hierarchy_closure.
+    Maps to: public.user_hierarchy_closure
+    """
+    pk = models.CompositePrimaryKey('ancestor_id', 'descendant_id')
+    ancestor = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='descendant_links'
+    )
+    descendant = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='ancestor_links'
+    )
+    depth = models.IntegerField()
+
+    class Meta:
+        managed = False
+        db_table = 'user_hierarchy_closure'
+        indexes = [
+            models.Index(fields=['descendant', 'depth'], name='uhc_descendant_depth_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor_id} -> {self.descendant_id} ({self.depth})"
+
+
+class DealMonthlyRollup(models.Model):
+    """
+    Pre-aggregated deal counts and premium per agency/agent/carrier/month.
+
+    Each deal contributes one 'written' row (agent = writing agent) and one
+    'hierarchy' row per deal_hierarchy_snapshot entry (agent = snapshot
+    agent, is_writer set when that is also the writing agent). Status is
+    stored raw; impact/placement classes are resolved through status_mapping
+    at read time so mapping edits never require a rebuild.
+    Maintained by apps.analytics.services.
+    Maps to: public.deal_monthly_rollup
+    """
+    SOURCE_CHOICES = [
+        ('written', 'Written'),
+        ('hierarchy', 'Hierarchy'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    agency = models.ForeignKey(
+        Agency,
+        on_delete=models.CASCADE,
+        related_name='deal_rollups'
+    )
+    source = models.TextField(choices=SOURCE_CHOICES)
+    agent = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='deal_rollups'
+    )
+    is_writer = models.BooleanField()
+    carrier = models.ForeignKey(
+        Carrier,
+        on_delete=models.CASCADE,
+        related_name='deal_rollups'
+    )
+    effective_month = models.DateField()
+    state = models.TextField()
+    age_band = models.TextField()
+    status = models.TextField(null=True, blank=True)
+    deal_count = models.IntegerField()
+    premium_count = models.IntegerField()
+    premium_sum = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+
+    class Meta:
+        managed = False
+        db_table = 'deal_monthly_rollup'
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    'agency', 'effective_month', 'source', 'agent', 'is_writer',
+                    'carrier', 'state', 'age_band', 'status',
+                ],
+                name='deal_monthly_rollup_key',
+                nulls_distinct=False,
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['agent', 'source', 'effective_month'], name='dmr_agent_source_month_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.agency_id} {self.effective_month:%Y-%m} {self.source}: {self.deal_count}"
+
+
+class DealBillingSchedule(models.Model):
+    """
+    Precomputed billing periods per deal.
+
+    payment_number n is the n-th period after the effective date (by
+    billing_cycle); payment_date is effective date + n periods and
+    billing_date the day the premium is drafted (the billing_day_of_month /
+    billing_weekday pattern when set, otherwise payment_date). Holds the
+    first 12 periods plus every period billing within the horizon.
+    Maintained by apps.deals.billing_schedule.
+    Maps to: public.deal_billing_schedule
+    """
+    id = models.BigAutoField(primary_key=True)
+    deal = models.ForeignKey(
+        Deal,
+        on_delete=models.CASCADE,
+        related_name='billing_schedule'
+    )
+    agency = models.ForeignKey(
+        Agency,
+        on_delete=models.CASCADE,
+        related_name='deal_billing_schedule'
+    )
+    agent = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='deal_billing_schedule'
+    )
+    payment_number = models.IntegerField()
+    payment_date = models.DateField()
+    billing_date = models.DateField(null=True, blank=True)
+    # Unrounded (annual_premium / payments per year); rounded when summed
+    payment_amount = models.DecimalField(max_digits=20, decimal_places=8, null=True, blank=True)
+
+    class Meta:
+        managed = False
+        db_table = 'deal_billing_schedule'
+        constraints = [
+            models.UniqueConstraint(fields=['deal', 'payment_number'], name='deal_billing_schedule_key'),
+        ]
+        indexes = [
+            models.Index(fields=['agency', 'payment_date'], name='dbs_agency_payment_date_idx'),
+            models.Index(fields=['billing_date'], name='dbs_billing_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.deal_id} #{self.payment_number}: {self.billing_date or self.payment_date}"
+
+
+class AgentUnreadCount(models.Model):
+    """
+    Unread inbound messages per agent, over their active SMS conversations.
+
+    The sum of conversations.unread_count by agent, kept current by
+    apps.sms.services.refresh_conversation_summaries (which applies each
+    conversation's change) and corrected by the reconcile_unread_counts
+    command. Agency totals are the sum of the agency's rows.
+    Maps to: public.agent_unread_counts
+    """
+    agent = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='unread_counter'
+    )
+    agency = models.ForeignKey(
+        Agency,
+        on_delete=models.CASCADE,
+        related_name='agent_unread_counts'
+    )
+    unread_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        managed = False
+        db_table = 'agent_unread_counts'
+        indexes = [
+            models.Index(fields=['agency'], name='agent_unread_counts_agency_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.agent_id}: {self.unread_count} unread"
+
+
+class BackgroundJob(models.Model):
+    """
+    Queued long-running operation (bulk SMS, reports, ingest, messaging runs).
+
+    Leased by `manage.py run_jobs` workers with FOR UPDATE SKIP LOCKED; see
+    apps.core.jobs. created_by has no foreign key so cron (system user) jobs
+    can be recorded.
+    Maps to: public.background_jobs
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4)
+    job_type = models.TextField()
+    agency_id = models.UUIDField(null=True, blank=True)
+    created_by = models.UUIDField(null=True, blank=True)
+    payload = models.JSONField(default=dict)
+    # Set by enqueuers that must not queue the same work twice (e.g. webhook retries)
+    dedupe_key = models.TextField(null=True, blank=True)
+    status = models.TextField(choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+    run_after = models.DateTimeField()
+    locked_by = models.TextField(null=True, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    progress = models.IntegerField(default=0)
+    progress_message = models.TextField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error_message = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        managed = False
+        db_table = 'background_jobs'
+        indexes = [
+            models.Index(
+                fields=['run_after'],
+                name='background_jobs_pending_idx',
+                condition=models.Q(status='pending'),
+            ),
+            models.Index(
+                fields=['locked_until'],
+                name='background_jobs_running_idx',
+                condition=models.Q(status='running'),
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['job_type', 'dedupe_key'],
+                name='background_jobs_dedupe_key_uniq',
+                condition=models.Q(dedupe_key__isnull=False),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.job_type} {self.id} ({self.status})"
+
+
 # =============================================================================
 # Manager Assignments
 # =============================================================================
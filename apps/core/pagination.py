@@ -0,0 +1,165 @@
+"""
+Keyset Pagination
+
+Cursor-based paging for list endpoints. A page is read with
+`WHERE (sort key) past cursor ORDER BY sort key LIMIT limit + 1`, so deep
+pages cost the same as the first and no page pays for a COUNT; the extra row
+tells whether there is a next page.
+
+Cursors are opaque to clients: the sort key of a page's last row, JSON
+encoded and base64url'd. Endpoints switch to keyset mode when the `cursor`
+query param is present (empty for the first page) and keep page/limit
+paging otherwise.
+
+Totals are opt-in (`include_total=true`) and come from cached_total(), which
+caches the COUNT per agency data version for CURSOR_PAGINATION['TOTAL_TTL']
+seconds, so they are approximate.
+"""
+import base64
+import binascii
+import hashlib
+import json
+import logging
+from collections.abc import Callable, Sequence
+from datetime import date
+from typing import Any
+from uuid import UUID
+
+from django.conf import settings
+
+from .cache import AgencyCache
+from .exceptions import ValidationError
+
+logger = logging.getLogger(__name__)
+
+_SETTINGS = getattr(settings, 'CURSOR_PAGINATION', {})
+TOTAL_COUNT_TTL = _SETTINGS.get('TOTAL_TTL', 300)
+
+
+def parse_cursor_params(query_params) -> tuple[str | None, bool]:
+    """
+    Read the keyset params of a list request.
+
+    Returns:
+        Tuple of (cursor, or None for page/limit paging; include_total)
+    """
+    cursor = query_params.get('cursor')
+    include_total = query_params.get('include_total', '').lower() in ('1', 'true')
+    return cursor, include_total
+
+
+def _cursor_value(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode a row's sort key as an opaque cursor."""
+    payload = json.dumps([_cursor_value(v) for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, size: int) -> list | None:
+    """
+    Decode a cursor from encode_cursor().
+
+    Args:
+        cursor: The cursor query param
+        size: Number of sort key values the endpoint expects
+
+    Returns:
+        The sort key values, or None for an empty cursor (first page)
+
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as err:
+        raise ValidationError('Invalid cursor') from err
+    if not isinstance(values, list) or len(values) != size:
+        raise ValidationError('Invalid cursor')
+    return values
+
+
+def name_sort_key(last_name: str | None, first_name: str | None) -> tuple:
+    """
+    Sort key values for an `x.last_name, x.first_name` ordering.
+
+    Matches `last_name IS NULL, COALESCE(last_name, ''), first_name IS NULL,
+    COALESCE(first_name, '')`, which orders like the plain columns (NULLs
+    last) while staying comparable in a keyset row comparison.
+    """
+    return last_name is None, last_name or '', first_name is None, first_name or ''
+
+
+def keyset_page(rows: list, limit: int, key: Callable[[Any], Sequence[Any]]) -> tuple[list, str | None]:
+    """
+    Trim a limit + 1 fetch to one page.
+
+    Args:
+        rows: Rows fetched with LIMIT limit + 1
+        limit: Page size
+        key: Returns a row's sort key
+
+    Returns:
+        Tuple of (page rows, cursor for the next page or None)
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(key(rows[-1]))
+
+
+def cursor_pagination(limit: int, next_cursor: str | None, total_count: int | None = None) -> dict:
+    """Build the pagination block of a keyset page."""
+    return {
+        'limit': limit,
+        'hasNextPage': next_cursor is not None,
+        'nextCursor': next_cursor,
+        'totalCount': total_count,
+    }
+
+
+def cached_total(
+    agency_id: UUID | str,
+    namespace: str,
+    params: dict[str, Any],
+    count: Callable[[], int],
+) -> int:
+    """
+    Get an approximate total for a keyset-paginated list.
+
+    Args:
+        agency_id: Agency whose data version scopes the entry
+        namespace: Key prefix identifying the list
+        params: Everything the count depends on (user, filters, search)
+        count: Runs the COUNT on a miss
+
+    Returns:
+        The cached or freshly counted total
+    """
+    digest = hashlib.sha256(
+        json.dumps(params, sort_keys=True, default=str).encode()
+    ).hexdigest()[:32]
+    key = f'total:{namespace}:{digest}'
+    try:
+        agency_cache = AgencyCache(agency_id)
+        total = agency_cache.get(key)
+    except Exception as e:
+        logger.warning(f'Total count cache lookup failed for {namespace}: {e}')
+        return count()
+
+    if total is None:
+        total = count()
+        try:
+            agency_cache.set(key, total, TOTAL_COUNT_TTL)
+        except Exception as e:
+            logger.warning(f'Total count cache store failed for {namespace}: {e}')
+    return total
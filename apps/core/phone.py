@@ -0,0 +1,62 @@
+"""
+Phone Number Lookups
+
+Phone columns hold numbers in whatever format they were entered or imported
+in, so each one has a generated E.164 companion computed by the SQL function
+public.phone_e164() and indexed with its agency:
+
+- agencies.phone_number_e164
+- deals.client_phone_e164
+- conversations.client_phone_e164
+
+Lookups normalize their input with to_e164(), which mirrors phone_e164(), and
+match the companion column with an indexed equality instead of trying format
+variations or wrapping the column in REGEXP_REPLACE.
+"""
+import re
+
+from django.db import connection
+
+
+def to_e164(phone: str | None) -> str | None:
+    """
+    Normalize a phone number to the E.164 form stored in *_e164 columns.
+
+    Ten digits are a US number (+1 added); anything else is taken as already
+    carrying its country code. Must stay in step with public.phone_e164().
+
+    Returns:
+        '+<digits>', or None if the input has no digits
+    """
+    if not phone:
+        return None
+    digits = re.sub(r'\D', '', phone)
+    if not digits:
+        return None
+    if len(digits) == 10:
+        return f'+1{digits}'
+    return f'+{digits}'
+
+
+def find_agency_by_phone(phone_number: str) -> dict | None:
+    """Find the agency that owns a phone number (e.g. an SMS receiving number)."""
+    e164 = to_e164(phone_number)
+    if not e164:
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT id, name, phone_number
+            FROM public.agencies
+            WHERE phone_number_e164 = %s
+            LIMIT 1
+        """, [e164])
+        row = cursor.fetchone()
+
+    if not row:
+        return None
+    return {
+        'id': str(row[0]),
+        'name': row[1],
+        'phone_number': row[2],
+    }
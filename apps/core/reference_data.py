@@ -0,0 +1,165 @@
+"""
+Reference Data Caching for AgentSpace Backend
+
+Carriers, status mappings, products and positions feed every dropdown but
+only change when an admin edits them. Their selectors are cached under a
+reference-data version, and views tag responses with an ETag derived from
+the same version so clients revalidate with If-None-Match and get a 304
+without the selector running at all.
+
+Two version scopes exist:
+- global: carriers and status mappings (edited directly in Supabase; expires
+  after REFERENCE_DATA['TTL'] or on `manage.py bump_reference_data`)
+- per agency: products and positions (bumped by their services)
+"""
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import uuid
+from collections.abc import Callable
+from typing import Any
+from uuid import UUID
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+_REFERENCE_SETTINGS = getattr(settings, 'REFERENCE_DATA', {})
+REFERENCE_CACHE_ALIAS = _REFERENCE_SETTINGS.get('ALIAS', 'default')
+REFERENCE_VERSION_ALIAS = _REFERENCE_SETTINGS.get('VERSION_ALIAS', 'default')
+REFERENCE_CACHE_TTL = _REFERENCE_SETTINGS.get('TTL', 3600)
+
+_GLOBAL_SCOPE = 'global'
+_MISSING = object()
+
+
+def _version_key(scope: str) -> str:
+    return f'reference_version:{scope}'
+
+
+def _get_scope_version(cache, scope: str) -> str:
+    # Tokens expire with the TTL so edits made outside this service are
+    # picked up (new cache keys, new ETags) within one TTL
+    key = _version_key(scope)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, REFERENCE_CACHE_TTL)
+        version = cache.get(key) or ''
+    return version
+
+
+def get_reference_version(agency_id: UUID | str | None = None) -> str:
+    """
+    Get the current reference-data version.
+
+    Args:
+        agency_id: Include this agency's products/positions version
+            (None for global data only)
+
+    Returns:
+        Opaque version string
+    """
+    cache = caches[REFERENCE_VERSION_ALIAS]
+    version = _get_scope_version(cache, _GLOBAL_SCOPE)
+    if agency_id:
+        version = f'{version}.{_get_scope_version(cache, str(agency_id))}'
+    return version
+
+
+def bump_reference_version(agency_id: UUID | str | None = None) -> None:
+    """
+    Mark reference data as changed once the surrounding transaction commits.
+
+    Args:
+        agency_id: The agency whose products/positions changed, or None for
+            global data (carriers, status mappings), which affects everyone
+    """
+    scope = str(agency_id) if agency_id else _GLOBAL_SCOPE
+
+    def _bump():
+        try:
+            caches[REFERENCE_VERSION_ALIAS].set(_version_key(scope), uuid.uuid4().hex, REFERENCE_CACHE_TTL)
+        except Exception as e:
+            logger.warning(f'Reference version bump failed: {e}')
+
+    transaction.on_commit(_bump)
+
+
+def _digest(namespace: str, version: str, params: Any) -> str:
+    payload = json.dumps([namespace, version, params], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def reference_cached(namespace: str, agency_arg: str | None = None) -> Callable:
+    """
+    Cache a reference-data selector per reference version.
+
+    Args:
+        namespace: Key prefix identifying the selector
+        agency_arg: Name of the argument holding the agency ID for
+            agency-scoped data (None for global data)
+
+    Example:
+        @reference_cached('products.all', agency_arg='agency_id')
+        def get_all_products_for_agency(agency_id):
+            ...
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if REFERENCE_CACHE_TTL <= 0:
+                return func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            agency_id = bound.arguments[agency_arg] if agency_arg else None
+
+            try:
+                cache = caches[REFERENCE_CACHE_ALIAS]
+                version = get_reference_version(agency_id)
+                key = f'reference:{namespace}:{_digest(namespace, version, bound.arguments)}'
+                result = cache.get(key, _MISSING)
+            except Exception as e:
+                logger.warning(f'Reference cache lookup failed for {namespace}: {e}')
+                return func(*args, **kwargs)
+
+            if result is not _MISSING:
+                return result
+
+            result = func(*args, **kwargs)
+            try:
+                cache.set(key, result, REFERENCE_CACHE_TTL)
+            except Exception as e:
+                logger.warning(f'Reference cache store failed for {namespace}: {e}')
+            return result
+
+        wrapper.uncached = func  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+def reference_etag(namespace: str, agency_id: UUID | str | None, request) -> str | None:
+    """
+    Build the ETag for a reference-data response.
+
+    Covers the reference version, the agency and the full request path
+    (including query parameters), so any edit or different filter changes it.
+
+    Returns:
+        Quoted ETag value, or None when reference caching is disabled
+    """
+    if REFERENCE_CACHE_TTL <= 0:
+        return None
+    try:
+        version = get_reference_version(agency_id)
+    except Exception as e:
+        logger.warning(f'Reference version lookup failed for {namespace}: {e}')
+        return None
+    return f'"{_digest(namespace, version, [str(agency_id or ""), request.get_full_path()])}"'
@@ -0,0 +1,127 @@
+"""
+Server-Sent Event Streams
+
+EventStream holds the logic of an SSE endpoint as two synchronous hooks,
+open() and handle(batch), which may query the database. The same stream is
+served either as a sync generator (WSGI: one worker thread per open
+connection) or as an async generator (ASGI/uvicorn: waiting is a coroutine
+on the event loop, and the hooks run on the loop's shared thread pool only
+when an event arrives), so thousands of idle streams cost no threads.
+
+Use sse_response() in the view; it picks the variant matching the server.
+"""
+import json
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections
+from django.http import StreamingHttpResponse
+
+from .events import aiter_event_batches, hub, iter_event_batches
+
+KEEPALIVE = ": keepalive\n\n"
+
+
+def format_event(event: str, data: Any) -> str:
+    """Format one SSE event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class EventStream:
+    """
+    An SSE stream woken by event hub notifications.
+
+    Subclasses set channel, implement handle() and optionally open() and
+    predicate(). Both hooks return the SSE chunks to send; set self.finished
+    to end the stream after them. A timeout event is sent at max_duration.
+    """
+    channel: str
+    poll_interval: float = 2
+    keepalive_interval: float = 15
+    max_duration: float = 300
+
+    finished = False
+
+    def predicate(self, event: dict) -> bool:
+        """Whether an event concerns this stream (no queries)."""
+        return True
+
+    def open(self) -> list[str]:
+        """Chunks sent when the stream starts."""
+        return []
+
+    def handle(self, batch: list[dict]) -> list[str]:
+        """Chunks sent for a batch of events ([RESYNC_EVENT] when polling)."""
+        raise NotImplementedError
+
+    def _timeout(self) -> str:
+        return format_event('timeout', {'message': 'Stream timeout'})
+
+    def __iter__(self) -> Iterator[str]:
+        with hub.subscribe(self.channel, self.predicate) as subscription:
+            yield from self.open()
+            if self.finished:
+                return
+            for batch in iter_event_batches(
+                subscription,
+                max_duration=self.max_duration,
+                keepalive_interval=self.keepalive_interval,
+                poll_interval=self.poll_interval,
+            ):
+                if batch is None:
+                    yield KEEPALIVE
+                    continue
+                yield from self.handle(batch)
+                if self.finished:
+                    return
+        yield self._timeout()
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        with hub.subscribe(self.channel, self.predicate) as subscription:
+            for chunk in await _run_sync(self.open):
+                yield chunk
+            if self.finished:
+                return
+            async for batch in aiter_event_batches(
+                subscription,
+                max_duration=self.max_duration,
+                keepalive_interval=self.keepalive_interval,
+                poll_interval=self.poll_interval,
+            ):
+                if batch is None:
+                    yield KEEPALIVE
+                    continue
+                for chunk in await _run_sync(self.handle, batch):
+                    yield chunk
+                if self.finished:
+                    return
+        yield self._timeout()
+
+
+async def _run_sync(func, *args):
+    # Not thread-sensitive: hooks from every stream share the loop's bounded
+    # executor (and its per-thread DB connections) instead of each request
+    # pinning a thread of its own
+    def call():
+        close_old_connections()
+        return func(*args)
+
+    return await sync_to_async(call, thread_sensitive=False)()
+
+
+def sse_response(request, stream: EventStream) -> StreamingHttpResponse:
+    """
+    Build the streaming response for an EventStream.
+
+    Under ASGI the stream is consumed asynchronously; under WSGI it runs as
+    a regular generator on the request thread.
+    """
+    django_request = getattr(request, '_request', request)
+    content = stream.__aiter__() if isinstance(django_request, ASGIRequest) else iter(stream)
+    response = StreamingHttpResponse(content, content_type='text/event-stream')
+    # Disable buffering for real-time streaming
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # For nginx
+    return response
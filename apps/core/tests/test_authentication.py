@@ -0,0 +1,234 @@
+"""
+Authentication Unit Tests
+
+Tests for Supabase JWT authentication, per-request memoization and the
+cross-request user cache.
+"""
+import uuid
+from dataclasses import replace
+from unittest.mock import MagicMock, patch
+
+from django.test import RequestFactory, SimpleTestCase
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from apps.auth_api.views import CompleteOnboardingView
+from apps.core.authentication import (
+    AuthenticatedUser,
+    SupabaseJWTAuthentication,
+    get_authenticated_user_by_auth_id,
+    invalidate_cached_user,
+)
+from apps.core.cache import LRUCache
+from apps.core.permissions import IsActiveUser
+from apps.onboarding.services import complete_onboarding
+from apps.onboarding.views import CompleteOnboardingView as OnboardingCompleteView
+
+
+def create_auth_user() -> AuthenticatedUser:
+    """Helper to create AuthenticatedUser for tests."""
+    return AuthenticatedUser(
+        id=uuid.uuid4(),
+        auth_user_id=uuid.uuid4(),
+        email='test@example.com',
+        agency_id=uuid.uuid4(),
+        role='agent',
+        is_admin=False,
+        status='active',
+        perm_level=None,
+        subscription_tier='free',
+    )
+
+
+class AuthenticationMemoizationTests(SimpleTestCase):
+    """Tests that a request is only authenticated once."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.authenticator = SupabaseJWTAuthentication()
+        self.user = create_auth_user()
+
+    @patch.object(SupabaseJWTAuthentication, '_get_user_from_payload')
+    @patch.object(SupabaseJWTAuthentication, '_decode_jwt')
+    def test_drf_pass_reuses_middleware_result(self, mock_decode, mock_lookup):
+        """DRF authentication reuses the result memoized by the middleware."""
+        mock_decode.return_value = {'sub': str(self.user.auth_user_id)}
+        mock_lookup.return_value = self.user
+        django_request = self.factory.get('/api/agents', HTTP_AUTHORIZATION='Bearer token-1')
+
+        # Middleware pass on the raw HttpRequest
+        first = self.authenticator.authenticate(django_request)
+        # DRF pass on the wrapped Request
+        second = SupabaseJWTAuthentication().authenticate(Request(django_request))
+
+        self.assertEqual(first, (self.user, 'token-1'))
+        self.assertIs(first, second)
+        mock_decode.assert_called_once()
+        mock_lookup.assert_called_once()
+
+    @patch.object(SupabaseJWTAuthentication, '_get_user_from_payload')
+    @patch.object(SupabaseJWTAuthentication, '_decode_jwt')
+    def test_separate_requests_are_not_shared(self, mock_decode, mock_lookup):
+        """Each request performs its own authentication."""
+        mock_decode.return_value = {'sub': str(self.user.auth_user_id)}
+        mock_lookup.return_value = self.user
+
+        self.authenticator.authenticate(self.factory.get('/api/agents', HTTP_AUTHORIZATION='Bearer token-1'))
+        self.authenticator.authenticate(self.factory.get('/api/agents', HTTP_AUTHORIZATION='Bearer token-1'))
+
+        self.assertEqual(mock_decode.call_count, 2)
+
+    def test_no_header_returns_none(self):
+        """Requests without a bearer token are not authenticated."""
+        self.assertIsNone(self.authenticator.authenticate(self.factory.get('/api/agents')))
+
+
+@patch('apps.core.authentication.USER_CACHE_TTL', 60)
+class UserCacheTests(SimpleTestCase):
+    """Tests for the auth_user_id -> AuthenticatedUser cache."""
+
+    def setUp(self):
+        self.user = create_auth_user()
+        local_patcher = patch('apps.core.authentication._local_user_cache', LRUCache(maxsize=16, ttl=5))
+        local_patcher.start()
+        self.addCleanup(local_patcher.stop)
+
+    @patch('apps.core.authentication._fetch_authenticated_user')
+    def test_repeat_lookups_hit_cache(self, mock_fetch):
+        """Only the first lookup reaches the database."""
+        mock_fetch.return_value = self.user
+
+        first = get_authenticated_user_by_auth_id(self.user.auth_user_id)
+        second = get_authenticated_user_by_auth_id(self.user.auth_user_id)
+
+        self.assertEqual(first, self.user)
+        self.assertEqual(second, self.user)
+        mock_fetch.assert_called_once()
+
+    @patch('apps.core.authentication._fetch_authenticated_user')
+    def test_missing_user_not_cached(self, mock_fetch):
+        """Unknown users are looked up again on the next request."""
+        mock_fetch.return_value = None
+
+        get_authenticated_user_by_auth_id(self.user.auth_user_id)
+        get_authenticated_user_by_auth_id(self.user.auth_user_id)
+
+        self.assertEqual(mock_fetch.call_count, 2)
+
+    @patch('apps.core.authentication._fetch_authenticated_user')
+    def test_invalidation_forces_refetch(self, mock_fetch):
+        """Invalidating a user makes the next lookup hit the database."""
+        mock_fetch.return_value = self.user
+
+        get_authenticated_user_by_auth_id(self.user.auth_user_id)
+        with patch('apps.core.authentication.transaction.on_commit', side_effect=lambda fn: fn()):
+            invalidate_cached_user(self.user.auth_user_id)
+        get_authenticated_user_by_auth_id(self.user.auth_user_id)
+
+        self.assertEqual(mock_fetch.call_count, 2)
+
+
+@patch('apps.auth_api.views.invalidate_cached_user')
+@patch('apps.auth_api.views.connection')
+class UserWriteInvalidationTests(SimpleTestCase):
+    """Views that write cached user columns drop the cached user."""
+
+    def test_complete_onboarding_invalidates(self, mock_connection, mock_invalidate):
+        """The next request sees status 'active' instead of the cached 'onboarding'."""
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = ('active',)
+        user = create_auth_user()
+        user.status = 'onboarding'
+        request = APIRequestFactory().post('/api/user/complete-onboarding')
+        force_authenticate(request, user=user)
+
+        response = CompleteOnboardingView.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        mock_invalidate.assert_called_once_with(user.auth_user_id)
+
+
+class ActiveOnlyView(APIView):
+    authentication_classes = [SupabaseJWTAuthentication]
+    permission_classes = [IsAuthenticated, IsActiveUser]
+
+    def get(self, request):
+        return Response({'ok': True})
+
+
+@patch('apps.core.authentication.USER_CACHE_TTL', 60)
+@patch('apps.core.authentication.transaction.on_commit', side_effect=lambda fn: fn())
+@patch('apps.onboarding.services.transaction.on_commit', side_effect=lambda fn: fn())
+@patch.object(OnboardingCompleteView, 'authentication_classes', [SupabaseJWTAuthentication])
+@patch.object(SupabaseJWTAuthentication, '_decode_jwt')
+class OnboardingCompletionTests(SimpleTestCase):
+    """Finishing onboarding through apps.onboarding is seen by the next request."""
+
+    def setUp(self):
+        self.user = create_auth_user()
+        self.db_status = 'onboarding'
+        for target, value in (
+            ('apps.core.authentication._local_user_cache', LRUCache(maxsize=16, ttl=5)),
+            ('apps.core.authentication._fetch_authenticated_user',
+             MagicMock(side_effect=lambda _: replace(self.user, status=self.db_status))),
+            ('apps.onboarding.views.complete_onboarding', complete_onboarding.__wrapped__),
+        ):
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        connection_patcher = patch('apps.onboarding.services.connection')
+        cursor = connection_patcher.start().cursor.return_value.__enter__.return_value
+        self.addCleanup(connection_patcher.stop)
+        cursor.execute.side_effect = self._execute
+        cursor.fetchone.side_effect = lambda: self._row
+
+    def _execute(self, sql, params):
+        if 'UPDATE users' in sql:
+            self.db_status = 'active'
+            self._row = (self.user.id, self.user.auth_user_id)
+        else:
+            self._row = (uuid.uuid4(),)
+
+    def _request(self, view, method='get'):
+        request = getattr(APIRequestFactory(), method)('/api/test', HTTP_AUTHORIZATION='Bearer token-1')
+        return view.as_view()(request)
+
+    def test_active_after_completing(self, mock_decode, *mocks):
+        mock_decode.return_value = {'sub': str(self.user.auth_user_id)}
+        self.assertEqual(self._request(ActiveOnlyView).status_code, 403)
+
+        response = self._request(OnboardingCompleteView, 'post')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._request(ActiveOnlyView).status_code, 200)
+
+
+class LRUCacheTests(SimpleTestCase):
+    """Tests for the in-process LRU cache."""
+
+    def test_evicts_least_recently_used(self):
+        """Oldest untouched entry is dropped when full."""
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    @patch('apps.core.cache.time.monotonic')
+    def test_expired_entries_are_missing(self, mock_monotonic):
+        """Entries past their TTL are treated as absent."""
+        cache = LRUCache(maxsize=2, ttl=10)
+        mock_monotonic.return_value = 100.0
+        cache.set('a', 1)
+
+        mock_monotonic.return_value = 111.0
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
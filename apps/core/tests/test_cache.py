@@ -0,0 +1,205 @@
+"""
+Cache Unit Tests
+
+Tests for the tiered cache backend, agency namespaces, data versions and the
+agency_cached decorator.
+"""
+import uuid
+from unittest.mock import MagicMock, patch
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.test import SimpleTestCase, override_settings
+
+from apps.core.cache import (
+    AgencyCache,
+    agency_cached,
+    bump_data_version,
+    get_cache_stats,
+    get_data_version,
+)
+
+
+class TieredCacheTests(SimpleTestCase):
+    """Tests for the L1 (process) / L2 (shared) cache backend."""
+
+    def setUp(self):
+        self.tiered = caches['tiered']
+        self.tiered.clear()
+
+    def test_reads_served_from_local_tier(self):
+        """Once loaded, values are returned without touching the shared tier."""
+        self.tiered.set('key', {'a': 1})
+
+        with patch.object(cache, 'get') as mock_shared_get:
+            self.assertEqual(self.tiered.get('key'), {'a': 1})
+
+        mock_shared_get.assert_not_called()
+
+    def test_local_miss_falls_back_to_shared(self):
+        """Values written by another process are found in the shared tier."""
+        cache.set('written-elsewhere', 42)
+
+        self.assertEqual(self.tiered.get('written-elsewhere'), 42)
+        self.assertIsNone(self.tiered.get('absent'))
+        self.assertEqual(self.tiered.get('absent', 'fallback'), 'fallback')
+
+    def test_delete_removes_both_tiers(self):
+        """Deleted keys are gone locally and in the shared cache."""
+        self.tiered.set('key', 1)
+        self.tiered.delete('key')
+
+        self.assertIsNone(self.tiered.get('key'))
+        self.assertIsNone(cache.get('key'))
+
+    def test_local_copies_are_isolated(self):
+        """Mutating a returned value does not change the cached one."""
+        self.tiered.set('key', {'items': [1]})
+        self.tiered.get('key')['items'].append(2)
+
+        self.assertEqual(self.tiered.get('key'), {'items': [1]})
+
+    def test_zero_timeout_not_kept_locally(self):
+        """A non-positive timeout skips the local tier."""
+        self.tiered.set('key', 1, timeout=0)
+
+        self.assertIsNone(self.tiered.get('key'))
+
+    def test_counters_reported(self):
+        """Shared-tier hits and misses show up in get_cache_stats."""
+        cache.set('counted', 1)
+        before = get_cache_stats()['caches']['tiered:default']
+
+        self.tiered.get('counted')
+        self.tiered.get('counted')
+        self.tiered.get('not-there')
+
+        after = get_cache_stats()['caches']['tiered:default']
+        self.assertEqual(after['shared_hits'] - before['shared_hits'], 1)
+        self.assertEqual(after['shared_misses'] - before['shared_misses'], 1)
+        self.assertEqual(after['hits'] - before['hits'], 1)
+
+
+@patch('apps.core.cache.transaction.on_commit', side_effect=lambda fn: fn())
+class AgencyCacheTests(SimpleTestCase):
+    """Tests for per-agency cache namespaces."""
+
+    def test_agencies_do_not_share_keys(self, _on_commit):
+        """The same key holds separate values per agency."""
+        first, second = AgencyCache(uuid.uuid4()), AgencyCache(uuid.uuid4())
+        first.set('carriers', ['a'])
+
+        self.assertEqual(first.get('carriers'), ['a'])
+        self.assertIsNone(second.get('carriers'))
+
+    def test_bump_drops_namespace(self, _on_commit):
+        """A data version bump hides the agency's existing entries."""
+        agency_id = uuid.uuid4()
+        AgencyCache(agency_id).set('carriers', ['a'])
+
+        bump_data_version(agency_id)
+
+        self.assertIsNone(AgencyCache(agency_id).get('carriers'))
+
+
+@patch('apps.core.cache.RESULT_CACHE_TTL', 60)
+@patch('apps.core.cache.transaction.on_commit', side_effect=lambda fn: fn())
+class AgencyCachedTests(SimpleTestCase):
+    """Tests for per-agency result caching."""
+
+    def setUp(self):
+        cache.clear()
+        self.agency_id = uuid.uuid4()
+        self.compute = MagicMock(side_effect=lambda agency_id, limit: {'limit': limit})
+
+        @agency_cached('tests.compute', agency_arg='agency_id')
+        def compute(agency_id, limit=10):
+            return self.compute(agency_id, limit)
+
+        self.cached = compute
+
+    def test_repeat_calls_hit_cache(self, _on_commit):
+        """Identical calls are computed once."""
+        self.assertEqual(self.cached(self.agency_id), {'limit': 10})
+        self.assertEqual(self.cached(self.agency_id, limit=10), {'limit': 10})
+
+        self.compute.assert_called_once()
+
+    def test_arguments_and_agency_are_part_of_key(self, _on_commit):
+        """Different arguments or agencies are cached separately."""
+        self.cached(self.agency_id)
+        self.cached(self.agency_id, limit=5)
+        self.cached(uuid.uuid4())
+
+        self.assertEqual(self.compute.call_count, 3)
+
+    def test_bump_invalidates_only_that_agency(self, _on_commit):
+        """Bumping an agency's version recomputes its results only."""
+        other_agency = uuid.uuid4()
+        self.cached(self.agency_id)
+        self.cached(other_agency)
+
+        bump_data_version(self.agency_id)
+        self.cached(self.agency_id)
+        self.cached(other_agency)
+
+        self.assertEqual(self.compute.call_count, 3)
+
+    def test_global_bump_invalidates_every_agency(self, _on_commit):
+        """Bumping the global version changes every agency's version."""
+        before = get_data_version(self.agency_id)
+        bump_data_version(None)
+
+        self.assertNotEqual(get_data_version(self.agency_id), before)
+
+    def test_agency_read_from_object_attribute(self, _on_commit):
+        """agency_arg may name an object carrying agency_id."""
+        compute = MagicMock(return_value={'ok': True})
+
+        @agency_cached('tests.user', agency_arg='user', ignore_args=('user',))
+        def cached(user):
+            return compute(user)
+
+        agency_id = uuid.uuid4()
+
+        cached(MagicMock(agency_id=agency_id))
+        cached(MagicMock(agency_id=agency_id))
+        bump_data_version(agency_id)
+        cached(MagicMock(agency_id=agency_id))
+
+        self.assertEqual(compute.call_count, 2)
+
+    def test_cache_if_skips_failed_results(self, _on_commit):
+        """Results rejected by cache_if are recomputed next time."""
+        compute = MagicMock(return_value={'success': False})
+
+        @agency_cached('tests.flaky', agency_arg='agency_id', cache_if=lambda r: r['success'])
+        def cached(agency_id):
+            return compute(agency_id)
+
+        cached(self.agency_id)
+        cached(self.agency_id)
+
+        self.assertEqual(compute.call_count, 2)
+
+
+class SharedCacheWarningTests(SimpleTestCase):
+    """CoreConfig.ready() warns when the default cache is per pod outside DEBUG."""
+
+    def _caches(self, backend):
+        return {**settings.CACHES, 'default': {**settings.CACHES['default'], 'BACKEND': backend}}
+
+    def test_per_process_backend_warns(self):
+        backend = 'django.core.cache.backends.locmem.LocMemCache'
+        with override_settings(DEBUG=False, CACHES=self._caches(backend)), \
+                self.assertLogs('apps.core.apps', level='WARNING') as logs:
+            apps.get_app_config('core').ready()
+
+        self.assertIn('not shared between pods', logs.output[0])
+
+    def test_shared_backend_is_quiet(self):
+        backend = 'django.core.cache.backends.db.DatabaseCache'
+        with override_settings(DEBUG=False, CACHES=self._caches(backend)), \
+                self.assertNoLogs('apps.core.apps', level='WARNING'):
+            apps.get_app_config('core').ready()
@@ -0,0 +1,111 @@
+"""
+Event Hub Unit Tests
+
+Tests for subscriptions, dispatch and the SSE wait loop.
+"""
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from apps.core.events import RESYNC_EVENT, EventHub, iter_event_batches, publish
+
+
+class SubscriptionTests(SimpleTestCase):
+    """Tests for EventHub dispatch and subscriptions."""
+
+    def setUp(self):
+        self.hub = EventHub(('sms_events',), enabled=False)
+
+    def test_dispatch_reaches_matching_subscribers(self):
+        """Events go to the channel's subscribers whose predicate matches."""
+        mine = self.hub.subscribe('sms_events', lambda e: e['agent_id'] == 'a')
+        other = self.hub.subscribe('sms_events', lambda e: e['agent_id'] == 'b')
+
+        self.hub.dispatch('sms_events', {'agent_id': 'a'})
+
+        self.assertEqual(mine.get_nowait(), {'agent_id': 'a'})
+        self.assertIsNone(other.get_nowait())
+
+    def test_closed_subscription_receives_nothing(self):
+        """Leaving the context manager unsubscribes."""
+        with self.hub.subscribe('sms_events') as subscription:
+            pass
+
+        self.hub.dispatch('sms_events', {'event': 'message_created'})
+
+        self.assertIsNone(subscription.get_nowait())
+
+    def test_overflow_replaced_by_resync(self):
+        """A subscriber that falls behind gets one resync instead of a backlog."""
+        subscription = self.hub.subscribe('sms_events')
+        subscription._queue.maxsize = 2
+
+        for i in range(3):
+            self.hub.dispatch('sms_events', {'n': i})
+
+        self.assertEqual(subscription.get_nowait(), RESYNC_EVENT)
+        self.assertIsNone(subscription.get_nowait())
+
+    def test_disabled_hub_starts_no_listener(self):
+        """Subscribing to a disabled hub does not connect."""
+        with patch.object(self.hub, '_connect') as mock_connect:
+            subscription = self.hub.subscribe('sms_events')
+
+        mock_connect.assert_not_called()
+        self.assertFalse(subscription.live)
+
+
+class IterEventBatchesTests(SimpleTestCase):
+    """Tests for the SSE wait loop."""
+
+    def setUp(self):
+        self.hub = EventHub(('sms_events',), enabled=False)
+
+    def test_queued_events_coalesced(self):
+        """Events queued together arrive as one batch."""
+        subscription = self.hub.subscribe('sms_events')
+        self.hub._connected.set()
+        self.hub.dispatch('sms_events', {'n': 1})
+        self.hub.dispatch('sms_events', {'n': 2})
+
+        batches = iter_event_batches(subscription, max_duration=1, keepalive_interval=0.01, poll_interval=0.01)
+
+        self.assertEqual(next(batches), [{'n': 1}, {'n': 2}])
+        self.assertIsNone(next(batches))
+
+    def test_not_live_falls_back_to_polling(self):
+        """Without a listener each poll interval yields a resync."""
+        subscription = self.hub.subscribe('sms_events')
+
+        batches = iter_event_batches(subscription, max_duration=1, keepalive_interval=10, poll_interval=0.01)
+
+        self.assertEqual(next(batches), [RESYNC_EVENT])
+
+    def test_stops_after_max_duration(self):
+        """The loop ends once max_duration has elapsed."""
+        subscription = self.hub.subscribe('sms_events')
+
+        batches = list(iter_event_batches(subscription, max_duration=0, keepalive_interval=1, poll_interval=1))
+
+        self.assertEqual(batches, [])
+
+
+class PublishTests(SimpleTestCase):
+    """Tests for publish()."""
+
+    @patch('apps.core.events.connection')
+    def test_oversized_payload_dropped(self, mock_connection):
+        """Payloads over the NOTIFY limit are not sent."""
+        publish('sms_events', {'body': 'x' * 10000})
+
+        mock_connection.cursor.assert_not_called()
+
+    @patch('apps.core.events.connection')
+    def test_publishes_json(self, mock_connection):
+        """Events are sent with pg_notify as JSON."""
+        publish('sms_events', {'event': 'message_created'})
+
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        cursor.execute.assert_called_once_with(
+            'SELECT pg_notify(%s, %s)', ['sms_events', '{"event": "message_created"}']
+        )
@@ -0,0 +1,154 @@
+"""
+Hierarchy Index Unit Tests
+
+Tests for the in-memory agency hierarchy index and closure maintenance.
+"""
+import uuid
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from apps.core.exceptions import ValidationError
+from apps.core.hierarchy import (
+    AgencyHierarchyIndex,
+    get_downline_ids,
+    is_in_downline,
+    update_hierarchy_closure,
+)
+
+
+class AgencyHierarchyIndexTests(SimpleTestCase):
+    """Tests for AgencyHierarchyIndex traversal."""
+
+    def setUp(self):
+        #        root
+        #       /    \
+        #      a      b
+        #     / \
+        #    c   d
+        #    |
+        #    e
+        self.agency_id = uuid.uuid4()
+        self.root, self.a, self.b, self.c, self.d, self.e = (uuid.uuid4() for _ in range(6))
+        self.client_id = uuid.uuid4()
+        rows = [
+            (self.root, None, 'admin'),
+            (self.a, self.root, 'agent'),
+            (self.b, self.root, 'agent'),
+            (self.c, self.a, 'agent'),
+            (self.d, self.a, 'agent'),
+            (self.e, self.c, 'agent'),
+            (self.client_id, None, 'client'),
+        ]
+        self.index = AgencyHierarchyIndex(self.agency_id, rows)
+
+    def test_downline(self):
+        """Downline contains every descendant and nothing else."""
+        self.assertEqual(set(self.index.downline(self.a)), {self.c, self.d, self.e})
+        self.assertEqual(set(self.index.downline(self.root)), {self.a, self.b, self.c, self.d, self.e})
+        self.assertEqual(self.index.downline(self.b), [])
+
+    def test_downline_max_depth(self):
+        """max_depth limits how many levels below the user are returned."""
+        self.assertEqual(set(self.index.downline(self.root, max_depth=1)), {self.a, self.b})
+        self.assertEqual(set(self.index.downline(self.a, max_depth=1)), {self.c, self.d})
+
+    def test_upline_chain(self):
+        """Upline chain is ordered from direct upline to root."""
+        self.assertEqual(self.index.upline_chain(self.e), [self.c, self.a, self.root])
+        self.assertEqual(self.index.upline_chain(self.root), [])
+
+    def test_is_descendant(self):
+        """Descendant checks follow the tree, not siblings or ancestors."""
+        self.assertTrue(self.index.is_descendant(self.root, self.e))
+        self.assertTrue(self.index.is_descendant(self.a, self.e))
+        self.assertFalse(self.index.is_descendant(self.b, self.e))
+        self.assertFalse(self.index.is_descendant(self.e, self.a))
+        self.assertFalse(self.index.is_descendant(self.a, self.a))
+
+    def test_depth(self):
+        """Depth counts uplines above the user."""
+        self.assertEqual(self.index.depth_of(self.root), 0)
+        self.assertEqual(self.index.depth_of(self.e), 3)
+
+    def test_agent_ids_exclude_clients(self):
+        """Clients are excluded from agent listings by default."""
+        self.assertNotIn(self.client_id, self.index.agent_ids())
+        self.assertIn(self.client_id, self.index.agent_ids(exclude_clients=False))
+
+    def test_string_ids_accepted(self):
+        """Lookups accept string IDs as well as UUIDs."""
+        self.assertTrue(self.index.is_descendant(str(self.a), str(self.c)))
+        self.assertIn(str(self.b), self.index)
+
+    def test_cycle_does_not_hang(self):
+        """Users on an upline cycle are still indexed exactly once."""
+        x, y = uuid.uuid4(), uuid.uuid4()
+        index = AgencyHierarchyIndex(self.agency_id, [(x, y, 'agent'), (y, x, 'agent')])
+
+        self.assertEqual(len(index.order), 2)
+        self.assertIn(x, index)
+        self.assertIn(y, index)
+
+
+class HierarchyFunctionTests(SimpleTestCase):
+    """Tests for the module-level helpers backed by the index."""
+
+    @patch('apps.core.hierarchy.connection')
+    def test_downline_ids_served_from_single_query(self, mock_connection):
+        """Repeated lookups reuse the index built from one users query."""
+        agency_id = uuid.uuid4()
+        root, child = uuid.uuid4(), uuid.uuid4()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(root, None, 'admin'), (child, root, 'agent')]
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+
+        with patch('apps.core.hierarchy.INDEX_MAX_AGE', 60):
+            self.assertEqual(get_downline_ids(root, agency_id, include_self=True), [root, child])
+            self.assertTrue(is_in_downline(root, child, agency_id))
+            self.assertFalse(is_in_downline(child, root, agency_id))
+
+        mock_cursor.execute.assert_called_once()
+
+
+class HierarchyClosureTests(SimpleTestCase):
+    """Tests for closure table maintenance."""
+
+    @patch('apps.core.hierarchy.connection')
+    def test_refuses_to_link_under_own_descendant(self, mock_connection):
+        """Moving a user beneath their own downline raises so the caller rolls back."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = (1,)
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+
+        with self.assertRaises(ValidationError):
+            update_hierarchy_closure(uuid.uuid4(), uuid.uuid4())
+
+        statements = [c.args[0] for c in mock_cursor.execute.call_args_list]
+        self.assertEqual(len(statements), 3)
+        self.assertNotIn('CROSS JOIN', statements[-1])
+
+    @patch('apps.core.hierarchy.connection')
+    def test_root_user_skips_ancestor_insert(self, mock_connection):
+        """Users without an upline only keep their self row."""
+        mock_cursor = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+
+        update_hierarchy_closure(uuid.uuid4(), None)
+
+        self.assertEqual(mock_cursor.execute.call_count, 2)
+        mock_cursor.fetchone.assert_not_called()
+
+    @patch('apps.core.hierarchy.connection')
+    def test_links_subtree_under_new_upline(self, mock_connection):
+        """Each subtree row is joined to every ancestor of the new upline."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = None
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        user_id, upline_id = uuid.uuid4(), uuid.uuid4()
+
+        update_hierarchy_closure(user_id, upline_id)
+
+        sql, params = mock_cursor.execute.call_args.args
+        self.assertIn('sup.depth + sub.depth + 1', sql)
+        self.assertEqual(params, {'user_id': str(user_id), 'upline_id': str(upline_id)})
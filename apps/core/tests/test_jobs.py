@@ -0,0 +1,177 @@
+"""
+Background Job Queue Unit Tests
+
+Tests for handler execution, retries and the job status endpoint.
+"""
+from types import SimpleNamespace
+from unittest.mock import patch
+from uuid import uuid4
+
+from django.test import RequestFactory, SimpleTestCase
+from rest_framework.test import force_authenticate
+
+from apps.core import jobs
+from apps.core.jobs import Job, register_job, run_job
+from apps.core.mixins import job_accepted_response
+from apps.core.views import job_status
+
+
+def make_user(agency_id=None, is_admin=False):
+    return SimpleNamespace(
+        id=uuid4(), agency_id=agency_id or uuid4(), is_admin=is_admin,
+        role='admin' if is_admin else 'agent', is_authenticated=True,
+    )
+
+
+def make_job(job_type: str, attempts: int = 1, max_attempts: int = 3) -> Job:
+    return Job(
+        id=uuid4(), job_type=job_type, payload={'x': 1},
+        attempts=attempts, max_attempts=max_attempts, agency_id=None, created_by=None,
+    )
+
+
+class RunJobTests(SimpleTestCase):
+    """Tests for run_job."""
+
+    def setUp(self):
+        patcher = patch.dict(jobs._handlers, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('apps.core.jobs.complete_job')
+    def test_success_records_result(self, mock_complete):
+        """A returning handler completes the job with its result."""
+        register_job('test.ok')(lambda job: {'echo': job.payload['x']})
+        job = make_job('test.ok')
+
+        self.assertTrue(run_job(job))
+        mock_complete.assert_called_once_with(job.id, {'echo': 1})
+
+    @patch('apps.core.jobs.fail_job', return_value=True)
+    @patch('apps.core.jobs.complete_job')
+    def test_exception_fails_attempt(self, mock_complete, mock_fail):
+        """A raising handler records a failed attempt."""
+        def handler(job):
+            raise RuntimeError('boom')
+
+        register_job('test.boom')(handler)
+        job = make_job('test.boom')
+
+        self.assertFalse(run_job(job))
+        mock_fail.assert_called_once_with(job, 'boom')
+        mock_complete.assert_not_called()
+
+    @patch('apps.core.jobs.fail_job')
+    def test_unknown_type_fails_permanently(self, mock_fail):
+        """Jobs without a handler are not retried."""
+        job = make_job('test.missing', attempts=1, max_attempts=3)
+
+        self.assertFalse(run_job(job))
+        failed = mock_fail.call_args[0][0]
+        self.assertEqual(failed.max_attempts, failed.attempts)
+
+    def test_register_job_max_attempts(self):
+        """Handlers default to JOB_QUEUE['MAX_ATTEMPTS'] unless overridden."""
+        register_job('test.default')(lambda job: None)
+        register_job('test.once', max_attempts=1)(lambda job: None)
+
+        self.assertEqual(jobs.get_handler('test.default').max_attempts, jobs.JOB_MAX_ATTEMPTS)
+        self.assertEqual(jobs.get_handler('test.once').max_attempts, 1)
+
+
+@patch('apps.core.jobs.connection')
+class FailJobTests(SimpleTestCase):
+    """Tests for fail_job retry decisions."""
+
+    def _params(self, mock_connection):
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        return cursor.execute.call_args[0][1]
+
+    def test_retries_with_backoff(self, mock_connection):
+        """Attempts left: the job goes back to pending with exponential backoff."""
+        retry = jobs.fail_job(make_job('t', attempts=2, max_attempts=3), 'err')
+
+        self.assertTrue(retry)
+        params = self._params(mock_connection)
+        self.assertTrue(params[0])
+        self.assertEqual(params[2], jobs.JOB_RETRY_BACKOFF * 2)
+
+    def test_last_attempt_fails(self, mock_connection):
+        """No attempts left: the job is failed."""
+        retry = jobs.fail_job(make_job('t', attempts=3, max_attempts=3), 'err')
+
+        self.assertFalse(retry)
+        self.assertFalse(self._params(mock_connection)[0])
+
+    def test_backoff_capped(self, mock_connection):
+        """Backoff never exceeds MAX_BACKOFF."""
+        jobs.fail_job(make_job('t', attempts=20, max_attempts=30), 'err')
+
+        self.assertEqual(self._params(mock_connection)[2], jobs.JOB_MAX_BACKOFF)
+
+
+@patch('apps.core.jobs.connection')
+class EnqueueJobTests(SimpleTestCase):
+    """Tests for enqueue_job deduplication."""
+
+    def _cursor(self, mock_connection, row):
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = row
+        return cursor
+
+    def test_returns_job_id(self, mock_connection):
+        job_id = uuid4()
+        cursor = self._cursor(mock_connection, (job_id,))
+
+        self.assertEqual(jobs.enqueue_job('t', {'a': 1}, dedupe_key='msg-1'), job_id)
+        self.assertIn('msg-1', cursor.execute.call_args[0][1])
+
+    def test_duplicate_returns_none(self, mock_connection):
+        """ON CONFLICT DO NOTHING returns no row for a seen dedupe_key."""
+        self._cursor(mock_connection, None)
+
+        self.assertIsNone(jobs.enqueue_job('t', {}, dedupe_key='msg-1'))
+
+
+class JobStatusTests(SimpleTestCase):
+    """Tests for the 202 response and GET /api/jobs/{id}."""
+
+    def setUp(self):
+        self.job_id = uuid4()
+        self.owner = make_user()
+        self.job = {
+            'job_id': str(self.job_id), 'status': 'running',
+            'created_by': str(self.owner.id), 'agency_id': str(self.owner.agency_id),
+        }
+
+    def _get(self, user):
+        request = RequestFactory().get(f'/api/jobs/{self.job_id}')
+        force_authenticate(request, user=user)
+        with patch('apps.core.views.get_job', return_value=self.job):
+            return job_status(request, job_id=self.job_id)
+
+    def test_accepted_response(self):
+        """Queued operations answer 202 pointing at the status endpoint."""
+        response = job_accepted_response(self.job_id)
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response['Location'], f'/api/jobs/{self.job_id}')
+        self.assertEqual(response.data['job_id'], str(self.job_id))
+
+    def test_creator_sees_job(self):
+        self.assertEqual(self._get(self.owner).status_code, 200)
+
+    def test_agency_admin_sees_job(self):
+        admin = make_user(self.owner.agency_id, is_admin=True)
+
+        self.assertEqual(self._get(admin).status_code, 200)
+
+    def test_other_agent_gets_404(self):
+        other = make_user(self.owner.agency_id)
+
+        self.assertEqual(self._get(other).status_code, 404)
+
+    def test_other_agency_admin_gets_404(self):
+        admin = make_user(is_admin=True)
+
+        self.assertEqual(self._get(admin).status_code, 404)
@@ -0,0 +1,144 @@
+"""
+Keyset Pagination Unit Tests
+
+Tests for cursor encoding, page trimming and cached totals.
+"""
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+from django.test import SimpleTestCase
+
+from apps.core.exceptions import ValidationError
+from apps.core.pagination import (
+    cached_total,
+    cursor_pagination,
+    decode_cursor,
+    encode_cursor,
+    keyset_page,
+    name_sort_key,
+    parse_cursor_params,
+)
+
+
+class CursorTests(SimpleTestCase):
+    """Tests for encode_cursor / decode_cursor."""
+
+    def test_round_trip(self):
+        """Datetimes and UUIDs come back as ISO strings."""
+        at = datetime(2026, 1, 2, 3, 4, 5, 678, tzinfo=UTC)
+        row_id = uuid4()
+
+        values = decode_cursor(encode_cursor((at, row_id, None)), 3)
+
+        self.assertEqual(values, [at.isoformat(), str(row_id), None])
+        self.assertEqual(datetime.fromisoformat(values[0]), at)
+
+    def test_empty_is_first_page(self):
+        self.assertIsNone(decode_cursor('', 2))
+
+    def test_malformed_rejected(self):
+        for cursor in ('not base64!', encode_cursor(('a',)), 'e30'):
+            with self.subTest(cursor=cursor), self.assertRaises(ValidationError):
+                decode_cursor(cursor, 2)
+
+    def test_parse_params(self):
+        self.assertEqual(parse_cursor_params({}), (None, False))
+        self.assertEqual(parse_cursor_params({'cursor': '', 'include_total': 'true'}), ('', True))
+
+
+class KeysetPageTests(SimpleTestCase):
+    """Tests for keyset_page."""
+
+    def test_extra_row_yields_cursor(self):
+        rows = [{'n': i} for i in range(4)]
+
+        page, next_cursor = keyset_page(rows, 3, lambda row: (row['n'],))
+
+        self.assertEqual(page, rows[:3])
+        self.assertEqual(decode_cursor(next_cursor, 1), [2])
+
+    def test_last_page(self):
+        rows = [{'n': i} for i in range(3)]
+
+        page, next_cursor = keyset_page(rows, 3, lambda row: (row['n'],))
+
+        self.assertEqual(page, rows)
+        self.assertIsNone(next_cursor)
+        self.assertFalse(cursor_pagination(3, next_cursor)['hasNextPage'])
+
+
+class NameSortKeyTests(SimpleTestCase):
+    """name_sort_key keeps the plain `last_name, first_name` order (NULLs last)."""
+
+    names = [
+        (None, 'Zed'), ('Smith', None), ('Adams', 'Bo'), ('', 'Amy'),
+        ('Smith', 'Al'), (None, None), ('Adams', None), ('', None),
+    ]
+
+    def test_nulls_sort_last(self):
+        ordered = sorted(self.names, key=lambda n: name_sort_key(*n))
+
+        self.assertEqual(ordered, [
+            ('', 'Amy'), ('', None), ('Adams', 'Bo'), ('Adams', None),
+            ('Smith', 'Al'), ('Smith', None), (None, 'Zed'), (None, None),
+        ])
+
+    def test_keyset_pages_cover_every_row(self):
+        """Paging past each cursor visits every row once, including '' vs NULL names."""
+        rows = sorted(
+            ({'last_name': last, 'first_name': first, 'id': str(i)} for i, (last, first) in enumerate(self.names)),
+            key=lambda r: name_sort_key(r['last_name'], r['first_name']) + (r['id'],),
+        )
+        seen, after = [], None
+        while True:
+            remaining = [
+                r for r in rows
+                if after is None or [*name_sort_key(r['last_name'], r['first_name']), r['id']] > after
+            ]
+            page, next_cursor = keyset_page(
+                remaining[:4], 3, lambda r: name_sort_key(r['last_name'], r['first_name']) + (r['id'],),
+            )
+            seen.extend(page)
+            if next_cursor is None:
+                break
+            after = decode_cursor(next_cursor, 5)
+
+        self.assertEqual(seen, rows)
+
+
+@patch('apps.core.pagination.AgencyCache')
+class CachedTotalTests(SimpleTestCase):
+    """Tests for cached_total."""
+
+    def test_miss_counts_and_stores(self, mock_cache_cls):
+        cache = mock_cache_cls.return_value
+        cache.get.return_value = None
+        count = MagicMock(return_value=42)
+
+        self.assertEqual(cached_total(uuid4(), 'test', {'q': 'x'}, count), 42)
+        count.assert_called_once_with()
+        self.assertEqual(cache.set.call_args[0][1], 42)
+
+    def test_hit_skips_count(self, mock_cache_cls):
+        mock_cache_cls.return_value.get.return_value = 7
+        count = MagicMock()
+
+        self.assertEqual(cached_total(uuid4(), 'test', {}, count), 7)
+        count.assert_not_called()
+
+    def test_params_change_key(self, mock_cache_cls):
+        cache = mock_cache_cls.return_value
+        cache.get.return_value = None
+        agency_id = uuid4()
+
+        cached_total(agency_id, 'test', {'q': 'a'}, lambda: 1)
+        cached_total(agency_id, 'test', {'q': 'b'}, lambda: 1)
+
+        keys = [call[0][0] for call in cache.get.call_args_list]
+        self.assertNotEqual(keys[0], keys[1])
+
+    def test_cache_failure_falls_back(self, mock_cache_cls):
+        mock_cache_cls.side_effect = RuntimeError('redis down')
+
+        self.assertEqual(cached_total(uuid4(), 'test', {}, lambda: 3), 3)
@@ -0,0 +1,50 @@
+"""
+Phone Lookup Unit Tests
+
+Tests for E.164 normalization and the indexed agency lookup.
+"""
+from unittest.mock import patch
+from uuid import uuid4
+
+from django.test import SimpleTestCase
+
+from apps.core.phone import find_agency_by_phone, to_e164
+
+
+class ToE164Tests(SimpleTestCase):
+    """Tests for to_e164."""
+
+    def test_formats_agree(self):
+        """Every way a US number is written maps to one key."""
+        for phone in ('6692456363', '(669) 245-6363', '669-245-6363', '16692456363', '+1 669 245 6363'):
+            with self.subTest(phone=phone):
+                self.assertEqual(to_e164(phone), '+16692456363')
+
+    def test_international_kept(self):
+        self.assertEqual(to_e164('+44 20 7946 0958'), '+442079460958')
+
+    def test_no_digits(self):
+        for phone in (None, '', 'n/a'):
+            with self.subTest(phone=phone):
+                self.assertIsNone(to_e164(phone))
+
+
+@patch('apps.core.phone.connection')
+class FindAgencyByPhoneTests(SimpleTestCase):
+    """Tests for find_agency_by_phone."""
+
+    def test_single_indexed_query(self, mock_connection):
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        agency_id = uuid4()
+        cursor.fetchone.return_value = (agency_id, 'Agency', '669-245-6363')
+
+        agency = find_agency_by_phone('(669) 245-6363')
+
+        self.assertEqual(agency, {'id': str(agency_id), 'name': 'Agency', 'phone_number': '669-245-6363'})
+        self.assertEqual(cursor.execute.call_count, 1)
+        self.assertIn('phone_number_e164 = %s', cursor.execute.call_args[0][0])
+        self.assertEqual(cursor.execute.call_args[0][1], ['+16692456363'])
+
+    def test_no_digits_skips_query(self, mock_connection):
+        self.assertIsNone(find_agency_by_phone('unknown'))
+        mock_connection.cursor.assert_not_called()
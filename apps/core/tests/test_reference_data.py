@@ -0,0 +1,107 @@
+"""
+Reference Data Unit Tests
+
+Tests for the reference-data selector cache and ETag handling.
+"""
+import uuid
+from unittest.mock import MagicMock, patch
+
+from django.test import RequestFactory, SimpleTestCase
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.core.mixins import reference_data_etag
+from apps.core.reference_data import bump_reference_version, reference_cached
+
+load_carriers = MagicMock()
+
+
+class CarriersView(APIView):
+    authentication_classes: list = []
+    permission_classes = [AllowAny]
+
+    @reference_data_etag('tests.carriers')
+    def get(self, request):
+        return Response(load_carriers())
+
+
+@patch('apps.core.reference_data.REFERENCE_CACHE_TTL', 60)
+@patch('apps.core.reference_data.transaction.on_commit', side_effect=lambda fn: fn())
+class ReferenceCachedTests(SimpleTestCase):
+    """Tests for reference_cached selectors."""
+
+    def setUp(self):
+        self.load = MagicMock(return_value=[{'id': 1}])
+
+        @reference_cached('tests.products', agency_arg='agency_id')
+        def get_products(agency_id, carrier_id=None):
+            return self.load(agency_id, carrier_id)
+
+        self.get_products = get_products
+        self.agency_id = uuid.uuid4()
+
+    def test_repeat_calls_hit_cache(self, _on_commit):
+        """The selector runs once per agency and arguments."""
+        self.get_products(self.agency_id)
+        self.get_products(self.agency_id)
+        self.get_products(self.agency_id, carrier_id=uuid.uuid4())
+
+        self.assertEqual(self.load.call_count, 2)
+
+    def test_agency_bump_reloads(self, _on_commit):
+        """Bumping the agency's reference version reloads its data."""
+        self.get_products(self.agency_id)
+        bump_reference_version(self.agency_id)
+        self.get_products(self.agency_id)
+
+        self.assertEqual(self.load.call_count, 2)
+
+    def test_global_bump_reloads_agency_data(self, _on_commit):
+        """Agency-scoped entries also depend on the global version."""
+        self.get_products(self.agency_id)
+        bump_reference_version(None)
+        self.get_products(self.agency_id)
+
+        self.assertEqual(self.load.call_count, 2)
+
+
+@patch('apps.core.reference_data.REFERENCE_CACHE_TTL', 60)
+@patch('apps.core.reference_data.transaction.on_commit', side_effect=lambda fn: fn())
+class ReferenceDataETagTests(SimpleTestCase):
+    """Tests for ETag/If-None-Match on reference-data views."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.view = CarriersView.as_view()
+        load_carriers.reset_mock()
+        load_carriers.return_value = [{'id': 'carrier'}]
+
+    def test_matching_etag_returns_304(self, _on_commit):
+        """A client presenting the current ETag gets 304 without a reload."""
+        first = self.view(self.factory.get('/api/carriers'))
+        etag = first['ETag']
+
+        second = self.view(self.factory.get('/api/carriers', HTTP_IF_NONE_MATCH=etag))
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second['ETag'], etag)
+        load_carriers.assert_called_once()
+
+    def test_bump_changes_etag(self, _on_commit):
+        """After an edit the old ETag no longer matches."""
+        etag = self.view(self.factory.get('/api/carriers'))['ETag']
+
+        bump_reference_version(None)
+        response = self.view(self.factory.get('/api/carriers', HTTP_IF_NONE_MATCH=etag))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_query_string_changes_etag(self, _on_commit):
+        """Different filters are tagged separately."""
+        first = self.view(self.factory.get('/api/carriers'))
+        second = self.view(self.factory.get('/api/carriers', {'carrier_id': 'x'}))
+
+        self.assertNotEqual(first['ETag'], second['ETag'])
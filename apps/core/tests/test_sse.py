@@ -0,0 +1,102 @@
+"""
+SSE Stream Unit Tests
+
+Tests for EventStream served synchronously (WSGI) and asynchronously (ASGI).
+"""
+import asyncio
+import threading
+from unittest.mock import patch
+
+from django.test import RequestFactory, SimpleTestCase
+
+from apps.core.events import RESYNC_EVENT, EventHub
+from apps.core.sse import KEEPALIVE, EventStream, format_event, sse_response
+
+
+class CountingStream(EventStream):
+    """Sends one event per batch and finishes after the second."""
+    channel = 'sms_events'
+    poll_interval = 0.01
+    keepalive_interval = 0.01
+    max_duration = 1
+
+    def __init__(self):
+        self.batches = []
+
+    def open(self):
+        return [format_event('opened', {})]
+
+    def handle(self, batch):
+        self.batches.append(batch)
+        self.finished = len(self.batches) == 2
+        return [format_event('batch', {'size': len(batch)})]
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream.__aiter__()]
+
+
+class EventStreamTests(SimpleTestCase):
+    """Tests for EventStream iteration."""
+
+    def setUp(self):
+        self.hub = EventHub(('sms_events',), enabled=False)
+        patcher = patch('apps.core.sse.hub', self.hub)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_sync_stream_polls_without_listener(self):
+        """Without the hub each poll interval is handled as a resync."""
+        stream = CountingStream()
+
+        chunks = list(stream)
+
+        self.assertEqual(chunks[0], format_event('opened', {}))
+        self.assertEqual(stream.batches, [[RESYNC_EVENT], [RESYNC_EVENT]])
+        self.assertEqual(len(chunks), 3)
+
+    def test_async_stream_matches_sync(self):
+        """The async variant produces the same events."""
+        stream = CountingStream()
+
+        chunks = asyncio.run(_collect(stream))
+
+        self.assertEqual(chunks[0], format_event('opened', {}))
+        self.assertEqual(stream.batches, [[RESYNC_EVENT], [RESYNC_EVENT]])
+
+    def test_async_stream_woken_by_dispatch(self):
+        """Events dispatched from another thread wake the waiting coroutine."""
+        self.hub._connected.set()
+        stream = CountingStream()
+        stream.keepalive_interval = 5
+
+        def publish_later():
+            for n in range(2):
+                threading.Event().wait(0.05)
+                self.hub.dispatch('sms_events', {'n': n})
+
+        threading.Thread(target=publish_later).start()
+        chunks = asyncio.run(_collect(stream))
+
+        self.assertNotIn(KEEPALIVE, chunks)
+        self.assertEqual(stream.batches, [[{'n': 0}], [{'n': 1}]])
+
+    def test_unsubscribes_when_done(self):
+        """Finished streams leave no subscription behind."""
+        list(CountingStream())
+
+        self.assertEqual(self.hub._subscribers['sms_events'], set())
+
+
+class SSEResponseTests(SimpleTestCase):
+    """Tests for sse_response."""
+
+    def test_wsgi_request_gets_sync_stream(self):
+        """Under WSGI the response iterates synchronously."""
+        request = RequestFactory().get('/api/sms/sse/unread-count')
+
+        response = sse_response(request, CountingStream())
+
+        self.assertFalse(response.is_async)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
@@ -6,7 +6,11 @@ Contains health check and other utility endpoints.
 from django.db import connection
 from django.http import JsonResponse
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
+
+from .cache import get_cache_stats
+from .jobs import get_job
+from .permissions import IsAdmin
 
 
 @api_view(['GET'])
@@ -53,3 +57,39 @@ def health_check(request):
         response_data['authenticated'] = False
 
     return JsonResponse(response_data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def cache_stats(request):
+    """
+    Cache hit/miss counters for monitoring.
+
+    Counters are kept per worker process; the response includes the pid so
+    repeated samples can be told apart.
+    """
+    return JsonResponse(get_cache_stats())
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def job_status(request, job_id):
+    """
+    Status of a background job (see apps.core.jobs).
+
+    Visible to the user who queued it and to admins of its agency.
+
+    Returns:
+        - 200: status, progress, result (once completed) or error_message
+        - 404: job not found or not visible to the user
+    """
+    job = get_job(job_id)
+    user = request.user
+    if job and job['created_by'] != str(user.id):
+        is_admin = user.is_admin or user.role == 'admin'
+        if not (is_admin and job['agency_id'] == str(user.agency_id)):
+            job = None
+
+    if not job:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+    return JsonResponse(job)
@@ -0,0 +1,30 @@
+"""
+Dashboard Background Jobs
+
+Handlers for apps.core.jobs; see ReportGenerateView.
+"""
+from uuid import UUID
+
+from apps.core.jobs import Job, register_job
+
+from .services import generate_report, get_user_context_from_auth_id
+
+GENERATE_REPORT_JOB = 'dashboard.generate_report'
+
+
+@register_job(GENERATE_REPORT_JOB)
+def generate_report_job(job: Job) -> dict:
+    """
+    Payload:
+        report_id: Report to generate
+        auth_user_id: Requesting user (report access is checked as them)
+    """
+    user_ctx = get_user_context_from_auth_id(job.payload['auth_user_id'])
+    if not user_ctx:
+        raise ValueError('Requesting user not found')
+
+    result = generate_report(UUID(job.payload['report_id']), user_ctx)
+    if result is None:
+        # generate_report has recorded the failure on the report itself
+        raise RuntimeError('Report not found or generation failed')
+    return result
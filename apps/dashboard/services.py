@@ -19,7 +19,9 @@ from django.db import connection
 from django.utils import timezone
 from psycopg2.extras import Json
 
+from apps.core.cache import agency_cached
 from apps.core.constants import EXPORT
+from apps.deals.billing_schedule import INITIAL_PAYMENTS
 from services.hierarchy_service import HierarchyService
 
 logger = logging.getLogger(__name__)
@@ -57,7 +59,10 @@ def get_user_context_from_auth_id(auth_user_id: UUID) -> UserContext | None:
     """
     Get user context from auth_user_id.
 
-    Uses Django ORM for the lookup.
+    Shares the users-row lookup with JWT authentication so callers that only
+    hold the auth ID don't issue a differently-shaped query for the same row.
+    Views should prefer building the context from request.user, which the
+    auth middleware has already resolved.
 
     Args:
         auth_user_id: The Supabase auth user ID (from JWT sub claim)
@@ -65,33 +70,29 @@ def get_user_context_from_auth_id(auth_user_id: UUID) -> UserContext | None:
     Returns:
         UserContext if found, None otherwise
     """
-    from apps.core.models import User
+    from apps.core.authentication import get_authenticated_user_by_auth_id
 
-    try:
-        user = User.objects.filter(auth_user_id=auth_user_id).first()  # type: ignore[attr-defined]
-
-        if not user:
-            return None
-
-        # Determine if user is admin (checking multiple fields for compatibility)
-        is_admin = (
-            (user.is_admin or False) or
-            user.perm_level == 'admin' or
-            user.role == 'admin'
-        )
-
-        return UserContext(
-            internal_user_id=user.id,
-            auth_user_id=user.auth_user_id,
-            agency_id=user.agency_id,
-            email=user.email or '',
-            is_admin=is_admin,
-        )
-    except Exception as e:
-        logger.error(f'Error getting user context: {e}')
+    user = get_authenticated_user_by_auth_id(auth_user_id)
+    if not user:
         return None
 
+    # Determine if user is admin (checking multiple fields for compatibility)
+    is_admin = (
+        user.is_admin or
+        user.perm_level == 'admin' or
+        user.role == 'admin'
+    )
+
+    return UserContext(
+        internal_user_id=user.id,
+        auth_user_id=user.auth_user_id,
+        agency_id=user.agency_id,
+        email=user.email or '',
+        is_admin=is_admin,
+    )
 
+
+@agency_cached('dashboard.summary', agency_arg='user_ctx')
 def get_dashboard_summary(
     user_ctx: UserContext,
     as_of_date: date | None = None,
@@ -374,6 +375,12 @@ def get_dashboard_summary(
         raise
 
 
+@agency_cached(
+    'dashboard.scoreboard',
+    agency_arg='user_ctx',
+    cache_if=lambda result: result.get('success'),
+    ignore_args=('user_ctx',),
+)
 def get_scoreboard_data(
     user_ctx: UserContext,
     start_date: date,
@@ -585,16 +592,20 @@ def get_scoreboard_lapsed_deals(
     try:
         with connection.cursor() as cursor:
             # Build scope filter - use CTE reference for downline scope
+            downline_ids: list[str] = []
             if scope == 'agency':
                 downline_cte = ""
                 agent_scope_filter = ""
                 deal_scope_filter = ""
             else:  # 'downline'
+                downline_ids = [
+                    str(uid) for uid in HierarchyService.get_downline(
+                        user_ctx.internal_user_id, user_ctx.agency_id, include_self=True
+                    )
+                ]
                 downline_cte = """
                 user_downline AS (
-                    SELECT id FROM users WHERE id = %(internal_id)s::uuid
-                    UNION ALL
-                    SELECT u2.id FROM users u2 JOIN user_downline d ON u2.upline_id = d.id
+                    SELECT unnest(%(downline_ids)s::uuid[]) AS id
                 ),
                 """
                 agent_scope_filter = """
@@ -771,6 +782,7 @@ def get_scoreboard_lapsed_deals(
             params = {
                 'agency_id': agency_id,
                 'internal_id': internal_id,
+                'downline_ids': downline_ids,
                 'start_date': start_date.isoformat(),
                 'end_date': end_date.isoformat(),
                 'submitted': submitted,
@@ -825,6 +837,7 @@ def get_scoreboard_with_billing_cycle(
     - annually: every 12 months
 
     Only payments falling within the date range (and not in the future) are counted.
+    Payment dates are read from public.deal_billing_schedule.
 
     Args:
         user_ctx: User context
@@ -848,23 +861,27 @@ def get_scoreboard_with_billing_cycle(
     try:
         with connection.cursor() as cursor:
             # Build scope filter - use CTE reference for downline scope
+            downline_ids: list[str] = []
             if scope == 'agency':
                 downline_cte = ""
                 agent_scope_filter = ""
                 deal_scope_filter = ""
             else:  # 'downline'
+                downline_ids = [
+                    str(uid) for uid in HierarchyService.get_downline(
+                        user_ctx.internal_user_id, user_ctx.agency_id, include_self=True
+                    )
+                ]
                 downline_cte = """
                 user_downline AS (
-                    SELECT id FROM users WHERE id = %(internal_id)s::uuid
-                    UNION ALL
-                    SELECT u2.id FROM users u2 JOIN user_downline d ON u2.upline_id = d.id
+                    SELECT unnest(%(downline_ids)s::uuid[]) AS id
                 ),
                 """
                 agent_scope_filter = """
                     AND u.id IN (SELECT id FROM user_downline)
                 """
                 deal_scope_filter = """
-                    AND d.agent_id IN (SELECT id FROM user_downline)
+                        AND s.agent_id IN (SELECT id FROM user_downline)
                 """
 
             query = f"""
@@ -881,79 +898,29 @@ def get_scoreboard_with_billing_cycle(
                         {agent_scope_filter}
                 ),
 
-                -- Get deals going back 12 months to capture recurring payments
-                lookback_deals AS (
+                -- Payments in range from the precomputed billing schedule:
+                -- the first 12 periods of deals effective in the past year
+                payment_dates AS (
                     SELECT
-                        d.id AS deal_id,
-                        d.agent_id,
-                        d.carrier_id,
-                        d.status,
-                        d.annual_premium,
-                        COALESCE(LOWER(d.billing_cycle), 'monthly') AS billing_cycle,
-                        COALESCE(d.policy_effective_date, d.submission_date) AS effective_date
-                    FROM deals d
-                    JOIN users u ON u.id = d.agent_id AND u.is_active = true
-                    WHERE d.agency_id = %(agency_id)s
-                        AND COALESCE(d.policy_effective_date, d.submission_date) IS NOT NULL
+                        s.deal_id,
+                        s.agent_id,
+                        s.payment_amount,
+                        s.payment_date
+                    FROM deal_billing_schedule s
+                    JOIN deals d ON d.id = s.deal_id
+                    JOIN users u ON u.id = s.agent_id AND u.is_active = true
+                    LEFT JOIN status_mapping sm
+                        ON sm.carrier_id = d.carrier_id
+                        AND sm.raw_status = d.status
+                    WHERE s.agency_id = %(agency_id)s
+                        AND s.payment_date BETWEEN %(start_date)s::date AND LEAST(%(end_date)s::date, CURRENT_DATE)
+                        AND s.payment_number < %(initial_payments)s
                         AND COALESCE(d.policy_effective_date, d.submission_date) >= (%(start_date)s::date - INTERVAL '1 year')
-                        AND COALESCE(d.policy_effective_date, d.submission_date) <= %(end_date)s::date
-                        AND d.annual_premium IS NOT NULL
                         AND d.annual_premium > 0
+                        AND COALESCE(sm.impact, 'neutral') = 'positive'
                         {deal_scope_filter}
                 ),
 
-                -- Filter to positive impact only
-                positive_deals AS (
-                    SELECT
-                        ld.deal_id,
-                        ld.agent_id,
-                        ld.annual_premium,
-                        ld.billing_cycle,
-                        ld.effective_date
-                    FROM lookback_deals ld
-                    LEFT JOIN status_mapping sm
-                        ON sm.carrier_id = ld.carrier_id
-                        AND sm.raw_status = ld.status
-                    WHERE COALESCE(sm.impact, 'neutral') = 'positive'
-                ),
-
-                -- Calculate payment amount and interval based on billing cycle
-                deals_with_payments AS (
-                    SELECT
-                        pd.deal_id,
-                        pd.agent_id,
-                        pd.annual_premium,
-                        pd.effective_date,
-                        CASE pd.billing_cycle
-                            WHEN 'monthly' THEN pd.annual_premium / 12
-                            WHEN 'quarterly' THEN pd.annual_premium / 4
-                            WHEN 'semi-annually' THEN pd.annual_premium / 2
-                            WHEN 'annually' THEN pd.annual_premium
-                            ELSE pd.annual_premium / 12
-                        END AS payment_amount,
-                        CASE pd.billing_cycle
-                            WHEN 'monthly' THEN 1
-                            WHEN 'quarterly' THEN 3
-                            WHEN 'semi-annually' THEN 6
-                            WHEN 'annually' THEN 12
-                            ELSE 1
-                        END AS months_interval
-                    FROM positive_deals pd
-                ),
-
-                -- Generate payment dates (up to 12 payments per deal)
-                payment_dates AS (
-                    SELECT
-                        dwp.deal_id,
-                        dwp.agent_id,
-                        dwp.payment_amount,
-                        (dwp.effective_date + (gs.n * dwp.months_interval * INTERVAL '1 month'))::date AS payment_date
-                    FROM deals_with_payments dwp
-                    CROSS JOIN generate_series(0, 11) AS gs(n)
-                    WHERE (dwp.effective_date + (gs.n * dwp.months_interval * INTERVAL '1 month'))::date
-                        BETWEEN %(start_date)s::date AND LEAST(%(end_date)s::date, CURRENT_DATE)
-                ),
-
                 -- Aggregate by agent and payment date for daily breakdown
                 agent_daily_breakdown AS (
                     SELECT
@@ -1046,8 +1013,10 @@ def get_scoreboard_with_billing_cycle(
             params = {
                 'agency_id': agency_id,
                 'internal_id': internal_id,
+                'downline_ids': downline_ids,
                 'start_date': start_date.isoformat(),
                 'end_date': end_date.isoformat(),
+                'initial_payments': INITIAL_PAYMENTS,
             }
 
             cursor.execute(query, params)
@@ -1108,24 +1077,29 @@ def get_production_data(
     try:
         with connection.cursor() as cursor:
             cursor.execute("""
-                WITH RECURSIVE
-                agent_tree AS (
-                    SELECT
-                        u.id as root_agent_id,
-                        u.id as descendant_id,
-                        0 as depth
+                WITH
+                agent_roots AS (
+                    SELECT u.id
                     FROM users u
                     WHERE u.id = ANY(%s::uuid[])
                         AND u.agency_id = %s
+                ),
+                agent_tree AS (
+                    SELECT
+                        r.id as root_agent_id,
+                        r.id as descendant_id,
+                        0 as depth
+                    FROM agent_roots r
 
                     UNION ALL
 
                     SELECT
-                        at.root_agent_id,
-                        u.id as descendant_id,
-                        at.depth + 1
-                    FROM agent_tree at
-                    JOIN users u ON u.upline_id = at.descendant_id
+                        c.ancestor_id as root_agent_id,
+                        c.descendant_id,
+                        c.depth
+                    FROM agent_roots r
+                    JOIN user_hierarchy_closure c ON c.ancestor_id = r.id AND c.depth > 0
+                    JOIN users u ON u.id = c.descendant_id
                     WHERE u.agency_id = %s
                 ),
                 individual_production AS (
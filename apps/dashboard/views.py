@@ -20,8 +20,10 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.core.constants import EXPORT_FORMATS
-from apps.core.mixins import AuthenticatedAPIView
+from apps.core.jobs import enqueue_job
+from apps.core.mixins import AuthenticatedAPIView, job_accepted_response
 
+from .jobs import GENERATE_REPORT_JOB
 from .services import (
     ReportInput,
     ScheduledReportInput,
@@ -35,7 +37,6 @@ from .services import (
     export_to_csv,
     export_to_excel,
     export_to_pdf,
-    generate_report,
     get_dashboard_summary,
     get_production_data,
     get_report_by_id,
@@ -427,7 +428,12 @@ class ReportDetailView(AuthenticatedAPIView, APIView):
 
 
 class ReportGenerateView(AuthenticatedAPIView, APIView):
-    """POST /api/dashboard/reports/{id}/generate - Generate a report (P2-033)."""
+    """
+    POST /api/dashboard/reports/{id}/generate - Generate a report (P2-033).
+
+    Queues generation and responds 202 with a job_id; the report and its
+    data are the job result at GET /api/jobs/{job_id}.
+    """
 
     permission_classes = [IsAuthenticated]
 
@@ -436,13 +442,19 @@ class ReportGenerateView(AuthenticatedAPIView, APIView):
         user_ctx = _get_user_ctx(user)
         report_uuid = self.parse_uuid(report_id, "report_id")
 
-        result = generate_report(report_uuid, user_ctx)
-        if not result:
+        if not get_report_by_id(report_uuid, user_ctx):
             return Response(
-                {"error": "Report not found or generation failed"},
+                {"error": "Report not found"},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        return Response(result)
+
+        job_id = enqueue_job(
+            GENERATE_REPORT_JOB,
+            {"report_id": str(report_uuid), "auth_user_id": str(user.auth_user_id)},
+            agency_id=user.agency_id,
+            created_by=user.id,
+        )
+        return job_accepted_response(job_id)
 
 
 class ScheduledReportsListView(AuthenticatedAPIView, APIView):
@@ -0,0 +1,224 @@
+"""
+Deal Billing Schedule
+
+Maintenance of public.deal_billing_schedule, the precomputed billing periods
+read by the billing reminder cron (apps.messaging.selectors) and the
+billing-cycle scoreboard (apps.dashboard.services).
+
+Each deal gets its first INITIAL_PAYMENTS periods (the scoreboard counts
+those) plus every period billing between today and the horizon
+(BILLING_SCHEDULE['HORIZON_DAYS']; reminders look a few days ahead). A
+refresh deletes and regenerates an agency's or a deal's rows with one
+DELETE and one INSERT in a single transaction, so it is idempotent and
+readers never see a half-written schedule. Deal writes refresh the deal;
+bulk imports refresh whole agencies; `manage.py refresh_billing_schedule`
+rebuilds everything by hand.
+
+The daily billing reminder run only rolls the horizon forward
+(roll_billing_schedule_horizon): it prunes periods that have billed and
+inserts each deal's periods after its last scheduled one, leaving the rest
+of the schedule untouched.
+
+Billing dates follow the RPC calculate_next_billing_date port in
+apps.messaging.selectors: with billing_day_of_month ('1st'..'4th') and
+billing_weekday set, the period's month on that weekday; otherwise the
+effective date plus n periods.
+"""
+from collections.abc import Iterable
+from uuid import UUID
+
+from django.conf import settings
+from django.db import connection, transaction
+
+# Payments per deal counted by the billing-cycle scoreboard
+INITIAL_PAYMENTS = 12
+BILLING_SCHEDULE_HORIZON_DAYS = getattr(settings, 'BILLING_SCHEDULE', {}).get('HORIZON_DAYS', 60)
+
+# Deal fields the schedule is derived from
+BILLING_SCHEDULE_FIELDS = frozenset({
+    'policy_effective_date', 'submission_date', 'billing_cycle',
+    'billing_day_of_month', 'billing_weekday', 'annual_premium',
+})
+
+# With roll set, each deal's series starts after its last scheduled period
+_INSERT_SCHEDULE_SQL = """
+    INSERT INTO public.deal_billing_schedule (
+        deal_id, agency_id, agent_id, payment_number, payment_date, billing_date, payment_amount
+    )
+    SELECT
+        d.id,
+        d.agency_id,
+        d.agent_id,
+        gs.n,
+        p.payment_date,
+        b.billing_date,
+        d.annual_premium / (12 / c.months_interval) AS payment_amount
+    FROM public.deals d
+    CROSS JOIN LATERAL (
+        SELECT
+            COALESCE(d.policy_effective_date, d.submission_date) AS anchor,
+            CASE COALESCE(LOWER(d.billing_cycle), 'monthly')
+                WHEN 'quarterly' THEN 3
+                WHEN 'semi-annually' THEN 6
+                WHEN 'annually' THEN 12
+                ELSE 1
+            END AS months_interval,
+            CASE d.billing_day_of_month
+                WHEN '2nd' THEN 2 WHEN '3rd' THEN 3 WHEN '4th' THEN 4 ELSE 1
+            END AS nth,
+            CASE d.billing_weekday
+                WHEN 'Tuesday' THEN 2 WHEN 'Wednesday' THEN 3 WHEN 'Thursday' THEN 4
+                WHEN 'Friday' THEN 5 WHEN 'Saturday' THEN 6 WHEN 'Sunday' THEN 7 ELSE 1
+            END AS weekday
+    ) c
+    CROSS JOIN (SELECT CURRENT_DATE + %(horizon_days)s::int AS horizon_end) h
+    CROSS JOIN LATERAL generate_series(
+        CASE WHEN %(roll)s THEN COALESCE((
+            SELECT MAX(s.payment_number) + 1
+            FROM public.deal_billing_schedule s
+            WHERE s.deal_id = d.id
+        ), 0) ELSE 0 END,
+        GREATEST(
+            %(initial_payments)s - 1,
+            (
+                (EXTRACT(YEAR FROM h.horizon_end) - EXTRACT(YEAR FROM c.anchor)) * 12
+                + EXTRACT(MONTH FROM h.horizon_end) - EXTRACT(MONTH FROM c.anchor)
+            )::int / c.months_interval + 1
+        )
+    ) AS gs(n)
+    CROSS JOIN LATERAL (
+        SELECT date_trunc(
+            'month', d.policy_effective_date + gs.n * c.months_interval * INTERVAL '1 month'
+        )::date AS month_start
+    ) m
+    CROSS JOIN LATERAL (
+        SELECT
+            (c.anchor + gs.n * c.months_interval * INTERVAL '1 month')::date AS payment_date,
+            m.month_start
+                + (c.weekday - EXTRACT(ISODOW FROM m.month_start)::int + 7) %% 7
+                + (c.nth - 1) * 7 AS pattern_date
+    ) p
+    CROSS JOIN LATERAL (
+        SELECT CASE
+            WHEN d.policy_effective_date IS NULL OR d.billing_cycle IS NULL THEN NULL
+            WHEN d.billing_day_of_month IS NULL OR d.billing_weekday IS NULL THEN p.payment_date
+            WHEN p.pattern_date > d.policy_effective_date THEN p.pattern_date
+        END AS billing_date
+    ) b
+    WHERE d.agency_id = %(agency_id)s
+        AND (%(deal_ids)s::uuid[] IS NULL OR d.id = ANY(%(deal_ids)s::uuid[]))
+        AND c.anchor IS NOT NULL
+        AND (
+            gs.n < %(initial_payments)s
+            OR b.billing_date BETWEEN CURRENT_DATE AND h.horizon_end
+        )
+"""
+
+
+@transaction.atomic
+def refresh_billing_schedule(agency_id: UUID | str, deal_ids: Iterable[UUID | str] | None = None) -> int:
+    """
+    Regenerate billing schedule rows for an agency.
+
+    Atomic and serialized per agency with a transaction-scoped advisory lock,
+    so concurrent refreshes cannot interleave their DELETE and INSERT.
+
+    Args:
+        agency_id: The agency to refresh
+        deal_ids: Only refresh these deals (None for every deal)
+
+    Returns:
+        Number of schedule rows written
+    """
+    agency_id = str(agency_id)
+    deal_ids = [str(did) for did in deal_ids] if deal_ids is not None else None
+    if deal_ids == []:
+        return 0
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_advisory_xact_lock(hashtext('deal_billing_schedule:' || %s))",
+            [agency_id]
+        )
+
+        cursor.execute("""
+            DELETE FROM public.deal_billing_schedule
+            WHERE agency_id = %s
+                AND (%s::uuid[] IS NULL OR deal_id = ANY(%s::uuid[]))
+        """, [agency_id, deal_ids, deal_ids])
+
+        cursor.execute(_INSERT_SCHEDULE_SQL, {
+            'agency_id': agency_id,
+            'deal_ids': deal_ids,
+            'initial_payments': INITIAL_PAYMENTS,
+            'horizon_days': BILLING_SCHEDULE_HORIZON_DAYS,
+            'roll': False,
+        })
+        return cursor.rowcount
+
+
+@transaction.atomic
+def roll_billing_schedule_horizon(agency_id: UUID | str) -> int:
+    """
+    Move an agency's billing schedule horizon up to today.
+
+    Deletes periods that billed before today (except the first
+    INITIAL_PAYMENTS, which the scoreboard reads) and inserts the periods
+    after each deal's last scheduled one that fall within the horizon.
+    Deals are otherwise left as their last refresh wrote them.
+
+    Args:
+        agency_id: The agency to roll
+
+    Returns:
+        Number of schedule rows inserted
+    """
+    agency_id = str(agency_id)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_advisory_xact_lock(hashtext('deal_billing_schedule:' || %s))",
+            [agency_id]
+        )
+
+        cursor.execute("""
+            DELETE FROM public.deal_billing_schedule
+            WHERE agency_id = %s
+                AND payment_number >= %s
+                AND billing_date < CURRENT_DATE
+        """, [agency_id, INITIAL_PAYMENTS])
+
+        cursor.execute(_INSERT_SCHEDULE_SQL, {
+            'agency_id': agency_id,
+            'deal_ids': None,
+            'initial_payments': INITIAL_PAYMENTS,
+            'horizon_days': BILLING_SCHEDULE_HORIZON_DAYS,
+            'roll': True,
+        })
+        return cursor.rowcount
+
+
+def _agency_ids() -> list[str]:
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT id FROM public.agencies ORDER BY id')
+        return [str(row[0]) for row in cursor.fetchall()]
+
+
+def refresh_all_billing_schedules() -> dict[str, int]:
+    """
+    Regenerate every agency's billing schedule, one transaction per agency.
+
+    Returns:
+        Dict mapping agency_id to schedule rows written
+    """
+    return {agency_id: refresh_billing_schedule(agency_id) for agency_id in _agency_ids()}
+
+
+def roll_billing_schedule_horizons() -> dict[str, int]:
+    """
+    Roll every agency's billing schedule horizon, one transaction per agency.
+
+    Returns:
+        Dict mapping agency_id to schedule rows inserted
+    """
+    return {agency_id: roll_billing_schedule_horizon(agency_id) for agency_id in _agency_ids()}
@@ -663,7 +663,8 @@ def find_deal_by_client_phone(phone: str, agency_id: str) -> dict | None:
     """
     Find a deal by client phone number within an agency.
 
-    Searches multiple phone format variations to handle different formats.
+    Matches on the indexed E.164 form, so any stored format of the number is
+    found (see apps.core.phone).
 
     Args:
         phone: The client phone number to search for
@@ -672,77 +673,13 @@ def find_deal_by_client_phone(phone: str, agency_id: str) -> dict | None:
     Returns:
         Deal dict with agent info if found, None otherwise
     """
-    import re
+    from apps.core.phone import to_e164
 
-    # Normalize phone number for comparison (remove all non-digits)
-    normalized = re.sub(r'\D', '', phone)
-
-    # Generate phone format variations to search
-    phone_variations = [
-        normalized,                                  # e.g., "6692456363"
-        f'+1{normalized}' if len(normalized) == 10 else f'+{normalized}',  # e.g., "+16692456363"
-        f'1{normalized}' if len(normalized) == 10 else normalized,         # e.g., "16692456363"
-    ]
-
-    # Add formatted versions if we have 10 digits
-    if len(normalized) == 10:
-        phone_variations.extend([
-            f'({normalized[:3]}) {normalized[3:6]}-{normalized[6:]}',  # (669) 245-6363
-            f'{normalized[:3]}-{normalized[3:6]}-{normalized[6:]}',    # 669-245-6363
-        ])
+    e164 = to_e164(phone)
+    if not e164:
+        return None
 
     try:
-        for variation in phone_variations:
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    SELECT
-                        d.id,
-                        d.policy_number,
-                        d.status,
-                        d.status_standardized,
-                        d.client_name,
-                        d.client_phone,
-                        d.client_email,
-                        d.annual_premium,
-                        d.monthly_premium,
-                        d.policy_effective_date,
-                        u.id as agent_id,
-                        u.first_name as agent_first_name,
-                        u.last_name as agent_last_name,
-                        u.phone_number as agent_phone,
-                        u.agency_id as agent_agency_id
-                    FROM public.deals d
-                    JOIN public.users u ON u.id = d.agent_id
-                    WHERE d.client_phone = %s
-                        AND d.agency_id = %s
-                    ORDER BY d.created_at DESC
-                    LIMIT 1
-                """, [variation, agency_id])
-                row = cursor.fetchone()
-
-            if row:
-                return {
-                    'id': str(row[0]),
-                    'policy_number': row[1],
-                    'status': row[2],
-                    'status_standardized': row[3],
-                    'client_name': row[4],
-                    'client_phone': row[5],
-                    'client_email': row[6],
-                    'annual_premium': float(row[7]) if row[7] else None,
-                    'monthly_premium': float(row[8]) if row[8] else None,
-                    'policy_effective_date': row[9].isoformat() if row[9] else None,
-                    'agent': {
-                        'id': str(row[10]),
-                        'first_name': row[11],
-                        'last_name': row[12],
-                        'phone_number': row[13],
-                        'agency_id': str(row[14]) if row[14] else None,
-                        'name': f"{row[11] or ''} {row[12] or ''}".strip(),
-                    }
-                }
-
-        # If no exact match found, try pattern matching with LIKE
         with connection.cursor() as cursor:
             cursor.execute("""
                 SELECT
@@ -763,36 +700,36 @@ def find_deal_by_client_phone(phone: str, agency_id: str) -> dict | None:
                     u.agency_id as agent_agency_id
                 FROM public.deals d
                 JOIN public.users u ON u.id = d.agent_id
-                WHERE REGEXP_REPLACE(d.client_phone, '[^0-9]', '', 'g') = %s
+                WHERE d.client_phone_e164 = %s
                     AND d.agency_id = %s
                 ORDER BY d.created_at DESC
                 LIMIT 1
-            """, [normalized, agency_id])
+            """, [e164, agency_id])
             row = cursor.fetchone()
 
-        if row:
-            return {
-                'id': str(row[0]),
-                'policy_number': row[1],
-                'status': row[2],
-                'status_standardized': row[3],
-                'client_name': row[4],
-                'client_phone': row[5],
-                'client_email': row[6],
-                'annual_premium': float(row[7]) if row[7] else None,
-                'monthly_premium': float(row[8]) if row[8] else None,
-                'policy_effective_date': row[9].isoformat() if row[9] else None,
-                'agent': {
-                    'id': str(row[10]),
-                    'first_name': row[11],
-                    'last_name': row[12],
-                    'phone_number': row[13],
-                    'agency_id': str(row[14]) if row[14] else None,
-                    'name': f"{row[11] or ''} {row[12] or ''}".strip(),
-                }
-            }
+        if not row:
+            return None
 
-        return None
+        return {
+            'id': str(row[0]),
+            'policy_number': row[1],
+            'status': row[2],
+            'status_standardized': row[3],
+            'client_name': row[4],
+            'client_phone': row[5],
+            'client_email': row[6],
+            'annual_premium': float(row[7]) if row[7] else None,
+            'monthly_premium': float(row[8]) if row[8] else None,
+            'policy_effective_date': row[9].isoformat() if row[9] else None,
+            'agent': {
+                'id': str(row[10]),
+                'first_name': row[11],
+                'last_name': row[12],
+                'phone_number': row[13],
+                'agency_id': str(row[14]) if row[14] else None,
+                'name': f"{row[11] or ''} {row[12] or ''}".strip(),
+            }
+        }
 
     except Exception as e:
         logger.error(f'Error finding deal by client phone: {e}')
@@ -13,7 +13,12 @@ from uuid import UUID
 
 from django.db import connection, transaction
 
+from apps.analytics.services import track_deal_rollup
 from apps.core.authentication import AuthenticatedUser
+from apps.core.cache import bump_data_version
+from apps.core.phone import to_e164
+
+from .billing_schedule import BILLING_SCHEDULE_FIELDS, refresh_billing_schedule
 
 logger = logging.getLogger(__name__)
 
@@ -178,16 +183,17 @@ def _check_phone_uniqueness(cursor, phone: str, agency_id: UUID, exclude_deal_id
     Raises:
         PhoneAlreadyExistsError: If phone exists for another deal
     """
-    normalized_phone = normalize_phone_for_storage(phone)
-    if not normalized_phone:
+    e164 = to_e164(phone)
+    if not e164:
         return
 
+    # Indexed E.164 match, so numbers stored in other formats still collide
     query = """
         SELECT id, client_name, policy_number
         FROM public.deals
-        WHERE client_phone = %s AND agency_id = %s
+        WHERE client_phone_e164 = %s AND agency_id = %s
     """
-    params: list[Any] = [normalized_phone, str(agency_id)]
+    params: list[Any] = [e164, str(agency_id)]
 
     if exclude_deal_id:
         query += " AND id != %s"
@@ -362,7 +368,7 @@ def create_deal(
     deal_id = uuid.uuid4()
     normalized_phone = normalize_phone_for_storage(data.client_phone)
 
-    with transaction.atomic(), connection.cursor() as cursor:
+    with transaction.atomic(), connection.cursor() as cursor, track_deal_rollup([deal_id]):
         # Step 1: Check subscription limits for free users
         _check_subscription_limit(cursor, data.agent_id)
 
@@ -429,6 +435,9 @@ def create_deal(
         # Step 7: Capture hierarchy snapshot
         _capture_hierarchy_snapshot(cursor, deal_id, data.agent_id, data.product_id)
 
+        # Step 8: Generate billing schedule
+        refresh_billing_schedule(data.agency_id, [deal_id])
+
     # Fetch and return the complete deal
     result = get_deal_by_id(deal_id, user)
     if result:
@@ -562,7 +571,7 @@ def update_deal(
         # Nothing to update, just return current deal
         return get_deal_by_id(deal_id, user)
 
-    with transaction.atomic(), connection.cursor() as cursor:
+    with transaction.atomic(), connection.cursor() as cursor, track_deal_rollup([deal_id]):
         # Validate phone uniqueness if phone is being updated
         if data.client_phone is not None and normalized_phone:
             _check_phone_uniqueness(cursor, data.client_phone, user.agency_id, exclude_deal_id=deal_id)
@@ -589,6 +598,10 @@ def update_deal(
         if data.beneficiaries is not None:
             _upsert_beneficiaries(cursor, deal_id, user.agency_id, data.beneficiaries)
 
+        # Regenerate billing schedule if billing fields changed
+        if any(getattr(data, name) is not None for name in BILLING_SCHEDULE_FIELDS):
+            refresh_billing_schedule(user.agency_id, [deal_id])
+
         # Update conversation phone if client_phone changed
         if normalized_phone:
             cursor.execute("""
@@ -623,7 +636,7 @@ def update_deal_status(
     if new_status_standardized and new_status_standardized not in valid_standardized:
         raise ValueError(f"Invalid status_standardized. Must be one of: {valid_standardized}")
 
-    with connection.cursor() as cursor:
+    with transaction.atomic(), connection.cursor() as cursor, track_deal_rollup([deal_id]):
         cursor.execute("""
             UPDATE public.deals
             SET
@@ -671,6 +684,8 @@ def update_deal_status_standardized(
         """, [new_status_standardized, str(deal_id), str(user.agency_id)])
 
         row = cursor.fetchone()
+        if row:
+            bump_data_version(user.agency_id)
         return row is not None
 
 
@@ -729,6 +744,7 @@ def resolve_deal_notification(
         if not updated_row:
             return None
 
+        bump_data_version(user.agency_id)
         return {
             'success': True,
             'deal_id': str(deal_id),
@@ -751,7 +767,7 @@ def delete_deal(
     Returns:
         True if deleted, False if not found
     """
-    with connection.cursor() as cursor:
+    with connection.cursor() as cursor, track_deal_rollup([deal_id]):
         # First delete hierarchy snapshots
         cursor.execute("""
             DELETE FROM public.deal_hierarchy_snapshots
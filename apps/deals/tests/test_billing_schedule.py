@@ -0,0 +1,95 @@
+"""
+Deal Billing Schedule Unit Tests
+
+Tests for schedule refreshes and when deal writes trigger them.
+"""
+from contextlib import nullcontext
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import patch
+from uuid import uuid4
+
+from django.test import SimpleTestCase
+
+from apps.deals.billing_schedule import INITIAL_PAYMENTS, refresh_billing_schedule, roll_billing_schedule_horizon
+from apps.deals.services import DealUpdateInput, update_deal
+
+
+@patch('apps.deals.billing_schedule.connection')
+class RefreshBillingScheduleTests(SimpleTestCase):
+    """Tests for refresh_billing_schedule (called through __wrapped__, outside its atomic block)."""
+
+    def test_empty_deal_list_is_noop(self, mock_connection):
+        self.assertEqual(refresh_billing_schedule.__wrapped__(uuid4(), []), 0)
+        mock_connection.cursor.assert_not_called()
+
+    def test_scoped_to_deals(self, mock_connection):
+        """Only the given deals are deleted and regenerated."""
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        cursor.rowcount = 14
+        agency_id, deal_id = uuid4(), uuid4()
+
+        self.assertEqual(refresh_billing_schedule.__wrapped__(agency_id, [deal_id]), 14)
+
+        delete_params = cursor.execute.call_args_list[1][0][1]
+        self.assertEqual(delete_params, [str(agency_id), [str(deal_id)], [str(deal_id)]])
+        insert_params = cursor.execute.call_args_list[2][0][1]
+        self.assertEqual(insert_params['deal_ids'], [str(deal_id)])
+        self.assertEqual(insert_params['initial_payments'], INITIAL_PAYMENTS)
+
+    def test_whole_agency(self, mock_connection):
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+
+        refresh_billing_schedule.__wrapped__(uuid4())
+
+        self.assertIsNone(cursor.execute.call_args_list[2][0][1]['deal_ids'])
+        self.assertFalse(cursor.execute.call_args_list[2][0][1]['roll'])
+
+    def test_roll_prunes_and_appends(self, mock_connection):
+        """The daily roll only deletes billed periods and appends past each deal's last one."""
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        cursor.rowcount = 3
+        agency_id = uuid4()
+
+        self.assertEqual(roll_billing_schedule_horizon.__wrapped__(agency_id), 3)
+
+        delete_sql, delete_params = cursor.execute.call_args_list[1][0]
+        self.assertIn('billing_date < CURRENT_DATE', delete_sql)
+        self.assertEqual(delete_params, [str(agency_id), INITIAL_PAYMENTS])
+        insert_params = cursor.execute.call_args_list[2][0][1]
+        self.assertTrue(insert_params['roll'])
+        self.assertIsNone(insert_params['deal_ids'])
+
+
+@patch('apps.deals.services.get_deal_by_id', return_value={})
+@patch('apps.deals.services.track_deal_rollup', return_value=nullcontext())
+@patch('apps.deals.services.transaction.atomic', return_value=nullcontext())
+@patch('apps.deals.services.connection')
+@patch('apps.deals.services.refresh_billing_schedule')
+class UpdateDealScheduleTests(SimpleTestCase):
+    """Tests for update_deal keeping the schedule in step."""
+
+    def setUp(self):
+        self.user = SimpleNamespace(agency_id=uuid4())
+        self.deal_id = uuid4()
+
+    def test_billing_change_refreshes(self, mock_refresh, mock_connection, *_):
+        mock_connection.cursor.return_value.__enter__.return_value.fetchone.return_value = (self.deal_id,)
+
+        update_deal(self.deal_id, self.user, DealUpdateInput(billing_cycle='quarterly'))
+
+        mock_refresh.assert_called_once_with(self.user.agency_id, [self.deal_id])
+
+    def test_premium_change_refreshes(self, mock_refresh, mock_connection, *_):
+        mock_connection.cursor.return_value.__enter__.return_value.fetchone.return_value = (self.deal_id,)
+
+        update_deal(self.deal_id, self.user, DealUpdateInput(annual_premium=Decimal('1200')))
+
+        mock_refresh.assert_called_once()
+
+    def test_other_change_does_not_refresh(self, mock_refresh, mock_connection, *_):
+        mock_connection.cursor.return_value.__enter__.return_value.fetchone.return_value = (self.deal_id,)
+
+        update_deal(self.deal_id, self.user, DealUpdateInput(notes='called client'))
+
+        mock_refresh.assert_not_called()
@@ -0,0 +1,176 @@
+"""
+Incremental Ingest
+
+Carriers resend their full book on every upload, so most staging rows an
+ingest run sees are unchanged since the last one. Before the pipeline runs,
+detect_staging_changes() finds the rows loaded since the agency's watermark
+(pending rows) and deletes the ones that change nothing:
+
+- a pending row whose content_hash equals the latest already-ingested row
+  for the same carrier and policy number
+- a pending row duplicated by a later pending row
+
+What remains is the set of new or changed rows. With none, the run skips
+the pipeline entirely; with only hashed rows, it skips the full-table
+dedupe procedure, since pending rows were just deduplicated against
+everything and older rows were deduplicated by earlier runs.
+
+The watermark is the loaded_at high-water mark read under the agency's
+staging lock (see apps.ingest.staging), stored in
+policy_report_staging_sync_log (reason 'ingest_watermark') once a run
+succeeds, so a failed run's rows stay pending.
+"""
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from django.db import connection, transaction
+
+from .staging import staging_lock_key
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_LOG_REASON = 'ingest_watermark'
+
+
+@dataclass
+class StagingChanges:
+    """Pending staging rows for an ingest run."""
+    since: datetime | None
+    until: datetime
+    pending_rows: int = 0
+    unchanged_removed: int = 0
+    unhashed_rows: int = 0
+
+    @property
+    def changed_rows(self) -> int:
+        return self.pending_rows - self.unchanged_removed
+
+    def as_dict(self) -> dict:
+        return {
+            'since': self.since.isoformat() if self.since else None,
+            'until': self.until.isoformat(),
+            'pending_rows': self.pending_rows,
+            'unchanged_removed': self.unchanged_removed,
+            'changed_rows': self.changed_rows,
+            'unhashed_rows': self.unhashed_rows,
+        }
+
+
+def get_watermark(agency_id: UUID) -> datetime | None:
+    """loaded_at high-water mark of the agency's last successful ingest run."""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT (details->>'watermark')::timestamptz
+            FROM public.policy_report_staging_sync_log
+            WHERE reason = %s AND details->>'agency_id' = %s
+            ORDER BY id DESC
+            LIMIT 1
+        """, [WATERMARK_LOG_REASON, str(agency_id)])
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def detect_staging_changes(agency_id: UUID) -> StagingChanges:
+    """
+    Remove unchanged pending staging rows and count the rest.
+
+    Waits for in-flight staging loads to commit, so every row loaded at or
+    before the new watermark is visible, and blocks new loads until done.
+
+    Args:
+        agency_id: Agency to check
+
+    Returns:
+        StagingChanges covering rows loaded after the last watermark
+    """
+    agency_id = str(agency_id)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [staging_lock_key(agency_id)])
+        # Read under the lock so a load committing in between is neither
+        # skipped nor counted twice
+        since = get_watermark(agency_id)
+        cursor.execute("SELECT clock_timestamp()")
+        until = cursor.fetchone()[0]
+        params = {'agency_id': agency_id, 'since': since, 'until': until}
+
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM public.policy_report_staging
+            WHERE agency_id = %(agency_id)s
+                AND loaded_at > COALESCE(%(since)s, '-infinity'::timestamptz)
+                AND loaded_at <= %(until)s
+        """, params)
+        pending_rows = cursor.fetchone()[0]
+
+        cursor.execute("""
+            DELETE FROM public.policy_report_staging p
+            WHERE p.agency_id = %(agency_id)s
+                AND p.loaded_at > COALESCE(%(since)s, '-infinity'::timestamptz)
+                AND p.loaded_at <= %(until)s
+                AND p.content_hash IS NOT NULL
+                AND (
+                    EXISTS (
+                        SELECT 1
+                        FROM public.policy_report_staging o
+                        WHERE o.agency_id = p.agency_id
+                            AND o.content_hash = p.content_hash
+                            AND o.loaded_at <= %(until)s
+                            AND (o.loaded_at, o.id) > (p.loaded_at, p.id)
+                    )
+                    OR p.content_hash = (
+                        SELECT l.content_hash
+                        FROM public.policy_report_staging l
+                        WHERE l.agency_id = p.agency_id
+                            AND l.carrier_name = p.carrier_name
+                            AND l.policy_number = p.policy_number
+                            AND l.loaded_at <= COALESCE(%(since)s, '-infinity'::timestamptz)
+                        ORDER BY l.loaded_at DESC
+                        LIMIT 1
+                    )
+                )
+        """, params)
+        unchanged_removed = cursor.rowcount
+
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM public.policy_report_staging
+            WHERE agency_id = %(agency_id)s
+                AND loaded_at > COALESCE(%(since)s, '-infinity'::timestamptz)
+                AND loaded_at <= %(until)s
+                AND content_hash IS NULL
+        """, params)
+        unhashed_rows = cursor.fetchone()[0]
+
+    changes = StagingChanges(
+        since=since,
+        until=until,
+        pending_rows=pending_rows,
+        unchanged_removed=unchanged_removed,
+        unhashed_rows=unhashed_rows,
+    )
+    logger.info(
+        f'Staging changes for agency {agency_id}: {changes.changed_rows} changed, '
+        f'{unchanged_removed} unchanged removed'
+    )
+    return changes
+
+
+def record_watermark(agency_id: UUID, run_id: UUID, changes: StagingChanges) -> None:
+    """Store a successful run's watermark; the next run starts after it."""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO public.policy_report_staging_sync_log (run_id, staging_id, reason, details, created_at)
+            VALUES (%s, NULL, %s, %s::jsonb, NOW())
+        """, [
+            str(run_id),
+            WATERMARK_LOG_REASON,
+            json.dumps({
+                'agency_id': str(agency_id),
+                'watermark': changes.until.isoformat(),
+                **changes.as_dict(),
+            }),
+        ])
@@ -0,0 +1,31 @@
+"""
+Ingest Background Jobs
+
+Handlers for apps.core.jobs; see OrchestrateIngestView.
+"""
+from uuid import UUID
+
+from apps.core.jobs import Job, register_job
+
+from .services import orchestrate_policy_report_ingest
+
+ORCHESTRATE_INGEST_JOB = 'ingest.orchestrate'
+
+
+@register_job(ORCHESTRATE_INGEST_JOB)
+def orchestrate_ingest_job(job: Job) -> dict:
+    """
+    Payload:
+        agency_id: Agency whose staging rows to ingest
+        ingest_job_id: Upload job to record stage metrics on (optional)
+        full: Run every stage even if no staging rows changed (optional)
+    """
+    ingest_job_id = job.payload.get('ingest_job_id')
+    result = orchestrate_policy_report_ingest(
+        UUID(job.payload['agency_id']),
+        ingest_job_id=UUID(ingest_job_id) if ingest_job_id else None,
+        full=bool(job.payload.get('full')),
+    )
+    if not result.get('ok', True):
+        raise RuntimeError(result.get('error') or 'Ingest orchestration failed')
+    return result
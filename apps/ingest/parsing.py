@@ -0,0 +1,246 @@
+"""
+Policy Report Parsing
+
+Reads uploaded carrier policy reports (CSV or XLSX) row by row and maps
+them onto staging records (STAGING_COLUMNS in apps.ingest.staging), so an
+upload can be fed straight into load_staging_records() without reading the
+whole file into memory:
+
+- CSV is decoded incrementally and read with the csv module
+- XLSX is opened with openpyxl in read-only mode, which streams the sheet
+
+Carrier reports name their columns differently. Headers are matched
+case- and punctuation-insensitively against HEADER_ALIASES, and a carrier
+can add or override aliases in POLICY_REPORT_PARSE['CARRIER_COLUMNS'].
+Normalization of the values themselves is left to the ingest pipeline
+(app.orchestrate_normalization), as for records posted as JSON.
+"""
+import codecs
+import csv
+import re
+from collections.abc import Iterator
+from datetime import date, datetime, time
+from typing import IO, Any
+
+from django.conf import settings
+
+from apps.core.exceptions import ValidationError
+
+from .staging import STAGING_COLUMNS
+
+_SETTINGS = getattr(settings, 'POLICY_REPORT_PARSE', {})
+HEADER_SCAN_ROWS = _SETTINGS.get('HEADER_SCAN_ROWS', 20)
+CARRIER_COLUMNS = _SETTINGS.get('CARRIER_COLUMNS', {})
+
+# A header row must map at least this many columns, one of them policy_number
+MIN_HEADER_COLUMNS = 3
+
+CSV_EXTENSIONS = ('.csv',)
+XLSX_EXTENSIONS = ('.xlsx', '.xlsm')
+
+# Normalized header -> staging column, shared by all carriers
+HEADER_ALIASES = {
+    'client name': 'client_name',
+    'insured name': 'client_name',
+    'insured': 'client_name',
+    'owner name': 'client_name',
+    'policy number': 'policy_number',
+    'policy no': 'policy_number',
+    'policy': 'policy_number',
+    'contract number': 'policy_number',
+    'writing agent number': 'writing_agent_number',
+    'writing agent id': 'writing_agent_number',
+    'agent number': 'writing_agent_number',
+    'agent id': 'writing_agent_number',
+    'writing number': 'writing_agent_number',
+    'agent name': 'agent_name',
+    'writing agent name': 'agent_name',
+    'writing agent': 'agent_name',
+    'status': 'status',
+    'policy status': 'status',
+    'effective date': 'policy_effective_date',
+    'policy effective date': 'policy_effective_date',
+    'issue date': 'policy_effective_date',
+    'product': 'product',
+    'product name': 'product',
+    'plan': 'product',
+    'plan name': 'product',
+    'date of birth': 'date_of_birth',
+    'dob': 'date_of_birth',
+    'insured dob': 'date_of_birth',
+    'issue age': 'issue_age',
+    'face value': 'face_value',
+    'face amount': 'face_value',
+    'coverage amount': 'face_value',
+    'payment method': 'payment_method',
+    'payment mode': 'payment_frequency',
+    'payment frequency': 'payment_frequency',
+    'billing mode': 'payment_frequency',
+    'modal premium': 'payment_cycle_premium',
+    'payment cycle premium': 'payment_cycle_premium',
+    'premium': 'payment_cycle_premium',
+    'annual premium': 'annual_premium',
+    'annualized premium': 'annual_premium',
+    'address': 'client_address',
+    'client address': 'client_address',
+    'phone': 'client_phone',
+    'phone number': 'client_phone',
+    'client phone': 'client_phone',
+    'email': 'client_email',
+    'client email': 'client_email',
+    'state': 'state',
+    'zip': 'zipcode',
+    'zip code': 'zipcode',
+    'zipcode': 'zipcode',
+    'postal code': 'zipcode',
+    'gender': 'client_gender',
+    'sex': 'client_gender',
+    'client gender': 'client_gender',
+}
+
+# Set from the agency and carrier of the upload, never from the file
+_FIXED_COLUMNS = {'agency_id', 'carrier_name'}
+
+
+def normalize_header(header: Any) -> str:
+    """Lowercase a header and collapse punctuation/whitespace to single spaces."""
+    if header is None:
+        return ''
+    return re.sub(r'[^a-z0-9]+', ' ', str(header).lower()).strip()
+
+
+def column_aliases(carrier_name: str) -> dict[str, str]:
+    """Header aliases for a carrier: HEADER_ALIASES plus its overrides."""
+    aliases = dict(HEADER_ALIASES)
+    overrides = CARRIER_COLUMNS.get(normalize_header(carrier_name), {})
+    aliases.update({normalize_header(header): column for header, column in overrides.items()})
+    return aliases
+
+
+def map_header_row(row: list, aliases: dict[str, str]) -> dict[int, str] | None:
+    """
+    Map a candidate header row's cell positions to staging columns.
+
+    Returns:
+        {cell index: column}, or None if the row doesn't look like a header
+    """
+    mapping = {}
+    for index, cell in enumerate(row):
+        column = aliases.get(normalize_header(cell))
+        if column in STAGING_COLUMNS and column not in _FIXED_COLUMNS and column not in mapping.values():
+            mapping[index] = column
+    if len(mapping) < MIN_HEADER_COLUMNS or 'policy_number' not in mapping.values():
+        return None
+    return mapping
+
+
+def _cell_value(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date().isoformat() if value.time() == time.min else value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, str):
+        return value.strip() or None
+    return value
+
+
+def iter_csv_rows(file: IO[bytes], encoding: str = 'utf-8-sig') -> Iterator[list]:
+    """Yield CSV rows, decoding the binary upload as it is read."""
+    reader = codecs.getreader(encoding)(file, errors='replace')
+    yield from csv.reader(reader)
+
+
+def iter_xlsx_rows(file: IO[bytes]) -> Iterator[tuple]:
+    """Yield the active sheet's rows as value tuples, streaming the workbook."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def check_report_format(file_name: str) -> str:
+    """
+    Check a policy report can be parsed, by file extension.
+
+    Returns:
+        'csv' or 'xlsx'
+
+    Raises:
+        ValidationError: For any other format
+    """
+    name = (file_name or '').lower()
+    if name.endswith(CSV_EXTENSIONS):
+        return 'csv'
+    if name.endswith(XLSX_EXTENSIONS):
+        return 'xlsx'
+    raise ValidationError(f'Unsupported policy report format: {file_name}. Upload a CSV or XLSX file.')
+
+
+def iter_report_rows(file: IO[bytes], file_name: str) -> Iterator:
+    """Yield raw rows from a CSV or XLSX upload, chosen by file extension."""
+    if check_report_format(file_name) == 'csv':
+        return iter_csv_rows(file)
+    return iter_xlsx_rows(file)
+
+
+def iter_staging_records(rows: Iterator, carrier_name: str) -> Iterator[dict]:
+    """
+    Map raw report rows to staging records.
+
+    The header is the first row (within HEADER_SCAN_ROWS) that maps a policy
+    number and at least MIN_HEADER_COLUMNS columns, so title and blank rows
+    above it are skipped. Rows without a policy number are skipped.
+
+    Raises:
+        ValidationError: If no header row is found
+    """
+    aliases = column_aliases(carrier_name)
+    rows = iter(rows)
+
+    mapping = None
+    for _ in range(HEADER_SCAN_ROWS):
+        row = next(rows, None)
+        if row is None:
+            break
+        mapping = map_header_row(list(row), aliases)
+        if mapping:
+            break
+    if not mapping:
+        raise ValidationError(
+            f'No policy report header found for {carrier_name}: expected a policy number '
+            f'column and at least {MIN_HEADER_COLUMNS} recognized columns'
+        )
+
+    for row in rows:
+        record = {
+            column: _cell_value(row[index])
+            for index, column in mapping.items() if index < len(row)
+        }
+        if not record.get('policy_number'):
+            continue
+        record['carrier_name'] = carrier_name
+        yield record
+
+
+def parse_policy_report(file: IO[bytes], file_name: str, carrier_name: str) -> Iterator[dict]:
+    """
+    Parse an uploaded policy report into staging records, lazily.
+
+    Args:
+        file: The upload, opened in binary mode and positioned at the start
+        file_name: Original file name (its extension picks the parser)
+        carrier_name: Carrier the report belongs to (set on every record)
+
+    Returns:
+        Iterator of staging record dicts
+
+    Raises:
+        ValidationError: For an unsupported format (on the call) or a
+            missing header row (when the iterator is first advanced)
+    """
+    return iter_staging_records(iter_report_rows(file, file_name), carrier_name)
@@ -0,0 +1,271 @@
+"""
+Policy Report Ingest Pipeline
+
+Runs the ingest stages for an agency as a dependency graph instead of one
+long transaction:
+
+    dedupe -> normalize -> users -> numbers -> sync -> rollup
+                                                    -> billing_schedule
+                                                    -> link_clients
+
+Each stage commits in its own transaction, so deals are only locked for the
+duration of the stage writing them, and stages whose dependencies are done
+run concurrently (up to INGEST_PIPELINE['CONCURRENCY']) in worker threads,
+each on its own database connection. Every stage is safe to rerun, so a
+failed run is retried from the start; stages not yet started when one fails
+are skipped.
+
+The stored procedures take only an agency, so work is split by stage rather
+than by carrier.
+
+Incremental runs (apps.ingest.incremental) leave out the dedupe stage when
+pending rows were already deduplicated.
+
+Per-stage timings and row counts are written to policy_report_staging_sync_log
+(one row per stage under the run's run_id) and, when the run belongs to an
+upload, to ingest_job.metrics.
+"""
+import json
+import logging
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_SETTINGS = getattr(settings, 'INGEST_PIPELINE', {})
+PIPELINE_CONCURRENCY = _SETTINGS.get('CONCURRENCY', 3)
+
+STAGE_LOG_REASON = 'ingest_stage'
+
+
+@dataclass
+class IngestStage:
+    """A pipeline stage: run(agency_id) returns its result, rows() counts it."""
+    name: str
+    run: Callable[[UUID], Any]
+    after: tuple[str, ...] = ()
+    rows: Callable[[Any], int | None] = lambda result: None
+
+
+@dataclass
+class StageResult:
+    """Timing and outcome of one stage."""
+    name: str
+    started_at: datetime
+    duration_ms: int
+    rows: int | None = None
+    result: Any = None
+    error: str | None = None
+
+    def as_metrics(self) -> dict:
+        return {
+            'stage': self.name,
+            'started_at': self.started_at.isoformat(),
+            'duration_ms': self.duration_ms,
+            'rows': self.rows,
+            'ok': self.error is None,
+            'error': self.error,
+        }
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of a pipeline run, stages in completion order."""
+    run_id: UUID
+    started_at: datetime
+    duration_ms: int = 0
+    stages: list[StageResult] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed_stage and not self.skipped
+
+    @property
+    def failed_stage(self) -> StageResult | None:
+        return next((stage for stage in self.stages if stage.error), None)
+
+    def stage(self, name: str) -> StageResult | None:
+        return next((stage for stage in self.stages if stage.name == name), None)
+
+    def as_metrics(self) -> dict:
+        return {
+            'run_id': str(self.run_id),
+            'started_at': self.started_at.isoformat(),
+            'duration_ms': self.duration_ms,
+            'ok': self.ok,
+            'stages': [stage.as_metrics() for stage in self.stages],
+            'skipped': self.skipped,
+        }
+
+
+def _fetch_result(sql: str, params: list) -> Any:
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def _normalize(agency_id: UUID) -> Any:
+    return _fetch_result("SELECT app.orchestrate_normalization(%s)", [str(agency_id)])
+
+
+def _sync_deals(agency_id: UUID) -> dict:
+    return _fetch_result("""
+        SELECT public.sync_policy_report_staging_to_deals_with_agency_id(p_agency_id => %s)
+    """, [str(agency_id)]) or {}
+
+
+def _sum_counts(*keys: str) -> Callable[[Any], int | None]:
+    def count(result: Any) -> int | None:
+        if not isinstance(result, dict):
+            return None
+        return sum(result.get(key) or 0 for key in keys)
+    return count
+
+
+def _as_count(result: Any) -> int | None:
+    return result if isinstance(result, int) else None
+
+
+def get_ingest_stages(skip_dedupe: bool = False) -> list[IngestStage]:
+    """
+    The ingest stages, in dependency order.
+
+    Args:
+        skip_dedupe: Leave out the full-table dedupe (incremental runs whose
+            pending rows were already deduplicated)
+    """
+    from apps.analytics.services import refresh_deal_rollup
+    from apps.deals.billing_schedule import refresh_billing_schedule
+
+    from .services import (
+        create_clients_from_deals,
+        create_users_from_staging,
+        create_writing_agent_numbers,
+        dedupe_staging,
+    )
+
+    stages = [
+        IngestStage('dedupe', dedupe_staging, rows=_sum_counts('total')),
+        IngestStage('normalize', _normalize, after=('dedupe',)),
+        IngestStage('users', create_users_from_staging, after=('normalize',), rows=_sum_counts('processed_count')),
+        IngestStage('numbers', create_writing_agent_numbers, after=('users',), rows=_sum_counts('processed_count')),
+        IngestStage('sync', _sync_deals, after=('numbers',)),
+        IngestStage('rollup', refresh_deal_rollup, after=('sync',), rows=_as_count),
+        IngestStage('billing_schedule', refresh_billing_schedule, after=('sync',), rows=_as_count),
+        IngestStage(
+            'link_clients', create_clients_from_deals, after=('sync',),
+            rows=_sum_counts('linked_phone', 'linked_email', 'created_clients'),
+        ),
+    ]
+    if skip_dedupe:
+        stages[1].after = ()
+        return stages[1:]
+    return stages
+
+
+def _run_stage(stage: IngestStage, agency_id: UUID) -> StageResult:
+    started_at = timezone.now()
+    start = time.monotonic()
+    result = StageResult(name=stage.name, started_at=started_at, duration_ms=0)
+    try:
+        with transaction.atomic():
+            result.result = stage.run(agency_id)
+        result.rows = stage.rows(result.result)
+    except Exception as e:
+        logger.error(f'Ingest stage {stage.name} failed for agency {agency_id}: {e}')
+        result.error = str(e)
+    finally:
+        result.duration_ms = int((time.monotonic() - start) * 1000)
+        # Worker threads each hold their own connection
+        connections.close_all()
+    return result
+
+
+def run_ingest_pipeline(
+    agency_id: UUID,
+    stages: list[IngestStage] | None = None,
+    concurrency: int | None = None,
+) -> PipelineResult:
+    """
+    Run the ingest stages for an agency, concurrently where they allow.
+
+    A stage starts as soon as the stages it runs after have succeeded. Once
+    one fails no further stages start; those already running finish.
+
+    Args:
+        agency_id: Agency whose staging rows to ingest
+        stages: Stages to run (default get_ingest_stages())
+        concurrency: Maximum stages running at once (default
+            INGEST_PIPELINE['CONCURRENCY'])
+
+    Returns:
+        PipelineResult with per-stage timings, row counts and results
+    """
+    stages = stages if stages is not None else get_ingest_stages()
+    run = PipelineResult(run_id=uuid.uuid4(), started_at=timezone.now())
+    start = time.monotonic()
+
+    pending = list(stages)
+    succeeded: set[str] = set()
+    with ThreadPoolExecutor(
+        max_workers=concurrency or PIPELINE_CONCURRENCY, thread_name_prefix='ingest-stage',
+    ) as pool:
+        running = {}
+        while pending or running:
+            for stage in [s for s in pending if succeeded.issuperset(s.after)]:
+                pending.remove(stage)
+                running[pool.submit(_run_stage, stage, agency_id)] = stage
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                del running[future]
+                result = future.result()
+                run.stages.append(result)
+                if result.error:
+                    pending.clear()
+                else:
+                    succeeded.add(result.name)
+
+    run.skipped = [stage.name for stage in stages if stage.name not in {s.name for s in run.stages}]
+    run.duration_ms = int((time.monotonic() - start) * 1000)
+    return run
+
+
+def record_pipeline_metrics(agency_id: UUID, run: PipelineResult, ingest_job_id: UUID | None = None) -> None:
+    """
+    Write a run's stage metrics to the sync log and, if given, its ingest job.
+
+    Failures are logged, not raised: metrics never fail an ingest.
+    """
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany("""
+                INSERT INTO public.policy_report_staging_sync_log (run_id, staging_id, reason, details, created_at)
+                VALUES (%s, NULL, %s, %s::jsonb, NOW())
+            """, [
+                [str(run.run_id), STAGE_LOG_REASON, json.dumps({'agency_id': str(agency_id), **stage.as_metrics()})]
+                for stage in run.stages
+            ])
+
+            if ingest_job_id:
+                cursor.execute("""
+                    UPDATE public.ingest_job
+                    SET metrics = %s::jsonb, updated_at = NOW()
+                    WHERE job_id = %s AND agency_id = %s
+                """, [json.dumps(run.as_metrics()), str(ingest_job_id), str(agency_id)])
+    except Exception as e:
+        logger.warning(f'Recording ingest metrics for run {run.run_id} failed: {e}')
@@ -7,11 +7,20 @@ Policy report processing functions translated from Supabase RPC functions:
 - sync_policy_report_staging_to_deals_with_agency_id
 """
 import logging
-from datetime import datetime
+from collections.abc import Iterable
+from datetime import timedelta
+from typing import BinaryIO
 from uuid import UUID
 
 from django.db import connection, transaction
 
+from apps.analytics.services import refresh_deal_rollup
+from apps.core.cache import bump_data_version
+from apps.core.hierarchy import invalidate_hierarchy_index, rebuild_hierarchy_closure
+from apps.deals.billing_schedule import refresh_billing_schedule
+
+from .staging import load_staging_records
+
 logger = logging.getLogger(__name__)
 
 
@@ -65,8 +74,11 @@ def enqueue_policy_report_parse_job(
         raise
 
 
-@transaction.atomic
-def orchestrate_policy_report_ingest(agency_id: UUID) -> dict:
+def orchestrate_policy_report_ingest(
+    agency_id: UUID,
+    ingest_job_id: UUID | None = None,
+    full: bool = False,
+) -> dict:
     """
     Orchestrate the full policy report ingest process.
     Translated from Supabase RPC: orchestrate_policy_report_ingest_with_agency_id
@@ -77,86 +89,76 @@ def orchestrate_policy_report_ingest(agency_id: UUID) -> dict:
     3. Creates users from staging
     4. Creates writing agent numbers
     5. Syncs staging to deals
-    6. Links/creates clients
+    6. Refreshes rollups and billing schedules, and links/creates clients
+
+    Stages run as a pipeline (see apps.ingest.pipeline), each in its own
+    transaction and concurrently where independent; their timings and row
+    counts are recorded in the sync log and on the ingest job.
+
+    Runs are incremental (see apps.ingest.incremental): staging rows loaded
+    since the last successful run that change nothing are removed first,
+    and if none changed the pipeline is skipped.
 
     Args:
         agency_id: Agency ID to process
+        ingest_job_id: Upload job the run belongs to, if any
+        full: Run every stage even if nothing changed
 
     Returns:
         Result dictionary with timing and status
     """
-    start_time = datetime.now()
-    durations = {}
-
-    try:
-        with connection.cursor() as cursor:
-            # 0) Dedupe staging rows for this agency
-            t0 = datetime.now()
-            cursor.execute("""
-                SELECT public.dedupe_policy_report_staging_with_agency_id(
-                    p_agency_id => %s,
-                    p_dry_run => false
-                )
-            """, [str(agency_id)])
-            durations['dedupe'] = str(datetime.now() - t0)
-
-            # 0.5) Normalize staging data
-            t1 = datetime.now()
-            cursor.execute("""
-                SELECT app.orchestrate_normalization(%s)
-            """, [str(agency_id)])
-            durations['normalize'] = str(datetime.now() - t1)
-
-            # 2) Users (agents)
-            t2 = datetime.now()
-            cursor.execute("""
-                SELECT public.create_users_from_policy_report_staging_with_agency_id(%s)
-            """, [str(agency_id)])
-            durations['users'] = str(datetime.now() - t2)
-
-            # 3) Writing agent numbers
-            t3 = datetime.now()
-            cursor.execute("""
-                SELECT public.create_writing_agent_numbers_from_policy_report_staging_with_agency_id(%s)
-            """, [str(agency_id)])
-            durations['numbers'] = str(datetime.now() - t3)
-
-            # 4) Deals sync
-            t4 = datetime.now()
-            cursor.execute("""
-                SELECT public.sync_policy_report_staging_to_deals_with_agency_id(p_agency_id => %s)
-            """, [str(agency_id)])
-            sync_result = cursor.fetchone()
-            sync_result = sync_result[0] if sync_result else {}
-            durations['sync'] = str(datetime.now() - t4)
+    import time
+    import uuid
 
-            # 5) Link/Create clients
-            t5 = datetime.now()
-            cursor.execute("""
-                SELECT public.create_clients_from_deals_with_agency_id(p_agency_id => %s)
-            """, [str(agency_id)])
-            link_result = cursor.fetchone()
-            link_result = link_result[0] if link_result else {}
-            durations['link_clients'] = str(datetime.now() - t5)
+    from .incremental import detect_staging_changes, record_watermark
+    from .pipeline import get_ingest_stages, record_pipeline_metrics, run_ingest_pipeline
 
-        durations['total'] = str(datetime.now() - start_time)
+    start = time.monotonic()
+    changes = detect_staging_changes(agency_id)
+    changes_duration = timedelta(seconds=time.monotonic() - start)
 
+    if not changes.changed_rows and not full:
+        run_id = uuid.uuid4()
+        record_watermark(agency_id, run_id, changes)
+        logger.info(f'Policy report ingest for agency {agency_id} skipped: no staging changes')
         return {
             'ok': True,
-            'started_at': start_time.isoformat(),
-            'durations': durations,
-            'sync_result': sync_result,
-            'link_result': link_result,
+            'run_id': str(run_id),
+            'skipped': True,
+            'changes': changes.as_dict(),
+            'durations': {'changes': str(changes_duration), 'total': str(changes_duration)},
+            'stages': [],
         }
 
-    except Exception as e:
-        logger.error(f'Orchestrate policy report ingest failed: {e}')
-        return {
-            'ok': False,
-            'error': str(e),
-            'started_at': start_time.isoformat(),
-            'durations': durations,
-        }
+    run = run_ingest_pipeline(agency_id, get_ingest_stages(skip_dedupe=not full and not changes.unhashed_rows))
+    record_pipeline_metrics(agency_id, run, ingest_job_id)
+
+    durations = {'changes': str(changes_duration)}
+    durations.update({stage.name: str(timedelta(milliseconds=stage.duration_ms)) for stage in run.stages})
+    durations['total'] = str(changes_duration + timedelta(milliseconds=run.duration_ms))
+    response = {
+        'ok': run.ok,
+        'run_id': str(run.run_id),
+        'started_at': run.started_at.isoformat(),
+        'changes': changes.as_dict(),
+        'durations': durations,
+        'stages': [stage.as_metrics() for stage in run.stages],
+    }
+
+    failed = run.failed_stage
+    if failed:
+        logger.error(f'Orchestrate policy report ingest failed at {failed.name}: {failed.error}')
+        return {**response, 'error': failed.error, 'failed_stage': failed.name, 'skipped': run.skipped}
+
+    record_watermark(agency_id, run.run_id, changes)
+
+    sync = run.stage('sync')
+    link = run.stage('link_clients')
+    return {
+        **response,
+        'sync_result': sync.result if sync else {},
+        'link_result': link.result if link else {},
+    }
 
 
 def sync_policy_report_staging_to_deals(agency_id: UUID) -> dict:
@@ -177,7 +179,10 @@ def sync_policy_report_staging_to_deals(agency_id: UUID) -> dict:
             """, [str(agency_id)])
 
             result = cursor.fetchone()
-            return result[0] if result else {'ok': False}
+
+        refresh_deal_rollup(agency_id)
+        refresh_billing_schedule(agency_id)
+        return result[0] if result else {'ok': False}
 
     except Exception as e:
         logger.error(f'Sync staging to deals failed: {e}')
@@ -321,6 +326,10 @@ def create_users_from_staging(agency_id: UUID) -> dict:
                 SELECT * FROM public.create_users_from_policy_report_staging_with_agency_id(%s)
             """, [str(agency_id)])
             row = cursor.fetchone()
+            if row and row[1]:
+                rebuild_hierarchy_closure(agency_id)
+                invalidate_hierarchy_index(agency_id)
+                bump_data_version(agency_id)
             if row:
                 return {
                     'processed_count': row[0],
@@ -408,9 +417,10 @@ def dedupe_staging(agency_id: UUID, dry_run: bool = False) -> dict:
     Translated from Supabase RPC: dedupe_policy_report_staging_with_agency_id
 
     This function:
-    1. Fingerprints each row (excluding id)
+    1. Fingerprints each row, excluding id and the load bookkeeping columns
+       (loaded_at is distinct per row, content_hash derives from the data)
     2. Identifies duplicate fingerprints
-    3. Deletes duplicate rows (keeping one per fingerprint)
+    3. Deletes duplicate rows (keeping the earliest loaded per fingerprint)
 
     Args:
         agency_id: Agency ID to process
@@ -422,19 +432,38 @@ def dedupe_staging(agency_id: UUID, dry_run: bool = False) -> dict:
     try:
         with connection.cursor() as cursor:
             cursor.execute("""
-                SELECT public.dedupe_policy_report_staging_with_agency_id(
-                    p_agency_id => %s,
-                    p_dry_run => %s
+                WITH fingerprinted AS (
+                    SELECT
+                        p.id,
+                        row_number() OVER (
+                            PARTITION BY md5((to_jsonb(p) - 'id' - 'loaded_at' - 'content_hash')::text)
+                            ORDER BY p.loaded_at, p.id
+                        ) AS rn
+                    FROM public.policy_report_staging p
+                    WHERE p.agency_id = %(agency_id)s
+                ),
+                deleted AS (
+                    DELETE FROM public.policy_report_staging s
+                    USING fingerprinted f
+                    WHERE s.id = f.id
+                        AND f.rn > 1
+                        AND NOT %(dry_run)s
+                    RETURNING 1
                 )
-            """, [str(agency_id), dry_run])
-            result = cursor.fetchone()
-            return result[0] if result else {
-                'scope': str(agency_id),
-                'total': 0,
-                'distinct': 0,
-                'dupe_rows': 0,
-                'deleted': 0,
-            }
+                SELECT
+                    (SELECT COUNT(*) FROM fingerprinted),
+                    (SELECT COUNT(*) FROM fingerprinted WHERE rn = 1),
+                    (SELECT COUNT(*) FROM deleted)
+            """, {'agency_id': str(agency_id), 'dry_run': dry_run})
+            total, distinct, deleted = cursor.fetchone()
+
+        return {
+            'scope': str(agency_id),
+            'total': total,
+            'distinct': distinct,
+            'dupe_rows': total - distinct,
+            'deleted': deleted,
+        }
 
     except Exception as e:
         logger.error(f'Dedupe staging failed: {e}')
@@ -692,7 +721,7 @@ def get_ingest_job(job_id: UUID, agency_id: UUID) -> dict | None:
         with connection.cursor() as cursor:
             cursor.execute("""
                 SELECT job_id, agency_id, expected_files, parsed_files, status,
-                       client_job_id, created_at, updated_at
+                       client_job_id, created_at, updated_at, metrics
                 FROM public.ingest_job
                 WHERE job_id = %s AND agency_id = %s
             """, [str(job_id), str(agency_id)])
@@ -710,6 +739,7 @@ def get_ingest_job(job_id: UUID, agency_id: UUID) -> dict | None:
             'client_job_id': row[5],
             'created_at': row[6].isoformat() if row[6] else None,
             'updated_at': row[7].isoformat() if row[7] else None,
+            'metrics': row[8],
         }
 
     except Exception as e:
@@ -818,59 +848,64 @@ def list_ingest_job_files(job_ids: list[UUID]) -> list[dict]:
 @transaction.atomic
 def bulk_insert_staging_records(
     agency_id: UUID,
-    records: list[dict],
+    records: Iterable[dict],
 ) -> dict:
     """
     Bulk insert policy report staging records.
 
+    Copies the records in chunks with COPY (see apps.ingest.staging); a
+    failed chunk is reported without losing the others.
+
     Args:
-        agency_id: Agency ID (for validation/logging)
-        records: List of staging record dictionaries
+        agency_id: Agency ID (set on every record)
+        records: Staging record dictionaries (any iterable, consumed lazily)
 
     Returns:
-        Dictionary with success status and inserted count
+        Dictionary with success status, inserted/failed counts and chunk errors
     """
-    if not records:
-        return {'success': True, 'inserted_count': 0}
+    result = load_staging_records(agency_id, records)
+
+    response = {
+        'success': result.success,
+        'inserted_count': result.inserted_count,
+        'failed_count': result.failed_count,
+        'chunk_count': len(result.chunks),
+    }
+    if not result.success:
+        response['error'] = result.errors[0]['error']
+        response['errors'] = result.errors
+    return response
 
-    try:
-        # Define the columns we support
-        columns = [
-            'client_name', 'policy_number', 'writing_agent_number', 'agent_name',
-            'status', 'policy_effective_date', 'product', 'date_of_birth',
-            'issue_age', 'face_value', 'payment_method', 'payment_frequency',
-            'payment_cycle_premium', 'client_address', 'client_phone', 'client_email',
-            'state', 'zipcode', 'annual_premium', 'client_gender',
-            'agency_id', 'carrier_name',
-        ]
 
-        # Build INSERT statement with placeholders
-        placeholders = ', '.join(['%s'] * len(columns))
-        columns_sql = ', '.join(columns)
+def stage_policy_report_file(
+    agency_id: UUID,
+    carrier_name: str,
+    file: BinaryIO,
+    file_name: str,
+) -> dict:
+    """
+    Parse an uploaded policy report and load its rows into staging.
 
-        insert_sql = f"""
-            INSERT INTO public.policy_report_staging ({columns_sql})
-            VALUES ({placeholders})
-        """
+    The file is parsed row by row (see apps.ingest.parsing) and streamed
+    into bulk_insert_staging_records, so it is never held in memory whole.
 
-        # Build values list
-        values_list = []
-        for record in records:
-            # Ensure agency_id is set correctly
-            record['agency_id'] = str(agency_id)
-            values = [record.get(col) for col in columns]
-            values_list.append(values)
+    Args:
+        agency_id: Agency ID
+        carrier_name: Carrier the report belongs to
+        file: The upload, opened in binary mode
+        file_name: Original file name (.csv or .xlsx)
 
-        with connection.cursor() as cursor:
-            cursor.executemany(insert_sql, values_list)
-            inserted_count = cursor.rowcount
+    Returns:
+        bulk_insert_staging_records result
 
-        logger.info(f'Bulk inserted {inserted_count} staging records for agency {agency_id}')
-        return {'success': True, 'inserted_count': inserted_count}
+    Raises:
+        ValidationError: If the file is not a recognizable policy report
+    """
+    from .parsing import parse_policy_report
 
-    except Exception as e:
-        logger.error(f'Bulk insert staging records failed: {e}')
-        return {'success': False, 'error': str(e)}
+    file.seek(0)
+    records = parse_policy_report(file, file_name, carrier_name)
+    return bulk_insert_staging_records(agency_id, records)
 
 
 @transaction.atomic
@@ -0,0 +1,175 @@
+"""
+Staging Loader
+
+Writes policy report rows into public.policy_report_staging with COPY FROM
+STDIN instead of one INSERT per row. Records are consumed from any iterable
+(a request body or an upload parser can yield them) and written as CSV into
+a spooled buffer, held in memory up to STAGING_LOAD['SPOOL_BYTES'] and on
+disk beyond, one chunk of STAGING_LOAD['CHUNK_SIZE'] rows at a time, so
+memory stays bounded however large the report.
+
+Each chunk is copied in its own atomic block (a savepoint inside an outer
+transaction): a chunk the table rejects is rolled back and reported with its
+row range while the other chunks load.
+
+Every row gets a content_hash of its data columns, which incremental ingest
+(apps.ingest.incremental) compares to find rows that changed. Loads hold a
+shared per-agency advisory lock until they commit, so incremental ingest can
+wait them out before taking its watermark.
+"""
+import csv
+import hashlib
+import json
+import logging
+import tempfile
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any
+from uuid import UUID
+
+from django.conf import settings
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+_SETTINGS = getattr(settings, 'STAGING_LOAD', {})
+STAGING_CHUNK_SIZE = _SETTINGS.get('CHUNK_SIZE', 5000)
+STAGING_SPOOL_BYTES = _SETTINGS.get('SPOOL_BYTES', 8 * 1024 * 1024)
+
+# Columns a staging record may set; anything else in a record is ignored
+STAGING_COLUMNS = [
+    'client_name', 'policy_number', 'writing_agent_number', 'agent_name',
+    'status', 'policy_effective_date', 'product', 'date_of_birth',
+    'issue_age', 'face_value', 'payment_method', 'payment_frequency',
+    'payment_cycle_premium', 'client_address', 'client_phone', 'client_email',
+    'state', 'zipcode', 'annual_premium', 'client_gender',
+    'agency_id', 'carrier_name',
+]
+
+# Columns hashed into content_hash: everything but the agency
+HASHED_COLUMNS = [col for col in STAGING_COLUMNS if col != 'agency_id']
+COPY_COLUMNS = [*STAGING_COLUMNS, 'content_hash']
+
+
+@dataclass
+class StagingChunk:
+    """Outcome of copying one chunk."""
+    index: int
+    first_row: int
+    row_count: int
+    inserted: int = 0
+    error: str | None = None
+
+
+@dataclass
+class StagingLoadResult:
+    """Outcome of a staging load."""
+    inserted_count: int = 0
+    failed_count: int = 0
+    chunks: list[StagingChunk] = field(default_factory=list)
+
+    @property
+    def success(self) -> bool:
+        return self.failed_count == 0
+
+    @property
+    def errors(self) -> list[dict]:
+        return [
+            {
+                'chunk': chunk.index,
+                'rows': f'{chunk.first_row}-{chunk.first_row + chunk.row_count - 1}',
+                'error': chunk.error,
+            }
+            for chunk in self.chunks if chunk.error
+        ]
+
+
+def _copy_value(value: Any) -> Any:
+    # Strings are quoted and None left unquoted (QUOTE_STRINGS), which COPY
+    # reads as '' and NULL respectively
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def staging_lock_key(agency_id: UUID | str) -> str:
+    """Advisory lock key serializing staging loads against incremental ingest."""
+    return f'policy_report_staging:{agency_id}'
+
+
+def _hash_values(values: list) -> str:
+    return hashlib.sha256(json.dumps(values, default=str).encode()).hexdigest()
+
+
+def content_hash(record: dict) -> str:
+    """Hash a staging record's data columns (values as loaded)."""
+    return _hash_values([_copy_value(record.get(col)) for col in HASHED_COLUMNS])
+
+
+def _rows(agency_id: str, records: Iterable[dict]) -> Iterator[list]:
+    agency_index = STAGING_COLUMNS.index('agency_id')
+    for record in records:
+        row = [_copy_value(record.get(col)) for col in STAGING_COLUMNS]
+        row.append(_hash_values(row[:agency_index] + row[agency_index + 1:]))
+        row[agency_index] = agency_id
+        yield row
+
+
+def _copy_chunk(agency_id: str, rows: list[list]) -> int:
+    copy_sql = (
+        f"COPY public.policy_report_staging ({', '.join(COPY_COLUMNS)}) "
+        "FROM STDIN WITH (FORMAT csv)"
+    )
+    with tempfile.SpooledTemporaryFile(
+        max_size=STAGING_SPOOL_BYTES, mode='w+', newline='', encoding='utf-8',
+    ) as buffer:
+        csv.writer(buffer, quoting=csv.QUOTE_STRINGS).writerows(rows)
+        buffer.seek(0)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock_shared(hashtext(%s))", [staging_lock_key(agency_id)]
+            )
+            cursor.copy_expert(copy_sql, buffer)
+            return cursor.rowcount
+
+
+def load_staging_records(
+    agency_id: UUID,
+    records: Iterable[dict],
+    chunk_size: int | None = None,
+) -> StagingLoadResult:
+    """
+    Copy policy report records into policy_report_staging.
+
+    Args:
+        agency_id: Agency the rows belong to (overrides any record value)
+        records: Staging record dicts keyed by STAGING_COLUMNS; consumed
+            lazily, so a generator is loaded in bounded memory
+        chunk_size: Rows per COPY (default STAGING_LOAD['CHUNK_SIZE'])
+
+    Returns:
+        StagingLoadResult with totals and per-chunk outcomes
+    """
+    chunk_size = chunk_size or STAGING_CHUNK_SIZE
+    result = StagingLoadResult()
+    rows = _rows(str(agency_id), records)
+
+    first_row = 1
+    while chunk_rows := list(islice(rows, chunk_size)):
+        chunk = StagingChunk(index=len(result.chunks), first_row=first_row, row_count=len(chunk_rows))
+        try:
+            chunk.inserted = _copy_chunk(str(agency_id), chunk_rows)
+            result.inserted_count += chunk.inserted
+        except Exception as e:
+            chunk.error = str(e)
+            result.failed_count += chunk.row_count
+            logger.error(f'Staging chunk {chunk.index} (rows {first_row}+) failed for agency {agency_id}: {e}')
+        result.chunks.append(chunk)
+        first_row += chunk.row_count
+
+    logger.info(
+        f'Loaded {result.inserted_count} staging records for agency {agency_id} '
+        f'in {len(result.chunks)} chunks ({result.failed_count} failed)'
+    )
+    return result
@@ -11,7 +11,7 @@ import os
 import re
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import BinaryIO, Optional
 from uuid import UUID
 
 import httpx
@@ -122,9 +122,10 @@ def generate_storage_path(agency_id: UUID, carrier_name: str, file_name: str) ->
 def upload_file(
     agency_id: UUID,
     carrier_name: str,
-    file_content: bytes,
+    file_content: bytes | BinaryIO,
     file_name: str,
     content_type: str,
+    size: int | None = None,
 ) -> UploadResult:
     """
     Upload a file to Supabase Storage.
@@ -132,15 +133,19 @@ def upload_file(
     Args:
         agency_id: The agency UUID
         carrier_name: Carrier name (will be sanitized)
-        file_content: File bytes
+        file_content: File bytes, or a binary file object streamed to storage
         file_name: Original file name
         content_type: MIME type
+        size: Size in bytes (required for a file object)
 
     Returns:
         UploadResult with path or error
     """
+    if size is None:
+        size = len(file_content)
+
     # Validate file
-    validation_error = validate_file(content_type, len(file_content), file_name)
+    validation_error = validate_file(content_type, size, file_name)
     if validation_error:
         return UploadResult(success=False, error=validation_error)
 
@@ -172,7 +177,7 @@ def upload_file(
             success=True,
             file_name=file_name,
             storage_path=storage_path,
-            size=len(file_content),
+            size=size,
             content_type=content_type,
         )
 
@@ -365,9 +370,10 @@ def delete_carrier_folder(
 def replace_carrier_files(
     agency_id: UUID,
     carrier_name: str,
-    file_content: bytes,
+    file_content: bytes | BinaryIO,
     file_name: str,
     content_type: str,
+    size: int | None = None,
 ) -> UploadResult:
     """
     Replace existing files in carrier folder with new upload.
@@ -376,9 +382,10 @@ def replace_carrier_files(
     Args:
         agency_id: The agency UUID
         carrier_name: Carrier name
-        file_content: File bytes
+        file_content: File bytes, or a binary file object streamed to storage
         file_name: Original file name
         content_type: MIME type
+        size: Size in bytes (required for a file object)
 
     Returns:
         UploadResult with path or error
@@ -402,6 +409,7 @@ def replace_carrier_files(
         file_content=file_content,
         file_name=file_name,
         content_type=content_type,
+        size=size,
     )
 
     return upload_result
@@ -0,0 +1,106 @@
+"""
+Incremental Ingest Unit Tests
+
+Tests for staging change detection and watermarks.
+"""
+import json
+from contextlib import nullcontext
+from datetime import UTC, datetime
+from unittest.mock import patch
+from uuid import uuid4
+
+from django.test import SimpleTestCase
+
+from apps.ingest.incremental import (
+    WATERMARK_LOG_REASON,
+    StagingChanges,
+    detect_staging_changes,
+    record_watermark,
+)
+from apps.ingest.services import dedupe_staging
+
+SINCE = datetime(2026, 10, 1, tzinfo=UTC)
+UNTIL = datetime(2026, 10, 8, tzinfo=UTC)
+
+
+@patch('apps.ingest.incremental.transaction.atomic', return_value=nullcontext())
+@patch('apps.ingest.incremental.connection')
+class DetectStagingChangesTests(SimpleTestCase):
+    """Tests for detect_staging_changes."""
+
+    def test_counts_changes_since_watermark(self, mock_connection, mock_atomic):
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        # watermark, clock, pending count, unhashed count
+        cursor.fetchone.side_effect = [(SINCE,), (UNTIL,), (100,), (0,)]
+        cursor.rowcount = 96
+        agency_id = uuid4()
+
+        changes = detect_staging_changes(agency_id)
+
+        self.assertEqual((changes.since, changes.until), (SINCE, UNTIL))
+        self.assertEqual((changes.pending_rows, changes.unchanged_removed), (100, 96))
+        self.assertEqual(changes.changed_rows, 4)
+
+        sql = [call[0][0] for call in cursor.execute.call_args_list]
+        # The watermark is read only once the staging lock is held
+        self.assertIn('pg_advisory_xact_lock', sql[0])
+        self.assertIn('policy_report_staging_sync_log', sql[1])
+        self.assertIn('DELETE FROM public.policy_report_staging', sql[4])
+        params = cursor.execute.call_args_list[4][0][1]
+        self.assertEqual(params, {'agency_id': str(agency_id), 'since': SINCE, 'until': UNTIL})
+
+    def test_first_run_has_no_watermark(self, mock_connection, mock_atomic):
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.side_effect = [None, (UNTIL,), (10,), (10,)]
+        cursor.rowcount = 0
+
+        changes = detect_staging_changes(uuid4())
+
+        self.assertIsNone(changes.since)
+        self.assertEqual((changes.changed_rows, changes.unhashed_rows), (10, 10))
+
+
+class RecordWatermarkTests(SimpleTestCase):
+    """Tests for record_watermark."""
+
+    @patch('apps.ingest.incremental.connection')
+    def test_logs_watermark(self, mock_connection):
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        agency_id, run_id = uuid4(), uuid4()
+        changes = StagingChanges(since=SINCE, until=UNTIL, pending_rows=5, unchanged_removed=2)
+
+        record_watermark(agency_id, run_id, changes)
+
+        params = cursor.execute.call_args[0][1]
+        self.assertEqual(params[:2], [str(run_id), WATERMARK_LOG_REASON])
+        details = json.loads(params[2])
+        self.assertEqual(details['agency_id'], str(agency_id))
+        self.assertEqual(details['watermark'], UNTIL.isoformat())
+        self.assertEqual(details['changed_rows'], 3)
+
+
+@patch('apps.ingest.services.connection')
+class DedupeStagingTests(SimpleTestCase):
+    """Tests for the full-table dedupe run by non-incremental ingests."""
+
+    def test_fingerprint_ignores_load_columns(self, mock_connection):
+        """loaded_at differs on every row, so it must not make duplicates distinct."""
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (10, 7, 3)
+        agency_id = uuid4()
+
+        result = dedupe_staging(agency_id)
+
+        sql, params = cursor.execute.call_args[0]
+        self.assertIn("- 'id' - 'loaded_at' - 'content_hash'", sql)
+        self.assertEqual(params, {'agency_id': str(agency_id), 'dry_run': False})
+        self.assertEqual(result, {'scope': str(agency_id), 'total': 10, 'distinct': 7, 'dupe_rows': 3, 'deleted': 3})
+
+    def test_dry_run_deletes_nothing(self, mock_connection):
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (10, 7, 0)
+
+        result = dedupe_staging(uuid4(), dry_run=True)
+
+        self.assertTrue(cursor.execute.call_args[0][1]['dry_run'])
+        self.assertEqual((result['dupe_rows'], result['deleted']), (3, 0))
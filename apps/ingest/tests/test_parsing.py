@@ -0,0 +1,116 @@
+"""
+Policy Report Parsing Unit Tests
+
+Tests for reading CSV/XLSX uploads into staging records.
+"""
+import io
+from datetime import datetime
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from openpyxl import Workbook
+
+from apps.core.exceptions import ValidationError
+from apps.ingest import parsing
+from apps.ingest.parsing import parse_policy_report
+
+
+def csv_file(text: str) -> io.BytesIO:
+    return io.BytesIO(text.encode('utf-8-sig'))
+
+
+class ParseCsvTests(SimpleTestCase):
+    """Tests for CSV reports."""
+
+    def test_maps_headers(self):
+        report = csv_file(
+            'Policy #,Insured Name,Writing Agent ID,Status,Unused\n'
+            'P1, Jane Doe ,A1,Active,x\n'
+            'P2,John Roe,A2,,y\n'
+        )
+
+        records = list(parse_policy_report(report, 'report.csv', 'Acme'))
+
+        self.assertEqual(records, [
+            {'policy_number': 'P1', 'client_name': 'Jane Doe', 'writing_agent_number': 'A1',
+             'status': 'Active', 'carrier_name': 'Acme'},
+            {'policy_number': 'P2', 'client_name': 'John Roe', 'writing_agent_number': 'A2',
+             'status': None, 'carrier_name': 'Acme'},
+        ])
+
+    def test_skips_title_and_blank_rows(self):
+        report = csv_file(
+            'Acme Life Policy Report\n'
+            '\n'
+            'Policy Number,Client Name,Agent Name\n'
+            'P1,Jane Doe,Al\n'
+            ',,\n'
+            'P2,John Roe\n'
+        )
+
+        records = list(parse_policy_report(report, 'REPORT.CSV', 'Acme'))
+
+        self.assertEqual([r['policy_number'] for r in records], ['P1', 'P2'])
+        self.assertNotIn('agent_name', records[1])
+
+    def test_carrier_overrides(self):
+        report = csv_file('Contract Ref,Insured,Status\nC1,Jane Doe,Active\n')
+
+        with patch.object(parsing, 'CARRIER_COLUMNS', {'acme life': {'Contract Ref': 'policy_number'}}):
+            records = list(parse_policy_report(report, 'report.csv', 'Acme Life'))
+
+        self.assertEqual(records[0]['policy_number'], 'C1')
+
+    def test_missing_header(self):
+        report = csv_file('a,b,c\n1,2,3\n')
+
+        with self.assertRaises(ValidationError):
+            list(parse_policy_report(report, 'report.csv', 'Acme'))
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ValidationError):
+            parse_policy_report(io.BytesIO(b''), 'report.pdf', 'Acme')
+
+
+class ParseXlsxTests(SimpleTestCase):
+    """Tests for XLSX reports."""
+
+    def test_reads_active_sheet(self):
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(['Policy Number', 'Client Name', 'Effective Date', 'Face Amount'])
+        sheet.append(['P1', 'Jane Doe', datetime(2026, 3, 1), 250000])
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        buffer.seek(0)
+
+        records = list(parse_policy_report(buffer, 'report.xlsx', 'Acme'))
+
+        self.assertEqual(records, [{
+            'policy_number': 'P1', 'client_name': 'Jane Doe',
+            'policy_effective_date': '2026-03-01', 'face_value': 250000,
+            'carrier_name': 'Acme',
+        }])
+
+
+class StagePolicyReportFileTests(SimpleTestCase):
+    """Tests for stage_policy_report_file."""
+
+    @patch('apps.ingest.services.bulk_insert_staging_records')
+    def test_streams_records_to_loader(self, mock_insert):
+        from apps.ingest.services import stage_policy_report_file
+
+        consumed = []
+
+        def insert(agency_id, records):
+            consumed.extend(records)
+            return {'success': True, 'inserted_count': len(consumed), 'failed_count': 0, 'chunk_count': 1}
+
+        mock_insert.side_effect = insert
+        report = csv_file('Policy Number,Client Name,Status\nP1,Jane Doe,Active\n')
+        report.read()
+
+        result = stage_policy_report_file('agency', 'Acme', report, 'report.csv')
+
+        self.assertEqual([r['policy_number'] for r in consumed], ['P1'])
+        self.assertEqual(result['inserted_count'], 1)
@@ -0,0 +1,214 @@
+"""
+Ingest Pipeline Unit Tests
+
+Tests for stage scheduling, failure handling and metrics recording.
+"""
+import json
+import threading
+from contextlib import nullcontext
+from unittest.mock import patch
+from uuid import uuid4
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from apps.ingest.incremental import StagingChanges
+from apps.ingest.pipeline import (
+    STAGE_LOG_REASON,
+    IngestStage,
+    PipelineResult,
+    StageResult,
+    get_ingest_stages,
+    record_pipeline_metrics,
+    run_ingest_pipeline,
+)
+
+
+@patch('apps.ingest.pipeline.connections')
+@patch('apps.ingest.pipeline.transaction.atomic', return_value=nullcontext())
+class RunIngestPipelineTests(SimpleTestCase):
+    """Tests for run_ingest_pipeline."""
+
+    def test_runs_after_dependencies(self, mock_atomic, mock_connections):
+        order = []
+
+        def stage(name, after=()):
+            return IngestStage(name, lambda agency_id: order.append(name) or 5, after=after, rows=lambda r: r)
+
+        run = run_ingest_pipeline(uuid4(), [
+            stage('a'), stage('b', ('a',)), stage('c', ('b',)),
+        ])
+
+        self.assertTrue(run.ok)
+        self.assertEqual(order, ['a', 'b', 'c'])
+        self.assertEqual([s.rows for s in run.stages], [5, 5, 5])
+        self.assertEqual(mock_atomic.call_count, 3)
+
+    def test_independent_stages_run_concurrently(self, mock_atomic, mock_connections):
+        # Both stages must be in flight at once to pass the barrier
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait(agency_id):
+            barrier.wait()
+
+        run = run_ingest_pipeline(uuid4(), [
+            IngestStage('root', lambda agency_id: None),
+            IngestStage('x', wait, after=('root',)),
+            IngestStage('y', wait, after=('root',)),
+        ], concurrency=2)
+
+        self.assertTrue(run.ok)
+        self.assertEqual({s.name for s in run.stages}, {'root', 'x', 'y'})
+
+    def test_failure_skips_downstream(self, mock_atomic, mock_connections):
+        def fail(agency_id):
+            raise RuntimeError('boom')
+
+        run = run_ingest_pipeline(uuid4(), [
+            IngestStage('a', lambda agency_id: None),
+            IngestStage('b', fail, after=('a',)),
+            IngestStage('c', lambda agency_id: None, after=('b',)),
+        ])
+
+        self.assertFalse(run.ok)
+        self.assertEqual(run.failed_stage.name, 'b')
+        self.assertEqual(run.failed_stage.error, 'boom')
+        self.assertEqual(run.skipped, ['c'])
+
+
+class IngestStagesTests(SimpleTestCase):
+    """Tests for the stage graph."""
+
+    def test_dependencies_precede_stages(self):
+        seen = set()
+        for stage in get_ingest_stages():
+            self.assertTrue(seen.issuperset(stage.after), stage.name)
+            seen.add(stage.name)
+        self.assertEqual(len(seen), 8)
+
+    def test_skip_dedupe(self):
+        stages = get_ingest_stages(skip_dedupe=True)
+
+        self.assertEqual(stages[0].name, 'normalize')
+        self.assertEqual(stages[0].after, ())
+
+
+class RecordPipelineMetricsTests(SimpleTestCase):
+    """Tests for record_pipeline_metrics."""
+
+    def make_run(self) -> PipelineResult:
+        run = PipelineResult(run_id=uuid4(), started_at=timezone.now())
+        run.stages.append(StageResult(name='sync', started_at=run.started_at, duration_ms=1200, rows=40))
+        return run
+
+    @patch('apps.ingest.pipeline.transaction.atomic', return_value=nullcontext())
+    @patch('apps.ingest.pipeline.connection')
+    def test_logs_stages_and_updates_job(self, mock_connection, mock_atomic):
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        agency_id, job_id = uuid4(), uuid4()
+        run = self.make_run()
+
+        record_pipeline_metrics(agency_id, run, job_id)
+
+        rows = cursor.executemany.call_args[0][1]
+        self.assertEqual(rows[0][:2], [str(run.run_id), STAGE_LOG_REASON])
+        details = json.loads(rows[0][2])
+        self.assertEqual((details['stage'], details['duration_ms'], details['rows']), ('sync', 1200, 40))
+
+        params = cursor.execute.call_args[0][1]
+        self.assertEqual(json.loads(params[0])['stages'][0]['stage'], 'sync')
+        self.assertEqual(params[1:], [str(job_id), str(agency_id)])
+
+    @patch('apps.ingest.pipeline.transaction.atomic', side_effect=RuntimeError('db down'))
+    def test_failure_is_not_raised(self, mock_atomic):
+        record_pipeline_metrics(uuid4(), self.make_run())
+
+
+def make_changes(changed=3, unhashed=0) -> StagingChanges:
+    return StagingChanges(
+        since=None, until=timezone.now(),
+        pending_rows=changed + 10, unchanged_removed=10, unhashed_rows=unhashed,
+    )
+
+
+@patch('apps.ingest.incremental.record_watermark')
+@patch('apps.ingest.incremental.detect_staging_changes')
+@patch('apps.ingest.pipeline.record_pipeline_metrics')
+@patch('apps.ingest.pipeline.run_ingest_pipeline')
+class OrchestrateIngestTests(SimpleTestCase):
+    """Tests for orchestrate_policy_report_ingest."""
+
+    def test_reports_stage_results(self, mock_run, mock_record, mock_changes, mock_watermark):
+        from apps.ingest.services import orchestrate_policy_report_ingest
+
+        now = timezone.now()
+        run = PipelineResult(run_id=uuid4(), started_at=now, duration_ms=2500)
+        run.stages = [
+            StageResult(name='sync', started_at=now, duration_ms=1500, result={'updated': 3}),
+            StageResult(name='link_clients', started_at=now, duration_ms=1000, result={'created_clients': 1}),
+        ]
+        mock_run.return_value = run
+        mock_changes.return_value = changes = make_changes()
+        agency_id, job_id = uuid4(), uuid4()
+
+        result = orchestrate_policy_report_ingest(agency_id, ingest_job_id=job_id)
+
+        self.assertTrue(result['ok'])
+        self.assertEqual(result['sync_result'], {'updated': 3})
+        self.assertEqual(result['link_result'], {'created_clients': 1})
+        self.assertEqual(result['changes']['changed_rows'], 3)
+        self.assertIn('changes', result['durations'])
+        mock_record.assert_called_once_with(agency_id, run, job_id)
+        mock_watermark.assert_called_once_with(agency_id, run.run_id, changes)
+
+        # Every pending row was hashed, so the full-table dedupe is left out
+        stage_names = [stage.name for stage in mock_run.call_args[0][1]]
+        self.assertNotIn('dedupe', stage_names)
+
+    def test_unhashed_rows_keep_dedupe(self, mock_run, mock_record, mock_changes, mock_watermark):
+        from apps.ingest.services import orchestrate_policy_report_ingest
+
+        mock_run.return_value = PipelineResult(run_id=uuid4(), started_at=timezone.now())
+        mock_changes.return_value = make_changes(unhashed=2)
+
+        orchestrate_policy_report_ingest(uuid4())
+
+        self.assertEqual(mock_run.call_args[0][1][0].name, 'dedupe')
+
+    def test_unchanged_skips_pipeline(self, mock_run, mock_record, mock_changes, mock_watermark):
+        from apps.ingest.services import orchestrate_policy_report_ingest
+
+        mock_changes.return_value = make_changes(changed=0)
+
+        result = orchestrate_policy_report_ingest(uuid4())
+
+        self.assertTrue(result['ok'])
+        self.assertTrue(result['skipped'])
+        mock_run.assert_not_called()
+        mock_watermark.assert_called_once()
+
+    def test_full_runs_unchanged(self, mock_run, mock_record, mock_changes, mock_watermark):
+        from apps.ingest.services import orchestrate_policy_report_ingest
+
+        mock_run.return_value = PipelineResult(run_id=uuid4(), started_at=timezone.now())
+        mock_changes.return_value = make_changes(changed=0)
+
+        orchestrate_policy_report_ingest(uuid4(), full=True)
+
+        self.assertEqual(mock_run.call_args[0][1][0].name, 'dedupe')
+
+    def test_reports_failed_stage(self, mock_run, mock_record, mock_changes, mock_watermark):
+        from apps.ingest.services import orchestrate_policy_report_ingest
+
+        run = PipelineResult(run_id=uuid4(), started_at=timezone.now(), skipped=['rollup'])
+        run.stages = [StageResult(name='sync', started_at=run.started_at, duration_ms=10, error='deadlock')]
+        mock_run.return_value = run
+        mock_changes.return_value = make_changes()
+
+        result = orchestrate_policy_report_ingest(uuid4())
+
+        self.assertFalse(result['ok'])
+        self.assertEqual((result['failed_stage'], result['error']), ('sync', 'deadlock'))
+        self.assertEqual(result['skipped'], ['rollup'])
+        # Rows stay pending for the next run
+        mock_watermark.assert_not_called()
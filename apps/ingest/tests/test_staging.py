@@ -0,0 +1,139 @@
+"""
+Staging Loader Unit Tests
+
+Tests for the chunked COPY loader and the NDJSON bulk endpoint.
+"""
+import json
+from contextlib import nullcontext
+from unittest.mock import patch
+from uuid import uuid4
+
+from django.test import RequestFactory, SimpleTestCase
+from rest_framework.test import force_authenticate
+
+from apps.core.authentication import AuthenticatedUser
+from apps.ingest import staging
+from apps.ingest.views import StagingBulkInsertView
+
+
+def make_records(count):
+    return ({'policy_number': f'P{i}', 'carrier_name': 'Acme'} for i in range(count))
+
+
+@patch('apps.ingest.staging.transaction.atomic', return_value=nullcontext())
+@patch('apps.ingest.staging.connection')
+class LoadStagingRecordsTests(SimpleTestCase):
+    """Tests for load_staging_records."""
+
+    def _cursor(self, mock_connection):
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        copied = []
+
+        def copy_expert(sql, buffer):
+            data = buffer.read()
+            copied.append((sql, data))
+            cursor.rowcount = data.count('\r\n')
+
+        cursor.copy_expert.side_effect = copy_expert
+        return cursor, copied
+
+    def test_chunks(self, mock_connection, mock_atomic):
+        """Rows are copied chunk_size at a time, one atomic block each."""
+        cursor, copied = self._cursor(mock_connection)
+
+        result = staging.load_staging_records(uuid4(), make_records(5), chunk_size=2)
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.inserted_count, 5)
+        self.assertEqual([c.row_count for c in result.chunks], [2, 2, 1])
+        self.assertEqual([c.first_row for c in result.chunks], [1, 3, 5])
+        self.assertEqual(mock_atomic.call_count, 3)
+        self.assertIn('FROM STDIN WITH (FORMAT csv)', copied[0][0])
+
+    def test_csv_encoding(self, mock_connection, mock_atomic):
+        """None is an unquoted NULL, strings are quoted, agency_id is forced."""
+        _, copied = self._cursor(mock_connection)
+        agency_id = uuid4()
+        record = {'client_name': 'A "B"\nC', 'client_email': '', 'agency_id': 'other', 'carrier_name': 'Acme'}
+
+        staging.load_staging_records(agency_id, [record])
+
+        values = dict(zip(staging.STAGING_COLUMNS, copied[0][1].rstrip('\r\n').split(','), strict=False))
+        self.assertEqual(values['policy_number'], '')
+        self.assertEqual(values['client_email'], '""')
+        self.assertEqual(values['agency_id'], f'"{agency_id}"')
+        self.assertIn('"A ""B""\nC"', copied[0][1])
+
+    def test_content_hash(self, mock_connection, mock_atomic):
+        """Each row ends with a hash of its data columns, not its agency."""
+        _, copied = self._cursor(mock_connection)
+        record = {'policy_number': 'P1', 'carrier_name': 'Acme', 'face_value': 1000}
+
+        staging.load_staging_records(uuid4(), [record, {**record, 'agency_id': 'other'}, {**record, 'face_value': 2000}])
+
+        self.assertIn('content_hash)', copied[0][0])
+        hashes = [line.rsplit(',', 1)[1].strip('"') for line in copied[0][1].splitlines()]
+        self.assertEqual(hashes[0], staging.content_hash(record))
+        self.assertEqual(hashes[0], hashes[1])
+        self.assertNotEqual(hashes[0], hashes[2])
+
+    def test_failed_chunk_reported(self, mock_connection, mock_atomic):
+        """A rejected chunk is reported with its rows; the others still load."""
+        cursor, _ = self._cursor(mock_connection)
+        calls = []
+
+        def copy_expert(sql, buffer):
+            calls.append(1)
+            if len(calls) == 2:
+                raise ValueError('invalid input syntax for type date')
+            cursor.rowcount = buffer.read().count('\r\n')
+
+        cursor.copy_expert.side_effect = copy_expert
+
+        result = staging.load_staging_records(uuid4(), make_records(5), chunk_size=2)
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.inserted_count, 3)
+        self.assertEqual(result.failed_count, 2)
+        self.assertEqual(result.errors, [{'chunk': 1, 'rows': '3-4', 'error': 'invalid input syntax for type date'}])
+
+    def test_empty(self, mock_connection, mock_atomic):
+        result = staging.load_staging_records(uuid4(), [])
+
+        self.assertEqual(result.inserted_count, 0)
+        mock_connection.cursor.assert_not_called()
+
+
+class StagingBulkInsertNdjsonTests(SimpleTestCase):
+    """Tests for streamed NDJSON bodies."""
+
+    def test_streams_valid_lines(self):
+        user = AuthenticatedUser(
+            id=uuid4(), auth_user_id=uuid4(), email='a@example.com', agency_id=uuid4(),
+            role='admin', is_admin=True, status='active', perm_level=None, subscription_tier=None,
+        )
+        body = '\n'.join([
+            json.dumps({'policy_number': 'P1', 'carrier_name': 'Acme'}),
+            'not json',
+            json.dumps({'policy_number': 'P2'}),
+            '',
+            json.dumps({'policy_number': 'P3', 'carrier_name': 'Acme'}),
+        ])
+        request = RequestFactory().post('/api/ingest/staging/bulk', body, content_type='application/x-ndjson')
+        force_authenticate(request, user=user)
+        consumed = []
+
+        def bulk_insert(agency_id, records):
+            consumed.extend(records)
+            return {'success': True, 'inserted_count': len(consumed), 'failed_count': 0, 'chunk_count': 1}
+
+        with patch('apps.ingest.services.bulk_insert_staging_records', side_effect=bulk_insert):
+            response = StagingBulkInsertView.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['policy_number'] for r in consumed], ['P1', 'P3'])
+        self.assertEqual(response.data['insertedCount'], 2)
+        self.assertEqual(
+            response.data['rejected'],
+            [{'line': 2, 'error': 'invalid JSON'}, {'line': 3, 'error': 'missing carrier_name'}],
+        )
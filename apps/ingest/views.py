@@ -3,7 +3,7 @@ Ingest API Views
 
 Provides endpoints for policy report processing:
 - POST /api/ingest/enqueue-job - Enqueue a policy report parse job
-- POST /api/ingest/orchestrate - Run full policy report ingest
+- POST /api/ingest/orchestrate - Queue full policy report ingest (202 + job_id)
 - POST /api/ingest/sync-staging - Sync staging to deals
 - GET /api/ingest/staging-summary - Get staging summary
 - POST /api/ingest/presign - Generate S3 presigned URLs for file uploads
@@ -19,7 +19,10 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.core.authentication import CronSecretAuthentication, SupabaseJWTAuthentication, get_user_context
+from apps.core.jobs import enqueue_job, job_agency_id
+from apps.core.mixins import job_accepted_response
 
+from .jobs import ORCHESTRATE_INGEST_JOB
 from .services import (
     create_clients_from_deals,
     create_clients_from_policy_staging,
@@ -32,7 +35,6 @@ from .services import (
     fill_agent_carrier_numbers_with_audit,
     get_staging_summary,
     link_staged_agent_numbers,
-    orchestrate_policy_report_ingest,
     sync_agent_carrier_numbers_from_staging,
     sync_policy_report_staging_to_deals,
     upsert_products_from_staging,
@@ -118,16 +120,24 @@ class OrchestrateIngestView(APIView):
     """
     POST /api/ingest/orchestrate
 
-    Run full policy report ingest orchestration.
+    Queue full policy report ingest orchestration; responds 202 with a job_id
+    to poll at GET /api/jobs/{job_id}.
     Translated from Supabase RPC: orchestrate_policy_report_ingest_with_agency_id
 
-    This runs the complete ingest pipeline:
+    The job runs the complete ingest pipeline (see apps.ingest.pipeline):
     1. Dedupe staging rows
     2. Normalize staging data
     3. Create users from staging
     4. Create writing agent numbers
     5. Sync staging to deals
-    6. Link/create clients
+    6. Refresh rollups/billing schedules and link/create clients
+
+    Runs are incremental: if no staging rows changed since the last
+    successful run, the pipeline is skipped.
+
+    Request body (optional):
+        ingest_job_id: Upload job to record per-stage metrics on
+        full: true to run every stage even if nothing changed
     """
     authentication_classes = [CronSecretAuthentication, SupabaseJWTAuthentication]
     permission_classes = [IsAuthenticated]
@@ -148,12 +158,30 @@ class OrchestrateIngestView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
 
+        payload = {'agency_id': str(user.agency_id)}
+        if str(request.data.get('full', '')).lower() == 'true':
+            payload['full'] = True
+        ingest_job_id = request.data.get('ingest_job_id')
+        if ingest_job_id:
+            try:
+                payload['ingest_job_id'] = str(uuid_module.UUID(str(ingest_job_id)))
+            except ValueError:
+                return Response(
+                    {'error': 'Invalid ingest_job_id format'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
         try:
-            result = orchestrate_policy_report_ingest(user.agency_id)
-            return Response(result)
+            job_id = enqueue_job(
+                ORCHESTRATE_INGEST_JOB,
+                payload,
+                agency_id=job_agency_id(user),
+                created_by=user.id,
+            )
+            return job_accepted_response(job_id)
 
         except Exception as e:
-            logger.error(f'Orchestrate ingest failed: {e}')
+            logger.error(f'Enqueue ingest orchestration failed: {e}')
             return Response(
                 {'ok': False, 'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -848,12 +876,17 @@ class StagingBulkInsertView(APIView):
     """
     POST /api/ingest/staging/bulk - Bulk insert staging records
 
-    Request body:
+    Request body (application/json):
         records: Array of staging records to insert
             Each record should have:
             - client_name, policy_number, writing_agent_number, agent_name
             - status, policy_effective_date, carrier_name
             - Optional: product, date_of_birth, issue_age, face_value, etc.
+
+    Request body (application/x-ndjson):
+        One staging record object per line. The body is streamed into
+        staging without being held in memory; invalid lines are skipped and
+        reported in rejected.
     """
     authentication_classes = [CronSecretAuthentication, SupabaseJWTAuthentication]
     permission_classes = [IsAuthenticated]
@@ -866,51 +899,55 @@ class StagingBulkInsertView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
-        records = request.data.get('records', [])
-
-        if not records:
-            return Response(
-                {'error': 'No records provided'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        from .services import bulk_insert_staging_records
 
-        if not isinstance(records, list):
-            return Response(
-                {'error': 'records must be an array'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        rejected: list[dict] = []
+        if request.content_type == 'application/x-ndjson':
+            records = self._ndjson_records(request, rejected)
+        else:
+            records = request.data.get('records', [])
 
-        # Validate each record has minimum required fields
-        for i, record in enumerate(records):
-            if not isinstance(record, dict):
+            if not records:
                 return Response(
-                    {'error': f'Record {i} is not an object'},
+                    {'error': 'No records provided'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            if not record.get('carrier_name'):
+
+            if not isinstance(records, list):
                 return Response(
-                    {'error': f'Record {i} missing carrier_name'},
+                    {'error': 'records must be an array'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-        try:
-            from .services import bulk_insert_staging_records
+            # Validate each record has minimum required fields
+            for i, record in enumerate(records):
+                error = self._record_error(record)
+                if error:
+                    return Response(
+                        {'error': f'Record {i} {error}'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
 
+        try:
             result = bulk_insert_staging_records(
                 agency_id=user.agency_id,
                 records=records,
             )
 
+            body = {
+                'success': result['success'],
+                'insertedCount': result['inserted_count'],
+                'failedCount': result['failed_count'],
+                'chunkCount': result['chunk_count'],
+            }
+            if rejected:
+                body['rejected'] = rejected
             if result['success']:
-                return Response({
-                    'success': True,
-                    'insertedCount': result['inserted_count'],
-                })
-            else:
-                return Response(
-                    {'error': result.get('error', 'Insert failed')},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
+                return Response(body)
+            return Response(
+                {**body, 'error': result.get('error', 'Insert failed'), 'errors': result.get('errors', [])},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
 
         except Exception as e:
             logger.error(f'Bulk insert staging failed: {e}')
@@ -919,6 +956,32 @@ class StagingBulkInsertView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @staticmethod
+    def _record_error(record) -> str | None:
+        if not isinstance(record, dict):
+            return 'is not an object'
+        if not record.get('carrier_name'):
+            return 'missing carrier_name'
+        return None
+
+    def _ndjson_records(self, request, rejected: list[dict]):
+        """Yield valid records from the request body line by line."""
+        import json
+
+        for line_number, line in enumerate(request.stream or [], start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                rejected.append({'line': line_number, 'error': 'invalid JSON'})
+                continue
+            error = self._record_error(record)
+            if error:
+                rejected.append({'line': line_number, 'error': error})
+                continue
+            yield record
+
 
 class UpsertJobFileView(APIView):
     """
@@ -1310,7 +1373,13 @@ class PolicyReportUploadView(APIView):
     This replaces the frontend direct Supabase Storage access.
 
     Expects multipart/form-data with files keyed as "carrier_{CarrierName}".
-    Each carrier's existing files are replaced with the new upload.
+    Each carrier's existing files are replaced with the new upload. Files are
+    streamed to storage from the upload rather than read into memory.
+
+    With stage=true, each CSV/XLSX file is also parsed row by row and loaded
+    into policy_report_staging (see apps.ingest.parsing), and its result
+    carries insertedCount/failedCount; staging errors are reported per
+    carrier like upload errors.
 
     Response (200):
         {
@@ -1339,8 +1408,14 @@ class PolicyReportUploadView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
+        from apps.core.exceptions import ValidationError
+
+        from .parsing import check_report_format
+        from .services import stage_policy_report_file
         from .storage_service import replace_carrier_files, validate_file
 
+        stage = str(request.data.get('stage', '')).lower() == 'true'
+
         # Parse files from request
         uploads = []
         for key, file in request.FILES.items():
@@ -1376,32 +1451,52 @@ class PolicyReportUploadView(APIView):
                 errors.append(f'{carrier}: {validation_error}')
                 continue
 
-            # Read file content
-            try:
-                file_content = file.read()
-            except Exception as e:
-                errors.append(f'{carrier}: Failed to read file - {e}')
-                continue
+            if stage:
+                try:
+                    check_report_format(file.name)
+                except ValidationError as e:
+                    errors.append(f'{carrier}: {e.message}')
+                    continue
 
-            # Upload (replacing existing files)
+            # Upload (replacing existing files), streamed from the upload
+            file.seek(0)
             result = replace_carrier_files(
                 agency_id=user.agency_id,
                 carrier_name=carrier,
-                file_content=file_content,
+                file_content=file,
                 file_name=file.name,
                 content_type=file.content_type,
+                size=file.size,
             )
 
-            if result.success:
-                results.append({
-                    'carrier': carrier,
-                    'fileName': result.file_name,
-                    'storagePath': result.storage_path,
-                    'size': result.size,
-                    'type': result.content_type,
-                })
-            else:
+            if not result.success:
                 errors.append(f'{carrier}: {result.error}')
+                continue
+
+            file_result = {
+                'carrier': carrier,
+                'fileName': result.file_name,
+                'storagePath': result.storage_path,
+                'size': result.size,
+                'type': result.content_type,
+            }
+            results.append(file_result)
+
+            if stage:
+                try:
+                    staged = stage_policy_report_file(user.agency_id, carrier, file, file.name)
+                except ValidationError as e:
+                    errors.append(f'{carrier}: {e.message}')
+                    continue
+                except Exception as e:
+                    logger.error(f'Staging policy report for {carrier} failed: {e}')
+                    errors.append(f'{carrier}: Failed to stage policy report')
+                    continue
+
+                file_result['insertedCount'] = staged['inserted_count']
+                file_result['failedCount'] = staged['failed_count']
+                if not staged['success']:
+                    errors.append(f"{carrier}: {staged.get('error', 'Staging failed')}")
 
         success = len(errors) == 0
         response_data = {
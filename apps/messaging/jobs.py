@@ -0,0 +1,52 @@
+"""
+Messaging Background Jobs
+
+Handlers for apps.core.jobs; see the Run*View endpoints.
+"""
+from apps.core.jobs import Job, register_job
+
+from .services import (
+    run_billing_reminders,
+    run_birthday_messages,
+    run_holiday_messages,
+    run_lapse_reminders,
+    run_needs_info_notifications,
+    run_policy_packet_checkups,
+    run_quarterly_checkins,
+)
+
+MESSAGING_RUN_JOB = 'messaging.run'
+
+# Payload 'run' value -> service
+MESSAGING_RUNS = {
+    'birthday_messages': run_birthday_messages,
+    'billing_reminders': run_billing_reminders,
+    'lapse_reminders': run_lapse_reminders,
+    'quarterly_checkins': run_quarterly_checkins,
+    'policy_packet_checkups': run_policy_packet_checkups,
+    'holiday_messages': run_holiday_messages,
+    'needs_info_notifications': run_needs_info_notifications,
+}
+
+
+@register_job(MESSAGING_RUN_JOB)
+def messaging_run_job(job: Job) -> dict:
+    """
+    Payload:
+        run: Key of MESSAGING_RUNS
+        holiday_name: Required for holiday_messages
+    """
+    run = job.payload['run']
+    kwargs = {'holiday_name': job.payload['holiday_name']} if run == 'holiday_messages' else {}
+    result = MESSAGING_RUNS[run](**kwargs)
+
+    response = {
+        'total': result.total,
+        'created': result.created,
+        'skipped': result.skipped,
+        'failed': result.failed,
+        'errors': result.errors[:10] if result.errors else [],
+    }
+    if run == 'holiday_messages':
+        response['holiday_name'] = job.payload['holiday_name']
+    return response
@@ -153,152 +153,62 @@ def get_billing_reminder_deals() -> list[dict]:
     Get deals eligible for billing reminder messages (3 days before next billing).
     Translated from Supabase RPC: get_billing_reminder_deals_v2
 
-    Supports two billing date calculation methods:
-    1. billing_day_of_month: Uses specific day of month for billing
-    2. policy_effective_date: Falls back to recurring dates from effective date
+    Billing dates come from public.deal_billing_schedule (see
+    apps.deals.billing_schedule), which applies the billing_day_of_month /
+    billing_weekday pattern when set and otherwise recurs from
+    policy_effective_date by billing_cycle. Deals whose policy takes effect
+    in 3 days are included as well.
 
     Returns:
         List of deals with billing reminder info
     """
     with connection.cursor() as cursor:
         cursor.execute("""
-            WITH active_deals AS (
-                SELECT DISTINCT
-                    d.id,
-                    d.agent_id,
-                    d.agency_id,
-                    d.client_name,
-                    d.client_phone,
-                    d.billing_cycle,
-                    d.policy_effective_date,
-                    d.billing_day_of_month,
-                    d.billing_weekday,
-                    d.monthly_premium,
-                    d.annual_premium,
-                    COALESCE(sm.impact, 'neutral') AS status_impact,
-                    u.first_name AS agent_first_name,
-                    u.last_name AS agent_last_name,
-                    COALESCE(u.subscription_tier, 'free') AS agent_subscription_tier,
-                    a.name AS agency_name,
-                    a.phone_number AS agency_phone,
-                    a.messaging_enabled AS messaging_enabled
-                FROM deals d
-                INNER JOIN users u ON d.agent_id = u.id
-                INNER JOIN agencies a ON d.agency_id = a.id
-                LEFT JOIN status_mapping sm
-                    ON sm.carrier_id = d.carrier_id
-                    AND LOWER(sm.raw_status) = LOWER(d.status)
-                WHERE d.client_phone IS NOT NULL
-                    AND d.billing_cycle IS NOT NULL
-                    AND d.policy_effective_date IS NOT NULL
-                    AND a.messaging_enabled = true
-                    AND COALESCE(sm.impact, 'neutral') = 'positive'
-            ),
-            deals_with_calculated_dates AS (
+            WITH due AS (
+                SELECT s.deal_id, s.billing_date AS next_billing_date
+                FROM deal_billing_schedule s
+                WHERE s.billing_date = (CURRENT_DATE + INTERVAL '3 days')::date
+                UNION
                 SELECT
-                    ad.id AS deal_id,
-                    ad.agent_id,
-                    ad.agency_id,
-                    ad.agent_first_name,
-                    ad.agent_last_name,
-                    ad.agent_subscription_tier,
-                    ad.agency_name,
-                    ad.agency_phone,
-                    ad.messaging_enabled,
-                    ad.client_name,
-                    ad.client_phone,
-                    ad.billing_cycle,
-                    ad.billing_day_of_month,
-                    ad.policy_effective_date,
-                    ad.monthly_premium,
-                    ad.annual_premium,
-                    -- Method 1: Use billing_day_of_month if set
-                    -- Calculate next occurrence of billing day in current or next month
-                    CASE
-                        WHEN ad.billing_day_of_month IS NOT NULL AND ad.billing_day_of_month BETWEEN 1 AND 31 THEN
-                            CASE
-                                -- If billing day hasn't passed this month, use this month
-                                WHEN ad.billing_day_of_month > EXTRACT(DAY FROM CURRENT_DATE) THEN
-                                    make_date(
-                                        EXTRACT(YEAR FROM CURRENT_DATE)::int,
-                                        EXTRACT(MONTH FROM CURRENT_DATE)::int,
-                                        LEAST(ad.billing_day_of_month,
-                                            (DATE_TRUNC('month', CURRENT_DATE) + INTERVAL '1 month' - INTERVAL '1 day')::date -
-                                            DATE_TRUNC('month', CURRENT_DATE)::date + 1)::int
-                                    )
-                                -- Otherwise use next month (accounting for billing cycle)
-                                ELSE
-                                    make_date(
-                                        EXTRACT(YEAR FROM CURRENT_DATE + (
-                                            CASE ad.billing_cycle
-                                                WHEN 'monthly' THEN INTERVAL '1 month'
-                                                WHEN 'quarterly' THEN INTERVAL '3 months'
-                                                WHEN 'semi-annually' THEN INTERVAL '6 months'
-                                                WHEN 'annually' THEN INTERVAL '1 year'
-                                                ELSE INTERVAL '1 month'
-                                            END
-                                        ))::int,
-                                        EXTRACT(MONTH FROM CURRENT_DATE + (
-                                            CASE ad.billing_cycle
-                                                WHEN 'monthly' THEN INTERVAL '1 month'
-                                                WHEN 'quarterly' THEN INTERVAL '3 months'
-                                                WHEN 'semi-annually' THEN INTERVAL '6 months'
-                                                WHEN 'annually' THEN INTERVAL '1 year'
-                                                ELSE INTERVAL '1 month'
-                                            END
-                                        ))::int,
-                                        LEAST(ad.billing_day_of_month, 28)::int
-                                    )
-                            END
-                        ELSE NULL
-                    END AS billing_day_calculated_date,
-                    -- Method 2: Fallback to generate_series from policy_effective_date
+                    d.id,
                     (
-                        SELECT dt::date
-                        FROM generate_series(
-                            ad.policy_effective_date::timestamp,
-                            (ad.policy_effective_date +
-                                CASE ad.billing_cycle
-                                    WHEN 'monthly' THEN interval '1 month'
-                                    WHEN 'quarterly' THEN interval '3 months'
-                                    WHEN 'semi-annually' THEN interval '6 months'
-                                    WHEN 'annually' THEN interval '1 year'
-                                    ELSE interval '1 month'
-                                END * 50)::timestamp,
-                            CASE ad.billing_cycle
-                                WHEN 'monthly' THEN interval '1 month'
-                                WHEN 'quarterly' THEN interval '3 months'
-                                WHEN 'semi-annually' THEN interval '6 months'
-                                WHEN 'annually' THEN interval '1 year'
-                                ELSE interval '1 month'
-                            END
-                        ) AS dt
-                        WHERE dt::date > CURRENT_DATE
-                        LIMIT 1
-                    ) AS fallback_billing_date
-                FROM active_deals ad
+                        SELECT MIN(s.billing_date)
+                        FROM deal_billing_schedule s
+                        WHERE s.deal_id = d.id AND s.billing_date > CURRENT_DATE
+                    )
+                FROM deals d
+                WHERE d.policy_effective_date = (CURRENT_DATE + INTERVAL '3 days')::date
             )
-            SELECT
-                dwcd.deal_id,
-                dwcd.agent_id,
-                dwcd.agent_first_name,
-                dwcd.agent_last_name,
-                dwcd.agent_subscription_tier,
-                dwcd.agency_id,
-                dwcd.agency_name,
-                dwcd.agency_phone,
-                dwcd.messaging_enabled,
-                dwcd.client_name,
-                dwcd.client_phone,
-                dwcd.billing_cycle,
-                -- Prefer billing_day calculation, fall back to effective date method
-                COALESCE(dwcd.billing_day_calculated_date, dwcd.fallback_billing_date) as next_billing_date,
-                dwcd.policy_effective_date,
-                dwcd.monthly_premium,
-                dwcd.annual_premium
-            FROM deals_with_calculated_dates dwcd
-            WHERE COALESCE(dwcd.billing_day_calculated_date, dwcd.fallback_billing_date) = (CURRENT_DATE + INTERVAL '3 days')::date
-                OR dwcd.policy_effective_date = (CURRENT_DATE + INTERVAL '3 days')::date
+            SELECT DISTINCT ON (d.id)
+                d.id AS deal_id,
+                d.agent_id,
+                u.first_name AS agent_first_name,
+                u.last_name AS agent_last_name,
+                COALESCE(u.subscription_tier, 'free') AS agent_subscription_tier,
+                d.agency_id,
+                a.name AS agency_name,
+                a.phone_number AS agency_phone,
+                a.messaging_enabled AS messaging_enabled,
+                d.client_name,
+                d.client_phone,
+                d.billing_cycle,
+                due.next_billing_date,
+                d.policy_effective_date,
+                d.monthly_premium,
+                d.annual_premium
+            FROM due
+            INNER JOIN deals d ON d.id = due.deal_id
+            INNER JOIN users u ON d.agent_id = u.id
+            INNER JOIN agencies a ON d.agency_id = a.id
+            LEFT JOIN status_mapping sm
+                ON sm.carrier_id = d.carrier_id
+                AND LOWER(sm.raw_status) = LOWER(d.status)
+            WHERE d.client_phone IS NOT NULL
+                AND d.billing_cycle IS NOT NULL
+                AND d.policy_effective_date IS NOT NULL
+                AND a.messaging_enabled = true
+                AND COALESCE(sm.impact, 'neutral') = 'positive'
+            ORDER BY d.id, due.next_billing_date
         """)
 
         columns = [col[0] for col in cursor.description]
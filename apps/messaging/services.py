@@ -3,13 +3,24 @@ Messaging Services
 
 Business logic for cron-triggered automated messaging.
 Creates draft messages for approval based on various triggers.
+
+Each job runs set-based: eligible deals are filtered in Python, their
+conversations are resolved with one query, each agency's template is
+compiled once and rendered per deal, and the drafts are written with
+multi-row INSERTs.
 """
+import json
 import logging
+import uuid
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from uuid import UUID
 
 from django.db import connection, transaction
 
+from apps.core.authentication import AuthenticatedUser
+from apps.core.phone import to_e164
+from apps.deals.billing_schedule import roll_billing_schedule_horizons
 from apps.messaging.selectors import (
     get_billing_reminder_deals,
     get_birthday_message_deals,
@@ -19,17 +30,20 @@ from apps.messaging.selectors import (
     get_policy_packet_checkup_deals,
     get_quarterly_checkin_deals,
 )
-from apps.sms.services import find_conversation, log_message, LogMessageInput
+from apps.sms.events import publish_message_events
+from apps.sms.services import refresh_conversation_summaries
 from apps.sms.templates_service import (
-    replace_placeholders,
-    get_template,
-    batch_get_agency_sms_settings,
     DEFAULT_SMS_TEMPLATES,
+    CompiledTemplate,
+    batch_get_agency_sms_settings,
+    compile_template,
 )
-from apps.core.authentication import AuthenticatedUser
 
 logger = logging.getLogger(__name__)
 
+# Drafts per INSERT statement
+DRAFT_INSERT_BATCH_SIZE = 1000
+
 
 @dataclass
 class MessageJobResult:
@@ -41,6 +55,16 @@ class MessageJobResult:
     errors: list[str] = field(default_factory=list)
 
 
+@dataclass
+class DraftMessage:
+    """A rendered draft for one deal."""
+    deal_id: str
+    conversation_id: str
+    agent_id: str
+    content: str
+    metadata: dict
+
+
 def _check_tier_allows_auto_sms(subscription_tier: str | None) -> bool:
     """
     Check if subscription tier allows automated SMS messages.
@@ -74,208 +98,260 @@ def _get_system_user() -> AuthenticatedUser:
     )
 
 
-def _find_conversation_for_deal(
-    agent_id: str,
-    deal_id: str,
-    agency_id: str,
-    client_phone: str,
-) -> dict | None:
+def _find_conversations_for_deals(deals: list[dict]) -> dict[str, dict]:
     """
-    Find an existing conversation for a deal.
+    Find existing conversations for many deals in one query.
 
-    Does NOT create new conversations for cron jobs.
+    Per deal, a conversation linked to the deal wins; otherwise the agent's
+    conversation with the client phone. The most recently updated one is
+    used in both cases. Does NOT create new conversations for cron jobs.
 
     Args:
-        agent_id: The agent UUID
-        deal_id: The deal UUID
-        agency_id: The agency UUID
-        client_phone: The client phone number
+        deals: Deals with deal_id, agent_id, agency_id and client_phone
 
     Returns:
-        Conversation dict if found, None otherwise
+        Dict mapping deal_id to {'id', 'sms_opt_in_status'}
     """
-    # Create a temporary user context for the find operation
-    user = AuthenticatedUser(
-        id=UUID(agent_id),
-        auth_user_id=UUID('00000000-0000-0000-0000-000000000000'),
-        email='',
-        agency_id=UUID(agency_id),
-        role='agent',
-        is_admin=False,
-        status='active',
-        perm_level=None,
-        subscription_tier='pro',
-    )
-
-    # Try finding by deal_id first
-    conv = find_conversation(
-        user=user,
-        deal_id=UUID(deal_id),
-    )
-
-    if conv:
-        return conv
-
-    # Try finding by phone number
-    conv = find_conversation(
-        user=user,
-        agent_id=UUID(agent_id),
-        phone=client_phone,
-    )
-
-    return conv
-
-
-def _create_draft_message(
-    agency_id: str,
-    conversation_id: str,
-    agent_id: str,
-    message_body: str,
-    metadata: dict,
-) -> bool:
+    if not deals:
+        return {}
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT d.deal_id, c.id, c.sms_opt_in_status
+            FROM unnest(%s::uuid[], %s::uuid[], %s::uuid[], %s::text[])
+                AS d(deal_id, agent_id, agency_id, phone)
+            CROSS JOIN LATERAL (
+                SELECT m.id, m.sms_opt_in_status
+                FROM (
+                    (
+                        SELECT c.id, c.sms_opt_in_status, 0 AS priority
+                        FROM public.conversations c
+                        WHERE c.agency_id = d.agency_id AND c.deal_id = d.deal_id
+                        ORDER BY c.updated_at DESC
+                        LIMIT 1
+                    )
+                    UNION ALL
+                    (
+                        SELECT c.id, c.sms_opt_in_status, 1 AS priority
+                        FROM public.conversations c
+                        WHERE c.agency_id = d.agency_id
+                          AND c.agent_id = d.agent_id
+                          AND c.client_phone_e164 = d.phone
+                        ORDER BY c.updated_at DESC
+                        LIMIT 1
+                    )
+                ) m
+                ORDER BY m.priority
+                LIMIT 1
+            ) c
+        """, [
+            [d['deal_id'] for d in deals],
+            [d['agent_id'] for d in deals],
+            [d['agency_id'] for d in deals],
+            [to_e164(d['client_phone']) for d in deals],
+        ])
+        rows = cursor.fetchall()
+
+    return {
+        str(deal_id): {'id': str(conversation_id), 'sms_opt_in_status': opt_in_status}
+        for deal_id, conversation_id, opt_in_status in rows
+    }
+
+
+def _insert_draft_messages(drafts: list[DraftMessage]) -> list[str]:
     """
-    Create a draft message in the database.
+    Insert draft messages with one multi-row INSERT.
 
     Args:
-        agency_id: The agency UUID
-        conversation_id: The conversation UUID
-        agent_id: The agent UUID
-        message_body: The message content
-        metadata: Message metadata
+        drafts: Drafts to insert
 
     Returns:
-        True if successful
+        The new message IDs, in the order of drafts
     """
-    # Create user context for the agent
-    user = AuthenticatedUser(
-        id=UUID(agent_id),
-        auth_user_id=UUID('00000000-0000-0000-0000-000000000000'),
-        email='',
-        agency_id=UUID(agency_id),
-        role='agent',
-        is_admin=False,
-        status='active',
-        perm_level=None,
-        subscription_tier='pro',
-    )
-
-    result = log_message(
-        user=user,
-        data=LogMessageInput(
-            conversation_id=UUID(conversation_id),
-            content=message_body,
-            direction='outbound',
-            status='draft',
-            metadata=metadata,
-        ),
-    )
-
-    return result.success
-
+    message_ids = [str(uuid.uuid4()) for _ in drafts]
 
-def run_birthday_messages() -> MessageJobResult:
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO public.messages (
+                id, conversation_id, content, direction, status, sent_by,
+                metadata, sent_at, read_at, created_at, updated_at
+            )
+            SELECT m.id, m.conversation_id, m.content, 'outbound', 'draft', m.sent_by,
+                   m.metadata, NULL, NULL, NOW(), NOW()
+            FROM unnest(%s::uuid[], %s::uuid[], %s::text[], %s::uuid[], %s::jsonb[])
+                AS m(id, conversation_id, content, sent_by, metadata)
+        """, [
+            message_ids,
+            [d.conversation_id for d in drafts],
+            [d.content for d in drafts],
+            [d.agent_id for d in drafts],
+            [json.dumps(d.metadata) for d in drafts],
+        ])
+        refresh_conversation_summaries({d.conversation_id for d in drafts})
+        publish_message_events('message_created', message_ids, 'outbound')
+
+    return message_ids
+
+
+def _first_name(deal: dict) -> str:
+    client_name = deal.get('client_name', '')
+    return client_name.split()[0] if client_name else 'there'
+
+
+def _agent_name(deal: dict) -> str:
+    return f"{deal.get('agent_first_name', '')} {deal.get('agent_last_name', '')}".strip()
+
+
+def _create_drafts_for_deals(
+    deals: list[dict],
+    message_type: str,
+    enabled_setting: str,
+    template_setting: str,
+    default_template: str,
+    placeholders: Callable[[dict], dict],
+    extra_metadata: Callable[[dict], dict] | None = None,
+) -> tuple[MessageJobResult, list[str]]:
     """
-    Create birthday message drafts for eligible deals.
+    Create draft messages for a cron job's deals.
 
-    Runs daily to find clients with birthdays today.
+    Skips deals whose agency has messaging (or this message type) disabled,
+    whose agent's tier has no automated SMS, or whose client has no opted-in
+    conversation.
+
+    Args:
+        deals: Deals from the job's selector
+        message_type: metadata.type of the drafts
+        enabled_setting: Agency setting that disables the job when False
+        template_setting: Agency setting holding a custom template
+        default_template: DEFAULT_SMS_TEMPLATES key used otherwise
+        placeholders: Template context for a deal
+        extra_metadata: Additional metadata for a deal
 
     Returns:
-        MessageJobResult with counts
+        Tuple of (MessageJobResult, deal IDs that got a draft)
     """
-    logger.info('Running birthday messages job')
-
-    deals = get_birthday_message_deals()
     result = MessageJobResult(total=len(deals))
-
     if not deals:
-        logger.info('No birthday deals found')
-        return result
+        return result, []
 
-    # Batch fetch agency settings
     agency_ids = [UUID(d['agency_id']) for d in deals]
     agency_settings_map = batch_get_agency_sms_settings(agency_ids)
 
+    eligible = []
     for deal in deals:
-        try:
-            agency_id = deal['agency_id']
+        agency_settings = agency_settings_map.get(deal['agency_id'], {})
+        if (
+            not deal.get('messaging_enabled', False)
+            or agency_settings.get(enabled_setting) is False
+            or not _check_tier_allows_auto_sms(deal.get('agent_subscription_tier'))
+        ):
+            result.skipped += 1
+            continue
+        eligible.append(deal)
+
+    conversations = _find_conversations_for_deals(eligible)
+
+    templates: dict[str, CompiledTemplate] = {}
+
+    def agency_template(agency_id: str) -> CompiledTemplate:
+        if agency_id not in templates:
             agency_settings = agency_settings_map.get(agency_id, {})
-
-            # Check if messaging is enabled
-            if not deal.get('messaging_enabled', False):
-                result.skipped += 1
-                continue
-
-            # Check if birthday messages are enabled for agency
-            if agency_settings.get('sms_birthday_enabled') is False:
-                result.skipped += 1
-                continue
-
-            # Check subscription tier
-            if not _check_tier_allows_auto_sms(deal.get('agent_subscription_tier')):
-                result.skipped += 1
-                continue
-
-            # Find existing conversation
-            conversation = _find_conversation_for_deal(
-                agent_id=deal['agent_id'],
-                deal_id=deal['deal_id'],
-                agency_id=agency_id,
-                client_phone=deal['client_phone'],
+            templates[agency_id] = compile_template(
+                agency_settings.get(template_setting) or DEFAULT_SMS_TEMPLATES.get(default_template, '')
             )
+        return templates[agency_id]
 
-            if not conversation:
-                result.skipped += 1
-                continue
-
-            # Check opt-in status
-            if conversation.get('sms_opt_in_status') != 'opted_in':
+    drafts = []
+    for deal in eligible:
+        try:
+            conversation = conversations.get(deal['deal_id'])
+            if not conversation or conversation.get('sms_opt_in_status') != 'opted_in':
                 result.skipped += 1
                 continue
 
-            # Get first name from client_name
-            client_name = deal.get('client_name', '')
-            first_name = client_name.split()[0] if client_name else 'there'
-
-            # Get template (custom or default)
-            custom_template = agency_settings.get('sms_birthday_template')
-            template = custom_template or DEFAULT_SMS_TEMPLATES.get('birthday', '')
-
-            # Render message
-            message_body = replace_placeholders(template, {
-                'client_first_name': first_name,
-                'agency_name': deal.get('agency_name', ''),
-            })
-
-            # Create draft message
-            success = _create_draft_message(
-                agency_id=agency_id,
+            drafts.append(DraftMessage(
+                deal_id=deal['deal_id'],
                 conversation_id=conversation['id'],
                 agent_id=deal['agent_id'],
-                message_body=message_body,
+                content=agency_template(deal['agency_id']).render(placeholders(deal)),
                 metadata={
                     'automated': True,
-                    'type': 'birthday',
+                    'type': message_type,
                     'deal_id': deal['deal_id'],
                     'client_phone': deal['client_phone'],
-                    'client_name': client_name,
+                    'client_name': deal.get('client_name', ''),
+                    **(extra_metadata(deal) if extra_metadata else {}),
                 },
-            )
-
-            if success:
-                result.created += 1
-            else:
-                result.failed += 1
+            ))
 
         except Exception as e:
             result.failed += 1
             result.errors.append(f"Deal {deal.get('deal_id', 'unknown')}: {e!s}")
-            logger.error(f"Error processing birthday deal: {e}")
+            logger.error(f"Error processing {message_type} deal: {e}")
+
+    created_deal_ids = []
+    for start in range(0, len(drafts), DRAFT_INSERT_BATCH_SIZE):
+        batch = drafts[start:start + DRAFT_INSERT_BATCH_SIZE]
+        try:
+            _insert_draft_messages(batch)
+        except Exception as e:
+            result.failed += len(batch)
+            result.errors.append(f'Inserting {len(batch)} {message_type} drafts: {e!s}')
+            logger.error(f'Error inserting {message_type} drafts: {e}')
+            continue
+        result.created += len(batch)
+        created_deal_ids.extend(d.deal_id for d in batch)
+
+    return result, created_deal_ids
+
 
+def _update_deal_statuses(deal_ids: list[str], status: str) -> None:
+    """Set status_standardized on many deals in one UPDATE."""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            UPDATE public.deals
+            SET status_standardized = %s,
+                updated_at = NOW()
+            WHERE id = ANY(%s::uuid[])
+        """, [status, deal_ids])
+
+
+def _log_job_result(job_name: str, result: MessageJobResult, created_label: str = 'created') -> None:
     logger.info(
-        f'Birthday messages completed: {result.created} created, '
+        f'{job_name} completed: {result.created} {created_label}, '
         f'{result.skipped} skipped, {result.failed} failed'
     )
 
+
+def run_birthday_messages() -> MessageJobResult:
+    """
+    Create birthday message drafts for eligible deals.
+
+    Runs daily to find clients with birthdays today.
+
+    Returns:
+        MessageJobResult with counts
+    """
+    logger.info('Running birthday messages job')
+
+    deals = get_birthday_message_deals()
+    if not deals:
+        logger.info('No birthday deals found')
+        return MessageJobResult()
+
+    result, _ = _create_drafts_for_deals(
+        deals,
+        message_type='birthday',
+        enabled_setting='sms_birthday_enabled',
+        template_setting='sms_birthday_template',
+        default_template='birthday',
+        placeholders=lambda deal: {
+            'client_first_name': _first_name(deal),
+            'agency_name': deal.get('agency_name', ''),
+        },
+    )
+
+    _log_job_result('Birthday messages', result)
     return result
 
 
@@ -283,95 +359,36 @@ def run_billing_reminders() -> MessageJobResult:
     """
     Create billing reminder drafts for deals with payments due in 3 days.
 
+    Rolls every agency's billing schedule horizon forward first; the rest
+    of the schedule is kept current by deal writes and imports.
+
     Returns:
         MessageJobResult with counts
     """
     logger.info('Running billing reminders job')
 
+    roll_billing_schedule_horizons()
     deals = get_billing_reminder_deals()
-    result = MessageJobResult(total=len(deals))
-
     if not deals:
         logger.info('No billing reminder deals found')
-        return result
-
-    # Batch fetch agency settings
-    agency_ids = [UUID(d['agency_id']) for d in deals]
-    agency_settings_map = batch_get_agency_sms_settings(agency_ids)
-
-    for deal in deals:
-        try:
-            agency_id = deal['agency_id']
-            agency_settings = agency_settings_map.get(agency_id, {})
-
-            if not deal.get('messaging_enabled', False):
-                result.skipped += 1
-                continue
-
-            if agency_settings.get('sms_billing_reminder_enabled') is False:
-                result.skipped += 1
-                continue
-
-            if not _check_tier_allows_auto_sms(deal.get('agent_subscription_tier')):
-                result.skipped += 1
-                continue
-
-            conversation = _find_conversation_for_deal(
-                agent_id=deal['agent_id'],
-                deal_id=deal['deal_id'],
-                agency_id=agency_id,
-                client_phone=deal['client_phone'],
-            )
-
-            if not conversation:
-                result.skipped += 1
-                continue
-
-            if conversation.get('sms_opt_in_status') != 'opted_in':
-                result.skipped += 1
-                continue
-
-            client_name = deal.get('client_name', '')
-            first_name = client_name.split()[0] if client_name else 'there'
-
-            custom_template = agency_settings.get('sms_billing_reminder_template')
-            template = custom_template or DEFAULT_SMS_TEMPLATES.get('billing_reminder', '')
-
-            message_body = replace_placeholders(template, {
-                'client_first_name': first_name,
-            })
-
-            success = _create_draft_message(
-                agency_id=agency_id,
-                conversation_id=conversation['id'],
-                agent_id=deal['agent_id'],
-                message_body=message_body,
-                metadata={
-                    'automated': True,
-                    'type': 'billing_reminder',
-                    'deal_id': deal['deal_id'],
-                    'client_phone': deal['client_phone'],
-                    'client_name': client_name,
-                    'billing_cycle': deal.get('billing_cycle'),
-                    'next_billing_date': deal.get('next_billing_date'),
-                },
-            )
-
-            if success:
-                result.created += 1
-            else:
-                result.failed += 1
-
-        except Exception as e:
-            result.failed += 1
-            result.errors.append(f"Deal {deal.get('deal_id', 'unknown')}: {e!s}")
-            logger.error(f"Error processing billing reminder deal: {e}")
-
-    logger.info(
-        f'Billing reminders completed: {result.created} created, '
-        f'{result.skipped} skipped, {result.failed} failed'
+        return MessageJobResult()
+
+    result, _ = _create_drafts_for_deals(
+        deals,
+        message_type='billing_reminder',
+        enabled_setting='sms_billing_reminder_enabled',
+        template_setting='sms_billing_reminder_template',
+        default_template='billing_reminder',
+        placeholders=lambda deal: {
+            'client_first_name': _first_name(deal),
+        },
+        extra_metadata=lambda deal: {
+            'billing_cycle': deal.get('billing_cycle'),
+            'next_billing_date': deal.get('next_billing_date'),
+        },
     )
 
+    _log_job_result('Billing reminders', result)
     return result
 
 
@@ -387,103 +404,31 @@ def run_lapse_reminders() -> MessageJobResult:
     logger.info('Running lapse reminders job')
 
     deals = get_lapse_reminder_deals()
-    result = MessageJobResult(total=len(deals))
-
     if not deals:
         logger.info('No lapse reminder deals found')
-        return result
-
-    agency_ids = [UUID(d['agency_id']) for d in deals]
-    agency_settings_map = batch_get_agency_sms_settings(agency_ids)
+        return MessageJobResult()
+
+    result, created_deal_ids = _create_drafts_for_deals(
+        deals,
+        message_type='lapse_reminder',
+        enabled_setting='sms_lapse_reminder_enabled',
+        template_setting='sms_lapse_reminder_template',
+        default_template='lapse_reminder',
+        placeholders=lambda deal: {
+            'client_first_name': _first_name(deal),
+            'agent_name': _agent_name(deal),
+            'agent_phone': deal.get('agent_phone', ''),
+        },
+    )
 
-    for deal in deals:
+    # Update deal status to track notification
+    if created_deal_ids:
         try:
-            agency_id = deal['agency_id']
-            agency_settings = agency_settings_map.get(agency_id, {})
-
-            if not deal.get('messaging_enabled', False):
-                result.skipped += 1
-                continue
-
-            if agency_settings.get('sms_lapse_reminder_enabled') is False:
-                result.skipped += 1
-                continue
-
-            if not _check_tier_allows_auto_sms(deal.get('agent_subscription_tier')):
-                result.skipped += 1
-                continue
-
-            conversation = _find_conversation_for_deal(
-                agent_id=deal['agent_id'],
-                deal_id=deal['deal_id'],
-                agency_id=agency_id,
-                client_phone=deal['client_phone'],
-            )
-
-            if not conversation:
-                result.skipped += 1
-                continue
-
-            if conversation.get('sms_opt_in_status') != 'opted_in':
-                result.skipped += 1
-                continue
-
-            client_name = deal.get('client_name', '')
-            first_name = client_name.split()[0] if client_name else 'there'
-
-            agent_name = f"{deal.get('agent_first_name', '')} {deal.get('agent_last_name', '')}".strip()
-            agent_phone = deal.get('agent_phone', '')
-
-            custom_template = agency_settings.get('sms_lapse_template')
-            template = custom_template or DEFAULT_SMS_TEMPLATES.get('lapse_reminder', '')
-
-            message_body = replace_placeholders(template, {
-                'client_first_name': first_name,
-                'agent_name': agent_name,
-                'agent_phone': agent_phone,
-            })
-
-            success = _create_draft_message(
-                agency_id=agency_id,
-                conversation_id=conversation['id'],
-                agent_id=deal['agent_id'],
-                message_body=message_body,
-                metadata={
-                    'automated': True,
-                    'type': 'lapse_reminder',
-                    'deal_id': deal['deal_id'],
-                    'client_phone': deal['client_phone'],
-                    'client_name': client_name,
-                },
-            )
-
-            if success:
-                result.created += 1
-
-                # Update deal status to track notification
-                try:
-                    with connection.cursor() as cursor:
-                        cursor.execute("""
-                            UPDATE public.deals
-                            SET status_standardized = 'lapse_sms_notified',
-                                updated_at = NOW()
-                            WHERE id = %s
-                        """, [deal['deal_id']])
-                except Exception as e:
-                    logger.error(f"Failed to update deal status: {e}")
-            else:
-                result.failed += 1
-
+            _update_deal_statuses(created_deal_ids, 'lapse_sms_notified')
         except Exception as e:
-            result.failed += 1
-            result.errors.append(f"Deal {deal.get('deal_id', 'unknown')}: {e!s}")
-            logger.error(f"Error processing lapse reminder deal: {e}")
-
-    logger.info(
-        f'Lapse reminders completed: {result.created} created, '
-        f'{result.skipped} skipped, {result.failed} failed'
-    )
+            logger.error(f"Failed to update deal statuses: {e}")
 
+    _log_job_result('Lapse reminders', result)
     return result
 
 
@@ -497,92 +442,27 @@ def run_quarterly_checkins() -> MessageJobResult:
     logger.info('Running quarterly check-ins job')
 
     deals = get_quarterly_checkin_deals()
-    result = MessageJobResult(total=len(deals))
-
     if not deals:
         logger.info('No quarterly check-in deals found')
-        return result
-
-    agency_ids = [UUID(d['agency_id']) for d in deals]
-    agency_settings_map = batch_get_agency_sms_settings(agency_ids)
-
-    for deal in deals:
-        try:
-            agency_id = deal['agency_id']
-            agency_settings = agency_settings_map.get(agency_id, {})
-
-            if not deal.get('messaging_enabled', False):
-                result.skipped += 1
-                continue
-
-            if agency_settings.get('sms_quarterly_enabled') is False:
-                result.skipped += 1
-                continue
-
-            if not _check_tier_allows_auto_sms(deal.get('agent_subscription_tier')):
-                result.skipped += 1
-                continue
-
-            conversation = _find_conversation_for_deal(
-                agent_id=deal['agent_id'],
-                deal_id=deal['deal_id'],
-                agency_id=agency_id,
-                client_phone=deal['client_phone'],
-            )
-
-            if not conversation:
-                result.skipped += 1
-                continue
-
-            if conversation.get('sms_opt_in_status') != 'opted_in':
-                result.skipped += 1
-                continue
-
-            client_name = deal.get('client_name', '')
-            first_name = client_name.split()[0] if client_name else 'there'
-
-            agent_name = f"{deal.get('agent_first_name', '')} {deal.get('agent_last_name', '')}".strip()
-            agent_phone = deal.get('agent_phone', '')
-
-            custom_template = agency_settings.get('sms_quarterly_template')
-            template = custom_template or DEFAULT_SMS_TEMPLATES.get('quarterly', '')
-
-            message_body = replace_placeholders(template, {
-                'client_first_name': first_name,
-                'agent_name': agent_name,
-                'agent_phone': agent_phone,
-            })
-
-            success = _create_draft_message(
-                agency_id=agency_id,
-                conversation_id=conversation['id'],
-                agent_id=deal['agent_id'],
-                message_body=message_body,
-                metadata={
-                    'automated': True,
-                    'type': 'quarterly_checkin',
-                    'deal_id': deal['deal_id'],
-                    'client_phone': deal['client_phone'],
-                    'client_name': client_name,
-                    'days_since_effective': deal.get('days_since_effective'),
-                },
-            )
-
-            if success:
-                result.created += 1
-            else:
-                result.failed += 1
-
-        except Exception as e:
-            result.failed += 1
-            result.errors.append(f"Deal {deal.get('deal_id', 'unknown')}: {e!s}")
-            logger.error(f"Error processing quarterly check-in deal: {e}")
-
-    logger.info(
-        f'Quarterly check-ins completed: {result.created} created, '
-        f'{result.skipped} skipped, {result.failed} failed'
+        return MessageJobResult()
+
+    result, _ = _create_drafts_for_deals(
+        deals,
+        message_type='quarterly_checkin',
+        enabled_setting='sms_quarterly_enabled',
+        template_setting='sms_quarterly_template',
+        default_template='quarterly',
+        placeholders=lambda deal: {
+            'client_first_name': _first_name(deal),
+            'agent_name': _agent_name(deal),
+            'agent_phone': deal.get('agent_phone', ''),
+        },
+        extra_metadata=lambda deal: {
+            'days_since_effective': deal.get('days_since_effective'),
+        },
     )
 
+    _log_job_result('Quarterly check-ins', result)
     return result
 
 
@@ -596,87 +476,25 @@ def run_policy_packet_checkups() -> MessageJobResult:
     logger.info('Running policy packet checkups job')
 
     deals = get_policy_packet_checkup_deals()
-    result = MessageJobResult(total=len(deals))
-
     if not deals:
         logger.info('No policy packet checkup deals found')
-        return result
-
-    agency_ids = [UUID(d['agency_id']) for d in deals]
-    agency_settings_map = batch_get_agency_sms_settings(agency_ids)
-
-    for deal in deals:
-        try:
-            agency_id = deal['agency_id']
-            agency_settings = agency_settings_map.get(agency_id, {})
-
-            if not deal.get('messaging_enabled', False):
-                result.skipped += 1
-                continue
-
-            if agency_settings.get('sms_policy_packet_enabled') is False:
-                result.skipped += 1
-                continue
-
-            if not _check_tier_allows_auto_sms(deal.get('agent_subscription_tier')):
-                result.skipped += 1
-                continue
-
-            conversation = _find_conversation_for_deal(
-                agent_id=deal['agent_id'],
-                deal_id=deal['deal_id'],
-                agency_id=agency_id,
-                client_phone=deal['client_phone'],
-            )
-
-            if not conversation:
-                result.skipped += 1
-                continue
-
-            if conversation.get('sms_opt_in_status') != 'opted_in':
-                result.skipped += 1
-                continue
-
-            client_name = deal.get('client_name', '')
-            first_name = client_name.split()[0] if client_name else 'there'
-
-            custom_template = agency_settings.get('sms_policy_packet_template')
-            template = custom_template or DEFAULT_SMS_TEMPLATES.get('policy_packet', '')
-
-            message_body = replace_placeholders(template, {
-                'client_first_name': first_name,
-            })
-
-            success = _create_draft_message(
-                agency_id=agency_id,
-                conversation_id=conversation['id'],
-                agent_id=deal['agent_id'],
-                message_body=message_body,
-                metadata={
-                    'automated': True,
-                    'type': 'policy_packet',
-                    'deal_id': deal['deal_id'],
-                    'client_phone': deal['client_phone'],
-                    'client_name': client_name,
-                    'policy_effective_date': deal.get('policy_effective_date'),
-                },
-            )
-
-            if success:
-                result.created += 1
-            else:
-                result.failed += 1
-
-        except Exception as e:
-            result.failed += 1
-            result.errors.append(f"Deal {deal.get('deal_id', 'unknown')}: {e!s}")
-            logger.error(f"Error processing policy packet deal: {e}")
-
-    logger.info(
-        f'Policy packet checkups completed: {result.created} created, '
-        f'{result.skipped} skipped, {result.failed} failed'
+        return MessageJobResult()
+
+    result, _ = _create_drafts_for_deals(
+        deals,
+        message_type='policy_packet',
+        enabled_setting='sms_policy_packet_enabled',
+        template_setting='sms_policy_packet_template',
+        default_template='policy_packet',
+        placeholders=lambda deal: {
+            'client_first_name': _first_name(deal),
+        },
+        extra_metadata=lambda deal: {
+            'policy_effective_date': deal.get('policy_effective_date'),
+        },
     )
 
+    _log_job_result('Policy packet checkups', result)
     return result
 
 
@@ -693,91 +511,27 @@ def run_holiday_messages(holiday_name: str) -> MessageJobResult:
     logger.info(f'Running holiday messages job for: {holiday_name}')
 
     deals = get_holiday_message_deals(holiday_name=holiday_name)
-    result = MessageJobResult(total=len(deals))
-
     if not deals:
         logger.info('No holiday message deals found')
-        return result
-
-    agency_ids = [UUID(d['agency_id']) for d in deals]
-    agency_settings_map = batch_get_agency_sms_settings(agency_ids)
-
-    for deal in deals:
-        try:
-            agency_id = deal['agency_id']
-            agency_settings = agency_settings_map.get(agency_id, {})
-
-            if not deal.get('messaging_enabled', False):
-                result.skipped += 1
-                continue
-
-            if agency_settings.get('sms_holiday_enabled') is False:
-                result.skipped += 1
-                continue
-
-            if not _check_tier_allows_auto_sms(deal.get('agent_subscription_tier')):
-                result.skipped += 1
-                continue
-
-            conversation = _find_conversation_for_deal(
-                agent_id=deal['agent_id'],
-                deal_id=deal['deal_id'],
-                agency_id=agency_id,
-                client_phone=deal['client_phone'],
-            )
-
-            if not conversation:
-                result.skipped += 1
-                continue
-
-            if conversation.get('sms_opt_in_status') != 'opted_in':
-                result.skipped += 1
-                continue
-
-            client_name = deal.get('client_name', '')
-            first_name = client_name.split()[0] if client_name else 'there'
-
-            agent_name = f"{deal.get('agent_first_name', '')} {deal.get('agent_last_name', '')}".strip()
-
-            custom_template = agency_settings.get('sms_holiday_template')
-            template = custom_template or DEFAULT_SMS_TEMPLATES.get('holiday', '')
-
-            message_body = replace_placeholders(template, {
-                'client_first_name': first_name,
-                'agent_name': agent_name,
-                'holiday_greeting': holiday_name,
-            })
-
-            success = _create_draft_message(
-                agency_id=agency_id,
-                conversation_id=conversation['id'],
-                agent_id=deal['agent_id'],
-                message_body=message_body,
-                metadata={
-                    'automated': True,
-                    'type': 'holiday',
-                    'deal_id': deal['deal_id'],
-                    'client_phone': deal['client_phone'],
-                    'client_name': client_name,
-                    'holiday_name': holiday_name,
-                },
-            )
-
-            if success:
-                result.created += 1
-            else:
-                result.failed += 1
-
-        except Exception as e:
-            result.failed += 1
-            result.errors.append(f"Deal {deal.get('deal_id', 'unknown')}: {e!s}")
-            logger.error(f"Error processing holiday message deal: {e}")
-
-    logger.info(
-        f'Holiday messages completed: {result.created} created, '
-        f'{result.skipped} skipped, {result.failed} failed'
+        return MessageJobResult()
+
+    result, _ = _create_drafts_for_deals(
+        deals,
+        message_type='holiday',
+        enabled_setting='sms_holiday_enabled',
+        template_setting='sms_holiday_template',
+        default_template='holiday',
+        placeholders=lambda deal: {
+            'client_first_name': _first_name(deal),
+            'agent_name': _agent_name(deal),
+            'holiday_greeting': holiday_name,
+        },
+        extra_metadata=lambda deal: {
+            'holiday_name': holiday_name,
+        },
     )
 
+    _log_job_result('Holiday messages', result)
     return result
 
 
@@ -799,38 +553,25 @@ def run_needs_info_notifications() -> MessageJobResult:
         logger.info('No needs more info deals found')
         return result
 
+    eligible_ids = []
     for deal in deals:
+        if (
+            not deal.get('messaging_enabled', False)
+            or not _check_tier_allows_auto_sms(deal.get('agent_subscription_tier'))
+        ):
+            result.skipped += 1
+            continue
+        eligible_ids.append(deal['deal_id'])
+
+    # Update deal status to track notification
+    if eligible_ids:
         try:
-            if not deal.get('messaging_enabled', False):
-                result.skipped += 1
-                continue
-
-            if not _check_tier_allows_auto_sms(deal.get('agent_subscription_tier')):
-                result.skipped += 1
-                continue
-
-            # Update deal status to track notification
-            try:
-                with connection.cursor() as cursor:
-                    cursor.execute("""
-                        UPDATE public.deals
-                        SET status_standardized = 'needs_more_info_notified',
-                            updated_at = NOW()
-                        WHERE id = %s
-                    """, [deal['deal_id']])
-                result.created += 1
-            except Exception as e:
-                logger.error(f"Failed to update deal status: {e}")
-                result.failed += 1
-
+            _update_deal_statuses(eligible_ids, 'needs_more_info_notified')
+            result.created = len(eligible_ids)
         except Exception as e:
-            result.failed += 1
-            result.errors.append(f"Deal {deal.get('deal_id', 'unknown')}: {e!s}")
-            logger.error(f"Error processing needs info deal: {e}")
-
-    logger.info(
-        f'Needs info notifications completed: {result.created} processed, '
-        f'{result.skipped} skipped, {result.failed} failed'
-    )
+            logger.error(f"Failed to update deal statuses: {e}")
+            result.failed = len(eligible_ids)
+            result.errors.append(f'Updating {len(eligible_ids)} deals: {e!s}')
 
+    _log_job_result('Needs info notifications', result, created_label='processed')
     return result
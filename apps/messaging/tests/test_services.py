@@ -0,0 +1,109 @@
+"""
+Messaging Services Unit Tests
+
+Tests for set-based draft creation in the cron jobs.
+"""
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from apps.messaging import services
+from apps.messaging.services import _create_drafts_for_deals, run_lapse_reminders
+
+AGENCY_ID = '11111111-1111-1111-1111-111111111111'
+
+
+def make_deal(n: int, **overrides) -> dict:
+    deal = {
+        'deal_id': f'00000000-0000-0000-0000-{n:012d}',
+        'agent_id': '22222222-2222-2222-2222-222222222222',
+        'agency_id': AGENCY_ID,
+        'client_name': f'Client{n} Smith',
+        'client_phone': f'555000{n:04d}',
+        'messaging_enabled': True,
+        'agent_subscription_tier': 'pro',
+    }
+    deal.update(overrides)
+    return deal
+
+
+def opted_in(*deals) -> dict:
+    return {d['deal_id']: {'id': f'conv-{d["deal_id"]}', 'sms_opt_in_status': 'opted_in'} for d in deals}
+
+
+@patch('apps.messaging.services._insert_draft_messages')
+@patch('apps.messaging.services._find_conversations_for_deals')
+@patch('apps.messaging.services.batch_get_agency_sms_settings')
+class CreateDraftsTests(SimpleTestCase):
+    """Tests for _create_drafts_for_deals."""
+
+    def _run(self, deals):
+        return _create_drafts_for_deals(
+            deals,
+            message_type='birthday',
+            enabled_setting='sms_birthday_enabled',
+            template_setting='sms_birthday_template',
+            default_template='birthday',
+            placeholders=lambda deal: {'client_first_name': services._first_name(deal)},
+        )
+
+    def test_counts_and_batched_insert(self, mock_settings, mock_find, mock_insert):
+        """Ineligible deals are skipped and the rest are inserted in one call."""
+        mock_settings.return_value = {AGENCY_ID: {'sms_birthday_template': 'Hi {{client_first_name}}'}}
+        ok, free_tier, no_conversation, opted_out = (
+            make_deal(1), make_deal(2, agent_subscription_tier='free'), make_deal(3), make_deal(4),
+        )
+        conversations = opted_in(ok)
+        conversations[opted_out['deal_id']] = {'id': 'conv-4', 'sms_opt_in_status': 'opted_out'}
+        mock_find.return_value = conversations
+
+        result, created = self._run([ok, free_tier, no_conversation, opted_out])
+
+        self.assertEqual((result.total, result.created, result.skipped, result.failed), (4, 1, 3, 0))
+        self.assertEqual(created, [ok['deal_id']])
+        # Conversations are resolved once, for eligible deals only
+        mock_find.assert_called_once_with([ok, no_conversation, opted_out])
+        (drafts,), _ = mock_insert.call_args
+        self.assertEqual(drafts[0].content, 'Hi Client1')
+        self.assertEqual(drafts[0].metadata['type'], 'birthday')
+
+    def test_disabled_agency_setting_skips(self, mock_settings, mock_find, mock_insert):
+        mock_settings.return_value = {AGENCY_ID: {'sms_birthday_enabled': False}}
+        mock_find.return_value = {}
+
+        result, created = self._run([make_deal(1), make_deal(2)])
+
+        self.assertEqual(result.skipped, 2)
+        self.assertEqual(created, [])
+        mock_insert.assert_not_called()
+
+    def test_insert_failure_counts_batch(self, mock_settings, mock_find, mock_insert):
+        """A failed INSERT fails every draft in its batch only."""
+        mock_settings.return_value = {}
+        deals = [make_deal(n) for n in range(5)]
+        mock_find.return_value = opted_in(*deals)
+        mock_insert.side_effect = [RuntimeError('db down'), None, None]
+
+        with patch.object(services, 'DRAFT_INSERT_BATCH_SIZE', 2):
+            result, created = self._run(deals)
+
+        self.assertEqual(mock_insert.call_count, 3)
+        self.assertEqual((result.created, result.failed), (3, 2))
+        self.assertEqual(created, [d['deal_id'] for d in deals[2:]])
+        self.assertEqual(len(result.errors), 1)
+
+
+class LapseRemindersTests(SimpleTestCase):
+    """Tests for run_lapse_reminders."""
+
+    @patch('apps.messaging.services._update_deal_statuses')
+    @patch('apps.messaging.services._create_drafts_for_deals')
+    @patch('apps.messaging.services.get_lapse_reminder_deals')
+    def test_marks_created_deals_in_one_update(self, mock_deals, mock_create, mock_update):
+        mock_deals.return_value = [make_deal(1), make_deal(2)]
+        mock_create.return_value = (services.MessageJobResult(total=2, created=1, skipped=1), ['d1'])
+
+        result = run_lapse_reminders()
+
+        self.assertEqual(result.created, 1)
+        mock_update.assert_called_once_with(['d1'], 'lapse_sms_notified')
@@ -0,0 +1,46 @@
+"""
+Messaging Views Unit Tests
+
+Tests for the cron-triggered run endpoints.
+"""
+from unittest.mock import patch
+from uuid import uuid4
+
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from apps.core.authentication import SYSTEM_USER_ID
+from apps.messaging.jobs import MESSAGING_RUN_JOB
+from apps.messaging.views import RunBillingRemindersView, RunBirthdayMessagesView
+
+
+@override_settings(CRON_SECRET='test-cron-secret')
+@patch('apps.messaging.views.enqueue_job')
+class CronRunViewTests(SimpleTestCase):
+    """Run endpoints called with the cron secret."""
+
+    def _post(self, view, path):
+        request = APIRequestFactory().post(path, HTTP_X_CRON_SECRET='test-cron-secret')
+        return view.as_view()(request)
+
+    def test_cron_job_has_no_agency(self, mock_enqueue):
+        """The system user's placeholder agency is not written to background_jobs."""
+        mock_enqueue.return_value = uuid4()
+
+        response = self._post(RunBillingRemindersView, '/api/messaging/run/billing-reminders')
+
+        self.assertEqual(response.status_code, 202)
+        mock_enqueue.assert_called_once_with(
+            MESSAGING_RUN_JOB,
+            {'run': 'billing_reminders'},
+            agency_id=None,
+            created_by=SYSTEM_USER_ID,
+        )
+
+    def test_wrong_secret_rejected(self, mock_enqueue):
+        request = APIRequestFactory().post('/api/messaging/run/birthday-messages', HTTP_X_CRON_SECRET='wrong')
+
+        response = RunBirthdayMessagesView.as_view()(request)
+
+        self.assertEqual(response.status_code, 403)
+        mock_enqueue.assert_not_called()
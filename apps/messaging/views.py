@@ -12,7 +12,8 @@ Query endpoints (GET - return eligible deals):
 - GET /api/messaging/policy-checkups - Deals for policy packet checkup
 - GET /api/messaging/quarterly-checkins - Deals for quarterly check-in
 
-Run endpoints (POST - create draft messages):
+Run endpoints (POST - queue a job creating draft messages; 202 with job_id,
+poll GET /api/jobs/{job_id} for the counts):
 - POST /api/messaging/run/birthday-messages - Create birthday draft messages
 - POST /api/messaging/run/billing-reminders - Create billing reminder drafts
 - POST /api/messaging/run/lapse-reminders - Create lapse reminder drafts
@@ -29,7 +30,10 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.core.authentication import CronSecretAuthentication, SupabaseJWTAuthentication, get_user_context
+from apps.core.jobs import enqueue_job, job_agency_id
+from apps.core.mixins import job_accepted_response
 
+from .jobs import MESSAGING_RUN_JOB
 from .selectors import (
     get_billing_reminder_deals,
     get_birthday_message_deals,
@@ -39,15 +43,6 @@ from .selectors import (
     get_policy_packet_checkup_deals,
     get_quarterly_checkin_deals,
 )
-from .services import (
-    run_birthday_messages,
-    run_billing_reminders,
-    run_lapse_reminders,
-    run_quarterly_checkins,
-    run_policy_packet_checkups,
-    run_holiday_messages,
-    run_needs_info_notifications,
-)
 
 logger = logging.getLogger(__name__)
 
@@ -352,7 +347,7 @@ class RunBirthdayMessagesView(APIView):
     """
     POST /api/messaging/run/birthday-messages
 
-    Execute the birthday messages job to create draft messages.
+    Queue the birthday messages job to create draft messages.
     Used by Vercel cron to trigger the full messaging workflow.
     """
     authentication_classes = [CronSecretAuthentication, SupabaseJWTAuthentication]
@@ -374,18 +369,16 @@ class RunBirthdayMessagesView(APIView):
             )
 
         try:
-            result = run_birthday_messages()
-            return Response({
-                'success': True,
-                'total': result.total,
-                'created': result.created,
-                'skipped': result.skipped,
-                'failed': result.failed,
-                'errors': result.errors[:10] if result.errors else [],
-            })
+            job_id = enqueue_job(
+                MESSAGING_RUN_JOB,
+                {'run': 'birthday_messages'},
+                agency_id=job_agency_id(user),
+                created_by=user.id,
+            )
+            return job_accepted_response(job_id)
 
         except Exception as e:
-            logger.error(f'Run birthday messages failed: {e}')
+            logger.error(f'Enqueue birthday messages failed: {e}')
             return Response(
                 {'success': False, 'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -396,7 +389,7 @@ class RunBillingRemindersView(APIView):
     """
     POST /api/messaging/run/billing-reminders
 
-    Execute the billing reminders job to create draft messages.
+    Queue the billing reminders job to create draft messages.
     """
     authentication_classes = [CronSecretAuthentication, SupabaseJWTAuthentication]
     permission_classes = [IsAuthenticated]
@@ -417,18 +410,16 @@ class RunBillingRemindersView(APIView):
             )
 
         try:
-            result = run_billing_reminders()
-            return Response({
-                'success': True,
-                'total': result.total,
-                'created': result.created,
-                'skipped': result.skipped,
-                'failed': result.failed,
-                'errors': result.errors[:10] if result.errors else [],
-            })
+            job_id = enqueue_job(
+                MESSAGING_RUN_JOB,
+                {'run': 'billing_reminders'},
+                agency_id=job_agency_id(user),
+                created_by=user.id,
+            )
+            return job_accepted_response(job_id)
 
         except Exception as e:
-            logger.error(f'Run billing reminders failed: {e}')
+            logger.error(f'Enqueue billing reminders failed: {e}')
             return Response(
                 {'success': False, 'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -439,7 +430,7 @@ class RunLapseRemindersView(APIView):
     """
     POST /api/messaging/run/lapse-reminders
 
-    Execute the lapse reminders job to create draft messages.
+    Queue the lapse reminders job to create draft messages.
     """
     authentication_classes = [CronSecretAuthentication, SupabaseJWTAuthentication]
     permission_classes = [IsAuthenticated]
@@ -460,18 +451,16 @@ class RunLapseRemindersView(APIView):
             )
 
         try:
-            result = run_lapse_reminders()
-            return Response({
-                'success': True,
-                'total': result.total,
-                'created': result.created,
-                'skipped': result.skipped,
-                'failed': result.failed,
-                'errors': result.errors[:10] if result.errors else [],
-            })
+            job_id = enqueue_job(
+                MESSAGING_RUN_JOB,
+                {'run': 'lapse_reminders'},
+                agency_id=job_agency_id(user),
+                created_by=user.id,
+            )
+            return job_accepted_response(job_id)
 
         except Exception as e:
-            logger.error(f'Run lapse reminders failed: {e}')
+            logger.error(f'Enqueue lapse reminders failed: {e}')
             return Response(
                 {'success': False, 'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -482,7 +471,7 @@ class RunQuarterlyCheckinsView(APIView):
     """
     POST /api/messaging/run/quarterly-checkins
 
-    Execute the quarterly check-ins job to create draft messages.
+    Queue the quarterly check-ins job to create draft messages.
     """
     authentication_classes = [CronSecretAuthentication, SupabaseJWTAuthentication]
     permission_classes = [IsAuthenticated]
@@ -503,18 +492,16 @@ class RunQuarterlyCheckinsView(APIView):
             )
 
         try:
-            result = run_quarterly_checkins()
-            return Response({
-                'success': True,
-                'total': result.total,
-                'created': result.created,
-                'skipped': result.skipped,
-                'failed': result.failed,
-                'errors': result.errors[:10] if result.errors else [],
-            })
+            job_id = enqueue_job(
+                MESSAGING_RUN_JOB,
+                {'run': 'quarterly_checkins'},
+                agency_id=job_agency_id(user),
+                created_by=user.id,
+            )
+            return job_accepted_response(job_id)
 
         except Exception as e:
-            logger.error(f'Run quarterly check-ins failed: {e}')
+            logger.error(f'Enqueue quarterly check-ins failed: {e}')
             return Response(
                 {'success': False, 'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -525,7 +512,7 @@ class RunPolicyPacketCheckupsView(APIView):
     """
     POST /api/messaging/run/policy-packet-checkups
 
-    Execute the policy packet checkups job to create draft messages.
+    Queue the policy packet checkups job to create draft messages.
     """
     authentication_classes = [CronSecretAuthentication, SupabaseJWTAuthentication]
     permission_classes = [IsAuthenticated]
@@ -546,18 +533,16 @@ class RunPolicyPacketCheckupsView(APIView):
             )
 
         try:
-            result = run_policy_packet_checkups()
-            return Response({
-                'success': True,
-                'total': result.total,
-                'created': result.created,
-                'skipped': result.skipped,
-                'failed': result.failed,
-                'errors': result.errors[:10] if result.errors else [],
-            })
+            job_id = enqueue_job(
+                MESSAGING_RUN_JOB,
+                {'run': 'policy_packet_checkups'},
+                agency_id=job_agency_id(user),
+                created_by=user.id,
+            )
+            return job_accepted_response(job_id)
 
         except Exception as e:
-            logger.error(f'Run policy packet checkups failed: {e}')
+            logger.error(f'Enqueue policy packet checkups failed: {e}')
             return Response(
                 {'success': False, 'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -568,7 +553,7 @@ class RunHolidayMessagesView(APIView):
     """
     POST /api/messaging/run/holiday-messages
 
-    Execute the holiday messages job to create draft messages.
+    Queue the holiday messages job to create draft messages.
 
     Request body:
         holiday_name: Name of the holiday (required)
@@ -599,19 +584,16 @@ class RunHolidayMessagesView(APIView):
             )
 
         try:
-            result = run_holiday_messages(holiday_name=holiday_name)
-            return Response({
-                'success': True,
-                'holiday_name': holiday_name,
-                'total': result.total,
-                'created': result.created,
-                'skipped': result.skipped,
-                'failed': result.failed,
-                'errors': result.errors[:10] if result.errors else [],
-            })
+            job_id = enqueue_job(
+                MESSAGING_RUN_JOB,
+                {'run': 'holiday_messages', 'holiday_name': holiday_name},
+                agency_id=job_agency_id(user),
+                created_by=user.id,
+            )
+            return job_accepted_response(job_id)
 
         except Exception as e:
-            logger.error(f'Run holiday messages failed: {e}')
+            logger.error(f'Enqueue holiday messages failed: {e}')
             return Response(
                 {'success': False, 'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -622,7 +604,7 @@ class RunNeedsInfoNotificationsView(APIView):
     """
     POST /api/messaging/run/needs-info-notifications
 
-    Execute the needs info notifications job.
+    Queue the needs info notifications job.
     """
     authentication_classes = [CronSecretAuthentication, SupabaseJWTAuthentication]
     permission_classes = [IsAuthenticated]
@@ -643,18 +625,16 @@ class RunNeedsInfoNotificationsView(APIView):
             )
 
         try:
-            result = run_needs_info_notifications()
-            return Response({
-                'success': True,
-                'total': result.total,
-                'created': result.created,
-                'skipped': result.skipped,
-                'failed': result.failed,
-                'errors': result.errors[:10] if result.errors else [],
-            })
+            job_id = enqueue_job(
+                MESSAGING_RUN_JOB,
+                {'run': 'needs_info_notifications'},
+                agency_id=job_agency_id(user),
+                created_by=user.id,
+            )
+            return job_accepted_response(job_id)
 
         except Exception as e:
-            logger.error(f'Run needs info notifications failed: {e}')
+            logger.error(f'Enqueue needs info notifications failed: {e}')
             return Response(
                 {'success': False, 'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -6,14 +6,26 @@ Job management functions for NIPR processing translated from Supabase RPC functi
 - complete_nipr_job -> complete_job()
 - update_nipr_job_progress -> update_job_progress()
 - release_stale_nipr_locks -> release_stale_locks()
+
+Job state changes are published on NIPR_EVENTS_CHANNEL (see apps.core.events)
+for the progress SSE stream.
 """
 import logging
 from uuid import UUID
 
 from django.db import connection, transaction
 
+from apps.core.events import publish
+
 logger = logging.getLogger(__name__)
 
+NIPR_EVENTS_CHANNEL = 'nipr_events'
+
+
+def _publish_job_event(job_id: UUID | str | None) -> None:
+    # job_id None means several jobs changed (e.g. stale locks released)
+    publish(NIPR_EVENTS_CHANNEL, {'event': 'job_updated', 'job_id': str(job_id) if job_id else None})
+
 
 def acquire_job() -> dict | None:
     """
@@ -59,6 +71,7 @@ def acquire_job() -> dict | None:
     if not row:
         return None
 
+    _publish_job_event(row[0])
     return {
         'job_id': str(row[0]),
         'user_id': str(row[1]) if row[1] else None,
@@ -109,6 +122,8 @@ def complete_job(
             WHERE id = %s
         """, [success, success, files, carriers, error, str(job_id)])
 
+    _publish_job_event(job_id)
+
 
 def update_job_progress(
     job_id: UUID,
@@ -136,6 +151,8 @@ def update_job_progress(
             WHERE id = %s
         """, [progress, message, str(job_id)])
 
+    _publish_job_event(job_id)
+
 
 def release_stale_locks() -> int:
     """
@@ -158,8 +175,11 @@ def release_stale_locks() -> int:
             WHERE status = 'processing'
             AND locked_until < NOW()
         """)
+        released = cursor.rowcount
 
-        return cursor.rowcount
+    if released:
+        _publish_job_event(None)
+    return released
 
 
 def create_job(
@@ -9,6 +9,8 @@ from uuid import UUID
 
 from django.db import connection, transaction
 
+from apps.core.authentication import invalidate_cached_user
+
 logger = logging.getLogger(__name__)
 
 
@@ -255,12 +257,18 @@ def complete_onboarding(user_id: UUID) -> bool:
             UPDATE users
             SET status = 'active'
             WHERE id = %s AND status = 'onboarding'
-            RETURNING id
+            RETURNING id, auth_user_id
         """, [str(user_id)])
 
         row = cursor.fetchone()
 
-    return row is not None
+    if row is None:
+        return False
+
+    # IsActiveUser reads the cached user; drop the 'onboarding' copy on commit
+    auth_user_id = row[1]
+    transaction.on_commit(lambda: invalidate_cached_user(auth_user_id))
+    return True
 
 
 @transaction.atomic
@@ -3,10 +3,13 @@ Server-Sent Events (SSE) for NIPR Progress
 
 Provides real-time updates for NIPR verification progress.
 Replaces 30s polling with efficient SSE streaming.
+
+Job changes arrive as nipr_events notifications (see apps.core.events); the
+job is only re-read when one arrives. If the event hub is unavailable the
+stream falls back to polling every SSE_POLL_INTERVAL seconds. Under ASGI
+(uvicorn) it is served asynchronously, see apps.core.sse.
 """
-import json
 import logging
-import time
 from uuid import UUID
 
 from django.db import connection
@@ -15,122 +18,83 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 
 from apps.core.authentication import get_user_context
+from apps.core.sse import EventStream, format_event, sse_response
+from apps.nipr.services import NIPR_EVENTS_CHANNEL
 
 logger = logging.getLogger(__name__)
 
-# SSE polling interval in seconds
+# SSE polling interval in seconds (when the event hub is unavailable)
 SSE_POLL_INTERVAL = 2
 
+# Keepalive comment interval while waiting for events
+SSE_KEEPALIVE_INTERVAL = 15
+
 # Maximum time to keep connection open (5 minutes)
 SSE_MAX_DURATION = 300
 
 
-class NiprProgressSSEView(APIView):
+class NiprProgressStream(EventStream):
     """
-    GET /api/onboarding/nipr/sse?job_id={job_id}
+    Progress of one NIPR job.
 
-    Server-Sent Events stream for NIPR job progress.
-    Polls database every 2 seconds and pushes updates to client.
-    Connection closes automatically when job completes/fails or after 5 minutes.
+    Events:
+    - progress: Job progress update (status, progress %, message)
+    - completed: Job completed successfully with results
+    - failed: Job failed with error message
+    - timeout: Stream timeout (client should reconnect or handle)
     """
-    permission_classes = [IsAuthenticated]
+    # Any job event may move this job's queue position, so no predicate
+    channel = NIPR_EVENTS_CHANNEL
+    poll_interval = SSE_POLL_INTERVAL
+    keepalive_interval = SSE_KEEPALIVE_INTERVAL
+    max_duration = SSE_MAX_DURATION
+
+    def __init__(self, job_id: UUID):
+        self.job_key = str(job_id)
+
+    def open(self) -> list[str]:
+        return self.handle([])
+
+    def handle(self, batch: list[dict]) -> list[str]:
+        # Fetch job status from database
+        job = self._get_job_status()
+
+        if not job:
+            self.finished = True
+            return [format_event('error', {'error': 'Job not found'})]
+
+        event_name, event_data = self._build_event(job)
+
+        # Handle terminal states
+        if event_name in ('completed', 'failed'):
+            self.finished = True
+        return [format_event(event_name, event_data)]
+
+    def _build_event(self, job: dict) -> tuple[str, dict]:
+        """Build the SSE event name and data for a job's current state."""
+        event_data = {
+            'job_id': self.job_key,
+            'status': job['status'],
+            'progress': job['progress'],
+            'progress_message': job['progress_message'],
+            'queue_position': job['queue_position'],
+        }
 
-    def get(self, request):
-        user = get_user_context(request)
-        if not user:
-            return StreamingHttpResponse(
-                self._error_stream('Unauthorized'),
-                content_type='text/event-stream',
-                status=401
-            )
+        if job['status'] == 'completed':
+            event_data.update({
+                'result_files': job['result_files'],
+                'result_carriers': job['result_carriers'],
+                'completed_at': job['completed_at'],
+            })
+            return 'completed', event_data
 
-        job_id_str = request.GET.get('job_id')
-        if not job_id_str:
-            return StreamingHttpResponse(
-                self._error_stream('job_id parameter required'),
-                content_type='text/event-stream',
-                status=400
-            )
+        if job['status'] == 'failed':
+            event_data['error_message'] = job['error_message']
+            return 'failed', event_data
 
-        try:
-            job_id = UUID(job_id_str)
-        except ValueError:
-            return StreamingHttpResponse(
-                self._error_stream('Invalid job_id format'),
-                content_type='text/event-stream',
-                status=400
-            )
-
-        response = StreamingHttpResponse(
-            self._event_stream(job_id, user.id),
-            content_type='text/event-stream'
-        )
-        # Disable buffering for real-time streaming
-        response['Cache-Control'] = 'no-cache'
-        response['X-Accel-Buffering'] = 'no'  # For nginx
-        return response
+        return 'progress', event_data
 
-    def _error_stream(self, message: str):
-        """Generate an error event and close stream."""
-        yield f"event: error\ndata: {json.dumps({'error': message})}\n\n"
-
-    def _event_stream(self, job_id: UUID, user_id: UUID):
-        """
-        Generate SSE events for NIPR job progress.
-
-        Events:
-        - progress: Job progress update (status, progress %, message)
-        - completed: Job completed successfully with results
-        - failed: Job failed with error message
-        - timeout: Stream timeout (client should reconnect or handle)
-        """
-        start_time = time.time()
-
-        while True:
-            # Check timeout
-            elapsed = time.time() - start_time
-            if elapsed > SSE_MAX_DURATION:
-                yield f"event: timeout\ndata: {json.dumps({'message': 'Stream timeout'})}\n\n"
-                break
-
-            # Fetch job status from database
-            job = self._get_job_status(job_id)
-
-            if not job:
-                yield f"event: error\ndata: {json.dumps({'error': 'Job not found'})}\n\n"
-                break
-
-            # Build event data
-            event_data = {
-                'job_id': str(job_id),
-                'status': job['status'],
-                'progress': job['progress'],
-                'progress_message': job['progress_message'],
-                'queue_position': job['queue_position'],
-            }
-
-            # Handle terminal states
-            if job['status'] == 'completed':
-                event_data.update({
-                    'result_files': job['result_files'],
-                    'result_carriers': job['result_carriers'],
-                    'completed_at': job['completed_at'],
-                })
-                yield f"event: completed\ndata: {json.dumps(event_data)}\n\n"
-                break
-
-            elif job['status'] == 'failed':
-                event_data['error_message'] = job['error_message']
-                yield f"event: failed\ndata: {json.dumps(event_data)}\n\n"
-                break
-
-            # Progress update
-            yield f"event: progress\ndata: {json.dumps(event_data)}\n\n"
-
-            # Wait before next poll
-            time.sleep(SSE_POLL_INTERVAL)
-
-    def _get_job_status(self, job_id: UUID) -> dict | None:
+    def _get_job_status(self) -> dict | None:
         """Fetch NIPR job status from database."""
         with connection.cursor() as cursor:
             cursor.execute("""
@@ -151,7 +115,7 @@ class NiprProgressSSEView(APIView):
                     ) as queue_position
                 FROM nipr_jobs nj
                 WHERE nj.id = %s
-            """, [str(job_id)])
+            """, [self.job_key])
 
             row = cursor.fetchone()
 
@@ -169,3 +133,41 @@ class NiprProgressSSEView(APIView):
             'error_message': row[7],
             'queue_position': row[8] if row[1] == 'pending' else None,
         }
+
+
+class NiprProgressSSEView(APIView):
+    """
+    GET /api/onboarding/nipr/sse?job_id={job_id}
+
+    Server-Sent Events stream for NIPR job progress.
+    Re-reads the job whenever a NIPR job changes and pushes updates to client.
+    Connection closes automatically when job completes/fails or after 5 minutes.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        user = get_user_context(request)
+        if not user:
+            return self._error_response('Unauthorized', 401)
+
+        job_id_str = request.GET.get('job_id')
+        if not job_id_str:
+            return self._error_response('job_id parameter required', 400)
+
+        try:
+            job_id = UUID(job_id_str)
+        except ValueError:
+            return self._error_response('Invalid job_id format', 400)
+
+        return sse_response(request, NiprProgressStream(job_id))
+
+    def _error_response(self, message: str, status: int) -> StreamingHttpResponse:
+        return StreamingHttpResponse(
+            self._error_stream(message),
+            content_type='text/event-stream',
+            status=status
+        )
+
+    def _error_stream(self, message: str):
+        """Generate an error event and close stream."""
+        yield format_event('error', {'error': message})
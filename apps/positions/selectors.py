@@ -11,6 +11,7 @@ from uuid import UUID
 from django.db.models import Count, Q
 
 from apps.core.models import Position, PositionProductCommission, User
+from apps.core.reference_data import reference_cached
 
 
 def get_positions_for_agency(user_id: UUID, include_agent_count: bool = False) -> list[dict]:
@@ -36,6 +37,15 @@ def get_positions_for_agency(user_id: UUID, include_agent_count: bool = False) -
 
     agency_id = user['agency_id']
 
+    # Agent counts change with every user write, so only the plain list is cached
+    if not include_agent_count:
+        return _get_positions(agency_id)
+
+    return _get_positions.uncached(agency_id, include_agent_count=True)
+
+
+@reference_cached('positions.agency', agency_arg='agency_id')
+def _get_positions(agency_id: UUID, include_agent_count: bool = False) -> list[dict]:
     # Query positions - order by level DESC to match RPC
     positions = (
         Position.objects  # type: ignore[attr-defined]
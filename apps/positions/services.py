@@ -8,6 +8,8 @@ from uuid import UUID
 
 from django.db import connection, transaction
 
+from apps.core.reference_data import bump_reference_version
+
 
 @transaction.atomic
 def create_position(
@@ -38,6 +40,7 @@ def create_position(
             RETURNING id, agency_id, name, level, description, is_active, created_at
         """, [str(agency_id), name, level, description, is_active])
         columns = [col[0] for col in cursor.description]
+        bump_reference_version(agency_id)
         return dict(zip(columns, cursor.fetchone(), strict=False))
 
 
@@ -100,6 +103,7 @@ def update_position(
         columns = [col[0] for col in cursor.description]
         row = cursor.fetchone()
         if row:
+            bump_reference_version(agency_id)
             return dict(zip(columns, row, strict=False))
         return None
 
@@ -143,7 +147,10 @@ def delete_position(
             WHERE id = %s AND agency_id = %s
             RETURNING id
         """, [str(position_id), str(agency_id)])
-        return cursor.fetchone() is not None
+        deleted = cursor.fetchone() is not None
+        if deleted:
+            bump_reference_version(agency_id)
+        return deleted
 
 
 @transaction.atomic
@@ -19,6 +19,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.core.authentication import get_user_context
+from apps.core.mixins import reference_data_etag
 
 from .selectors import (
     get_all_position_product_commissions,
@@ -61,6 +62,7 @@ class PositionsListView(APIView):
     """
     permission_classes = [IsAuthenticated]
 
+    @reference_data_etag('positions.list', agency_scoped=True)
     def get(self, request):
         user = get_user_context(request)
         if not user:
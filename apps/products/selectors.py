@@ -8,8 +8,10 @@ Uses Django ORM with select_related for efficient queries.
 from uuid import UUID
 
 from apps.core.models import Product
+from apps.core.reference_data import reference_cached
 
 
+@reference_cached('products.carrier', agency_arg='agency_id')
 def get_products_for_carrier(carrier_id: UUID, agency_id: UUID) -> list[dict]:
     """
     Get all active products for a specific carrier and agency.
@@ -46,6 +48,7 @@ def get_products_for_carrier(carrier_id: UUID, agency_id: UUID) -> list[dict]:
     ]
 
 
+@reference_cached('products.all', agency_arg='agency_id')
 def get_all_products_for_agency(agency_id: UUID) -> list[dict]:
     """
     Get all active products for an agency with carrier information.
@@ -118,6 +121,7 @@ def get_product_by_id(product_id: UUID, agency_id: UUID) -> dict | None:
     }
 
 
+@reference_cached('products.dropdown', agency_arg='agency_id')
 def get_products_for_dropdown(agency_id: UUID, carrier_id: UUID | None = None) -> list[dict]:
     """
     Get products for dropdown selection (lightweight query).
@@ -8,6 +8,8 @@ from uuid import UUID
 
 from django.db import connection, transaction
 
+from apps.core.reference_data import bump_reference_version
+
 
 @transaction.atomic
 def create_product(
@@ -62,6 +64,7 @@ def create_product(
             WHERE agency_id = %s AND is_active = true
         """, [str(product['id']), str(agency_id)])
 
+        bump_reference_version(agency_id)
         return product
 
 
@@ -119,6 +122,7 @@ def update_product(
         columns = [col[0] for col in cursor.description]
         row = cursor.fetchone()
         if row:
+            bump_reference_version(agency_id)
             return dict(zip(columns, row, strict=False))
         return None
 
@@ -146,4 +150,7 @@ def delete_product(
             WHERE id = %s AND agency_id = %s
             RETURNING id
         """, [str(product_id), str(agency_id)])
-        return cursor.fetchone() is not None
+        deleted = cursor.fetchone() is not None
+        if deleted:
+            bump_reference_version(agency_id)
+        return deleted
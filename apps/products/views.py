@@ -16,6 +16,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.core.authentication import get_user_context
+from apps.core.mixins import reference_data_etag
 
 from .selectors import (
     get_all_products_for_agency,
@@ -50,6 +51,7 @@ class ProductsListView(APIView):
     """
     permission_classes = [IsAuthenticated]
 
+    @reference_data_etag('products.carrier', agency_scoped=True)
     def get(self, request):
         user = get_user_context(request)
         if not user:
@@ -175,6 +177,7 @@ class AllProductsView(APIView):
     """
     permission_classes = [IsAuthenticated]
 
+    @reference_data_etag('products.all', agency_scoped=True)
     def get(self, request):
         user = get_user_context(request)
         if not user:
@@ -9,6 +9,8 @@ from uuid import UUID
 
 from django.db import connection
 
+from apps.core.hierarchy import get_downline_ids
+
 
 def search_agents_downline(
     user_id: UUID,
@@ -26,7 +28,7 @@ def search_agents_downline(
         search_query: Search term
         limit: Maximum results
         search_type: 'downline' or 'pre-invite'
-        agency_id: Agency ID for pre-invite search
+        agency_id: Agency ID (required for both search types)
 
     Returns:
         List of matching agents
@@ -63,17 +65,8 @@ def search_agents_downline(
             ])
         else:
             # Search in user's downline
+            downline_ids = [str(uid) for uid in get_downline_ids(user_id, agency_id, include_self=True)]
             cursor.execute("""
-                WITH RECURSIVE downline AS (
-                    SELECT u.id
-                    FROM users u
-                    WHERE u.id = %s
-                    UNION ALL
-                    SELECT u.id
-                    FROM users u
-                    JOIN downline d ON u.upline_id = d.id
-                    WHERE d.id <> u.id  -- Prevent cycles
-                )
                 SELECT
                     u.id,
                     u.first_name,
@@ -81,8 +74,8 @@ def search_agents_downline(
                     u.email,
                     u.status
                 FROM users u
-                JOIN downline d ON d.id = u.id
-                WHERE u.status IN ('active', 'invited')
+                WHERE u.id = ANY(%s::uuid[])
+                    AND u.status IN ('active', 'invited')
                     AND u.role <> 'client'
                     AND (
                         LOWER(u.first_name) LIKE %s
@@ -93,7 +86,7 @@ def search_agents_downline(
                 ORDER BY u.last_name, u.first_name
                 LIMIT %s
             """, [
-                str(user_id),
+                downline_ids,
                 f'%{search_query.lower()}%',
                 f'%{search_query.lower()}%',
                 f'%{search_query.lower()}%',
@@ -121,18 +114,10 @@ def search_agents_all(
     Returns:
         List of agents
     """
+    downline_ids = [str(uid) for uid in get_downline_ids(user_id, agency_id, include_self=True)]
+
     with connection.cursor() as cursor:
         cursor.execute("""
-            WITH RECURSIVE downline AS (
-                SELECT u.id
-                FROM users u
-                WHERE u.id = %s
-                UNION ALL
-                SELECT u.id
-                FROM users u
-                JOIN downline d ON u.upline_id = d.id
-                WHERE d.id <> u.id
-            )
             SELECT
                 u.id,
                 u.first_name,
@@ -140,12 +125,12 @@ def search_agents_all(
                 u.email,
                 u.status
             FROM users u
-            JOIN downline d ON d.id = u.id
-            WHERE u.status IN ('active', 'invited')
+            WHERE u.id = ANY(%s::uuid[])
+                AND u.status IN ('active', 'invited')
                 AND u.role <> 'client'
             ORDER BY u.last_name, u.first_name
             LIMIT %s
-        """, [str(user_id), limit])
+        """, [downline_ids, limit])
 
         columns = [col[0] for col in cursor.description]
         return [dict(zip(columns, row, strict=False)) for row in cursor.fetchall()]
@@ -88,7 +88,7 @@ class SearchAgentsView(APIView):
                     sanitized_query,
                     limit=50,  # Get more for client-side filtering
                     search_type=search_type,
-                    agency_id=user.agency_id if search_type == 'pre-invite' else None,
+                    agency_id=user.agency_id,
                 )
 
                 # Multi-word search filtering
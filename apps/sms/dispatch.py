@@ -0,0 +1,108 @@
+"""
+Bulk SMS Dispatch
+
+Sends many SMS through the pooled Telnyx session with bounded concurrency
+and a per-provider rate limit. Only the provider HTTP calls run in worker
+threads; callers prepare and record the messages with batched queries
+before and after (see services.send_bulk_messages).
+
+Rate limits are per process, shared by every bulk send running in it.
+"""
+import logging
+import threading
+import time
+from collections.abc import Hashable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_DISPATCH_SETTINGS = getattr(settings, 'SMS_DISPATCH', {})
+DISPATCH_CONCURRENCY = _DISPATCH_SETTINGS.get('CONCURRENCY', 8)
+# Messages per second per provider (0 disables limiting)
+PROVIDER_RATE_LIMITS = _DISPATCH_SETTINGS.get('RATE_LIMITS', {'telnyx': 6})
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing calls to at most `rate` per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> None:
+        """Block until the caller may make the next call."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> RateLimiter:
+    """Get the process-wide rate limiter for a provider."""
+    with _limiters_lock:
+        if provider not in _limiters:
+            _limiters[provider] = RateLimiter(PROVIDER_RATE_LIMITS.get(provider, 0))
+        return _limiters[provider]
+
+
+@dataclass
+class OutboundSMS:
+    """One SMS to send; key identifies it in the results (e.g. a message ID)."""
+    key: Hashable
+    from_number: str
+    to_number: str
+    text: str
+
+
+def dispatch_sms(
+    messages: list[OutboundSMS],
+    provider: str = 'telnyx',
+    concurrency: int | None = None,
+) -> dict[Hashable, dict]:
+    """
+    Send SMS concurrently through a provider.
+
+    Args:
+        messages: Messages to send
+        provider: Provider name (rate limit key)
+        concurrency: Maximum in-flight requests (default SMS_DISPATCH['CONCURRENCY'])
+
+    Returns:
+        Provider result per message key: dict with 'success', 'message_id'
+        and optionally 'error' (as returned by send_sms_via_telnyx)
+    """
+    from .services import send_sms_via_telnyx
+
+    if not messages:
+        return {}
+
+    limiter = get_rate_limiter(provider)
+
+    def send(message: OutboundSMS) -> dict:
+        limiter.acquire()
+        return send_sms_via_telnyx(message.from_number, message.to_number, message.text)
+
+    results: dict[Hashable, dict] = {}
+    workers = min(concurrency or DISPATCH_CONCURRENCY, len(messages))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sms-dispatch') as pool:
+        futures = {pool.submit(send, message): message.key for message in messages}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                logger.error(f'SMS dispatch failed for {key}: {e}')
+                results[key] = {'success': False, 'error': str(e)}
+    return results
@@ -0,0 +1,106 @@
+"""
+SMS Change Events
+
+Message and conversation writes publish on SMS_EVENTS_CHANNEL (see
+apps.core.events) so the SSE streams in apps.sms.sse wake up only when
+something changed. Events carry the conversation's routing keys (agent,
+agency) so each stream can filter without querying.
+
+Event names:
+- message_created: a message was inserted (direction included)
+- message_updated: message status/content/read_at changed
+- messages_read: inbound messages of a conversation were marked read
+- conversation_updated: conversation metadata (e.g. opt-in status) changed
+"""
+from uuid import UUID
+
+from django.db import connection
+
+from apps.core.phone import to_e164
+
+SMS_EVENTS_CHANNEL = 'sms_events'
+
+
+def publish_conversation_event(
+    event: str,
+    conversation_id: UUID | str,
+    message_id: UUID | str | None = None,
+    direction: str | None = None,
+) -> None:
+    """
+    Publish an SMS event for a conversation.
+
+    Args:
+        event: Event name (see module docstring)
+        conversation_id: The conversation that changed
+        message_id: The message that changed, if a single one
+        direction: Message direction for message_created
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT pg_notify(%s, json_build_object(
+                'event', %s::text,
+                'conversation_id', c.id,
+                'agent_id', c.agent_id,
+                'agency_id', c.agency_id,
+                'message_id', %s::uuid,
+                'direction', %s::text
+            )::text)
+            FROM public.conversations c
+            WHERE c.id = %s
+        """, [
+            SMS_EVENTS_CHANNEL,
+            event,
+            str(message_id) if message_id else None,
+            direction,
+            str(conversation_id),
+        ])
+
+
+def publish_phone_conversations_updated(phone_number: str, agency_id: UUID | str) -> None:
+    """
+    Publish conversation_updated for every conversation with a client phone.
+
+    Used by opt-in/opt-out keyword handling, which updates conversations by
+    phone number rather than ID.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT pg_notify(%s, json_build_object(
+                'event', 'conversation_updated',
+                'conversation_id', c.id,
+                'agent_id', c.agent_id,
+                'agency_id', c.agency_id
+            )::text)
+            FROM public.conversations c
+            WHERE c.client_phone_e164 = %s AND c.agency_id = %s
+        """, [SMS_EVENTS_CHANNEL, to_e164(phone_number), str(agency_id)])
+
+
+def publish_message_events(
+    event: str,
+    message_ids: list[UUID | str],
+    direction: str | None = None,
+) -> None:
+    """
+    Publish one SMS event per message in a single query.
+
+    Used by bulk sends; equivalent to publish_conversation_event for each
+    message's conversation.
+    """
+    if not message_ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT pg_notify(%s, json_build_object(
+                'event', %s::text,
+                'conversation_id', c.id,
+                'agent_id', c.agent_id,
+                'agency_id', c.agency_id,
+                'message_id', m.id,
+                'direction', %s::text
+            )::text)
+            FROM public.messages m
+            JOIN public.conversations c ON c.id = m.conversation_id
+            WHERE m.id = ANY(%s::uuid[])
+        """, [SMS_EVENTS_CHANNEL, event, direction, [str(mid) for mid in message_ids]])
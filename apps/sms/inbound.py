@@ -0,0 +1,290 @@
+"""
+Inbound SMS Processing
+
+TelnyxWebhookView only validates a message.received event and enqueues it,
+deduplicated on the Telnyx message ID, so the webhook acknowledges at once
+and Telnyx retries never queue the same message twice. The
+sms.inbound_message job (apps.sms.jobs) runs process_inbound_message():
+resolve the agency by the receiving number and the deal by the client's
+number, get or create the conversation, log the message and handle
+compliance keywords.
+
+Phone resolutions are cached: receiving number -> agency globally for
+SMS_INBOUND['PHONE_CACHE_TTL'] seconds (hits only; agency phone changes call
+invalidate_agency_by_phone()), client number -> deal per agency data version
+(deal writes call bump_data_version()).
+"""
+import logging
+from dataclasses import dataclass
+from uuid import UUID
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+
+from apps.core.authentication import AuthenticatedUser
+from apps.core.cache import RESULT_CACHE_ALIAS, AgencyCache
+from apps.core.phone import to_e164
+
+from .services import (
+    GetOrCreateConversationInput,
+    LogMessageInput,
+    get_or_create_conversation,
+    handle_start_keyword,
+    handle_stop_keyword,
+    log_message,
+    normalize_phone_number,
+)
+
+logger = logging.getLogger(__name__)
+
+_SETTINGS = getattr(settings, 'SMS_INBOUND', {})
+PHONE_CACHE_TTL = _SETTINGS.get('PHONE_CACHE_TTL', 300)
+
+# Cached in place of None so misses are cached too
+_NOT_FOUND = 'not_found'
+
+
+@dataclass
+class InboundSMS:
+    """A message.received event from a Telnyx webhook."""
+    telnyx_message_id: str | None
+    from_number: str | None
+    to_number: str | None
+    text: str
+
+
+def parse_inbound_event(body: dict) -> InboundSMS | None:
+    """
+    Read a Telnyx webhook body.
+
+    Returns:
+        InboundSMS, or None if the event is not message.received
+    """
+    data = body.get('data') or {}
+    if data.get('event_type') != 'message.received':
+        return None
+
+    payload = data.get('payload') or {}
+    to_numbers = payload.get('to') or []
+    return InboundSMS(
+        telnyx_message_id=payload.get('id'),
+        from_number=(payload.get('from') or {}).get('phone_number'),
+        to_number=to_numbers[0].get('phone_number') if to_numbers else None,
+        text=payload.get('text') or '',
+    )
+
+
+def get_compliance_keyword(message_text: str) -> str | None:
+    """Check if message is an opt-out/help/opt-in keyword."""
+    text = message_text.strip().upper()
+    if text in ('STOP', 'UNSUBSCRIBE'):
+        return 'STOP'
+    if text in ('START', 'UNSTOP', 'SUBSCRIBE'):
+        return 'START'
+    if text in ('HELP', 'INFO'):
+        return 'HELP'
+    return None
+
+
+def _cached_lookup(cache, key: str, load, timeout, cache_misses: bool = True):
+    try:
+        cached = cache.get(key)
+    except Exception as e:
+        logger.warning(f'Inbound phone cache lookup failed for {key}: {e}')
+        return load()
+
+    if cached is not None:
+        return None if cached == _NOT_FOUND else cached
+
+    value = load()
+    if value is None and not cache_misses:
+        return None
+    try:
+        cache.set(key, _NOT_FOUND if value is None else value, timeout)
+    except Exception as e:
+        logger.warning(f'Inbound phone cache store failed for {key}: {e}')
+    return value
+
+
+def _agency_by_phone_key(phone_number: str) -> str:
+    return f'sms:agency_by_phone:{to_e164(phone_number)}'
+
+
+def find_agency_by_phone(phone_number: str) -> dict | None:
+    """
+    Find the agency that owns a receiving phone number (cached).
+
+    Misses are not cached, so a number an agency has just set up resolves on
+    its first inbound message.
+    """
+    from apps.core.phone import find_agency_by_phone as load_agency
+
+    return _cached_lookup(
+        caches[RESULT_CACHE_ALIAS], _agency_by_phone_key(phone_number),
+        lambda: load_agency(phone_number),
+        PHONE_CACHE_TTL,
+        cache_misses=False,
+    )
+
+
+def invalidate_agency_by_phone(*phone_numbers: str | None) -> None:
+    """
+    Drop cached agency resolutions for receiving numbers.
+
+    Call with an agency's old and new phone_number when it changes. Deferred
+    until the surrounding transaction commits.
+
+    Args:
+        phone_numbers: Numbers in any format (empty values are ignored)
+    """
+    keys = [_agency_by_phone_key(p) for p in phone_numbers if to_e164(p)]
+    if not keys:
+        return
+
+    def _invalidate():
+        try:
+            caches[RESULT_CACHE_ALIAS].delete_many(keys)
+        except Exception as e:
+            logger.warning(f'Inbound phone cache invalidation failed: {e}')
+
+    transaction.on_commit(_invalidate)
+
+
+def find_inbound_deal(client_phone: str, agency_id: str) -> dict | None:
+    """Find the deal (with its agent) for a client phone number (cached)."""
+    from apps.deals.selectors import find_deal_by_client_phone
+
+    try:
+        agency_cache = AgencyCache(agency_id)
+    except Exception as e:
+        logger.warning(f'Inbound deal cache unavailable: {e}')
+        return find_deal_by_client_phone(client_phone, agency_id)
+
+    return _cached_lookup(
+        agency_cache, f'sms:deal_by_phone:{to_e164(client_phone)}',
+        lambda: find_deal_by_client_phone(client_phone, agency_id),
+        PHONE_CACHE_TTL,
+    )
+
+
+def _is_logged(conversation_id: str, telnyx_message_id: str) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT 1
+            FROM public.messages
+            WHERE conversation_id = %s
+                AND metadata->>'telnyx_message_id' = %s
+            LIMIT 1
+        """, [conversation_id, telnyx_message_id])
+        return cursor.fetchone() is not None
+
+
+def process_inbound_message(body: dict) -> dict:
+    """
+    Log an inbound SMS from a Telnyx webhook body.
+
+    Safe to retry: a message already logged in its conversation is skipped.
+    Unknown agencies, clients and agents are outcomes rather than errors
+    (retrying won't find them); anything else raises so the job retries.
+
+    Args:
+        body: The raw webhook body
+
+    Returns:
+        Outcome dict with status and, once resolved, conversation_id
+    """
+    message = parse_inbound_event(body)
+    if not message or not message.from_number or not message.to_number:
+        return {'status': 'ignored'}
+
+    agency = find_agency_by_phone(message.to_number)
+    if not agency:
+        logger.warning(f"No agency found for phone number: {message.to_number}")
+        return {'status': 'agency_not_found'}
+
+    agency_id = agency['id']
+
+    # Normalize client phone for storage
+    normalized_client_phone = normalize_phone_number(message.from_number)
+    if normalized_client_phone.startswith('+1'):
+        normalized_client_phone = normalized_client_phone[2:]
+
+    deal = find_inbound_deal(normalized_client_phone, agency_id)
+    if not deal:
+        logger.warning(f"No deal found for client phone: {normalized_client_phone} in agency: {agency_id}")
+        return {'status': 'client_not_found'}
+
+    agent_id = deal.get('agent', {}).get('id')
+    if not agent_id:
+        logger.warning(f"No agent found for deal: {deal.get('id')}")
+        return {'status': 'agent_not_found'}
+
+    # Create a minimal user object for the service calls
+    user = AuthenticatedUser(
+        id=UUID(agent_id),
+        auth_user_id=UUID(agent_id),
+        email='webhook@system.internal',
+        agency_id=UUID(agency_id),
+        role='agent',
+        is_admin=False,
+        status='active',
+        perm_level=None,
+        subscription_tier=None,
+    )
+
+    conv_result = get_or_create_conversation(
+        user=user,
+        data=GetOrCreateConversationInput(
+            agent_id=UUID(agent_id),
+            deal_id=UUID(deal['id']) if deal.get('id') else None,
+            phone_number=normalized_client_phone,
+        ),
+    )
+    if not conv_result.success or not conv_result.conversation:
+        raise RuntimeError(f'Failed to get/create conversation: {conv_result.error}')
+
+    conversation_id = conv_result.conversation['id']
+    outcome = {
+        'status': 'processed',
+        'conversation_id': conversation_id,
+        'deal_id': deal.get('id'),
+        'agent_id': agent_id,
+    }
+
+    if message.telnyx_message_id and _is_logged(conversation_id, message.telnyx_message_id):
+        logger.info(f"Inbound message {message.telnyx_message_id} already logged")
+        return {**outcome, 'status': 'duplicate'}
+
+    keyword = get_compliance_keyword(message.text)
+    metadata = {
+        'client_phone': normalized_client_phone,
+        'telnyx_message_id': message.telnyx_message_id,
+    }
+    if keyword:
+        logger.info(f"Received compliance keyword: {keyword}")
+        metadata['compliance_keyword'] = keyword
+
+    # Message and opt-out change commit together, so a retry never finds the
+    # message logged but the keyword unhandled
+    with transaction.atomic():
+        result = log_message(
+            user=user,
+            data=LogMessageInput(
+                conversation_id=UUID(conversation_id),
+                content=message.text,
+                direction='inbound',
+                status='received',
+                metadata=metadata,
+            ),
+        )
+        if not result.success:
+            raise RuntimeError(f'Failed to log inbound message: {result.error}')
+
+        # Note: Response SMS is still sent by Next.js webhook handler
+        if keyword == 'STOP':
+            handle_stop_keyword(normalized_client_phone, UUID(agency_id))
+        elif keyword == 'START':
+            handle_start_keyword(normalized_client_phone, UUID(agency_id))
+
+    return {**outcome, 'keyword': keyword}
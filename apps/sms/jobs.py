@@ -0,0 +1,48 @@
+"""
+SMS Background Jobs
+
+Handlers for apps.core.jobs; see BulkSmsView and TelnyxWebhookView.
+"""
+from dataclasses import asdict
+from uuid import UUID
+
+from apps.core.authentication import get_authenticated_user_by_auth_id
+from apps.core.jobs import Job, register_job
+
+from .inbound import process_inbound_message
+from .services import BulkSendInput, send_bulk_messages
+
+BULK_SEND_JOB = 'sms.bulk_send'
+INBOUND_MESSAGE_JOB = 'sms.inbound_message'
+
+
+# Not retried: a repeat would text recipients who already got the message
+@register_job(BULK_SEND_JOB, max_attempts=1)
+def bulk_send_job(job: Job) -> dict:
+    """
+    Payload:
+        auth_user_id: Sender (re-resolved so deactivated users can't send)
+        template_id, content, recipient_ids, recipient_type: BulkSendInput
+    """
+    payload = job.payload
+    user = get_authenticated_user_by_auth_id(payload['auth_user_id'])
+    if not user or user.status == 'inactive':
+        raise ValueError('Sender no longer exists or was deactivated')
+
+    result = send_bulk_messages(user, BulkSendInput(
+        template_id=UUID(payload['template_id']) if payload.get('template_id') else None,
+        content=payload.get('content'),
+        recipient_ids=[UUID(rid) for rid in payload['recipient_ids']],
+        recipient_type=payload.get('recipient_type', 'client'),
+    ))
+    return asdict(result)
+
+
+# Retried safely: process_inbound_message skips messages already logged
+@register_job(INBOUND_MESSAGE_JOB)
+def inbound_message_job(job: Job) -> dict:
+    """
+    Payload:
+        event: Raw Telnyx webhook body (see apps.sms.inbound)
+    """
+    return process_inbound_message(job.payload['event'])
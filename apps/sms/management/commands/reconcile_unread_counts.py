@@ -0,0 +1,42 @@
+"""
+Correct conversation and per-agent unread counters from messages.
+
+Run periodically (e.g. hourly) so drift from writes that bypass
+apps.sms.services.refresh_conversation_summaries is bounded (see
+reconcile_unread_counts).
+
+Usage:
+    python manage.py reconcile_unread_counts
+    python manage.py reconcile_unread_counts --agency <agency_id>
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.sms.services import reconcile_unread_counts
+
+
+class Command(BaseCommand):
+    help = 'Reconcile unread counters for one or all agencies'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--agency', dest='agency_id', help='Only reconcile this agency')
+
+    def handle(self, *args, **options):
+        agency_id = options.get('agency_id')
+        if agency_id:
+            agency_ids = [agency_id]
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT id FROM public.agencies ORDER BY id')
+                agency_ids = [row[0] for row in cursor.fetchall()]
+
+        total = 0
+        for aid in agency_ids:
+            corrected = reconcile_unread_counts(aid)
+            total += corrected
+            if corrected:
+                self.stdout.write(f'{aid}: {corrected} counters corrected')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Reconciled unread counters for {len(agency_ids)} agencies ({total} corrected)'
+        ))
@@ -9,9 +9,11 @@ from typing import Literal
 from uuid import UUID
 
 from django.core.paginator import Paginator
-from django.db.models import Count, OuterRef, Q, Subquery
+from django.db import connection
+from django.db.models import Q
 
 from apps.core.authentication import AuthenticatedUser
+from apps.core.pagination import cached_total, cursor_pagination, decode_cursor, keyset_page
 from apps.core.permissions import get_visible_agent_ids
 
 logger = logging.getLogger(__name__)
@@ -25,6 +27,8 @@ def get_sms_conversations(
     page: int = 1,
     limit: int = 20,
     search_query: str | None = None,
+    cursor: str | None = None,
+    include_total: bool = False,
 ) -> dict:
     """
     Get SMS conversations based on view mode.
@@ -37,13 +41,16 @@ def get_sms_conversations(
         page: Page number (1-based)
         limit: Page size
         search_query: Search by client name or phone number
+        cursor: Keyset cursor ('' for the first page); None uses page
+        include_total: With cursor, include the cached approximate total
 
     Returns:
         Dictionary with conversations and pagination
     """
-    from apps.core.models import Conversation, Message
+    from apps.core.models import Conversation
 
     is_admin = user.is_admin or user.role == 'admin'
+    after = decode_cursor(cursor, 2) if cursor is not None else None
 
     try:
         # Start with base queryset - filter for SMS type only
@@ -65,7 +72,7 @@ def get_sms_conversations(
                 .values_list('deal_id', flat=True)
             )
             if not visible_deal_ids:
-                return {'conversations': [], 'pagination': _empty_pagination(page, limit)}
+                return {'conversations': [], 'pagination': _empty_pagination(page, limit, cursor)}
             qs = qs.filter(deal_id__in=visible_deal_ids)
         else:  # 'self'
             # User sees only their own conversations
@@ -79,36 +86,40 @@ def get_sms_conversations(
                 Q(client__last_name__icontains=search_query)
             )
 
-        # Add last message content via subquery
-        last_message_subquery = (
-            Message.objects.filter(conversation_id=OuterRef('id'))  # type: ignore[attr-defined]
-            .order_by('-created_at')
-            .values('content')[:1]
-        )
-
-        # Add unread count via subquery (inbound messages without read_at)
-        unread_count_subquery = (
-            Message.objects.filter(  # type: ignore[attr-defined]
-                conversation_id=OuterRef('id'),
-                direction='inbound',
-                read_at__isnull=True
-            )
-            .values('conversation_id')
-            .annotate(cnt=Count('id'))
-            .values('cnt')[:1]
-        )
-
-        # Optimize with select_related and annotate
+        # unread_count and last_message_content are maintained on the conversation
+        # (apps.sms.services.refresh_conversation_summaries)
         # Note: Conversation has no client FK, client info comes from deal
         qs = (
             qs.select_related('agent', 'deal')
-            .annotate(
-                last_message_content=Subquery(last_message_subquery),
-                unread_count=Subquery(unread_count_subquery),
-            )
             .order_by('-last_message_at', '-id')
         )
 
+        if cursor is not None:
+            # Keyset mode: rows past (last_message_at, id); DESC puts NULL last_message_at first
+            page_qs = qs
+            if after:
+                last_at, last_id = after
+                if last_at is None:
+                    page_qs = qs.filter(
+                        Q(last_message_at__isnull=True, id__lt=last_id) | Q(last_message_at__isnull=False)
+                    )
+                else:
+                    page_qs = qs.filter(
+                        Q(last_message_at__lt=last_at) | Q(last_message_at=last_at, id__lt=last_id)
+                    )
+            rows, next_cursor = keyset_page(
+                list(page_qs[:limit + 1]), limit, lambda conv: (conv.last_message_at, conv.id)
+            )
+            total = cached_total(
+                user.agency_id, 'sms.conversations',
+                {'user': user.id, 'view_mode': view_mode, 'search': search_query},
+                qs.count,
+            ) if include_total else None
+            return {
+                'conversations': [_format_conversation(conv) for conv in rows],
+                'pagination': cursor_pagination(limit, next_cursor, total),
+            }
+
         # Get total count before pagination
         total_count = qs.count()
 
@@ -117,46 +128,7 @@ def get_sms_conversations(
         page_obj = paginator.get_page(page)
 
         # Format results
-        conversations = []
-        for conv in page_obj:
-            # Use client_phone field (model uses client_phone, not phone_number)
-            phone = getattr(conv, 'client_phone', None) or getattr(conv, 'phone_number', None)
-            # unread_count comes from annotation, is_archived may not exist
-            unread = getattr(conv, 'unread_count', 0) or 0
-            is_archived = getattr(conv, 'is_archived', False) or False
-
-            # Client info comes from deal (conversations don't have direct client FK)
-            client_name = conv.deal.client_name if conv.deal else None
-            client_email = conv.deal.client_email if conv.deal else None
-            client_first = client_name.split(' ', 1)[0] if client_name else None
-            client_last = client_name.split(' ', 1)[1] if client_name and ' ' in client_name else None
-
-            conversations.append({
-                'id': str(conv.id),
-                'phone_number': phone,
-                'deal_id': str(conv.deal_id) if conv.deal_id else None,
-                'last_message_at': conv.last_message_at.isoformat() if conv.last_message_at else None,
-                'unread_count': unread,
-                'is_archived': is_archived,
-                'created_at': conv.created_at.isoformat() if conv.created_at else None,
-                'last_message': conv.last_message_content,
-                'sms_opt_in_status': conv.sms_opt_in_status,
-                'opted_in_at': conv.opted_in_at.isoformat() if conv.opted_in_at else None,
-                'opted_out_at': conv.opted_out_at.isoformat() if conv.opted_out_at else None,
-                'status_standardized': conv.deal.status_standardized if conv.deal else None,
-                'client': {
-                    'name': client_name or '',
-                    'first_name': client_first,
-                    'last_name': client_last,
-                    'email': client_email,
-                } if client_name or client_email else None,
-                'agent': {
-                    'id': str(conv.agent.id) if conv.agent else None,
-                    'first_name': conv.agent.first_name if conv.agent else None,
-                    'last_name': conv.agent.last_name if conv.agent else None,
-                    'name': f"{conv.agent.first_name or ''} {conv.agent.last_name or ''}".strip() if conv.agent else '',
-                } if conv.agent else None,
-            })
+        conversations = [_format_conversation(conv) for conv in page_obj]
 
         total_pages = paginator.num_pages
 
@@ -177,11 +149,55 @@ def get_sms_conversations(
         raise
 
 
+def _format_conversation(conv) -> dict:
+    """Format a Conversation (with agent and deal selected) for the API."""
+    # Use client_phone field (model uses client_phone, not phone_number)
+    phone = getattr(conv, 'client_phone', None) or getattr(conv, 'phone_number', None)
+    # is_archived may not exist
+    unread = conv.unread_count or 0
+    is_archived = getattr(conv, 'is_archived', False) or False
+
+    # Client info comes from deal (conversations don't have direct client FK)
+    client_name = conv.deal.client_name if conv.deal else None
+    client_email = conv.deal.client_email if conv.deal else None
+    client_first = client_name.split(' ', 1)[0] if client_name else None
+    client_last = client_name.split(' ', 1)[1] if client_name and ' ' in client_name else None
+
+    return {
+        'id': str(conv.id),
+        'phone_number': phone,
+        'deal_id': str(conv.deal_id) if conv.deal_id else None,
+        'last_message_at': conv.last_message_at.isoformat() if conv.last_message_at else None,
+        'unread_count': unread,
+        'is_archived': is_archived,
+        'created_at': conv.created_at.isoformat() if conv.created_at else None,
+        'last_message': conv.last_message_content,
+        'sms_opt_in_status': conv.sms_opt_in_status,
+        'opted_in_at': conv.opted_in_at.isoformat() if conv.opted_in_at else None,
+        'opted_out_at': conv.opted_out_at.isoformat() if conv.opted_out_at else None,
+        'status_standardized': conv.deal.status_standardized if conv.deal else None,
+        'client': {
+            'name': client_name or '',
+            'first_name': client_first,
+            'last_name': client_last,
+            'email': client_email,
+        } if client_name or client_email else None,
+        'agent': {
+            'id': str(conv.agent.id) if conv.agent else None,
+            'first_name': conv.agent.first_name if conv.agent else None,
+            'last_name': conv.agent.last_name if conv.agent else None,
+            'name': f"{conv.agent.first_name or ''} {conv.agent.last_name or ''}".strip() if conv.agent else '',
+        } if conv.agent else None,
+    }
+
+
 def get_sms_messages(
     user: AuthenticatedUser,
     conversation_id: UUID,
     page: int = 1,
     limit: int = 50,
+    cursor: str | None = None,
+    include_total: bool = False,
 ) -> dict:
     """
     Get messages for a conversation.
@@ -193,51 +209,62 @@ def get_sms_messages(
         conversation_id: The conversation ID
         page: Page number (1-based)
         limit: Page size
+        cursor: Keyset cursor ('' for the first page); None uses page
+        include_total: With cursor, include the cached approximate total
 
     Returns:
         Dictionary with messages and pagination
     """
     from apps.core.models import Conversation, Message
 
+    after = decode_cursor(cursor, 2) if cursor is not None else None
+
     try:
         # Verify access to conversation
         try:
             conversation = Conversation.objects.get(id=conversation_id)  # type: ignore[attr-defined]
         except Conversation.DoesNotExist:
-            return {'messages': [], 'pagination': _empty_pagination(page, limit)}
+            return {'messages': [], 'pagination': _empty_pagination(page, limit, cursor)}
 
         # Check agency access
         if str(conversation.agency_id) != str(user.agency_id):
-            return {'messages': [], 'pagination': _empty_pagination(page, limit)}
+            return {'messages': [], 'pagination': _empty_pagination(page, limit, cursor)}
 
         # Check hierarchy access
         is_admin = user.is_admin or user.role == 'admin'
         if not is_admin and conversation.agent_id:
             visible_ids = get_visible_agent_ids(user, include_full_agency=False)
             if conversation.agent_id not in visible_ids:
-                return {'messages': [], 'pagination': _empty_pagination(page, limit)}
+                return {'messages': [], 'pagination': _empty_pagination(page, limit, cursor)}
 
         # Mark inbound messages as read (matches RPC side effect)
-        from django.db import connection as db_connection
-        with db_connection.cursor() as cursor:
-            cursor.execute("""
-                UPDATE public.messages m
-                SET read_at = NOW()
-                FROM public.conversations c
-                WHERE m.conversation_id = %s
-                    AND m.conversation_id = c.id
-                    AND c.agency_id = %s
-                    AND m.direction = 'inbound'
-                    AND m.read_at IS NULL
-            """, [str(conversation_id), str(user.agency_id)])
+        from .services import mark_conversation_read
+        mark_conversation_read(user, conversation_id)
 
         # Get messages with optimized query
         qs = (
             Message.objects.filter(conversation_id=conversation_id)  # type: ignore[attr-defined]
             .select_related('sent_by')
-            .order_by('created_at')
+            .order_by('created_at', 'id')
         )
 
+        if cursor is not None:
+            # Keyset mode: rows past (created_at, id)
+            page_qs = qs
+            if after:
+                last_at, last_id = after
+                page_qs = qs.filter(Q(created_at__gt=last_at) | Q(created_at=last_at, id__gt=last_id))
+            rows, next_cursor = keyset_page(
+                list(page_qs[:limit + 1]), limit, lambda msg: (msg.created_at, msg.id)
+            )
+            total = cached_total(
+                user.agency_id, 'sms.messages', {'conversation': conversation_id}, qs.count,
+            ) if include_total else None
+            return {
+                'messages': [_format_message(msg) for msg in rows],
+                'pagination': cursor_pagination(limit, next_cursor, total),
+            }
+
         # Get total count
         total_count = qs.count()
 
@@ -246,22 +273,7 @@ def get_sms_messages(
         page_obj = paginator.get_page(page)
 
         # Format results
-        messages = []
-        for msg in page_obj:
-            messages.append({
-                'id': str(msg.id),
-                'content': msg.content,
-                'direction': msg.direction,
-                'status': msg.status,
-                'is_read': msg.read_at is not None,
-                'created_at': msg.created_at.isoformat() if msg.created_at else None,
-                'sent_at': msg.sent_at.isoformat() if msg.sent_at else None,
-                'external_id': msg.external_id,
-                'sent_by': {
-                    'id': str(msg.sent_by.id) if msg.sent_by else None,
-                    'name': f"{msg.sent_by.first_name or ''} {msg.sent_by.last_name or ''}".strip() if msg.sent_by else '',
-                } if msg.sent_by else None,
-            })
+        messages = [_format_message(msg) for msg in page_obj]
 
         total_pages = paginator.num_pages
 
@@ -282,6 +294,24 @@ def get_sms_messages(
         raise
 
 
+def _format_message(msg) -> dict:
+    """Format a Message (with sent_by selected) for the API."""
+    return {
+        'id': str(msg.id),
+        'content': msg.content,
+        'direction': msg.direction,
+        'status': msg.status,
+        'is_read': msg.read_at is not None,
+        'created_at': msg.created_at.isoformat() if msg.created_at else None,
+        'sent_at': msg.sent_at.isoformat() if msg.sent_at else None,
+        'external_id': msg.external_id,
+        'sent_by': {
+            'id': str(msg.sent_by.id) if msg.sent_by else None,
+            'name': f"{msg.sent_by.first_name or ''} {msg.sent_by.last_name or ''}".strip() if msg.sent_by else '',
+        } if msg.sent_by else None,
+    }
+
+
 def get_draft_messages(
     user: AuthenticatedUser,
     view_mode: ViewMode = 'self',
@@ -396,6 +426,24 @@ def get_draft_messages(
         raise
 
 
+def get_agent_unread_count(agent_ids: list[UUID | str]) -> int:
+    """
+    Get unread inbound messages across agents' active SMS conversations.
+
+    Reads the per-agent counters in public.agent_unread_counts (see
+    apps.sms.services.refresh_conversation_summaries).
+    """
+    if not agent_ids:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT COALESCE(SUM(unread_count), 0)
+            FROM public.agent_unread_counts
+            WHERE agent_id = ANY(%s::uuid[])
+        """, [[str(agent_id) for agent_id in agent_ids]])
+        return int(cursor.fetchone()[0])
+
+
 def get_unread_message_count(
     user: AuthenticatedUser,
     view_mode: ViewMode = 'self',
@@ -403,64 +451,29 @@ def get_unread_message_count(
     """
     Get count of unread inbound messages.
 
-    Uses Django ORM with django-cte for downlines.
-    Filters by conversation type='sms' and is_active=True to match RPC behavior.
+    Counts active SMS conversations only, to match RPC behavior, from the
+    maintained per-agent counters rather than the messages table.
     """
-    from django_cte import With
-
-    from apps.core.models import Message, User
-
     is_admin = user.is_admin or user.role == 'admin'
 
     try:
-        # Base filter matching RPC: type='sms' and is_active=True
-        base_filter = {
-            'conversation__type': 'sms',
-            'conversation__is_active': True,
-            'direction': 'inbound',
-            'read_at__isnull': True,
-        }
-
         if view_mode == 'all' and is_admin:
-            return (
-                Message.objects.filter(  # type: ignore[attr-defined]
-                    conversation__agent__agency_id=user.agency_id,
-                    **base_filter
-                )
-                .count()
-            )
+            with connection.cursor() as cursor:
+                cursor.execute("""
+                    SELECT COALESCE(SUM(unread_count), 0)
+                    FROM public.agent_unread_counts
+                    WHERE agency_id = %s
+                """, [str(user.agency_id)])
+                return int(cursor.fetchone()[0])
 
         elif view_mode == 'self':
-            return (
-                Message.objects.filter(  # type: ignore[attr-defined]
-                    conversation__agent_id=user.id,
-                    **base_filter
-                )
-                .count()
-            )
+            return get_agent_unread_count([user.id])
 
         else:
-            def make_cte(cte):
-                base = User.objects.filter(id=user.id).values('id')
-                recursive = (
-                    cte.join(User, upline_id=cte.col.id)
-                    .values('id')
-                )
-                return base.union(recursive, all=True)
-
-            cte = With.recursive(make_cte)
-            downline_ids = list(
-                cte.queryset()
-                .with_cte(cte)
-                .values_list('id', flat=True)
-            )
+            from apps.core.hierarchy import get_downline_ids
 
-            return (
-                Message.objects.filter(  # type: ignore[attr-defined]
-                    conversation__agent_id__in=downline_ids,
-                    **base_filter
-                )
-                .count()
+            return get_agent_unread_count(
+                get_downline_ids(user.id, user.agency_id, include_self=True)
             )
 
     except Exception as e:
@@ -468,8 +481,10 @@ def get_unread_message_count(
         return 0
 
 
-def _empty_pagination(page: int, limit: int) -> dict:
-    """Return empty pagination structure."""
+def _empty_pagination(page: int, limit: int, cursor: str | None = None) -> dict:
+    """Return empty pagination structure (keyset shape when a cursor was given)."""
+    if cursor is not None:
+        return cursor_pagination(limit, None, 0)
     return {
         'currentPage': page,
         'totalPages': 0,
@@ -9,7 +9,9 @@ Business logic for SMS operations:
 """
 import logging
 import os
+import threading
 import uuid
+from collections.abc import Iterable
 from dataclasses import dataclass
 from typing import Any
 from uuid import UUID
@@ -17,12 +19,22 @@ from uuid import UUID
 from django.db import connection, transaction
 
 from apps.core.authentication import AuthenticatedUser
+from apps.core.phone import to_e164
+
+from .dispatch import DISPATCH_CONCURRENCY, OutboundSMS, dispatch_sms
+from .events import publish_conversation_event, publish_message_events, publish_phone_conversations_updated
+from .templates_service import compile_template
 
 logger = logging.getLogger(__name__)
 
 # Telnyx configuration (standardized SMS provider)
 TELNYX_API_KEY = os.getenv('TELNYX_API_KEY')
 TELNYX_API_URL = 'https://api.telnyx.com/v2/messages'
+# (connect, read) seconds
+TELNYX_TIMEOUT = (5, 30)
+
+_telnyx_session = None
+_telnyx_session_lock = threading.Lock()
 
 
 def normalize_phone_number(phone: str) -> str:
@@ -38,6 +50,29 @@ def normalize_phone_number(phone: str) -> str:
     return f'+{digits}'
 
 
+def _get_telnyx_session():
+    """
+    Get the process-wide Telnyx HTTP session.
+
+    Keeps connections alive across messages instead of a new TCP/TLS
+    handshake per send; the pool is sized for bulk dispatch concurrency.
+    """
+    import requests  # type: ignore[import-untyped]
+    from requests.adapters import HTTPAdapter  # type: ignore[import-untyped]
+
+    global _telnyx_session
+    with _telnyx_session_lock:
+        if _telnyx_session is None:
+            session = requests.Session()
+            session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=DISPATCH_CONCURRENCY))
+            session.headers.update({
+                'Content-Type': 'application/json',
+                'Authorization': f'Bearer {TELNYX_API_KEY}',
+            })
+            _telnyx_session = session
+        return _telnyx_session
+
+
 def send_sms_via_telnyx(from_number: str, to_number: str, text: str) -> dict:
     """
     Send an SMS message via Telnyx API.
@@ -50,8 +85,6 @@ def send_sms_via_telnyx(from_number: str, to_number: str, text: str) -> dict:
     Returns:
         dict with 'success', 'message_id', and optionally 'error'
     """
-    import requests  # type: ignore[import-untyped]
-
     if not TELNYX_API_KEY:
         return {'success': False, 'error': 'TELNYX_API_KEY is not configured'}
 
@@ -59,18 +92,14 @@ def send_sms_via_telnyx(from_number: str, to_number: str, text: str) -> dict:
     normalized_to = normalize_phone_number(to_number)
 
     try:
-        response = requests.post(
+        response = _get_telnyx_session().post(
             TELNYX_API_URL,
-            headers={
-                'Content-Type': 'application/json',
-                'Authorization': f'Bearer {TELNYX_API_KEY}',
-            },
             json={
                 'from': normalized_from,
                 'to': normalized_to,
                 'text': text,
             },
-            timeout=30
+            timeout=TELNYX_TIMEOUT
         )
 
         if not response.ok:
@@ -125,6 +154,7 @@ class BulkSendResult:
     sent: int = 0
     failed: int = 0
     errors: list[dict[Any, Any]] | None = None
+    results: list[dict[str, Any]] | None = None
 
 
 @transaction.atomic
@@ -183,6 +213,8 @@ def send_message(
                 VALUES (%s, %s, %s, 'outbound', 'pending', %s, NOW(), NOW())
                 RETURNING id
             """, [str(message_id), str(data.conversation_id), data.content, str(user.id)])
+        refresh_conversation_summaries([data.conversation_id])
+        publish_conversation_event('message_created', data.conversation_id, message_id, 'outbound')
 
         # Send via Telnyx
         try:
@@ -200,6 +232,7 @@ def send_message(
                         SET status = 'failed', updated_at = NOW()
                         WHERE id = %s
                     """, [str(message_id)])
+                publish_conversation_event('message_updated', data.conversation_id, message_id)
                 return SendMessageResult(
                     success=False,
                     message_id=message_id,
@@ -223,6 +256,7 @@ def send_message(
                     SET last_message_at = NOW(), updated_at = NOW()
                     WHERE id = %s
                 """, [str(data.conversation_id)])
+            publish_conversation_event('message_updated', data.conversation_id, message_id)
 
             # Increment user's message count
             with connection.cursor() as cursor:
@@ -248,6 +282,7 @@ def send_message(
                     SET status = 'failed', updated_at = NOW()
                     WHERE id = %s
                 """, [str(message_id)])
+            publish_conversation_event('message_updated', data.conversation_id, message_id)
 
             logger.error(f"Telnyx send failed: {e}")
             return SendMessageResult(success=False, message_id=message_id, error=str(e))
@@ -337,12 +372,17 @@ def send_bulk_messages(
     """
     Send bulk SMS messages to multiple recipients.
 
+    Conversations, message rows and the agency phone are resolved with a few
+    batched queries; the sends then go out concurrently through the pooled
+    Telnyx session (see dispatch.dispatch_sms) and their outcomes are
+    recorded in one more batch.
+
     Args:
         user: The authenticated user sending messages
         data: Bulk send data including template/content and recipient IDs
 
     Returns:
-        BulkSendResult with success counts
+        BulkSendResult with success counts and per-recipient results
     """
     if not data.recipient_ids:
         return BulkSendResult(success=False, errors=[{"error": "No recipients provided"}])
@@ -363,12 +403,14 @@ def send_bulk_messages(
 
     if not content_template:
         return BulkSendResult(success=False, errors=[{"error": "No content provided"}])
+    template = compile_template(content_template)
 
     # Get recipients with their conversation IDs
     recipient_ids_str = [str(rid) for rid in data.recipient_ids]
+    is_client = data.recipient_type == 'client'
 
-    if data.recipient_type == 'client':
-        with connection.cursor() as cursor:
+    with connection.cursor() as cursor:
+        if is_client:
             cursor.execute("""
                 SELECT
                     c.id as client_id,
@@ -383,10 +425,8 @@ def send_bulk_messages(
                     AND c.agency_id = %s
                     AND c.phone IS NOT NULL
             """, [str(user.agency_id), recipient_ids_str, str(user.agency_id)])
-            recipients = cursor.fetchall()
-    else:
-        # Agent recipients
-        with connection.cursor() as cursor:
+        else:
+            # Agent recipients
             cursor.execute("""
                 SELECT
                     u.id as agent_id,
@@ -400,94 +440,182 @@ def send_bulk_messages(
                     AND u.agency_id = %s
                     AND u.phone_number IS NOT NULL
             """, [recipient_ids_str, str(user.agency_id)])
-            recipients = cursor.fetchall()
+        recipients = cursor.fetchall()
 
-    total = len(recipients)
-    sent = 0
-    failed = 0
-    errors = []
+        cursor.execute("""
+            SELECT phone_number FROM public.agencies WHERE id = %s
+        """, [str(user.agency_id)])
+        agency_row = cursor.fetchone()
+        agency_phone = agency_row[0] if agency_row else None
 
-    for recipient in recipients:
-        recipient_id, first_name, last_name, phone, conversation_id, opt_status = recipient
+    results: list[dict] = []
+    pending = []  # (result, to_number, content, conversation_id)
+
+    for recipient_id, first_name, last_name, phone, conversation_id, opt_status in recipients:
+        result = {'recipient_id': str(recipient_id), 'success': False}
+        results.append(result)
 
         # Check opt-out
         if opt_status == 'opted_out':
-            failed += 1
-            errors.append({"recipient_id": str(recipient_id), "error": "Opted out"})
+            result['error'] = 'Opted out'
             continue
 
-        # Render template
-        content = content_template
-        content = content.replace('{{client_name}}', f"{first_name or ''} {last_name or ''}".strip())
-        content = content.replace('{{first_name}}', first_name or '')
-        content = content.replace('{{last_name}}', last_name or '')
+        if not agency_phone:
+            result['error'] = 'No agency phone configured' if not is_client else 'No from number configured'
+            continue
 
-        # Create or get conversation
-        if not conversation_id and data.recipient_type == 'client':
-            conv_id = uuid.uuid4()
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    INSERT INTO public.conversations (
-                        id, agency_id, agent_id, client_id, phone_number,
-                        sms_opt_in_status, created_at, updated_at
-                    )
-                    VALUES (%s, %s, %s, %s, %s, 'pending', NOW(), NOW())
-                    ON CONFLICT DO NOTHING
-                    RETURNING id
-                """, [str(conv_id), str(user.agency_id), str(user.id), str(recipient_id), phone])
-                row = cursor.fetchone()
-                conversation_id = row[0] if row else conv_id
+        content = template.render({
+            'client_name': f"{first_name or ''} {last_name or ''}".strip(),
+            'first_name': first_name,
+            'last_name': last_name,
+        })
 
-        try:
-            # Send message
-            if conversation_id:
-                result = send_message(user, SendMessageInput(
-                    conversation_id=conversation_id,
-                    content=content
-                ))
-                if result.success:
-                    sent += 1
-                else:
-                    failed += 1
-                    errors.append({"recipient_id": str(recipient_id), "error": result.error or "Unknown error"})
-            else:
-                # Direct send without conversation (for agents) - get agency phone
-                with connection.cursor() as cursor:
-                    cursor.execute("""
-                        SELECT phone_number FROM public.agencies WHERE id = %s
-                    """, [str(user.agency_id)])
-                    agency_row = cursor.fetchone()
-                    agency_phone = agency_row[0] if agency_row else None
-
-                if not agency_phone:
-                    failed += 1
-                    errors.append({"recipient_id": str(recipient_id), "error": "No agency phone configured"})
-                    continue
-
-                telnyx_result = send_sms_via_telnyx(
-                    from_number=agency_phone,
-                    to_number=phone,
-                    text=content
-                )
-                if telnyx_result['success']:
-                    sent += 1
-                else:
-                    failed += 1
-                    errors.append({"recipient_id": str(recipient_id), "error": telnyx_result.get('error', 'Unknown error')})
+        pending.append((result, phone, content, conversation_id))
 
-        except Exception as e:
-            failed += 1
-            errors.append({"recipient_id": str(recipient_id), "error": str(e)})
+    if is_client and pending:
+        pending = _prepare_bulk_client_messages(user, pending)
+
+    # Send concurrently; keyed by position since agents have no message row
+    outcomes = dispatch_sms([
+        OutboundSMS(key=index, from_number=agency_phone, to_number=phone, text=content)
+        for index, (_, phone, content, _) in enumerate(pending)
+    ])
+
+    for index, (result, *_) in enumerate(pending):
+        outcome = outcomes.get(index) or {'success': False, 'error': 'Not sent'}
+        result['success'] = outcome['success']
+        if outcome['success']:
+            result['external_id'] = outcome.get('message_id')
+        else:
+            result['error'] = outcome.get('error') or 'Unknown Telnyx error'
+
+    if is_client and pending:
+        _record_bulk_client_outcomes(user, pending)
+
+    sent = sum(1 for result in results if result['success'])
+    failed = len(results) - sent
+    errors = [
+        {"recipient_id": result['recipient_id'], "error": result['error']}
+        for result in results if not result['success']
+    ]
+    logger.info(f'Bulk SMS for agency {user.agency_id}: {sent} sent, {failed} failed')
 
     return BulkSendResult(
         success=failed == 0,
-        total=total,
+        total=len(results),
         sent=sent,
         failed=failed,
-        errors=errors if errors else None
+        errors=errors if errors else None,
+        results=results,
     )
 
 
+@transaction.atomic
+def _prepare_bulk_client_messages(user: AuthenticatedUser, pending: list[tuple]) -> list[tuple]:
+    """
+    Create missing conversations and pending message rows for a bulk send.
+
+    Committed before sending so the rows (and their events) are visible
+    while the provider calls are in flight.
+    """
+    # Create conversations for clients without one
+    missing = {
+        result['recipient_id']: phone
+        for result, phone, _, conversation_id in pending if not conversation_id
+    }
+    conversation_ids: dict[str, str] = {}
+    if missing:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO public.conversations (
+                    id, agency_id, agent_id, client_id, phone_number, client_phone,
+                    sms_opt_in_status, created_at, updated_at
+                )
+                SELECT r.id, %s, %s, r.client_id, r.phone, r.phone, 'pending', NOW(), NOW()
+                FROM unnest(%s::uuid[], %s::uuid[], %s::text[]) AS r(id, client_id, phone)
+                ON CONFLICT DO NOTHING
+            """, [
+                str(user.agency_id), str(user.id),
+                [str(uuid.uuid4()) for _ in missing], list(missing), list(missing.values()),
+            ])
+            # Includes conversations another request created concurrently
+            cursor.execute("""
+                SELECT DISTINCT ON (client_id) client_id, id
+                FROM public.conversations
+                WHERE agency_id = %s AND client_id = ANY(%s::uuid[])
+                ORDER BY client_id, created_at
+            """, [str(user.agency_id), list(missing)])
+            conversation_ids = {str(client_id): str(conv_id) for client_id, conv_id in cursor.fetchall()}
+
+    prepared = []
+    for result, phone, content, conversation_id in pending:
+        conversation_id = conversation_id or conversation_ids.get(result['recipient_id'])
+        if not conversation_id:
+            result['error'] = 'Conversation could not be created'
+            continue
+        result['message_id'] = str(uuid.uuid4())
+        prepared.append((result, phone, content, str(conversation_id)))
+
+    if prepared:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO public.messages (
+                    id, conversation_id, content, direction, status, sent_by, created_at, updated_at
+                )
+                SELECT m.id, m.conversation_id, m.content, 'outbound', 'pending', %s, NOW(), NOW()
+                FROM unnest(%s::uuid[], %s::uuid[], %s::text[]) AS m(id, conversation_id, content)
+            """, [
+                str(user.id),
+                [result['message_id'] for result, *_ in prepared],
+                [conversation_id for *_, conversation_id in prepared],
+                [content for _, _, content, _ in prepared],
+            ])
+        refresh_conversation_summaries({conversation_id for *_, conversation_id in prepared})
+        publish_message_events('message_created', [result['message_id'] for result, *_ in prepared], 'outbound')
+
+    return prepared
+
+
+@transaction.atomic
+def _record_bulk_client_outcomes(user: AuthenticatedUser, sent: list[tuple]) -> None:
+    """Record provider outcomes of a bulk send in batched updates."""
+    delivered = [result for result, *_ in sent if result['success']]
+    failed_ids = [result['message_id'] for result, *_ in sent if not result['success']]
+
+    with connection.cursor() as cursor:
+        if delivered:
+            cursor.execute("""
+                UPDATE public.messages m
+                SET status = 'sent', external_id = s.external_id, sent_at = NOW(), updated_at = NOW()
+                FROM unnest(%s::uuid[], %s::text[]) AS s(id, external_id)
+                WHERE m.id = s.id
+            """, [
+                [result['message_id'] for result in delivered],
+                [result.get('external_id') for result in delivered],
+            ])
+
+            cursor.execute("""
+                UPDATE public.conversations
+                SET last_message_at = NOW(), updated_at = NOW()
+                WHERE id = ANY(%s::uuid[])
+            """, [list({conversation_id for result, *_, conversation_id in sent if result['success']})])
+
+            cursor.execute("""
+                UPDATE public.users
+                SET messages_sent_count = COALESCE(messages_sent_count, 0) + %s, updated_at = NOW()
+                WHERE id = %s
+            """, [len(delivered), str(user.id)])
+
+        if failed_ids:
+            cursor.execute("""
+                UPDATE public.messages
+                SET status = 'failed', updated_at = NOW()
+                WHERE id = ANY(%s::uuid[])
+            """, [failed_ids])
+
+    publish_message_events('message_updated', [result['message_id'] for result, *_ in sent])
+
+
 # =============================================================================
 # SMS Templates (P2-029)
 # =============================================================================
@@ -730,11 +858,13 @@ def handle_stop_keyword(phone_number: str, agency_id: UUID) -> bool:
         cursor.execute("""
             UPDATE public.conversations
             SET sms_opt_in_status = 'opted_out', opted_out_at = NOW(), updated_at = NOW()
-            WHERE phone_number = %s AND agency_id = %s
+            WHERE client_phone_e164 = %s AND agency_id = %s
             RETURNING id
-        """, [phone_number, str(agency_id)])
+        """, [to_e164(phone_number), str(agency_id)])
         rows = cursor.fetchall()
 
+    if rows:
+        publish_phone_conversations_updated(phone_number, agency_id)
     logger.info(f"STOP keyword: opted out {len(rows)} conversations for {phone_number}")
     return len(rows) > 0
 
@@ -756,11 +886,13 @@ def handle_start_keyword(phone_number: str, agency_id: UUID) -> bool:
         cursor.execute("""
             UPDATE public.conversations
             SET sms_opt_in_status = 'opted_in', opted_in_at = NOW(), updated_at = NOW()
-            WHERE phone_number = %s AND agency_id = %s
+            WHERE client_phone_e164 = %s AND agency_id = %s
             RETURNING id
-        """, [phone_number, str(agency_id)])
+        """, [to_e164(phone_number), str(agency_id)])
         rows = cursor.fetchall()
 
+    if rows:
+        publish_phone_conversations_updated(phone_number, agency_id)
     logger.info(f"START keyword: opted in {len(rows)} conversations for {phone_number}")
     return len(rows) > 0
 
@@ -864,6 +996,7 @@ def approve_drafts(
                         SET status = 'sent', sent_at = NOW(), updated_at = NOW()
                         WHERE id = %s
                     """, [str(message_id)])
+                publish_conversation_event('message_updated', conversation_id, message_id)
 
                 results.append({
                     'messageId': str(message_id),
@@ -941,6 +1074,8 @@ def update_draft_body(
                 error="Draft message not found"
             )
 
+        refresh_conversation_summaries([row[1]])
+        publish_conversation_event('message_updated', row[1], row[0])
         logger.info(f"Draft message {message_id} body updated")
 
         return UpdateDraftResult(
@@ -1007,10 +1142,11 @@ def reject_drafts(
                 DELETE FROM public.messages
                 WHERE id = ANY(%s::uuid[])
                     AND status = 'draft'
-                RETURNING id
+                RETURNING id, conversation_id
             """, [valid_ids])
             deleted = cursor.fetchall()
 
+        refresh_conversation_summaries({row[1] for row in deleted})
         deleted_count = len(deleted)
         logger.info(f"Rejected and deleted {deleted_count} draft messages")
 
@@ -1053,10 +1189,13 @@ def mark_message_as_read(
                     AND m.conversation_id = c.id
                     AND d.agency_id = %s
                     AND m.read_at IS NULL
-                RETURNING m.id
+                RETURNING m.id, m.conversation_id
             """, [str(message_id), str(user.agency_id)])
             result = cursor.fetchone()
 
+        if result:
+            refresh_conversation_summaries([result[1]])
+            publish_conversation_event('message_updated', result[1], result[0])
         return result is not None
 
     except Exception as e:
@@ -1064,6 +1203,193 @@ def mark_message_as_read(
         return False
 
 
+def mark_conversation_read(
+    user: AuthenticatedUser,
+    conversation_id: UUID,
+    up_to_message_id: UUID | None = None,
+) -> int:
+    """
+    Mark a conversation's unread inbound messages as read with one UPDATE.
+
+    Args:
+        user: The authenticated user
+        conversation_id: The conversation to mark read
+        up_to_message_id: Only mark messages created up to this one
+            (None for every message)
+
+    Returns:
+        Number of messages marked as read
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("""
+            UPDATE public.messages m
+            SET read_at = NOW()
+            FROM public.conversations c
+            WHERE m.conversation_id = %s
+                AND m.conversation_id = c.id
+                AND c.agency_id = %s
+                AND m.direction = 'inbound'
+                AND m.read_at IS NULL
+                AND (
+                    %s::uuid IS NULL
+                    OR m.created_at <= (
+                        SELECT up_to.created_at
+                        FROM public.messages up_to
+                        WHERE up_to.id = %s::uuid AND up_to.conversation_id = c.id
+                    )
+                )
+        """, [
+            str(conversation_id),
+            str(user.agency_id),
+            str(up_to_message_id) if up_to_message_id else None,
+            str(up_to_message_id) if up_to_message_id else None,
+        ])
+        marked = cursor.rowcount
+
+        if marked:
+            refresh_conversation_summaries([conversation_id])
+
+    if marked:
+        publish_conversation_event('messages_read', conversation_id)
+    return marked
+
+
+def refresh_conversation_summaries(conversation_ids: Iterable[UUID | str]) -> None:
+    """
+    Recompute the denormalized unread_count and last_message_content of conversations.
+
+    Called after every write that adds, edits, deletes or reads messages so
+    the inbox list can read both from public.conversations. The change in
+    each active SMS conversation's unread_count is applied to its agent's
+    row in public.agent_unread_counts in the same statement, so the unread
+    badge reads one counter instead of counting messages.
+
+    Args:
+        conversation_ids: Conversations whose messages changed
+    """
+    conversation_ids = list({str(cid) for cid in conversation_ids})
+    if not conversation_ids:
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            WITH previous AS (
+                SELECT id, unread_count
+                FROM public.conversations
+                WHERE id = ANY(%s::uuid[])
+                FOR UPDATE
+            ),
+            refreshed AS (
+                UPDATE public.conversations c
+                SET
+                    unread_count = (
+                        SELECT COUNT(*)
+                        FROM public.messages m
+                        WHERE m.conversation_id = c.id
+                            AND m.direction = 'inbound'
+                            AND m.read_at IS NULL
+                    ),
+                    last_message_content = (
+                        SELECT m.content
+                        FROM public.messages m
+                        WHERE m.conversation_id = c.id
+                        ORDER BY m.created_at DESC
+                        LIMIT 1
+                    )
+                FROM previous p
+                WHERE c.id = p.id
+                RETURNING c.agent_id, c.agency_id, c.type, c.is_active,
+                    c.unread_count - COALESCE(p.unread_count, 0) AS delta
+            )
+            INSERT INTO public.agent_unread_counts (agent_id, agency_id, unread_count, updated_at)
+            SELECT agent_id, agency_id, SUM(delta), NOW()
+            FROM refreshed
+            WHERE delta <> 0 AND agent_id IS NOT NULL AND type = 'sms' AND is_active
+            GROUP BY agent_id, agency_id
+            ON CONFLICT (agent_id) DO UPDATE
+            SET unread_count = agent_unread_counts.unread_count + EXCLUDED.unread_count,
+                updated_at = NOW()
+        """, [conversation_ids])
+
+
+def reconcile_unread_counts(agency_id: UUID | str) -> int:
+    """
+    Correct an agency's unread counters from its messages.
+
+    Counters drift when messages or conversations change outside
+    refresh_conversation_summaries (direct writes, reassigned or deactivated
+    conversations). Run periodically by the reconcile_unread_counts command.
+
+    Args:
+        agency_id: The agency to reconcile
+
+    Returns:
+        Number of conversation and agent counters corrected
+    """
+    agency_id = str(agency_id)
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            UPDATE public.conversations c
+            SET unread_count = actual.unread
+            FROM (
+                SELECT c2.id, COUNT(m.id) AS unread
+                FROM public.conversations c2
+                LEFT JOIN public.messages m ON m.conversation_id = c2.id
+                    AND m.direction = 'inbound'
+                    AND m.read_at IS NULL
+                WHERE c2.agency_id = %s
+                GROUP BY c2.id
+            ) actual
+            WHERE c.id = actual.id
+                AND c.unread_count IS DISTINCT FROM actual.unread
+        """, [agency_id])
+        corrected = cursor.rowcount
+
+    # Separate transaction: counters are locked before conversations are
+    # read, so deltas committed meanwhile are either already counted or
+    # wait and apply on top. Conversations are only read here, never
+    # locked, so this cannot deadlock with refresh_conversation_summaries.
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT agent_id FROM public.agent_unread_counts
+            WHERE agency_id = %s
+            FOR UPDATE
+        """, [agency_id])
+
+        cursor.execute("""
+            WITH totals AS (
+                SELECT agent_id, SUM(unread_count) AS unread
+                FROM public.conversations
+                WHERE agency_id = %s
+                    AND agent_id IS NOT NULL
+                    AND type = 'sms'
+                    AND is_active
+                GROUP BY agent_id
+            ),
+            agents AS (
+                SELECT agent_id FROM totals
+                UNION
+                SELECT agent_id FROM public.agent_unread_counts WHERE agency_id = %s
+            )
+            INSERT INTO public.agent_unread_counts (agent_id, agency_id, unread_count, updated_at)
+            SELECT a.agent_id, %s, COALESCE(t.unread, 0), NOW()
+            FROM agents a
+            LEFT JOIN totals t ON t.agent_id = a.agent_id
+            ON CONFLICT (agent_id) DO UPDATE
+            SET unread_count = EXCLUDED.unread_count,
+                agency_id = EXCLUDED.agency_id,
+                updated_at = NOW()
+            WHERE agent_unread_counts.unread_count IS DISTINCT FROM EXCLUDED.unread_count
+                OR agent_unread_counts.agency_id IS DISTINCT FROM EXCLUDED.agency_id
+        """, [agency_id, agency_id, agency_id])
+        corrected += cursor.rowcount
+
+    if corrected:
+        logger.info(f'Reconciled {corrected} unread counters for agency {agency_id}')
+    return corrected
+
+
 def find_conversation(
     user: AuthenticatedUser,
     agent_id: UUID | None = None,
@@ -1098,9 +1424,8 @@ def find_conversation(
             params.append(str(deal_id))
 
         if phone:
-            normalized = normalize_phone_number(phone)
-            conditions.append("c.phone_number = %s")
-            params.append(normalized)
+            conditions.append("c.client_phone_e164 = %s")
+            params.append(to_e164(phone))
 
         where_clause = " AND ".join(conditions)
 
@@ -1213,9 +1538,9 @@ def get_or_create_conversation(
                     FROM public.conversations c
                     WHERE c.agency_id = %s
                         AND c.agent_id = %s
-                        AND c.phone_number = %s
+                        AND c.client_phone_e164 = %s
                     LIMIT 1
-                """, [str(user.agency_id), str(data.agent_id), normalized_phone])
+                """, [str(user.agency_id), str(data.agent_id), to_e164(normalized_phone)])
             else:
                 return GetOrCreateConversationResult(
                     success=False,
@@ -1269,10 +1594,10 @@ def get_or_create_conversation(
         with connection.cursor() as cursor:
             cursor.execute("""
                 INSERT INTO public.conversations (
-                    id, agency_id, agent_id, deal_id, client_id, phone_number,
+                    id, agency_id, agent_id, deal_id, client_id, phone_number, client_phone,
                     sms_opt_in_status, created_at, updated_at
                 )
-                VALUES (%s, %s, %s, %s, %s, %s, 'pending', NOW(), NOW())
+                VALUES (%s, %s, %s, %s, %s, %s, %s, 'pending', NOW(), NOW())
                 RETURNING id, agency_id, agent_id, deal_id, client_id, phone_number,
                     sms_opt_in_status, last_message_at, created_at, updated_at
             """, [
@@ -1282,6 +1607,7 @@ def get_or_create_conversation(
                 str(data.deal_id) if data.deal_id else None,
                 str(data.client_id) if data.client_id else None,
                 normalized_phone,
+                normalized_phone,
             ])
             row = cursor.fetchone()
 
@@ -1407,6 +1733,8 @@ def log_message(
                     WHERE id = %s
                 """, [str(data.conversation_id)])
 
+        refresh_conversation_summaries([data.conversation_id])
+        publish_conversation_event('message_created', data.conversation_id, message_id, data.direction)
         logger.info(f"Message logged: {message_id} ({data.status})")
 
         return LogMessageResult(success=True, message_id=message_id)
@@ -1535,11 +1863,11 @@ def start_conversation(
                 SELECT id, agent_id, deal_id
                 FROM public.conversations
                 WHERE agency_id = %s
-                    AND client_phone = %s
+                    AND client_phone_e164 = %s
                     AND type = 'sms'
                     AND is_active = true
                 LIMIT 1
-            """, [str(agency_id), storage_phone])
+            """, [str(agency_id), to_e164(storage_phone)])
             existing = cursor.fetchone()
 
         if existing:
@@ -1630,6 +1958,8 @@ def start_conversation(
                 '{"automated": true, "type": "welcome_message", "telnyx_message_id": "' +
                 (telnyx_result.get('message_id') or '') + '"}',
             ])
+        refresh_conversation_summaries([conv_id])
+        publish_conversation_event('message_created', conv_id, message_id, 'outbound')
 
         if not telnyx_result['success']:
             logger.warning(f"Welcome SMS failed to send: {telnyx_result.get('error')}")
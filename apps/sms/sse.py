@@ -3,12 +3,14 @@ Server-Sent Events (SSE) for SMS Real-time Updates
 
 Provides real-time updates for SMS conversations and messages.
 Replaces Supabase realtime subscriptions with efficient SSE streaming.
+
+Streams wait on SMS change events (apps.sms.events via apps.core.events)
+and only query when one arrives; they poll every SSE_POLL_INTERVAL only
+while the event hub is unavailable. Under ASGI (uvicorn) they are served
+asynchronously, see apps.core.sse.
 """
-import json
 import logging
-import time
 from datetime import datetime
-from typing import Optional
 from uuid import UUID
 
 from django.db import connection
@@ -17,116 +19,152 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 
 from apps.core.authentication import get_user_context
+from apps.core.events import RESYNC_EVENT
+from apps.core.sse import EventStream, format_event, sse_response
+
+from .events import SMS_EVENTS_CHANNEL
+from .selectors import get_agent_unread_count
 
 logger = logging.getLogger(__name__)
 
-# SSE polling interval in seconds
+# Fallback polling interval in seconds (event hub unavailable)
 SSE_POLL_INTERVAL = 2
 
+# Idle seconds between keepalive comments
+SSE_KEEPALIVE_INTERVAL = 15
+
 # Maximum time to keep connection open (5 minutes)
 SSE_MAX_DURATION = 300
 
 
-class ConversationMessagesSSEView(APIView):
-    """
-    GET /api/sms/sse/messages?conversation_id={id}
+def _error_stream(message: str):
+    """Generate an error event and close stream."""
+    yield format_event('error', {'error': message})
 
-    Server-Sent Events stream for conversation messages.
-    Polls database every 2 seconds and pushes updates to client.
-    Connection closes automatically after 5 minutes.
+
+def _error_response(message: str, status: int) -> StreamingHttpResponse:
+    return StreamingHttpResponse(
+        _error_stream(message),
+        content_type='text/event-stream',
+        status=status
+    )
+
+
+def _format_message(columns: list[str], row: tuple) -> dict:
+    """Convert a messages row to JSON-safe values."""
+    msg = dict(zip(columns, row, strict=False))
+    # Convert datetime objects to ISO strings
+    for key in ['sent_at', 'read_at', 'created_at', 'updated_at']:
+        if msg.get(key):
+            msg[key] = msg[key].isoformat()
+    # Convert UUID to string
+    for key in ['id', 'conversation_id', 'sender_id', 'receiver_id']:
+        if msg.get(key):
+            msg[key] = str(msg[key])
+    return msg
+
+
+def _event_message_ids(batch: list[dict], event_name: str) -> list[str]:
+    """Distinct message IDs of the batch's events with the given name."""
+    return list(dict.fromkeys(
+        event['message_id'] for event in batch
+        if event.get('event') == event_name and event.get('message_id')
+    ))
+
+
+def _needs_scan(event: dict) -> bool:
+    """Whether an event can only be handled by rescanning the conversation."""
+    return event.get('event') not in ('message_created', 'message_updated') or not event.get('message_id')
+
+
+class SMSEventStream(EventStream):
+    """SMS change-event stream with the module's timing settings."""
+    channel = SMS_EVENTS_CHANNEL
+    poll_interval = SSE_POLL_INTERVAL
+    keepalive_interval = SSE_KEEPALIVE_INTERVAL
+    max_duration = SSE_MAX_DURATION
+
+
+class ConversationMessagesStream(SMSEventStream):
+    """
+    Message changes of one conversation.
 
     Events:
     - new_message: New message inserted
     - message_updated: Message updated (e.g., marked as read)
     - conversation_updated: Conversation metadata changed
     """
-    permission_classes = [IsAuthenticated]
 
-    def get(self, request):
-        user = get_user_context(request)
-        if not user:
-            return StreamingHttpResponse(
-                self._error_stream('Unauthorized'),
-                content_type='text/event-stream',
-                status=401
-            )
+    def __init__(self, conversation_id: UUID):
+        self.conversation_key = str(conversation_id)
+        self.last_message_check = datetime.utcnow().isoformat()
+        self.last_conversation_check = self.last_message_check
 
-        conversation_id_str = request.GET.get('conversation_id')
-        if not conversation_id_str:
-            return StreamingHttpResponse(
-                self._error_stream('conversation_id parameter required'),
-                content_type='text/event-stream',
-                status=400
-            )
+    def predicate(self, event: dict) -> bool:
+        return event.get('conversation_id') == self.conversation_key
 
-        try:
-            conversation_id = UUID(conversation_id_str)
-        except ValueError:
-            return StreamingHttpResponse(
-                self._error_stream('Invalid conversation_id format'),
-                content_type='text/event-stream',
-                status=400
-            )
-
-        response = StreamingHttpResponse(
-            self._event_stream(conversation_id, user.id),
-            content_type='text/event-stream'
-        )
-        # Disable buffering for real-time streaming
-        response['Cache-Control'] = 'no-cache'
-        response['X-Accel-Buffering'] = 'no'  # For nginx
-        return response
-
-    def _error_stream(self, message: str):
-        """Generate an error event and close stream."""
-        yield f"event: error\ndata: {json.dumps({'error': message})}\n\n"
-
-    def _event_stream(self, conversation_id: UUID, user_id: UUID):
-        """
-        Generate SSE events for conversation updates.
-        """
-        start_time = time.time()
-        last_message_check = None
-        last_conversation_check = None
-
-        while True:
-            # Check timeout
-            elapsed = time.time() - start_time
-            if elapsed > SSE_MAX_DURATION:
-                yield f"event: timeout\ndata: {json.dumps({'message': 'Stream timeout'})}\n\n"
-                break
-
-            # Check for new/updated messages
-            messages_result = self._get_messages_since(
-                conversation_id, last_message_check
-            )
-
-            for msg in messages_result.get('new_messages', []):
-                yield f"event: new_message\ndata: {json.dumps(msg)}\n\n"
-
-            for msg in messages_result.get('updated_messages', []):
-                yield f"event: message_updated\ndata: {json.dumps(msg)}\n\n"
-
-            if messages_result.get('latest_check'):
-                last_message_check = messages_result['latest_check']
-
-            # Check for conversation updates
-            conv_result = self._get_conversation_updates(
-                conversation_id, last_conversation_check
-            )
-
-            if conv_result.get('updated'):
-                yield f"event: conversation_updated\ndata: {json.dumps(conv_result['data'])}\n\n"
-
-            if conv_result.get('latest_check'):
-                last_conversation_check = conv_result['latest_check']
-
-            # Wait before next poll
-            time.sleep(SSE_POLL_INTERVAL)
-
-    def _get_messages_since(
-        self, conversation_id: UUID, since: Optional[str]
-    ) -> dict:
+    def handle(self, batch: list[dict]) -> list[str]:
+        chunks = []
+
+        # Single-message events name the row; load exactly those
+        created_ids = _event_message_ids(batch, 'message_created')
+        updated_ids = [mid for mid in _event_message_ids(batch, 'message_updated') if mid not in created_ids]
+        if created_ids or updated_ids:
+            messages = self._get_messages_by_ids(created_ids + updated_ids)
+            for mid in created_ids:
+                if mid in messages:
+                    chunks.append(format_event('new_message', messages[mid]))
+            for mid in updated_ids:
+                if mid in messages:
+                    chunks.append(format_event('message_updated', messages[mid]))
+
+        # Anything else (bulk reads, conversation changes, resyncs)
+        # is picked up by the timestamp scan
+        if not any(_needs_scan(event) for event in batch):
+            return chunks
+
+        # Check for new/updated messages
+        messages_result = self._get_messages_since(self.last_message_check)
+
+        for msg in messages_result.get('new_messages', []):
+            if msg['id'] not in created_ids:
+                chunks.append(format_event('new_message', msg))
+
+        for msg in messages_result.get('updated_messages', []):
+            if msg['id'] not in updated_ids:
+                chunks.append(format_event('message_updated', msg))
+
+        if messages_result.get('latest_check'):
+            self.last_message_check = messages_result['latest_check']
+
+        # Check for conversation updates
+        conv_result = self._get_conversation_updates(self.last_conversation_check)
+
+        if conv_result.get('updated'):
+            chunks.append(format_event('conversation_updated', conv_result['data']))
+
+        if conv_result.get('latest_check'):
+            self.last_conversation_check = conv_result['latest_check']
+
+        return chunks
+
+    def _get_messages_by_ids(self, message_ids: list[str]) -> dict[str, dict]:
+        """Fetch specific messages of the conversation, keyed by ID."""
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT id, conversation_id, sender_id, receiver_id, body,
+                       direction, status, sent_at, read_at, metadata,
+                       created_at, updated_at
+                FROM messages
+                WHERE conversation_id = %s
+                  AND id = ANY(%s::uuid[])
+            """, [self.conversation_key, message_ids])
+
+            columns = [col[0] for col in cursor.description]
+            messages = [_format_message(columns, row) for row in cursor.fetchall()]
+        return {msg['id']: msg for msg in messages}
+
+    def _get_messages_since(self, since: str | None) -> dict:
         """Fetch new and updated messages since the last check."""
         result = {
             'new_messages': [],
@@ -147,20 +185,11 @@ class ConversationMessagesSSEView(APIView):
                     WHERE conversation_id = %s
                       AND created_at > %s
                     ORDER BY created_at ASC
-                """, [str(conversation_id), since])
+                """, [self.conversation_key, since])
 
                 columns = [col[0] for col in cursor.description]
                 for row in cursor.fetchall():
-                    msg = dict(zip(columns, row))
-                    # Convert datetime objects to ISO strings
-                    for key in ['sent_at', 'read_at', 'created_at', 'updated_at']:
-                        if msg.get(key):
-                            msg[key] = msg[key].isoformat()
-                    # Convert UUID to string
-                    for key in ['id', 'conversation_id', 'sender_id', 'receiver_id']:
-                        if msg.get(key):
-                            msg[key] = str(msg[key])
-                    result['new_messages'].append(msg)
+                    result['new_messages'].append(_format_message(columns, row))
 
                 # Check for updated messages (e.g., marked as read)
                 cursor.execute("""
@@ -172,26 +201,17 @@ class ConversationMessagesSSEView(APIView):
                       AND updated_at > %s
                       AND created_at <= %s
                     ORDER BY updated_at ASC
-                """, [str(conversation_id), since, since])
+                """, [self.conversation_key, since, since])
 
                 columns = [col[0] for col in cursor.description]
                 for row in cursor.fetchall():
-                    msg = dict(zip(columns, row))
-                    for key in ['sent_at', 'read_at', 'created_at', 'updated_at']:
-                        if msg.get(key):
-                            msg[key] = msg[key].isoformat()
-                    for key in ['id', 'conversation_id', 'sender_id', 'receiver_id']:
-                        if msg.get(key):
-                            msg[key] = str(msg[key])
-                    result['updated_messages'].append(msg)
+                    result['updated_messages'].append(_format_message(columns, row))
 
             result['latest_check'] = now
 
         return result
 
-    def _get_conversation_updates(
-        self, conversation_id: UUID, since: Optional[str]
-    ) -> dict:
+    def _get_conversation_updates(self, since: str | None) -> dict:
         """Check if conversation metadata was updated."""
         result = {
             'updated': False,
@@ -208,12 +228,12 @@ class ConversationMessagesSSEView(APIView):
                            updated_at
                     FROM conversations
                     WHERE id = %s AND updated_at > %s
-                """, [str(conversation_id), since])
+                """, [self.conversation_key, since])
 
                 row = cursor.fetchone()
                 if row:
                     columns = [col[0] for col in cursor.description]
-                    data = dict(zip(columns, row))
+                    data = dict(zip(columns, row, strict=False))
                     data['id'] = str(data['id'])
                     for key in ['opted_in_at', 'opted_out_at', 'updated_at']:
                         if data.get(key):
@@ -226,139 +246,114 @@ class ConversationMessagesSSEView(APIView):
         return result
 
 
-class UnreadCountSSEView(APIView):
+class ConversationMessagesSSEView(APIView):
     """
-    GET /api/sms/sse/unread-count
+    GET /api/sms/sse/messages?conversation_id={id}
 
-    Server-Sent Events stream for unread message count.
-    Polls database every 2 seconds and pushes updates when count changes.
+    Server-Sent Events stream for conversation messages.
+    Pushes updates to the client when the conversation changes.
+    Connection closes automatically after 5 minutes.
+
+    Events: see ConversationMessagesStream
     """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         user = get_user_context(request)
         if not user:
-            return StreamingHttpResponse(
-                self._error_stream('Unauthorized'),
-                content_type='text/event-stream',
-                status=401
-            )
-
-        response = StreamingHttpResponse(
-            self._event_stream(user.id),
-            content_type='text/event-stream'
-        )
-        response['Cache-Control'] = 'no-cache'
-        response['X-Accel-Buffering'] = 'no'
-        return response
+            return _error_response('Unauthorized', 401)
 
-    def _error_stream(self, message: str):
-        """Generate an error event and close stream."""
-        yield f"event: error\ndata: {json.dumps({'error': message})}\n\n"
+        conversation_id_str = request.GET.get('conversation_id')
+        if not conversation_id_str:
+            return _error_response('conversation_id parameter required', 400)
 
-    def _event_stream(self, user_id: UUID):
-        """Generate SSE events for unread count changes."""
-        start_time = time.time()
-        last_count = None
+        try:
+            conversation_id = UUID(conversation_id_str)
+        except ValueError:
+            return _error_response('Invalid conversation_id format', 400)
 
-        while True:
-            elapsed = time.time() - start_time
-            if elapsed > SSE_MAX_DURATION:
-                yield f"event: timeout\ndata: {json.dumps({'message': 'Stream timeout'})}\n\n"
-                break
+        return sse_response(request, ConversationMessagesStream(conversation_id))
 
-            current_count = self._get_unread_count(user_id)
 
-            # Only send event if count changed
-            if last_count is None or current_count != last_count:
-                yield f"event: count_update\ndata: {json.dumps({'unread_count': current_count})}\n\n"
-                last_count = current_count
+class UnreadCountStream(SMSEventStream):
+    """Rereads the user's unread counter when their conversations change; sends count_update on change."""
 
-            time.sleep(SSE_POLL_INTERVAL)
+    def __init__(self, user_id: UUID):
+        self.user_key = str(user_id)
+        self.last_count = None
 
-    def _get_unread_count(self, user_id: UUID) -> int:
-        """Get total unread message count for user."""
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT COUNT(*)
-                FROM messages m
-                JOIN conversations c ON m.conversation_id = c.id
-                WHERE c.agent_id = %s
-                  AND m.direction = 'inbound'
-                  AND m.read_at IS NULL
-            """, [str(user_id)])
+    def predicate(self, event: dict) -> bool:
+        return event.get('agent_id') == self.user_key
 
-            row = cursor.fetchone()
-            return row[0] if row else 0
+    def open(self) -> list[str]:
+        self.last_count = self._get_unread_count()
+        return [format_event('count_update', {'unread_count': self.last_count})]
 
+    def handle(self, batch: list[dict]) -> list[str]:
+        current_count = self._get_unread_count()
 
-class ConversationsSSEView(APIView):
+        # Only send event if count changed
+        if current_count == self.last_count:
+            return []
+        self.last_count = current_count
+        return [format_event('count_update', {'unread_count': current_count})]
+
+    def _get_unread_count(self) -> int:
+        """Get total unread message count for user."""
+        return get_agent_unread_count([self.user_key])
+
+
+class UnreadCountSSEView(APIView):
     """
-    GET /api/sms/sse/conversations
+    GET /api/sms/sse/unread-count
 
-    Server-Sent Events stream for conversation list updates.
-    Notifies when any conversation has new inbound messages.
-    Used for list invalidation.
+    Server-Sent Events stream for unread message count.
+    Recounts when the user's conversations change and pushes updates when
+    the count changes.
     """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         user = get_user_context(request)
         if not user:
-            return StreamingHttpResponse(
-                self._error_stream('Unauthorized'),
-                content_type='text/event-stream',
-                status=401
-            )
+            return _error_response('Unauthorized', 401)
 
-        # Get view mode (self or all for admins)
-        view = request.GET.get('view', 'self')
+        return sse_response(request, UnreadCountStream(user.id))
+
+
+class ConversationsStream(SMSEventStream):
+    """New inbound messages in the user's (or, for admins, the agency's) conversations."""
 
-        response = StreamingHttpResponse(
-            self._event_stream(user.id, user.agency_id, user.is_admin, view),
-            content_type='text/event-stream'
+    def __init__(self, user_id: UUID, agency_id: UUID, is_admin: bool, view: str):
+        if view == 'all' and is_admin:
+            self.scope_field, self.scope_key = 'agency_id', str(agency_id)
+        else:
+            self.scope_field, self.scope_key = 'agent_id', str(user_id)
+        self.last_check = datetime.utcnow().isoformat()
+
+    def predicate(self, event: dict) -> bool:
+        return (
+            event.get(self.scope_field) == self.scope_key
+            and event.get('event') == 'message_created'
+            and event.get('direction') == 'inbound'
         )
-        response['Cache-Control'] = 'no-cache'
-        response['X-Accel-Buffering'] = 'no'
-        return response
-
-    def _error_stream(self, message: str):
-        """Generate an error event and close stream."""
-        yield f"event: error\ndata: {json.dumps({'error': message})}\n\n"
-
-    def _event_stream(
-        self, user_id: UUID, agency_id: UUID, is_admin: bool, view: str
-    ):
-        """Generate SSE events for conversation list changes."""
-        start_time = time.time()
-        last_check = None
-
-        while True:
-            elapsed = time.time() - start_time
-            if elapsed > SSE_MAX_DURATION:
-                yield f"event: timeout\ndata: {json.dumps({'message': 'Stream timeout'})}\n\n"
-                break
-
-            result = self._check_conversation_updates(
-                user_id, agency_id, is_admin, view, last_check
-            )
-
-            if result.get('has_updates'):
-                yield f"event: conversation_update\ndata: {json.dumps({'updated_conversations': result['conversation_ids']})}\n\n"
-
-            if result.get('latest_check'):
-                last_check = result['latest_check']
-
-            time.sleep(SSE_POLL_INTERVAL)
-
-    def _check_conversation_updates(
-        self,
-        user_id: UUID,
-        agency_id: UUID,
-        is_admin: bool,
-        view: str,
-        since: Optional[str]
-    ) -> dict:
+
+    def handle(self, batch: list[dict]) -> list[str]:
+        if RESYNC_EVENT in batch:
+            # Events may have been missed; fall back to the query
+            result = self._check_conversation_updates(self.last_check)
+            conversation_ids = result.get('conversation_ids', [])
+            self.last_check = result.get('latest_check') or self.last_check
+        else:
+            # The events name the conversations; no query needed
+            conversation_ids = list(dict.fromkeys(e['conversation_id'] for e in batch))
+            self.last_check = datetime.utcnow().isoformat()
+
+        if not conversation_ids:
+            return []
+        return [format_event('conversation_update', {'updated_conversations': conversation_ids})]
+
+    def _check_conversation_updates(self, since: str | None) -> dict:
         """Check for conversations with new inbound messages."""
         result = {
             'has_updates': False,
@@ -371,7 +366,7 @@ class ConversationsSSEView(APIView):
 
             if since:
                 # Build base query based on view mode
-                if view == 'all' and is_admin:
+                if self.scope_field == 'agency_id':
                     # Admin sees all agency conversations
                     cursor.execute("""
                         SELECT DISTINCT c.id
@@ -380,7 +375,7 @@ class ConversationsSSEView(APIView):
                         WHERE c.agency_id = %s
                           AND m.direction = 'inbound'
                           AND m.created_at > %s
-                    """, [str(agency_id), since])
+                    """, [self.scope_key, since])
                 else:
                     # User sees only their conversations
                     cursor.execute("""
@@ -390,7 +385,7 @@ class ConversationsSSEView(APIView):
                         WHERE c.agent_id = %s
                           AND m.direction = 'inbound'
                           AND m.created_at > %s
-                    """, [str(user_id), since])
+                    """, [self.scope_key, since])
 
                 conversation_ids = [str(row[0]) for row in cursor.fetchall()]
 
@@ -401,3 +396,24 @@ class ConversationsSSEView(APIView):
             result['latest_check'] = now
 
         return result
+
+
+class ConversationsSSEView(APIView):
+    """
+    GET /api/sms/sse/conversations
+
+    Server-Sent Events stream for conversation list updates.
+    Notifies when any conversation has new inbound messages.
+    Used for list invalidation.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        user = get_user_context(request)
+        if not user:
+            return _error_response('Unauthorized', 401)
+
+        # Get view mode (self or all for admins)
+        view = request.GET.get('view', 'self')
+
+        return sse_response(request, ConversationsStream(user.id, user.agency_id, user.is_admin, view))
@@ -3,14 +3,29 @@ SMS Templates Service
 
 Provides template management and rendering for automated SMS messages.
 Ported from frontend sms-template-helpers.ts.
+
+Templates are compiled once (compile_template) into literal and placeholder
+segments and rendered per recipient by joining the segments, instead of
+rescanning the text for every placeholder. Compiled templates are cached by
+their text, so agencies sharing a template share one compiled copy and an
+edited template simply compiles anew.
 """
 import logging
+import re
+from collections.abc import Iterable
 from uuid import UUID
 
 from django.db import connection
 
+from apps.core.cache import LRUCache
+
 logger = logging.getLogger(__name__)
 
+_PLACEHOLDER_RE = re.compile(r'\{\{(\w+)\}\}')
+
+# Compiled templates never go stale (keyed by text); the TTL only bounds memory
+_compiled_cache = LRUCache(maxsize=512, ttl=3600, name='sms_templates')
+
 
 # Default templates used across the application
 # These match the frontend DEFAULT_SMS_TEMPLATES in sms-template-helpers.ts
@@ -70,12 +85,15 @@ SMS_TEMPLATE_PLACEHOLDERS = {
     'policy_packet': ['client_first_name'],
 }
 
+# Placeholders available to bulk messages (send_bulk_messages)
+BULK_SMS_PLACEHOLDERS = ['client_name', 'first_name', 'last_name']
+
 # Mapping of template types to agency column names
 AGENCY_TEMPLATE_COLUMNS = {
     'welcome': 'sms_welcome_template',
     'birthday': 'sms_birthday_template',
     'billing_reminder': 'sms_billing_reminder_template',
-    'lapse_reminder': 'sms_lapse_template',
+    'lapse_reminder': 'sms_lapse_reminder_template',
     'quarterly': 'sms_quarterly_template',
     'holiday': 'sms_holiday_template',
     'policy_packet': 'sms_policy_packet_template',
@@ -92,6 +110,68 @@ AGENCY_TEMPLATE_ENABLED_COLUMNS = {
 }
 
 
+class CompiledTemplate:
+    """
+    A template parsed into alternating literal and placeholder segments.
+
+    Rendering fills each placeholder from the context. Placeholders missing
+    from the context are kept as written and falsy values render empty, as
+    with replace_placeholders().
+    """
+
+    __slots__ = ('source', 'placeholders', '_literals', '_names')
+
+    def __init__(self, source: str):
+        parts = _PLACEHOLDER_RE.split(source)
+        self.source = source
+        self._literals = parts[0::2]
+        self._names = parts[1::2]
+        self.placeholders = frozenset(self._names)
+
+    def unknown_placeholders(self, known: Iterable[str]) -> list[str]:
+        """Placeholders not in known, in order of first use."""
+        known = set(known)
+        return list(dict.fromkeys(name for name in self._names if name not in known))
+
+    def render(self, context: dict) -> str:
+        """Fill the placeholders from context."""
+        if not self._names:
+            return self.source
+        out = [self._literals[0]]
+        for name, literal in zip(self._names, self._literals[1:], strict=True):
+            if name in context:
+                value = context[name]
+                out.append(str(value) if value else '')
+            else:
+                out.append('{{' + name + '}}')
+            out.append(literal)
+        return ''.join(out)
+
+
+def compile_template(template: str) -> CompiledTemplate:
+    """Get the compiled form of a template (cached by its text)."""
+    compiled = _compiled_cache.get(template)
+    if compiled is None:
+        compiled = CompiledTemplate(template)
+        _compiled_cache.set(template, compiled)
+    return compiled
+
+
+def validate_template(template: str, template_type: str) -> list[str]:
+    """
+    Check a template's placeholders against those its type provides.
+
+    Args:
+        template: The template text
+        template_type: A SMS_TEMPLATE_PLACEHOLDERS key, or 'bulk'
+
+    Returns:
+        Unknown placeholder names (empty if the template is valid)
+    """
+    known = BULK_SMS_PLACEHOLDERS if template_type == 'bulk' else SMS_TEMPLATE_PLACEHOLDERS.get(template_type, [])
+    return compile_template(template).unknown_placeholders(known)
+
+
 def replace_placeholders(template: str, context: dict) -> str:
     """
     Replace {{placeholder}} tokens with values from context.
@@ -105,11 +185,7 @@ def replace_placeholders(template: str, context: dict) -> str:
     Returns:
         The template with all placeholders replaced
     """
-    result = template
-    for key, value in context.items():
-        placeholder = '{{' + key + '}}'
-        result = result.replace(placeholder, str(value) if value else '')
-    return result
+    return compile_template(template).render(context)
 
 
 def get_agency_template(agency_id: UUID, template_type: str) -> str | None:
@@ -231,7 +307,7 @@ def get_agency_sms_settings(agency_id: UUID) -> dict:
                     sms_welcome_template,
                     sms_birthday_template,
                     sms_billing_reminder_template,
-                    sms_lapse_template,
+                    sms_lapse_reminder_template,
                     sms_quarterly_template,
                     sms_holiday_template,
                     sms_policy_packet_template
@@ -256,7 +332,7 @@ def get_agency_sms_settings(agency_id: UUID) -> dict:
             'sms_welcome_template': row[7],
             'sms_birthday_template': row[8],
             'sms_billing_reminder_template': row[9],
-            'sms_lapse_template': row[10],
+            'sms_lapse_reminder_template': row[10],
             'sms_quarterly_template': row[11],
             'sms_holiday_template': row[12],
             'sms_policy_packet_template': row[13],
@@ -302,7 +378,7 @@ def batch_get_agency_sms_settings(agency_ids: list[UUID]) -> dict[str, dict]:
                     sms_welcome_template,
                     sms_birthday_template,
                     sms_billing_reminder_template,
-                    sms_lapse_template,
+                    sms_lapse_reminder_template,
                     sms_quarterly_template,
                     sms_holiday_template,
                     sms_policy_packet_template
@@ -325,7 +401,7 @@ def batch_get_agency_sms_settings(agency_ids: list[UUID]) -> dict[str, dict]:
                 'sms_welcome_template': row[8],
                 'sms_birthday_template': row[9],
                 'sms_billing_reminder_template': row[10],
-                'sms_lapse_template': row[11],
+                'sms_lapse_reminder_template': row[11],
                 'sms_quarterly_template': row[12],
                 'sms_holiday_template': row[13],
                 'sms_policy_packet_template': row[14],
@@ -0,0 +1,104 @@
+"""
+Conversation Phone Matching Unit Tests
+
+Conversations written by get_or_create_conversation must be found again by
+every lookup that matches on the generated client_phone_e164 column.
+"""
+import re
+from contextlib import nullcontext
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+from django.test import SimpleTestCase
+
+from apps.core.phone import to_e164
+from apps.sms import services
+
+
+class FakeConversationsTable:
+    """
+    Minimal stand-in for public.conversations.
+
+    client_phone_e164 is derived from client_phone on insert, like the
+    generated column, so a write to any other phone column leaves it NULL.
+    """
+
+    def __init__(self):
+        self.rows: list[dict] = []
+        self._result = []
+
+    def cursor(self):
+        cursor = MagicMock()
+        cursor.execute.side_effect = self._execute
+        cursor.fetchone.side_effect = lambda: self._result[0] if self._result else None
+        cursor.fetchall.side_effect = lambda: list(self._result)
+        return nullcontext(cursor)
+
+    def _execute(self, sql, params):
+        sql = ' '.join(sql.split())
+        if sql.startswith('INSERT INTO public.conversations'):
+            columns = re.search(r'\((.*?)\) VALUES', sql).group(1).replace(' ', '').split(',')
+            row = dict(zip(columns, params, strict=False))
+            row.update(sms_opt_in_status='pending', last_message_at=None,
+                       created_at=datetime.now(UTC), updated_at=datetime.now(UTC))
+            row['client_phone_e164'] = to_e164(row.get('client_phone'))
+            self.rows.append(row)
+            self._result = [self._select(row)]
+        elif sql.startswith('SELECT'):
+            e164 = params[-1]
+            self._result = [self._select(r) for r in self.rows if r['client_phone_e164'] == e164][:1]
+        elif sql.startswith('UPDATE public.conversations'):
+            status = re.search(r"sms_opt_in_status = '(\w+)'", sql).group(1)
+            matched = [r for r in self.rows if r['client_phone_e164'] == params[0]]
+            for row in matched:
+                row['sms_opt_in_status'] = status
+            self._result = [(r['id'],) for r in matched]
+        else:
+            raise AssertionError(f'Unexpected SQL: {sql}')
+
+    @staticmethod
+    def _select(row):
+        return (
+            row['id'], row['agency_id'], row['agent_id'], row['deal_id'], row['client_id'],
+            row['phone_number'], row['sms_opt_in_status'], row['last_message_at'],
+            row['created_at'], row['updated_at'],
+        )
+
+
+@patch('apps.sms.services.publish_phone_conversations_updated')
+class GetOrCreateConversationPhoneTests(SimpleTestCase):
+    """Conversations created by get_or_create are found by the E.164 lookups.
+
+    The atomic-decorated services are called through __wrapped__.
+    """
+
+    def setUp(self):
+        self.table = FakeConversationsTable()
+        patcher = patch('apps.sms.services.connection', self.table)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = MagicMock(id=uuid4(), agency_id=uuid4())
+        self.agent_id = uuid4()
+
+    def _get_or_create(self, phone):
+        return services.get_or_create_conversation.__wrapped__(
+            self.user,
+            services.GetOrCreateConversationInput(agent_id=self.agent_id, phone_number=phone),
+        )
+
+    def test_created_conversation_is_found_and_opted_out(self, mock_publish):
+        created = self._get_or_create('(669) 245-6363')
+        self.assertTrue(created.created)
+
+        # A second call with another format reuses the row instead of duplicating it
+        again = self._get_or_create('669-245-6363')
+        self.assertFalse(again.created)
+        self.assertEqual(again.conversation['id'], created.conversation['id'])
+        self.assertEqual(len(self.table.rows), 1)
+
+        found = services.find_conversation(self.user, phone='+1 669 245 6363')
+        self.assertEqual(found['id'], created.conversation['id'])
+
+        self.assertTrue(services.handle_stop_keyword.__wrapped__('+16692456363', self.user.agency_id))
+        self.assertEqual(self.table.rows[0]['sms_opt_in_status'], 'opted_out')
@@ -0,0 +1,90 @@
+"""
+SMS Dispatch Unit Tests
+
+Tests for concurrent bulk sending and provider rate limiting.
+"""
+import threading
+import time
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from apps.sms.dispatch import OutboundSMS, RateLimiter, dispatch_sms
+
+
+def outbound(count: int) -> list[OutboundSMS]:
+    return [OutboundSMS(key=i, from_number='+15550000000', to_number=f'+1555000{i:04d}', text='hi') for i in range(count)]
+
+
+class RateLimiterTests(SimpleTestCase):
+    """Tests for RateLimiter."""
+
+    def test_spaces_calls(self):
+        """Calls beyond the first are spaced by 1/rate seconds."""
+        limiter = RateLimiter(rate=50)
+
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.acquire()
+
+        self.assertGreaterEqual(time.monotonic() - start, 4 / 50)
+
+    def test_zero_rate_does_not_block(self):
+        """A rate of 0 disables limiting."""
+        limiter = RateLimiter(rate=0)
+
+        start = time.monotonic()
+        for _ in range(100):
+            limiter.acquire()
+
+        self.assertLess(time.monotonic() - start, 0.05)
+
+
+@patch('apps.sms.dispatch.get_rate_limiter', return_value=RateLimiter(rate=0))
+class DispatchSMSTests(SimpleTestCase):
+    """Tests for dispatch_sms."""
+
+    @patch('apps.sms.services.send_sms_via_telnyx')
+    def test_results_keyed_per_message(self, mock_send, _limiter):
+        """Every message gets its own provider result."""
+        mock_send.side_effect = lambda from_number, to_number, text: {
+            'success': not to_number.endswith('1'), 'message_id': to_number,
+        }
+
+        results = dispatch_sms(outbound(3))
+
+        self.assertEqual(set(results), {0, 1, 2})
+        self.assertTrue(results[0]['success'])
+        self.assertFalse(results[1]['success'])
+
+    @patch('apps.sms.services.send_sms_via_telnyx')
+    def test_sends_run_concurrently(self, mock_send, _limiter):
+        """Up to `concurrency` sends are in flight at once."""
+        in_flight, peak, lock = [0], [0], threading.Lock()
+
+        def send(from_number, to_number, text):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.02)
+            with lock:
+                in_flight[0] -= 1
+            return {'success': True}
+
+        mock_send.side_effect = send
+
+        dispatch_sms(outbound(8), concurrency=4)
+
+        self.assertGreater(peak[0], 1)
+        self.assertLessEqual(peak[0], 4)
+
+    @patch('apps.sms.services.send_sms_via_telnyx', side_effect=RuntimeError('boom'))
+    def test_exception_becomes_failure(self, _send, _limiter):
+        """A raising send is reported as a failed result."""
+        results = dispatch_sms(outbound(1))
+
+        self.assertEqual(results[0], {'success': False, 'error': 'boom'})
+
+    def test_no_messages(self, _limiter):
+        """Nothing to send returns no results."""
+        self.assertEqual(dispatch_sms([]), {})
@@ -0,0 +1,194 @@
+"""
+Inbound SMS Unit Tests
+
+Tests for the Telnyx webhook fast path and the inbound message job.
+"""
+from contextlib import nullcontext
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+from django.test import RequestFactory, SimpleTestCase
+
+from apps.sms import inbound
+from apps.sms.services import GetOrCreateConversationResult, LogMessageResult
+from apps.sms.views import TelnyxWebhookView
+
+
+def make_event(text='Hello', message_id='msg-1', event_type='message.received'):
+    return {
+        'data': {
+            'event_type': event_type,
+            'payload': {
+                'id': message_id,
+                'from': {'phone_number': '+16692456363'},
+                'to': [{'phone_number': '+15551234567'}],
+                'text': text,
+            },
+        },
+    }
+
+
+class TelnyxWebhookViewTests(SimpleTestCase):
+    """Tests for TelnyxWebhookView.post."""
+
+    def _post(self, body):
+        request = RequestFactory().post('/api/sms/webhooks/telnyx', body, content_type='application/json')
+        return TelnyxWebhookView.as_view()(request)
+
+    @patch('apps.core.jobs.enqueue_job')
+    def test_queues_event(self, mock_enqueue):
+        job_id = uuid4()
+        mock_enqueue.return_value = job_id
+        event = make_event(text='stop')
+
+        response = self._post(event)
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['job_id'], str(job_id))
+        self.assertEqual(response.data['keyword'], 'STOP')
+        mock_enqueue.assert_called_once_with('sms.inbound_message', {'event': event}, dedupe_key='msg-1')
+
+    @patch('apps.core.jobs.enqueue_job', return_value=None)
+    def test_retry_is_acknowledged(self, mock_enqueue):
+        """A redelivered message is acknowledged without a second job."""
+        response = self._post(make_event())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['duplicate'])
+
+    @patch('apps.core.jobs.enqueue_job')
+    def test_other_events_ignored(self, mock_enqueue):
+        response = self._post(make_event(event_type='message.sent'))
+
+        self.assertEqual(response.status_code, 200)
+        mock_enqueue.assert_not_called()
+
+    @patch('apps.core.jobs.enqueue_job')
+    def test_missing_numbers_rejected(self, mock_enqueue):
+        event = make_event()
+        event['data']['payload']['to'] = []
+
+        self.assertEqual(self._post(event).status_code, 400)
+        mock_enqueue.assert_not_called()
+
+
+class PhoneLookupCacheTests(SimpleTestCase):
+    """Tests for the cached phone resolutions."""
+
+    def test_hit_skips_load(self):
+        cache = MagicMock()
+        cache.get.return_value = {'id': 'a'}
+        load = MagicMock()
+
+        self.assertEqual(inbound._cached_lookup(cache, 'k', load, 60), {'id': 'a'})
+        load.assert_not_called()
+
+    def test_miss_is_cached(self):
+        """Unknown numbers are cached too, and read back as None."""
+        cache = MagicMock()
+        cache.get.return_value = None
+
+        self.assertIsNone(inbound._cached_lookup(cache, 'k', lambda: None, 60))
+        cache.set.assert_called_once_with('k', inbound._NOT_FOUND, 60)
+
+        cache.get.return_value = inbound._NOT_FOUND
+        load = MagicMock()
+        self.assertIsNone(inbound._cached_lookup(cache, 'k', load, 60))
+        load.assert_not_called()
+
+    @patch('apps.sms.inbound.caches')
+    def test_agency_miss_not_cached(self, mock_caches):
+        """An unknown receiving number is looked up again on the next message."""
+        cache = mock_caches.__getitem__.return_value
+        cache.get.return_value = None
+
+        with patch('apps.core.phone.find_agency_by_phone', return_value=None) as load:
+            self.assertIsNone(inbound.find_agency_by_phone('(669) 245-6363'))
+            self.assertIsNone(inbound.find_agency_by_phone('(669) 245-6363'))
+
+        self.assertEqual(load.call_count, 2)
+        cache.set.assert_not_called()
+
+    @patch('apps.sms.inbound.transaction.on_commit', side_effect=lambda func: func())
+    @patch('apps.sms.inbound.caches')
+    def test_invalidate_agency_by_phone(self, mock_caches, mock_on_commit):
+        cache = mock_caches.__getitem__.return_value
+
+        inbound.invalidate_agency_by_phone('(669) 245-6363', None, '+1 555 123 4567')
+
+        cache.delete_many.assert_called_once_with([
+            'sms:agency_by_phone:+16692456363', 'sms:agency_by_phone:+15551234567',
+        ])
+
+    def test_cache_failure_falls_back(self):
+        cache = MagicMock()
+        cache.get.side_effect = RuntimeError('redis down')
+
+        self.assertEqual(inbound._cached_lookup(cache, 'k', lambda: 1, 60), 1)
+
+
+@patch('apps.sms.inbound.transaction.atomic', return_value=nullcontext())
+@patch('apps.sms.inbound.handle_stop_keyword')
+@patch('apps.sms.inbound.log_message')
+@patch('apps.sms.inbound._is_logged', return_value=False)
+@patch('apps.sms.inbound.get_or_create_conversation')
+@patch('apps.sms.inbound.find_inbound_deal')
+@patch('apps.sms.inbound.find_agency_by_phone')
+class ProcessInboundMessageTests(SimpleTestCase):
+    """Tests for process_inbound_message."""
+
+    def setUp(self):
+        self.agency_id = str(uuid4())
+        self.agent_id = str(uuid4())
+        self.conversation_id = str(uuid4())
+
+    def _resolve(self, mock_agency, mock_deal, mock_conversation):
+        mock_agency.return_value = {'id': self.agency_id, 'name': 'A', 'phone_number': '+15551234567'}
+        mock_deal.return_value = {'id': str(uuid4()), 'agent': {'id': self.agent_id}}
+        mock_conversation.return_value = GetOrCreateConversationResult(
+            success=True, conversation={'id': self.conversation_id},
+        )
+
+    def test_logs_and_handles_stop(self, mock_agency, mock_deal, mock_conversation,
+                                   mock_is_logged, mock_log, mock_stop, mock_atomic):
+        self._resolve(mock_agency, mock_deal, mock_conversation)
+        mock_log.return_value = LogMessageResult(success=True, message_id=uuid4())
+
+        outcome = inbound.process_inbound_message(make_event(text=' Stop '))
+
+        self.assertEqual(outcome['status'], 'processed')
+        self.assertEqual(outcome['keyword'], 'STOP')
+        mock_deal.assert_called_once_with('6692456363', self.agency_id)
+        metadata = mock_log.call_args.kwargs['data'].metadata
+        self.assertEqual(metadata['telnyx_message_id'], 'msg-1')
+        self.assertEqual(metadata['compliance_keyword'], 'STOP')
+        mock_stop.assert_called_once()
+
+    def test_already_logged_skipped(self, mock_agency, mock_deal, mock_conversation,
+                                    mock_is_logged, mock_log, mock_stop, mock_atomic):
+        """A retried job does not log the message twice."""
+        self._resolve(mock_agency, mock_deal, mock_conversation)
+        mock_is_logged.return_value = True
+
+        outcome = inbound.process_inbound_message(make_event())
+
+        self.assertEqual(outcome['status'], 'duplicate')
+        mock_is_logged.assert_called_once_with(self.conversation_id, 'msg-1')
+        mock_log.assert_not_called()
+
+    def test_unknown_agency_not_retried(self, mock_agency, mock_deal, mock_conversation,
+                                        mock_is_logged, mock_log, mock_stop, mock_atomic):
+        mock_agency.return_value = None
+
+        self.assertEqual(inbound.process_inbound_message(make_event())['status'], 'agency_not_found')
+        mock_deal.assert_not_called()
+
+    def test_log_failure_raises(self, mock_agency, mock_deal, mock_conversation,
+                                mock_is_logged, mock_log, mock_stop, mock_atomic):
+        """Failures raise so the job is retried."""
+        self._resolve(mock_agency, mock_deal, mock_conversation)
+        mock_log.return_value = LogMessageResult(success=False, error='db down')
+
+        with self.assertRaises(RuntimeError):
+            inbound.process_inbound_message(make_event())
+        mock_stop.assert_not_called()
@@ -0,0 +1,156 @@
+"""
+SMS Read State Unit Tests
+
+Tests for conversation-level mark-read, the denormalized conversation
+summaries and the per-agent unread counters.
+"""
+from contextlib import nullcontext
+from types import SimpleNamespace
+from unittest.mock import patch
+from uuid import uuid4
+
+from django.test import SimpleTestCase
+
+from apps.sms import selectors, services
+
+
+def make_user():
+    return SimpleNamespace(id=uuid4(), agency_id=uuid4(), is_admin=False, role='agent')
+
+
+@patch('apps.sms.services.transaction.atomic', return_value=nullcontext())
+@patch('apps.sms.services.connection')
+class MarkConversationReadTests(SimpleTestCase):
+    """Tests for mark_conversation_read."""
+
+    def _cursor(self, mock_connection, rowcount):
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        cursor.rowcount = rowcount
+        return cursor
+
+    @patch('apps.sms.services.publish_conversation_event')
+    @patch('apps.sms.services.refresh_conversation_summaries')
+    def test_marks_and_refreshes(self, mock_refresh, mock_publish, mock_connection, mock_atomic):
+        """Marked messages refresh the summary and publish one event."""
+        cursor = self._cursor(mock_connection, 3)
+        user = make_user()
+        conversation_id = uuid4()
+
+        marked = services.mark_conversation_read(user, conversation_id)
+
+        self.assertEqual(marked, 3)
+        self.assertEqual(cursor.execute.call_count, 1)
+        params = cursor.execute.call_args[0][1]
+        self.assertEqual(params[:3], [str(conversation_id), str(user.agency_id), None])
+        mock_refresh.assert_called_once_with([conversation_id])
+        mock_publish.assert_called_once_with('messages_read', conversation_id)
+
+    @patch('apps.sms.services.publish_conversation_event')
+    @patch('apps.sms.services.refresh_conversation_summaries')
+    def test_up_to_message(self, mock_refresh, mock_publish, mock_connection, mock_atomic):
+        """up_to_message_id bounds the UPDATE."""
+        cursor = self._cursor(mock_connection, 1)
+        up_to = uuid4()
+
+        services.mark_conversation_read(make_user(), uuid4(), up_to_message_id=up_to)
+
+        params = cursor.execute.call_args[0][1]
+        self.assertEqual(params[2:], [str(up_to), str(up_to)])
+
+    @patch('apps.sms.services.publish_conversation_event')
+    @patch('apps.sms.services.refresh_conversation_summaries')
+    def test_nothing_unread(self, mock_refresh, mock_publish, mock_connection, mock_atomic):
+        """Already-read conversations skip the refresh and the event."""
+        self._cursor(mock_connection, 0)
+
+        self.assertEqual(services.mark_conversation_read(make_user(), uuid4()), 0)
+        mock_refresh.assert_not_called()
+        mock_publish.assert_not_called()
+
+
+@patch('apps.sms.services.connection')
+class RefreshConversationSummariesTests(SimpleTestCase):
+    """Tests for refresh_conversation_summaries."""
+
+    def test_one_update_for_distinct_ids(self, mock_connection):
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        conversation_id = uuid4()
+
+        services.refresh_conversation_summaries([conversation_id, str(conversation_id)])
+
+        self.assertEqual(cursor.execute.call_count, 1)
+        self.assertEqual(cursor.execute.call_args[0][1], [[str(conversation_id)]])
+
+    def test_counter_updated_in_same_statement(self, mock_connection):
+        """The agent's unread counter moves with the conversation's unread_count."""
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+
+        services.refresh_conversation_summaries([uuid4()])
+
+        sql = cursor.execute.call_args[0][0]
+        self.assertIn('INSERT INTO public.agent_unread_counts', sql)
+        self.assertIn('agent_unread_counts.unread_count + EXCLUDED.unread_count', sql)
+
+    def test_empty_is_noop(self, mock_connection):
+        services.refresh_conversation_summaries([])
+
+        mock_connection.cursor.assert_not_called()
+
+
+@patch('apps.sms.services.transaction.atomic', return_value=nullcontext())
+@patch('apps.sms.services.connection')
+class ReconcileUnreadCountsTests(SimpleTestCase):
+    """Tests for reconcile_unread_counts."""
+
+    def test_conversations_then_locked_counters(self, mock_connection, mock_atomic):
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        cursor.rowcount = 2
+        agency_id = uuid4()
+
+        self.assertEqual(services.reconcile_unread_counts(agency_id), 4)
+
+        statements = [call[0][0] for call in cursor.execute.call_args_list]
+        self.assertIn('UPDATE public.conversations', statements[0])
+        self.assertIn('FOR UPDATE', statements[1])
+        self.assertIn('INSERT INTO public.agent_unread_counts', statements[2])
+        mock_atomic.assert_called_once_with()
+
+
+@patch('apps.sms.selectors.connection')
+class UnreadCountReadTests(SimpleTestCase):
+    """Tests for the counter-backed unread count reads."""
+
+    def _cursor(self, mock_connection, total):
+        cursor = mock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (total,)
+        return cursor
+
+    def test_self(self, mock_connection):
+        cursor = self._cursor(mock_connection, 4)
+        user = make_user()
+
+        self.assertEqual(selectors.get_unread_message_count(user, 'self'), 4)
+        self.assertEqual(cursor.execute.call_args[0][1], [[str(user.id)]])
+
+    def test_agency_for_admins(self, mock_connection):
+        cursor = self._cursor(mock_connection, 9)
+        user = make_user()
+        user.is_admin = True
+
+        self.assertEqual(selectors.get_unread_message_count(user, 'all'), 9)
+        self.assertEqual(cursor.execute.call_args[0][1], [str(user.agency_id)])
+
+    @patch('apps.core.hierarchy.get_downline_ids')
+    def test_downlines(self, mock_downline, mock_connection):
+        cursor = self._cursor(mock_connection, 3)
+        user = make_user()
+        downline = [user.id, uuid4()]
+        mock_downline.return_value = downline
+
+        self.assertEqual(selectors.get_unread_message_count(user, 'downlines'), 3)
+        mock_downline.assert_called_once_with(user.id, user.agency_id, include_self=True)
+        self.assertEqual(cursor.execute.call_args[0][1], [[str(i) for i in downline]])
+
+    def test_no_agents_skips_query(self, mock_connection):
+        self.assertEqual(selectors.get_agent_unread_count([]), 0)
+        mock_connection.cursor.assert_not_called()
@@ -0,0 +1,67 @@
+"""
+SMS Template Unit Tests
+
+Tests for the template compiler and placeholder validation.
+"""
+from django.test import SimpleTestCase
+
+from apps.sms.templates_service import (
+    DEFAULT_SMS_TEMPLATES,
+    SMS_TEMPLATE_PLACEHOLDERS,
+    compile_template,
+    replace_placeholders,
+    validate_template,
+)
+
+
+class CompiledTemplateTests(SimpleTestCase):
+    """Tests for CompiledTemplate.render."""
+
+    def test_render(self):
+        template = compile_template('Hi {{first_name}}, from {{agent_name}} and {{agent_name}}.')
+
+        self.assertEqual(
+            template.render({'first_name': 'Ann', 'agent_name': 'Bo'}),
+            'Hi Ann, from Bo and Bo.',
+        )
+        self.assertEqual(template.placeholders, {'first_name', 'agent_name'})
+
+    def test_missing_kept_and_falsy_empty(self):
+        """Same rules as replace_placeholders always had."""
+        template = compile_template('{{a}}-{{b}}-{{c}}')
+
+        self.assertEqual(template.render({'a': None, 'b': 0}), '--{{c}}')
+
+    def test_values_not_rescanned(self):
+        """A value that looks like a placeholder is inserted verbatim."""
+        self.assertEqual(
+            replace_placeholders('{{a}} {{b}}', {'a': '{{b}}', 'b': 'x'}),
+            '{{b}} x',
+        )
+
+    def test_no_placeholders(self):
+        self.assertEqual(compile_template('Plain text').render({'a': 1}), 'Plain text')
+
+    def test_compiled_once(self):
+        source = 'Cached {{first_name}}'
+
+        self.assertIs(compile_template(source), compile_template(source))
+
+
+class ValidateTemplateTests(SimpleTestCase):
+    """Tests for validate_template."""
+
+    def test_defaults_are_valid(self):
+        for template_type in SMS_TEMPLATE_PLACEHOLDERS:
+            with self.subTest(template_type=template_type):
+                self.assertEqual(validate_template(DEFAULT_SMS_TEMPLATES[template_type], template_type), [])
+
+    def test_unknown_reported_once(self):
+        self.assertEqual(
+            validate_template('{{client_first_name}} {{agent_phone}} {{agent_phone}}', 'birthday'),
+            ['agent_phone'],
+        )
+
+    def test_bulk(self):
+        self.assertEqual(validate_template('Hi {{first_name}} {{agent_name}}', 'bulk'), ['agent_name'])
+
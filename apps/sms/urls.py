@@ -12,6 +12,7 @@ from .views import (
     DraftsEditView,
     DraftsRejectView,
     DraftsView,
+    MarkConversationReadView,
     MarkMessageReadView,
     MessageLogView,
     MessagesView,
@@ -35,6 +36,7 @@ urlpatterns = [
     path('conversations/find', ConversationFindView.as_view(), name='conversation_find'),
     path('conversations/get-or-create', ConversationGetOrCreateView.as_view(), name='conversation_get_or_create'),
     path('conversations/start', StartConversationView.as_view(), name='conversation_start'),
+    path('conversations/<str:conversation_id>/read/', MarkConversationReadView.as_view(), name='mark_conversation_read'),
     path('messages/', MessagesView.as_view(), name='messages'),
     path('send', SmsSendWithBillingView.as_view(), name='sms_send'),
     path('messages/log', MessageLogView.as_view(), name='message_log'),
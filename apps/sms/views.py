@@ -4,7 +4,7 @@ SMS API Views (P1-016, P2-029, P2-030, P2-031)
 Endpoints:
 - GET /api/sms/conversations - Get SMS conversations
 - GET/POST /api/sms/messages - Get/send messages
-- POST /api/sms/bulk - Send bulk SMS
+- POST /api/sms/bulk - Queue bulk SMS (202 + job_id)
 - CRUD /api/sms/templates - SMS template management
 - GET/PUT /api/sms/opt-out - Opt-out management
 """
@@ -19,8 +19,11 @@ from rest_framework.views import APIView
 
 from apps.core.authentication import CronSecretAuthentication, SupabaseJWTAuthentication
 from apps.core.constants import PAGINATION, RATE_LIMITS
-from apps.core.mixins import AuthenticatedAPIView
+from apps.core.jobs import enqueue_job
+from apps.core.mixins import AuthenticatedAPIView, handle_api_errors, job_accepted_response
+from apps.core.pagination import parse_cursor_params
 
+from .jobs import BULK_SEND_JOB
 from .selectors import (
     get_draft_messages,
     get_sms_conversations,
@@ -28,7 +31,6 @@ from .selectors import (
     get_unread_message_count,
 )
 from .services import (
-    BulkSendInput,
     GetOrCreateConversationInput,
     LogMessageInput,
     SendMessageInput,
@@ -43,9 +45,9 @@ from .services import (
     get_template_by_id,
     list_templates,
     log_message,
+    mark_conversation_read,
     mark_message_as_read,
     reject_drafts,
-    send_bulk_messages,
     send_message,
     send_message_with_billing,
     start_conversation,
@@ -53,15 +55,24 @@ from .services import (
     update_opt_status,
     update_template,
 )
+from .templates_service import validate_template
 
 logger = logging.getLogger(__name__)
 
 
 class ConversationsView(AuthenticatedAPIView, APIView):
-    """GET /api/sms/conversations - Get SMS conversations."""
+    """
+    GET /api/sms/conversations - Get SMS conversations
+
+    Query params:
+        page, limit: Page/limit paging
+        cursor: Keyset paging instead ('' for the first page, then nextCursor)
+        include_total: With cursor, include an approximate totalCount
+    """
 
     permission_classes = [IsAuthenticated]
 
+    @handle_api_errors
     def get(self, request):
         user = self.get_user(request)
 
@@ -75,6 +86,7 @@ class ConversationsView(AuthenticatedAPIView, APIView):
             PAGINATION["max_limit"],
         )
         search_query = request.query_params.get("search", "").strip() or None
+        cursor, include_total = parse_cursor_params(request.query_params)
 
         result = get_sms_conversations(
             user=user,
@@ -82,6 +94,8 @@ class ConversationsView(AuthenticatedAPIView, APIView):
             page=page,
             limit=limit,
             search_query=search_query,
+            cursor=cursor,
+            include_total=include_total,
         )
         return Response(result)
 
@@ -90,10 +104,13 @@ class MessagesView(AuthenticatedAPIView, APIView):
     """
     GET /api/sms/messages - Get messages for a conversation
     POST /api/sms/messages - Send a message (P1-016)
+
+    GET accepts cursor/include_total for keyset paging (see ConversationsView).
     """
 
     permission_classes = [IsAuthenticated]
 
+    @handle_api_errors
     def get(self, request):
         user = self.get_user(request)
 
@@ -111,11 +128,15 @@ class MessagesView(AuthenticatedAPIView, APIView):
             int(request.query_params.get("limit", 50)), PAGINATION["max_limit"]
         )
 
+        cursor, include_total = parse_cursor_params(request.query_params)
+
         result = get_sms_messages(
             user=user,
             conversation_id=conversation_uuid,
             page=page,
             limit=limit,
+            cursor=cursor,
+            include_total=include_total,
         )
         return Response(result)
 
@@ -298,6 +319,33 @@ class MarkMessageReadView(AuthenticatedAPIView, APIView):
         )
 
 
+class MarkConversationReadView(AuthenticatedAPIView, APIView):
+    """
+    POST /api/sms/conversations/{conversation_id}/read/
+
+    Mark a conversation's inbound messages as read in one statement.
+
+    Request body:
+        up_to_message_id: Optional - only mark messages up to this one
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, conversation_id: str):
+        user = self.get_user(request)
+
+        conversation_uuid = self.parse_uuid(conversation_id, "conversation_id")
+        up_to_message_id = request.data.get("up_to_message_id")
+        up_to_uuid = self.parse_uuid(up_to_message_id, "up_to_message_id") if up_to_message_id else None
+
+        marked = mark_conversation_read(
+            user=user,
+            conversation_id=conversation_uuid,
+            up_to_message_id=up_to_uuid,
+        )
+        return Response({"success": True, "marked_read": marked})
+
+
 class SmsSendWithBillingView(AuthenticatedAPIView, APIView):
     """
     POST /api/sms/send
@@ -365,7 +413,12 @@ class SmsSendWithBillingView(AuthenticatedAPIView, APIView):
 
 
 class BulkSmsView(AuthenticatedAPIView, APIView):
-    """POST /api/sms/bulk - Send bulk SMS messages (P2-030)."""
+    """
+    POST /api/sms/bulk - Send bulk SMS messages (P2-030).
+
+    Queues the send and responds 202 with a job_id; per-recipient results
+    are the job result at GET /api/jobs/{job_id}.
+    """
 
     permission_classes = [IsAuthenticated]
 
@@ -391,32 +444,30 @@ class BulkSmsView(AuthenticatedAPIView, APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        if not template_id:
+            unknown = validate_template(content, "bulk")
+            if unknown:
+                return Response(
+                    {"error": f"Unknown placeholders: {', '.join(unknown)}"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
         template_uuid = self.parse_uuid(template_id, "template_id") if template_id else None
         recipient_uuids = [self.parse_uuid(rid, "recipient_id") for rid in recipient_ids]
 
-        result = send_bulk_messages(
-            user=user,
-            data=BulkSendInput(
-                template_id=template_uuid,
-                content=content,
-                recipient_ids=recipient_uuids,
-                recipient_type=recipient_type,
-            ),
-        )
-
-        response_status = (
-            status.HTTP_200_OK if result.success else status.HTTP_207_MULTI_STATUS
-        )
-        return Response(
+        job_id = enqueue_job(
+            BULK_SEND_JOB,
             {
-                "success": result.success,
-                "total": result.total,
-                "sent": result.sent,
-                "failed": result.failed,
-                "errors": result.errors,
+                "auth_user_id": str(user.auth_user_id),
+                "template_id": str(template_uuid) if template_uuid else None,
+                "content": content,
+                "recipient_ids": [str(rid) for rid in recipient_uuids],
+                "recipient_type": recipient_type,
             },
-            status=response_status,
+            agency_id=user.agency_id,
+            created_by=user.id,
         )
+        return job_accepted_response(job_id)
 
 
 class TemplatesListView(AuthenticatedAPIView, APIView):
@@ -819,6 +870,9 @@ class TelnyxWebhookView(APIView):
 
     This endpoint receives webhooks from Telnyx when SMS messages are received.
     No authentication required (public webhook endpoint).
+
+    Events are queued as sms.inbound_message jobs (deduplicated on the Telnyx
+    message ID) and processed by run_jobs workers; see apps.sms.inbound.
     """
 
     # Disable authentication for webhook
@@ -826,166 +880,45 @@ class TelnyxWebhookView(APIView):
     permission_classes = []
 
     def post(self, request):
-        """Handle inbound SMS webhook from Telnyx."""
+        """Queue an inbound SMS webhook from Telnyx for processing."""
+        from apps.core.jobs import enqueue_job
+
+        from .inbound import get_compliance_keyword, parse_inbound_event
+        from .jobs import INBOUND_MESSAGE_JOB
+
         try:
             body = request.data
 
-            # Telnyx sends event_type in data.event_type
-            event_type = body.get("data", {}).get("event_type")
-
-            if event_type != "message.received":
+            message = parse_inbound_event(body)
+            if not message:
                 return Response({
                     "success": True,
                     "message": "Event received"
                 })
 
-            payload = body.get("data", {}).get("payload", {})
-            from_number = payload.get("from", {}).get("phone_number")
-            to_numbers = payload.get("to", [])
-            to_number = to_numbers[0].get("phone_number") if to_numbers else None
-            message_text = payload.get("text", "")
-            telnyx_message_id = payload.get("id")
-
-            if not from_number or not to_number:
+            if not message.from_number or not message.to_number:
                 return Response({
                     "success": False,
                     "message": "Missing phone numbers"
                 }, status=status.HTTP_400_BAD_REQUEST)
 
-            logger.info(f"Received inbound SMS from {from_number} to {to_number}: {message_text[:50]}...")
-
-            # Find agency by receiving phone number
-            from apps.sms.services import normalize_phone_number
-            from apps.deals.selectors import find_deal_by_client_phone
-
-            # Get agency by phone number
-            agency = self._find_agency_by_phone(to_number)
-            if not agency:
-                logger.warning(f"No agency found for phone number: {to_number}")
-                return Response({
-                    "success": False,
-                    "message": "Agency not found"
-                })
-
-            agency_id = agency["id"]
-            logger.info(f"Message received for agency: {agency['name']} ({agency_id})")
-
-            # Normalize client phone for storage
-            normalized_client_phone = normalize_phone_number(from_number)
-            if normalized_client_phone.startswith("+1"):
-                normalized_client_phone = normalized_client_phone[2:]
-
-            # Find deal by client phone
-            deal = find_deal_by_client_phone(normalized_client_phone, agency_id)
-            if not deal:
-                logger.warning(f"No deal found for client phone: {normalized_client_phone} in agency: {agency_id}")
-                return Response({
-                    "success": False,
-                    "message": "Client not found"
-                })
-
-            agent_info = deal.get("agent", {})
-            agent_id = agent_info.get("id")
-            if not agent_id:
-                logger.warning(f"No agent found for deal: {deal.get('id')}")
-                return Response({
-                    "success": False,
-                    "message": "Agent not found"
-                })
-
-            # Get or create conversation
-            from apps.sms.services import (
-                get_or_create_conversation,
-                GetOrCreateConversationInput,
-                handle_stop_keyword,
-                handle_start_keyword,
-            )
-            from apps.core.authentication import AuthenticatedUser
-            from uuid import UUID
-
-            # Create a minimal user object for the service call
-            user = AuthenticatedUser(
-                id=UUID(agent_id),
-                email="webhook@system.internal",
-                agency_id=UUID(agency_id),
-                is_admin=False,
-                role="agent",
-            )
+            logger.info(f"Received inbound SMS from {message.from_number} to {message.to_number}: {message.text[:50]}...")
 
-            conv_result = get_or_create_conversation(
-                user=user,
-                data=GetOrCreateConversationInput(
-                    agent_id=UUID(agent_id),
-                    deal_id=UUID(deal["id"]) if deal.get("id") else None,
-                    phone_number=normalized_client_phone,
-                ),
-            )
-
-            if not conv_result.success or not conv_result.conversation:
-                logger.error(f"Failed to get/create conversation: {conv_result.error}")
-                return Response({
-                    "success": False,
-                    "message": "Failed to create conversation"
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-            conversation = conv_result.conversation
-            conversation_id = conversation["id"]
-
-            # Check for compliance keywords
-            keyword = self._get_compliance_keyword(message_text)
-
-            if keyword:
-                logger.info(f"Received compliance keyword: {keyword}")
-
-                # Log the incoming keyword message
-                self._log_message(
-                    conversation_id=conversation_id,
-                    content=message_text,
-                    direction="inbound",
-                    status="received",
-                    metadata={
-                        "client_phone": normalized_client_phone,
-                        "telnyx_message_id": telnyx_message_id,
-                        "compliance_keyword": keyword,
-                    },
-                    user=user,
-                )
-
-                # Handle the compliance keyword
-                if keyword == "STOP":
-                    handle_stop_keyword(normalized_client_phone, UUID(agency_id))
-                    # Note: Response SMS is still sent by Next.js webhook handler
-                elif keyword == "START":
-                    handle_start_keyword(normalized_client_phone, UUID(agency_id))
-                    # Note: Response SMS is still sent by Next.js webhook handler
-
-                return Response({
-                    "success": True,
-                    "message": "Compliance keyword processed",
-                    "keyword": keyword,
-                    "conversation_id": conversation_id,
-                })
-
-            # Log regular inbound message
-            self._log_message(
-                conversation_id=conversation_id,
-                content=message_text,
-                direction="inbound",
-                status="received",
-                metadata={
-                    "client_phone": normalized_client_phone,
-                    "telnyx_message_id": telnyx_message_id,
-                },
-                user=user,
+            # Telnyx retries slow or failed deliveries; the message ID keeps
+            # each message to one job
+            job_id = enqueue_job(
+                INBOUND_MESSAGE_JOB,
+                {"event": body},
+                dedupe_key=message.telnyx_message_id,
             )
 
             return Response({
                 "success": True,
-                "message": "Message processed",
-                "conversation_id": conversation_id,
-                "deal_id": deal.get("id"),
-                "agent_id": agent_id,
-            })
+                "message": "Message queued" if job_id else "Duplicate message ignored",
+                "job_id": str(job_id) if job_id else None,
+                "duplicate": job_id is None,
+                "keyword": get_compliance_keyword(message.text),
+            }, status=status.HTTP_202_ACCEPTED if job_id else status.HTTP_200_OK)
 
         except Exception as e:
             logger.error(f"Telnyx webhook error: {e}", exc_info=True)
@@ -1000,69 +933,3 @@ class TelnyxWebhookView(APIView):
             "status": "ok",
             "message": "Telnyx webhook endpoint is active"
         })
-
-    def _get_compliance_keyword(self, message_text: str) -> str | None:
-        """Check if message is an opt-out/help/opt-in keyword."""
-        text = message_text.strip().upper()
-        if text in ("STOP", "UNSUBSCRIBE"):
-            return "STOP"
-        if text in ("START", "UNSTOP", "SUBSCRIBE"):
-            return "START"
-        if text in ("HELP", "INFO"):
-            return "HELP"
-        return None
-
-    def _find_agency_by_phone(self, phone_number: str) -> dict | None:
-        """Find agency by phone number."""
-        import re
-        from django.db import connection
-
-        # Normalize phone number
-        normalized = re.sub(r"\D", "", phone_number)
-        phone_variations = [
-            phone_number,
-            normalized,
-            f"+1{normalized}" if len(normalized) == 10 else f"+{normalized}",
-        ]
-
-        for variation in phone_variations:
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    SELECT id, name, phone_number
-                    FROM public.agencies
-                    WHERE phone_number = %s
-                """, [variation])
-                row = cursor.fetchone()
-
-            if row:
-                return {
-                    "id": str(row[0]),
-                    "name": row[1],
-                    "phone_number": row[2],
-                }
-
-        return None
-
-    def _log_message(
-        self,
-        conversation_id: str,
-        content: str,
-        direction: str,
-        status: str,
-        metadata: dict,
-        user,
-    ) -> None:
-        """Log a message to the database."""
-        from apps.sms.services import log_message, LogMessageInput
-        from uuid import UUID
-
-        log_message(
-            user=user,
-            data=LogMessageInput(
-                conversation_id=UUID(conversation_id),
-                content=content,
-                direction=direction,
-                status=status,
-                metadata=metadata,
-            ),
-        )
@@ -15,6 +15,8 @@ from uuid import UUID
 
 from django.db import connection
 
+from apps.core.authentication import invalidate_cached_users_by_id
+
 logger = logging.getLogger(__name__)
 
 # Stripe configuration
@@ -138,6 +140,7 @@ def handle_checkout_completed(session_data: dict) -> SubscriptionUpdateResult:
                     user_id,
                 ])
 
+            invalidate_cached_users_by_id([user_id])
             logger.info(f'Subscription activated for user {user_id}: {tier} tier')
 
             # Add metered prices to subscription
@@ -366,6 +369,7 @@ def handle_subscription_updated(subscription_data: dict) -> SubscriptionUpdateRe
                 WHERE id = %s
             """, values)
 
+        invalidate_cached_users_by_id([user_id])
         final_tier = update_fields.get('subscription_tier', tier)
         logger.info(f'Subscription updated for user {user_id}: {final_tier} tier, status: {status}')
 
@@ -409,6 +413,7 @@ def handle_subscription_deleted(subscription_data: dict) -> SubscriptionUpdateRe
                 WHERE id = %s
             """, [user_id])
 
+        invalidate_cached_users_by_id([user_id])
         logger.info(f'Subscription canceled for user {user_id} - reverted to free tier')
 
         return SubscriptionUpdateResult(
@@ -12,6 +12,8 @@ from uuid import UUID
 
 from django.db import connection
 
+from apps.core.authentication import invalidate_cached_users_by_id
+
 logger = logging.getLogger(__name__)
 
 # Stripe configuration
@@ -466,6 +468,7 @@ def change_subscription(
                     WHERE id = %s
                 """, [new_tier, str(user_id)])
 
+            invalidate_cached_users_by_id([user_id])
             logger.info(f'Upgrade completed for user {user_id}: {new_tier}')
 
             return SubscriptionChangeResult(
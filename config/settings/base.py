@@ -132,6 +132,49 @@ DATABASES = {
     }
 }
 
+# =============================================================================
+# Caches
+# 'default' is shared by every worker (DRF throttles, version tokens, cached
+# users); 'tiered' adds a per-process LRU in front of it for hot, versioned
+# data (see apps.core.cache.TieredCache).
+# 'default' MUST be shared by every pod: invalidation only reaches other
+# workers through it (bump_data_version, invalidate_hierarchy_index,
+# invalidate_cached_user), so a per-pod cache serves stale results and stale
+# permissions until the TTLs run out. Production defaults to 'db'; 'file'
+# and 'locmem' are per pod and log a warning at startup outside DEBUG.
+# CACHE_BACKEND: 'file' (CACHE_LOCATION directory), 'db' (CACHE_LOCATION
+# table, create it once with `manage.py createcachetable`) or 'locmem'
+# =============================================================================
+
+CACHE_BACKEND = config('CACHE_BACKEND', default='file')
+CACHE_BACKENDS = {
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', '/tmp/agentspace-cache'),
+    'db': ('django.core.cache.backends.db.DatabaseCache', 'django_cache'),
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'agentspace'),
+}
+# Backends that are not shared between pods
+PER_PROCESS_CACHE_BACKENDS = frozenset({CACHE_BACKENDS['file'][0], CACHE_BACKENDS['locmem'][0]})
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': config('CACHE_LOCATION', default=CACHE_BACKENDS[CACHE_BACKEND][1]),
+        'TIMEOUT': 300,
+        'KEY_PREFIX': 'agentspace',
+        'OPTIONS': {
+            'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=10000, cast=int),
+        },
+    },
+    'tiered': {
+        'BACKEND': 'apps.core.cache.TieredCache',
+        'LOCATION': 'default',
+        'OPTIONS': {
+            'LOCAL_TTL': config('CACHE_LOCAL_TTL', default=30, cast=int),
+            'LOCAL_MAX_ENTRIES': config('CACHE_LOCAL_MAX_ENTRIES', default=1024, cast=int),
+        },
+    },
+}
+
 # =============================================================================
 # Authentication Configuration
 # =============================================================================
@@ -147,6 +190,107 @@ AUTH_JWT_SECRET = config('AUTH_JWT_SECRET', default='')
 # Cron authentication secret (shared with frontend)
 CRON_SECRET = config('CRON_SECRET', default='')
 
+# Cache for auth_user_id -> users row resolution (see apps.core.authentication)
+# TTL: seconds in the shared Django cache; LOCAL_TTL: seconds in the per-process LRU
+AUTH_USER_CACHE = {
+    'ALIAS': 'default',
+    'TTL': config('AUTH_USER_CACHE_TTL', default=60, cast=int),
+    'LOCAL_TTL': config('AUTH_USER_CACHE_LOCAL_TTL', default=5, cast=int),
+    'MAX_ENTRIES': 1024,
+}
+
+# In-memory agency hierarchy index (see apps.core.hierarchy)
+# MAX_AGE: seconds before an index is rebuilt even without a version bump,
+# bounding staleness from writes made outside this service
+HIERARCHY_INDEX = {
+    'ALIAS': 'default',
+    'MAX_AGE': config('HIERARCHY_INDEX_MAX_AGE', default=300, cast=int),
+    'MAX_AGENCIES': 64,
+}
+
+# Cached analytics/dashboard results (see apps.core.cache.agency_cached)
+# Keys embed the agency data version, so TTL only bounds staleness from
+# writes made outside this service (e.g. status_mapping edits in Supabase)
+RESULT_CACHE = {
+    'ALIAS': 'tiered',
+    'VERSION_ALIAS': 'default',
+    'TTL': config('RESULT_CACHE_TTL', default=900, cast=int),
+}
+
+# Keyset pagination (see apps.core.pagination): approximate totals for cursor
+# pages are cached per agency data version for TOTAL_TTL seconds
+CURSOR_PAGINATION = {
+    'TOTAL_TTL': config('CURSOR_PAGINATION_TOTAL_TTL', default=300, cast=int),
+}
+
+# Inbound SMS (see apps.sms.inbound): receiving number -> agency and client
+# number -> deal resolutions are cached for PHONE_CACHE_TTL seconds
+SMS_INBOUND = {
+    'PHONE_CACHE_TTL': config('SMS_INBOUND_PHONE_CACHE_TTL', default=300, cast=int),
+}
+
+# Bulk SMS dispatch (see apps.sms.dispatch): concurrent provider requests per
+# bulk send and per-process messages/second per provider
+SMS_DISPATCH = {
+    'CONCURRENCY': config('SMS_DISPATCH_CONCURRENCY', default=8, cast=int),
+    'RATE_LIMITS': {
+        'telnyx': config('TELNYX_RATE_LIMIT', default=6, cast=float),
+    },
+}
+
+# Postgres LISTEN/NOTIFY fan-out for SSE streams (see apps.core.events)
+# LISTEN needs a session-level connection (not a transaction-mode pooler)
+EVENT_HUB = {
+    'ENABLED': config('EVENT_HUB_ENABLED', default=True, cast=bool),
+    'DATABASE': 'default',
+    'CHANNELS': ['sms_events', 'nipr_events'],
+}
+
+# Cached carriers/status mappings/products/positions (see apps.core.reference_data)
+# Versions expire after TTL so edits made directly in Supabase show up within it
+REFERENCE_DATA = {
+    'ALIAS': 'tiered',
+    'VERSION_ALIAS': 'default',
+    'TTL': config('REFERENCE_DATA_TTL', default=3600, cast=int),
+}
+
+# Precomputed deal billing periods (see apps.deals.billing_schedule)
+# Upcoming billing dates are kept this many days ahead; refresh daily with
+# `manage.py refresh_billing_schedule`
+BILLING_SCHEDULE = {
+    'HORIZON_DAYS': config('BILLING_SCHEDULE_HORIZON_DAYS', default=60, cast=int),
+}
+
+# Background job queue (see apps.core.jobs); workers run `manage.py run_jobs`
+# Failed attempts retry after RETRY_BACKOFF * 2^(attempt-1) seconds, capped
+JOB_QUEUE = {
+    'LEASE_SECONDS': config('JOB_LEASE_SECONDS', default=600, cast=int),
+    'MAX_ATTEMPTS': 3,
+    'RETRY_BACKOFF': 30,
+    'MAX_BACKOFF': 3600,
+}
+
+# Policy report staging loads (see apps.ingest.staging): rows per COPY, and
+# bytes of each chunk's CSV buffer kept in memory before spilling to disk
+STAGING_LOAD = {
+    'CHUNK_SIZE': config('STAGING_LOAD_CHUNK_SIZE', default=5000, cast=int),
+    'SPOOL_BYTES': 8 * 1024 * 1024,
+}
+
+# Policy report ingest pipeline (see apps.ingest.pipeline): stages run at
+# once, each in its own thread and database connection
+INGEST_PIPELINE = {
+    'CONCURRENCY': config('INGEST_PIPELINE_CONCURRENCY', default=3, cast=int),
+}
+
+# Uploaded policy report parsing (see apps.ingest.parsing): rows searched for
+# the header row, and per-carrier header aliases keyed by lowercased carrier
+# name, e.g. {'acme life': {'Contract #': 'policy_number'}}
+POLICY_REPORT_PARSE = {
+    'HEADER_SCAN_ROWS': 20,
+    'CARRIER_COLUMNS': {},
+}
+
 # =============================================================================
 # REST Framework
 # =============================================================================
@@ -47,6 +47,14 @@ CORS_ALLOW_ALL_ORIGINS = False
 
 DATABASES['default']['OPTIONS']['sslmode'] = 'require'  # noqa: F405
 
+# =============================================================================
+# Cache - Shared by every pod (see base.py)
+# =============================================================================
+
+CACHE_BACKEND = config('CACHE_BACKEND', default='db')  # noqa: F405
+CACHES['default']['BACKEND'] = CACHE_BACKENDS[CACHE_BACKEND][0]  # noqa: F405
+CACHES['default']['LOCATION'] = config('CACHE_LOCATION', default=CACHE_BACKENDS[CACHE_BACKEND][1])  # noqa: F405
+
 # =============================================================================
 # Logging - Less verbose in production
 # =============================================================================
@@ -84,6 +84,58 @@ SUPABASE_JWT_SECRET = 'test-jwt-secret-key-for-testing-purposes-only'
 # Cron authentication secret for testing
 CRON_SECRET = 'test-cron-secret'
 
+# Keep cached data inside the test process
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'agentspace-test',
+    },
+    'tiered': {
+        'BACKEND': 'apps.core.cache.TieredCache',
+        'LOCATION': 'default',
+        'OPTIONS': {
+            'LOCAL_TTL': 30,
+            'LOCAL_MAX_ENTRIES': 128,
+        },
+    },
+}
+
+# Disable cross-request user caching so tests see row updates immediately
+AUTH_USER_CACHE = {
+    'ALIAS': 'default',
+    'TTL': 0,
+    'LOCAL_TTL': 0,
+    'MAX_ENTRIES': 0,
+}
+
+# Rebuild the hierarchy index on every lookup so fixtures are always visible
+HIERARCHY_INDEX = {
+    'ALIAS': 'default',
+    'MAX_AGE': 0,
+    'MAX_AGENCIES': 64,
+}
+
+# Compute analytics/dashboard results fresh on every call
+RESULT_CACHE = {
+    'ALIAS': 'tiered',
+    'VERSION_ALIAS': 'default',
+    'TTL': 0,
+}
+
+# No listener thread in tests; SSE streams fall back to polling
+EVENT_HUB = {
+    'ENABLED': False,
+    'DATABASE': 'default',
+    'CHANNELS': ['sms_events', 'nipr_events'],
+}
+
+# Load reference data fresh on every call (no ETags)
+REFERENCE_DATA = {
+    'ALIAS': 'tiered',
+    'VERSION_ALIAS': 'default',
+    'TTL': 0,
+}
+
 # =============================================================================
 # CORS - Allow all for tests
 # =============================================================================
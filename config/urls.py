@@ -6,7 +6,7 @@ All routes are prefixed with /api/ to match Next.js conventions.
 from django.contrib import admin
 from django.urls import include, path
 
-from apps.core.views import health_check
+from apps.core.views import cache_stats, health_check, job_status
 from apps.clients.urls import client_dashboard_urlpatterns
 from apps.auth_api.user_urls import users_urlpatterns
 from apps.carriers.urls import contracts_urlpatterns
@@ -25,6 +25,10 @@ urlpatterns = [
 
     # Health check endpoint (public)
     path('api/health', health_check, name='health_check'),
+    path('api/health/cache', cache_stats, name='cache_stats'),
+
+    # Background job status (202 responses point here)
+    path('api/jobs/<uuid:job_id>', job_status, name='job_status'),
 
     # Authentication endpoints
     path('api/auth/', include('apps.auth_api.urls')),
@@ -2,13 +2,12 @@
 Hierarchy Service (P1-016)
 
 Provides methods for navigating and validating the agent hierarchy.
-Uses django-cte 2.0 for recursive CTEs.
+Delegates to the in-memory agency hierarchy index in apps.core.hierarchy.
 """
 import logging
 from uuid import UUID
 
-from django.db.models import IntegerField, Value
-from django_cte import With
+from apps.core import hierarchy
 
 logger = logging.getLogger(__name__)
 
@@ -29,84 +28,17 @@ class HierarchyService:
     ) -> list[UUID]:
         """
         Get all agents in a user's downline (recursive).
-
-        Uses django-cte for efficient hierarchy traversal.
         """
-        from apps.core.models import User
-
-        if max_depth is not None:
-            max_depth = int(max_depth)
-            if max_depth < 1:
-                max_depth = None
-
-        def make_cte(cte):
-            base = (
-                User.objects
-                .filter(upline_id=user_id, agency_id=agency_id)
-                .annotate(depth=Value(1, output_field=IntegerField()))
-                .values('id', 'depth')
-            )
-            if max_depth is not None:
-                recursive = (
-                    cte.join(User, upline_id=cte.col.id)
-                    .filter(agency_id=agency_id)
-                    .filter(**{f'{cte.col.depth}__lt': max_depth})
-                    .annotate(depth=cte.col.depth + 1)
-                    .values('id', 'depth')
-                )
-            else:
-                recursive = (
-                    cte.join(User, upline_id=cte.col.id)
-                    .filter(agency_id=agency_id)
-                    .annotate(depth=cte.col.depth + 1)
-                    .values('id', 'depth')
-                )
-            return base.union(recursive, all=True)
-
-        cte = With.recursive(make_cte)
-        result = list(
-            cte.queryset()
-            .with_cte(cte)
-            .values_list('id', flat=True)
-        )
-
-        if include_self:
-            result.insert(0, user_id)
-
-        return result
+        return hierarchy.get_downline_ids(user_id, agency_id, max_depth, include_self)
 
     @staticmethod
-    def get_upline_chain(user_id: UUID) -> list[UUID]:
+    def get_upline_chain(user_id: UUID, agency_id: UUID | None = None) -> list[UUID]:
         """
         Get the chain of uplines from a user to the root.
 
         Returns list of user IDs from direct upline to root (ordered by proximity).
         """
-        from apps.core.models import User
-
-        def make_cte(cte):
-            base = (
-                User.objects
-                .filter(id=user_id)
-                .annotate(depth=Value(1, output_field=IntegerField()))
-                .values('id', 'upline_id', 'depth')
-            )
-            recursive = (
-                cte.join(User, id=cte.col.upline_id)
-                .annotate(depth=cte.col.depth + 1)
-                .values('id', 'upline_id', 'depth')
-            )
-            return base.union(recursive, all=True)
-
-        cte = With.recursive(make_cte)
-        result = list(
-            cte.queryset()
-            .with_cte(cte)
-            .filter(**{f'{cte.col.depth}__gt': 1})
-            .order_by(cte.col.depth)
-            .values_list('id', flat=True)
-        )
-        return result
+        return hierarchy.get_upline_ids(user_id, agency_id=agency_id)
 
     @staticmethod
     def get_visible_agent_ids(
@@ -118,35 +50,13 @@ class HierarchyService:
         """
         Get list of agent IDs visible to a user based on their role and hierarchy.
         """
-        from apps.core.models import User
-
         if include_full_agency and is_admin:
-            return list(
-                User.objects  # type: ignore[attr-defined]
-                .filter(agency_id=agency_id)
-                .exclude(role='client')
-                .values_list('id', flat=True)
-            )
+            return hierarchy.get_all_agency_agent_ids(agency_id, exclude_clients=True)
 
-        def make_cte(cte):
-            base = (
-                User.objects
-                .filter(id=user_id)
-                .values('id')
-            )
-            recursive = (
-                cte.join(User, upline_id=cte.col.id)
-                .filter(agency_id=agency_id)
-                .values('id')
-            )
-            return base.union(recursive, all=True)
-
-        cte = With.recursive(make_cte)
-        return list(
-            cte.queryset()
-            .with_cte(cte)
-            .values_list('id', flat=True)
-        )
+        index = hierarchy.get_hierarchy_index(agency_id)
+        if user_id not in index:
+            return []
+        return [user_id, *index.downline(user_id)]
 
     @staticmethod
     def is_in_hierarchy(
@@ -158,48 +68,13 @@ class HierarchyService:
         """
         Check if a target user is in the user's hierarchy.
         """
-        from apps.core.models import User
-
         if str(user_id) == str(target_id):
             return True
 
+        index = hierarchy.get_hierarchy_index(agency_id)
         if direction == 'downline':
-            def make_cte(cte):
-                base = User.objects.filter(id=user_id).values('id')
-                recursive = (
-                    cte.join(User, upline_id=cte.col.id)
-                    .filter(agency_id=agency_id)
-                    .values('id')
-                )
-                return base.union(recursive, all=True)
-
-            cte = With.recursive(make_cte)
-            return (
-                cte.queryset()
-                .with_cte(cte)
-                .filter(**{f'{cte.col.id}': target_id})
-                .exists()
-            )
-        else:
-            def make_cte(cte):
-                base = (
-                    User.objects
-                    .filter(id=user_id)
-                    .values('id', 'upline_id')
-                )
-                recursive = (
-                    cte.join(User, id=cte.col.upline_id)
-                    .values('id', 'upline_id')
-                )
-                return base.union(recursive, all=True)
-
-            cte = With.recursive(make_cte)
-            return (
-                cte.queryset()
-                .with_cte(cte)
-                .filter(**{f'{cte.col.id}': target_id})
-                .exists()
-            )
+            return index.is_descendant(user_id, target_id)
+        return index.is_descendant(target_id, user_id)
 
     @staticmethod
     def can_access_user(
@@ -216,16 +91,11 @@ class HierarchyService:
         - Admins can access anyone in their agency
         - Agents can access their downlines
         """
-        from apps.core.models import User
-
         if str(requesting_user_id) == str(target_user_id):
             return True
 
         if requesting_user_is_admin:
-            return User.objects.filter(  # type: ignore[attr-defined]
-                id=target_user_id,
-                agency_id=requesting_user_agency_id
-            ).exists()
+            return hierarchy.is_in_agency(target_user_id, requesting_user_agency_id)
 
         return HierarchyService.is_in_hierarchy(
             requesting_user_id,
@@ -239,32 +109,7 @@ class HierarchyService:
         """
         Get the depth of a user in the hierarchy (distance from root).
         """
-        from apps.core.models import User
-
-        def make_cte(cte):
-            base = (
-                User.objects
-                .filter(id=user_id, agency_id=agency_id)
-                .annotate(depth=Value(0, output_field=IntegerField()))
-                .values('id', 'upline_id', 'depth')
-            )
-            recursive = (
-                cte.join(User, id=cte.col.upline_id)
-                .filter(agency_id=agency_id)
-                .annotate(depth=cte.col.depth + 1)
-                .values('id', 'upline_id', 'depth')
-            )
-            return base.union(recursive, all=True)
-
-        cte = With.recursive(make_cte)
-        result = (
-            cte.queryset()
-            .with_cte(cte)
-            .order_by(f'-{cte.col.depth}')
-            .values_list('depth', flat=True)
-            .first()
-        )
-        return result if result is not None else 0
+        return hierarchy.get_hierarchy_depth(user_id, agency_id)
 
     @staticmethod
     def validate_upline_assignment(
@@ -275,8 +120,6 @@ class HierarchyService:
         """
         Validate that an upline assignment won't create a cycle.
         """
-        from apps.core.models import User
-
         if str(agent_id) == str(new_upline_id):
             return False, "An agent cannot be their own upline"
 
@@ -285,7 +128,7 @@ class HierarchyService:
         ):
             return False, "Cannot assign upline that is in agent's downline (would create cycle)"
 
-        if not User.objects.filter(id=new_upline_id, agency_id=agency_id).exists():  # type: ignore[attr-defined]
+        if not hierarchy.is_in_agency(new_upline_id, agency_id):
             return False, "New upline not found in agency"
 
         return True, None